@@ -5,7 +5,8 @@ export interface AdminUser { id: number; email: string; username: string | null;
 export interface QueryResult { rank: number; score: number; reason: string; document_uuid: string; title: string | null; url: string; source_domain: string }
 export interface ConversationMessage { id: number; role: 'user' | 'assistant'; content: string; created_at: string; steps: Array<Record<string, unknown>>; results: QueryResult[] }
 export interface AdminConversation { id: number; uuid: string; title: string | null; created_at: string; updated_at: string; user_id: number; email: string; username: string | null; messages: ConversationMessage[] }
-export interface AdminOverview { totals: Record<string, number>; source_statuses: Record<string, number>; document_types: Record<string, number> }
+export interface AdminAuthMetrics { identity_cache_hits: number; identity_cache_misses: number; identity_cache_size: number; user_cache_hits: number; user_cache_misses: number; verify_p50_ms: number; verify_p95_ms: number; resolve_p50_ms: number; resolve_p95_ms: number }
+export interface AdminOverview { totals: Record<string, number>; source_statuses: Record<string, number>; document_types: Record<string, number>; counts_as_of?: string | null; auth?: AdminAuthMetrics | null }
 export interface AdminLibraryEntry { document: { uuid: string; title: string | null; url: string; source_domain: string }; status: 'saved' | 'read' | 'archived'; favorited: boolean; note: string | null; intent_note: string | null; tags: string[]; first_seen_at: string | null; read_at: string | null; archived_at: string | null; favorited_at: string | null }
 export interface AdminLibraryCollection { id: number; name: string; description: string | null; visibility: 'private' | 'share_link'; created_at: string; updated_at: string; items: AdminLibraryEntry[] }
 export interface AdminUserLibrary { collections: AdminLibraryCollection[]; entries: Page<AdminLibraryEntry> }
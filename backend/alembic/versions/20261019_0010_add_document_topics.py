@@ -0,0 +1,60 @@
+"""Add the normalized document topic index and topic vocabulary.
+
+Run ``python -m iris.backfills.document_topics`` afterwards to populate both
+tables from existing ``documents.topics`` arrays.
+
+Revision ID: 20261019_0010
+Revises: 20260802_0009
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0010"
+down_revision = "20260802_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing_tables = set(sa.inspect(bind).get_table_names())
+
+    if "topics" not in existing_tables:
+        op.create_table(
+            "topics",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("slug", sa.String(length=255), nullable=False),
+            sa.Column("name", sa.String(length=255), nullable=False),
+            sa.Column("document_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+        op.create_index("ix_topics_slug", "topics", ["slug"], unique=True)
+        op.create_index("ix_topics_document_count", "topics", ["document_count"])
+
+    if "document_topics" not in existing_tables:
+        op.create_table(
+            "document_topics",
+            sa.Column("document_id", sa.Integer(), sa.ForeignKey("documents.id"), primary_key=True),
+            sa.Column("topic_slug", sa.String(length=255), primary_key=True),
+        )
+        op.create_index("idx_document_topics_slug_document", "document_topics", ["topic_slug", "document_id"])
+
+    if bind.dialect.name == "postgresql":
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_documents_topics_lower_gin "
+            "ON documents USING gin ((lower(topics::text)::jsonb) jsonb_path_ops)"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_documents_topics_lower_gin")
+    existing_tables = set(sa.inspect(bind).get_table_names())
+    if "document_topics" in existing_tables:
+        op.drop_table("document_topics")
+    if "topics" in existing_tables:
+        op.drop_table("topics")
@@ -0,0 +1,40 @@
+"""Add resumable checkpoints for long-running document backfills.
+
+Revision ID: 20261019_0011
+Revises: 20261019_0010
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0011"
+down_revision = "20261019_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if "backfill_checkpoints" in set(sa.inspect(bind).get_table_names()):
+        return
+    op.create_table(
+        "backfill_checkpoints",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(length=120), nullable=False),
+        sa.Column("scope", sa.String(length=255), nullable=False, server_default=""),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_document_id", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("counters", sa.JSON(), nullable=False),
+        sa.UniqueConstraint("name", "scope", name="uq_backfill_checkpoints_name_scope"),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if "backfill_checkpoints" in set(sa.inspect(bind).get_table_names()):
+        op.drop_table("backfill_checkpoints")
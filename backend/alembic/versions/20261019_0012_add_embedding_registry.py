@@ -0,0 +1,62 @@
+"""Add the per-model embedding registry.
+
+Run ``python -m iris.backfills.reembed --seed-only`` afterwards to register
+the model behind existing ``documents.embedding_vector`` rows.
+
+Revision ID: 20261019_0012
+Revises: 20261019_0011
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+revision = "20261019_0012"
+down_revision = "20261019_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing_tables = set(sa.inspect(bind).get_table_names())
+
+    if "embedding_models" not in existing_tables:
+        op.create_table(
+            "embedding_models",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("name", sa.String(length=120), nullable=False),
+            sa.Column("dimensions", sa.Integer(), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum("building", "serving", "retired", name="embedding_model_status", native_enum=False, create_constraint=True, length=40),
+                nullable=False,
+            ),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("activated_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_embedding_models_name", "embedding_models", ["name"], unique=True)
+        op.create_index("ix_embedding_models_status", "embedding_models", ["status"])
+
+    if "document_embeddings" not in existing_tables:
+        vector_type = Vector() if bind.dialect.name == "postgresql" else sa.LargeBinary()
+        op.create_table(
+            "document_embeddings",
+            sa.Column("document_id", sa.Integer(), sa.ForeignKey("documents.id"), primary_key=True),
+            sa.Column("model", sa.String(length=120), primary_key=True),
+            sa.Column("dimensions", sa.Integer(), nullable=False),
+            sa.Column("vector", vector_type, nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("idx_document_embeddings_model_document", "document_embeddings", ["model", "document_id"])
+
+
+def downgrade() -> None:
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "document_embeddings" in existing_tables:
+        op.drop_table("document_embeddings")
+    if "embedding_models" in existing_tables:
+        op.drop_table("embedding_models")
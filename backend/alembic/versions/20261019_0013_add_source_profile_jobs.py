@@ -0,0 +1,55 @@
+"""Track queued source profile analysis jobs.
+
+Revision ID: 20261019_0013
+Revises: 20261019_0012
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0013"
+down_revision = "20261019_0012"
+branch_labels = None
+depends_on = None
+
+STATUS_CHECK = "source_profile_analysis_status"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    existing = {column["name"] for column in inspector.get_columns("source_profile_analyses")}
+    if "queued_at" not in existing:
+        op.add_column("source_profile_analyses", sa.Column("queued_at", sa.DateTime(timezone=True), nullable=True))
+    if "started_at" not in existing:
+        op.add_column("source_profile_analyses", sa.Column("started_at", sa.DateTime(timezone=True), nullable=True))
+    indexes = {index["name"] for index in inspector.get_indexes("source_profile_analyses")}
+    if "ix_source_profile_analyses_queued_at" not in indexes:
+        op.create_index("ix_source_profile_analyses_queued_at", "source_profile_analyses", ["queued_at"])
+    if bind.dialect.name == "postgresql":
+        _replace_status_check("status IN ('pending', 'running', 'succeeded', 'failed')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("UPDATE source_profile_analyses SET status = 'pending' WHERE status = 'running'")
+        _replace_status_check("status IN ('pending', 'succeeded', 'failed')")
+    inspector = sa.inspect(bind)
+    indexes = {index["name"] for index in inspector.get_indexes("source_profile_analyses")}
+    if "ix_source_profile_analyses_queued_at" in indexes:
+        op.drop_index("ix_source_profile_analyses_queued_at", table_name="source_profile_analyses")
+    existing = {column["name"] for column in inspector.get_columns("source_profile_analyses")}
+    for column in ("started_at", "queued_at"):
+        if column in existing:
+            op.drop_column("source_profile_analyses", column)
+
+
+def _replace_status_check(condition: str) -> None:
+    checks = {check["name"] for check in sa.inspect(op.get_bind()).get_check_constraints("source_profile_analyses")}
+    if STATUS_CHECK in checks:
+        op.drop_constraint(STATUS_CHECK, "source_profile_analyses", type_="check")
+    op.create_check_constraint(STATUS_CHECK, "source_profile_analyses", condition)
@@ -0,0 +1,63 @@
+"""Cache homepage classifications and record when sources were classified.
+
+Revision ID: 20261019_0014
+Revises: 20261019_0013
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0014"
+down_revision = "20261019_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    existing = {column["name"] for column in inspector.get_columns("sources")}
+    if "classified_at" not in existing:
+        op.add_column("sources", sa.Column("classified_at", sa.DateTime(timezone=True), nullable=True))
+
+    if "source_homepage_classifications" not in set(inspector.get_table_names()):
+        op.create_table(
+            "source_homepage_classifications",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("content_hash", sa.String(length=64), nullable=False),
+            sa.Column(
+                "status",
+                sa.Enum(
+                    "queued",
+                    "indexed",
+                    "ignored",
+                    "crawling",
+                    "failed",
+                    name="source_homepage_classification_status",
+                    native_enum=False,
+                    create_constraint=True,
+                    length=40,
+                ),
+                nullable=False,
+            ),
+            sa.Column("reason", sa.Text(), nullable=False),
+            sa.Column("model", sa.String(length=120), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index(
+            "ix_source_homepage_classifications_content_hash",
+            "source_homepage_classifications",
+            ["content_hash"],
+            unique=True,
+        )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "source_homepage_classifications" in set(inspector.get_table_names()):
+        op.drop_table("source_homepage_classifications")
+    existing = {column["name"] for column in inspector.get_columns("sources")}
+    if "classified_at" in existing:
+        op.drop_column("sources", "classified_at")
@@ -0,0 +1,97 @@
+"""Add scheme-agnostic URL lookup keys to documents and links.
+
+Revision ID: 20261019_0015
+Revises: 20261019_0014
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0015"
+down_revision = "20261019_0014"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+KEY_COLUMNS = (
+    ("documents", "url", "url_key", "ix_documents_url_key"),
+    ("links", "target_url", "target_url_key", "ix_links_target_url_key"),
+)
+# Equal keys nominate candidates; the URL must match exactly or differ only in scheme.
+LINK_TARGET_MATCH = """
+    d.url_key = links.target_url_key
+    AND (
+        d.url = links.target_url
+        OR (links.target_url LIKE 'http://%' AND d.url = 'https://' || substr(links.target_url, 8))
+        OR (links.target_url LIKE 'https://%' AND d.url = 'http://' || substr(links.target_url, 9))
+    )
+"""
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    for table, url_column, key_column, index_name in KEY_COLUMNS:
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        if key_column not in existing:
+            op.add_column(table, sa.Column(key_column, sa.BigInteger(), nullable=True))
+        _backfill_keys(bind, table, url_column, key_column)
+        indexes = {index["name"] for index in inspector.get_indexes(table)}
+        if index_name not in indexes:
+            op.create_index(index_name, table, [key_column])
+    # Resolve links whose target document was crawled after the link was stored,
+    # accepting either http/https spelling as links.resolve_links_to_document does.
+    # If both spellings were crawled, the older document wins, as it would have at runtime.
+    target_id = f"(SELECT min(d.id) FROM documents d WHERE {LINK_TARGET_MATCH})"
+    op.execute(
+        f"""
+        UPDATE links
+        SET target_document_id = {target_id},
+            target_source_id = (SELECT t.source_id FROM documents t WHERE t.id = {target_id})
+        WHERE target_document_id IS NULL
+          AND EXISTS (SELECT 1 FROM documents d WHERE {LINK_TARGET_MATCH})
+        """
+    )
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table, _url_column, key_column, index_name in KEY_COLUMNS:
+        indexes = {index["name"] for index in inspector.get_indexes(table)}
+        if index_name in indexes:
+            op.drop_index(index_name, table_name=table)
+        existing = {column["name"] for column in inspector.get_columns(table)}
+        if key_column in existing:
+            op.drop_column(table, key_column)
+
+
+def _backfill_keys(bind, table: str, url_column: str, key_column: str) -> None:
+    after_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, {url_column} FROM {table} "
+                f"WHERE id > :after_id AND {key_column} IS NULL ORDER BY id LIMIT :limit"
+            ),
+            {"after_id": after_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {key_column} = :key WHERE id = :id"),
+            [{"id": row_id, "key": _url_key(url)} for row_id, url in rows],
+        )
+        after_id = rows[-1][0]
+
+
+def _url_key(url: str) -> int:
+    # Frozen copy of iris.services.common.url_utils.url_key.
+    scheme, separator, rest = url.partition(":")
+    if separator and scheme.lower() in {"http", "https"}:
+        url = rest
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
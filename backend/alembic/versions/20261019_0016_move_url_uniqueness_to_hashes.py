@@ -0,0 +1,88 @@
+"""Key document and link URL uniqueness on 64-bit hashes instead of Text.
+
+Revision ID: 20261019_0016
+Revises: 20261019_0015
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0016"
+down_revision = "20261019_0015"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+# table, URL column, hash column, old unique constraint and columns, new unique constraint and columns
+UNIQUE_KEYS = (
+    ("documents", "url", "url_hash", "uq_documents_url", ["url"], "uq_documents_url_hash", ["url_hash"]),
+    (
+        "links",
+        "target_url",
+        "target_url_hash",
+        "uq_links_source_target",
+        ["source_document_id", "target_url"],
+        "uq_links_source_target_hash",
+        ["source_document_id", "target_url_hash"],
+    ),
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for table, url_column, hash_column, old_name, _old_columns, new_name, new_columns in UNIQUE_KEYS:
+        inspector = sa.inspect(bind)
+        if hash_column not in {column["name"] for column in inspector.get_columns(table)}:
+            op.add_column(table, sa.Column(hash_column, sa.BigInteger(), nullable=True))
+        _backfill_hashes(bind, table, url_column, hash_column)
+        constraints = {constraint["name"] for constraint in sa.inspect(bind).get_unique_constraints(table)}
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(hash_column, existing_type=sa.BigInteger(), nullable=False)
+            if old_name in constraints:
+                batch_op.drop_constraint(old_name, type_="unique")
+            if new_name not in constraints:
+                batch_op.create_unique_constraint(new_name, new_columns)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, _url_column, hash_column, old_name, old_columns, new_name, _new_columns in UNIQUE_KEYS:
+        inspector = sa.inspect(bind)
+        if hash_column not in {column["name"] for column in inspector.get_columns(table)}:
+            continue
+        constraints = {constraint["name"] for constraint in inspector.get_unique_constraints(table)}
+        with op.batch_alter_table(table) as batch_op:
+            if new_name in constraints:
+                batch_op.drop_constraint(new_name, type_="unique")
+            if old_name not in constraints:
+                batch_op.create_unique_constraint(old_name, old_columns)
+            batch_op.drop_column(hash_column)
+
+
+def _backfill_hashes(bind, table: str, url_column: str, hash_column: str) -> None:
+    after_id = 0
+    while True:
+        rows = bind.execute(
+            sa.text(
+                f"SELECT id, {url_column} FROM {table} "
+                f"WHERE id > :after_id AND {hash_column} IS NULL ORDER BY id LIMIT :limit"
+            ),
+            {"after_id": after_id, "limit": BATCH_SIZE},
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            sa.text(f"UPDATE {table} SET {hash_column} = :hash WHERE id = :id"),
+            [{"id": row_id, "hash": _url_hash(url)} for row_id, url in rows],
+        )
+        after_id = rows[-1][0]
+
+
+def _url_hash(url: str) -> int:
+    # Frozen copy of iris.services.common.url_utils.url_hash.
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
@@ -0,0 +1,38 @@
+"""Allow run_finished index events carrying crawl timing histograms.
+
+Revision ID: 20261019_0017
+Revises: 20261019_0016
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0017"
+down_revision = "20261019_0016"
+branch_labels = None
+depends_on = None
+
+EVENT_TYPE_CHECK = "index_event_type"
+EVENT_TYPES = ("plan_created", "source_homepage_normalized", "source_started", "source_finished")
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        _replace_event_type_check((*EVENT_TYPES, "run_finished"))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DELETE FROM index_events WHERE event_type = 'run_finished'")
+        _replace_event_type_check(EVENT_TYPES)
+
+
+def _replace_event_type_check(event_types: tuple[str, ...]) -> None:
+    checks = {check["name"] for check in sa.inspect(op.get_bind()).get_check_constraints("index_events")}
+    if EVENT_TYPE_CHECK in checks:
+        op.drop_constraint(EVENT_TYPE_CHECK, "index_events", type_="check")
+    values = ", ".join(f"'{event_type}'" for event_type in event_types)
+    op.create_check_constraint(EVENT_TYPE_CHECK, "index_events", f"event_type IN ({values})")
@@ -0,0 +1,38 @@
+"""Store a rolling agent context on each conversation.
+
+Revision ID: 20261019_0018
+Revises: 20261019_0017
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0018"
+down_revision = "20261019_0017"
+branch_labels = None
+depends_on = None
+
+CONTEXT_COLUMNS = (
+    ("context_summary", sa.Text()),
+    ("context_turns", sa.JSON()),
+    ("context_message_id", sa.Integer()),
+)
+
+
+def upgrade() -> None:
+    # Existing conversations start without stored context and are folded in full on their next turn.
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("agent_conversations")}
+    for name, type_ in CONTEXT_COLUMNS:
+        if name not in existing:
+            op.add_column("agent_conversations", sa.Column(name, type_, nullable=True))
+
+
+def downgrade() -> None:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("agent_conversations")}
+    with op.batch_alter_table("agent_conversations") as batch_op:
+        for name, _type in reversed(CONTEXT_COLUMNS):
+            if name in existing:
+                batch_op.drop_column(name)
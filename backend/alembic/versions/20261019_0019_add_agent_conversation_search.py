@@ -0,0 +1,139 @@
+"""Add indexed full-text search over agent conversations.
+
+Postgres gets a generated tsvector on each message, a title-weighted rollup on
+each conversation maintained by triggers, and GIN indexes on both. SQLite gets
+external-content FTS5 tables kept in sync by triggers.
+
+Revision ID: 20261019_0019
+Revises: 20261019_0018
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0019"
+down_revision = "20261019_0018"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+# Frozen copy of iris.models.user.AGENT_SEARCH_DDL.
+POSTGRES_DDL = (
+    'ALTER TABLE agent_messages ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS '
+    "(to_tsvector('simple', coalesce(content, ''))) STORED",
+    'ALTER TABLE agent_conversations ADD COLUMN IF NOT EXISTS search_vector tsvector',
+    'CREATE INDEX IF NOT EXISTS ix_agent_messages_search_vector ON agent_messages USING gin (search_vector)',
+    'CREATE INDEX IF NOT EXISTS ix_agent_conversations_search_vector ON agent_conversations USING gin '
+    '(search_vector)',
+    """
+    CREATE OR REPLACE FUNCTION agent_conversations_search_title() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS agent_conversations_search_title ON agent_conversations',
+    'CREATE TRIGGER agent_conversations_search_title BEFORE INSERT ON agent_conversations FOR EACH ROW '
+    'EXECUTE FUNCTION agent_conversations_search_title()',
+    """
+    CREATE OR REPLACE FUNCTION agent_messages_search_rollup() RETURNS trigger AS $$
+    BEGIN
+        UPDATE agent_conversations
+        SET search_vector = coalesce(search_vector, ''::tsvector) || NEW.search_vector
+        WHERE id = NEW.conversation_id;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS agent_messages_search_rollup ON agent_messages',
+    'CREATE TRIGGER agent_messages_search_rollup AFTER INSERT ON agent_messages FOR EACH ROW EXECUTE '
+    'FUNCTION agent_messages_search_rollup()',
+)
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS agent_messages_fts USING fts5(content, content='agent_messages', "
+    "content_rowid='id')",
+    'CREATE TRIGGER IF NOT EXISTS agent_messages_fts_insert AFTER INSERT ON agent_messages BEGIN INSERT '
+    'INTO agent_messages_fts(rowid, content) VALUES (new.id, new.content); END',
+    'CREATE TRIGGER IF NOT EXISTS agent_messages_fts_delete AFTER DELETE ON agent_messages BEGIN INSERT '
+    "INTO agent_messages_fts(agent_messages_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+    'END',
+    'CREATE TRIGGER IF NOT EXISTS agent_messages_fts_update AFTER UPDATE OF content ON agent_messages '
+    "BEGIN INSERT INTO agent_messages_fts(agent_messages_fts, rowid, content) VALUES ('delete', old.id, "
+    'old.content); INSERT INTO agent_messages_fts(rowid, content) VALUES (new.id, new.content); END',
+    'CREATE VIRTUAL TABLE IF NOT EXISTS agent_conversations_fts USING fts5(title, '
+    "content='agent_conversations', content_rowid='id')",
+    'CREATE TRIGGER IF NOT EXISTS agent_conversations_fts_insert AFTER INSERT ON agent_conversations '
+    'BEGIN INSERT INTO agent_conversations_fts(rowid, title) VALUES (new.id, new.title); END',
+    'CREATE TRIGGER IF NOT EXISTS agent_conversations_fts_delete AFTER DELETE ON agent_conversations '
+    "BEGIN INSERT INTO agent_conversations_fts(agent_conversations_fts, rowid, title) VALUES ('delete', "
+    'old.id, old.title); END',
+    'CREATE TRIGGER IF NOT EXISTS agent_conversations_fts_update AFTER UPDATE OF title ON '
+    'agent_conversations BEGIN INSERT INTO agent_conversations_fts(agent_conversations_fts, rowid, title)'
+    " VALUES ('delete', old.id, old.title); INSERT INTO agent_conversations_fts(rowid, title) VALUES "
+    '(new.id, new.title); END',
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+        _backfill_conversation_vectors(bind)
+    elif bind.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO agent_messages_fts(agent_messages_fts) VALUES ('rebuild')")
+        op.execute("INSERT INTO agent_conversations_fts(agent_conversations_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS agent_messages_search_rollup ON agent_messages")
+        op.execute("DROP TRIGGER IF EXISTS agent_conversations_search_title ON agent_conversations")
+        op.execute("DROP FUNCTION IF EXISTS agent_messages_search_rollup()")
+        op.execute("DROP FUNCTION IF EXISTS agent_conversations_search_title()")
+        op.execute("DROP INDEX IF EXISTS ix_agent_messages_search_vector")
+        op.execute("DROP INDEX IF EXISTS ix_agent_conversations_search_vector")
+        op.execute("ALTER TABLE agent_messages DROP COLUMN IF EXISTS search_vector")
+        op.execute("ALTER TABLE agent_conversations DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        for table in ("agent_messages", "agent_conversations"):
+            for action in ("insert", "delete", "update"):
+                op.execute(f"DROP TRIGGER IF EXISTS {table}_fts_{action}")
+            op.execute(f"DROP TABLE IF EXISTS {table}_fts")
+
+
+def _backfill_conversation_vectors(bind) -> None:
+    after_id = 0
+    while True:
+        last_id = bind.scalar(
+            sa.text(
+                "SELECT max(id) FROM (SELECT id FROM agent_conversations WHERE id > :after_id "
+                "ORDER BY id LIMIT :limit) batch"
+            ),
+            {"after_id": after_id, "limit": BATCH_SIZE},
+        )
+        if last_id is None:
+            return
+        bind.execute(
+            sa.text(
+                """
+                UPDATE agent_conversations c
+                SET search_vector = setweight(to_tsvector('simple', coalesce(c.title, '')), 'A') ||
+                    coalesce((
+                        SELECT to_tsvector('simple', string_agg(coalesce(m.content, ''), ' ' ORDER BY m.id))
+                        FROM agent_messages m
+                        WHERE m.conversation_id = c.id
+                    ), ''::tsvector)
+                WHERE c.id > :after_id AND c.id <= :last_id
+                """
+            ),
+            {"after_id": after_id, "last_id": last_id},
+        )
+        after_id = last_id
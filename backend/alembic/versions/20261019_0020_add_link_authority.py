@@ -0,0 +1,60 @@
+"""Store personalised PageRank authority for sources and documents.
+
+Revision ID: 20261019_0020
+Revises: 20261019_0019
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0020"
+down_revision = "20261019_0019"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Scores start empty; the next autopilot run or `iris compute-authority` fills them.
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "source_authority" not in existing_tables:
+        op.create_table(
+            "source_authority",
+            sa.Column("source_id", sa.Integer(), sa.ForeignKey("sources.id"), primary_key=True),
+            sa.Column("score", sa.Float(), nullable=False),
+            sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_source_authority_score", "source_authority", ["score"])
+
+    if "document_authority" not in existing_tables:
+        op.create_table(
+            "document_authority",
+            sa.Column("document_id", sa.Integer(), sa.ForeignKey("documents.id"), primary_key=True),
+            sa.Column("score", sa.Float(), nullable=False),
+            sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_document_authority_score", "document_authority", ["score"])
+
+    if "authority_runs" not in existing_tables:
+        op.create_table(
+            "authority_runs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("graph", sa.String(length=20), nullable=False),
+            sa.Column("fingerprint", sa.String(length=255), nullable=False),
+            sa.Column("nodes", sa.Integer(), nullable=False),
+            sa.Column("edges", sa.Integer(), nullable=False),
+            sa.Column("seeds", sa.Integer(), nullable=False),
+            sa.Column("iterations", sa.Integer(), nullable=False),
+            sa.Column("residual", sa.Float(), nullable=False),
+            sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("idx_authority_runs_graph_computed", "authority_runs", ["graph", "computed_at"])
+
+
+def downgrade() -> None:
+    existing_tables = set(sa.inspect(op.get_bind()).get_table_names())
+    for table in ("authority_runs", "document_authority", "source_authority"):
+        if table in existing_tables:
+            op.drop_table(table)
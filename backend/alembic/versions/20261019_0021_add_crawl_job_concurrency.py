@@ -0,0 +1,38 @@
+"""Record adaptive page concurrency and host pushback on crawl jobs.
+
+Revision ID: 20261019_0021
+Revises: 20261019_0020
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0021"
+down_revision = "20261019_0020"
+branch_labels = None
+depends_on = None
+
+CONCURRENCY_COLUMNS = (
+    ("active_pages", sa.Column("active_pages", sa.Integer(), nullable=True)),
+    ("peak_active_pages", sa.Column("peak_active_pages", sa.Integer(), nullable=True)),
+    ("fetch_retries", sa.Column("fetch_retries", sa.Integer(), nullable=False, server_default="0")),
+    ("throttled_responses", sa.Column("throttled_responses", sa.Integer(), nullable=False, server_default="0")),
+)
+
+
+def upgrade() -> None:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("crawl_jobs")}
+    for name, column in CONCURRENCY_COLUMNS:
+        if name not in existing:
+            op.add_column("crawl_jobs", column)
+
+
+def downgrade() -> None:
+    existing = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("crawl_jobs")}
+    with op.batch_alter_table("crawl_jobs") as batch_op:
+        for name, _column in reversed(CONCURRENCY_COLUMNS):
+            if name in existing:
+                batch_op.drop_column(name)
@@ -0,0 +1,73 @@
+"""Track provider batches of document analysis requests.
+
+Revision ID: 20261019_0022
+Revises: 20261019_0021
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0022"
+down_revision = "20261019_0021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "analysis_batches" in set(sa.inspect(op.get_bind()).get_table_names()):
+        return
+    op.create_table(
+        "analysis_batches",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column(
+            "mode",
+            sa.Enum(
+                "reclassify",
+                "summaries",
+                "metadata",
+                name="analysis_batch_mode",
+                native_enum=False,
+                create_constraint=True,
+                length=20,
+            ),
+            nullable=False,
+        ),
+        sa.Column("scope", sa.String(length=255), nullable=False),
+        sa.Column(
+            "status",
+            sa.Enum(
+                "prepared",
+                "submitted",
+                "completed",
+                "ingested",
+                "failed",
+                name="analysis_batch_status",
+                native_enum=False,
+                create_constraint=True,
+                length=20,
+            ),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("ingested_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("first_document_id", sa.Integer(), nullable=False),
+        sa.Column("last_document_id", sa.Integer(), nullable=False),
+        sa.Column("request_count", sa.Integer(), nullable=False),
+        sa.Column("request_path", sa.String(length=1024), nullable=False),
+        sa.Column("output_path", sa.String(length=1024), nullable=True),
+        sa.Column("provider_batch_id", sa.String(length=255), nullable=True),
+        sa.Column("counters", sa.JSON(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+    )
+    op.create_index("ix_analysis_batches_status", "analysis_batches", ["status"])
+    op.create_index("idx_analysis_batches_mode_scope_last", "analysis_batches", ["mode", "scope", "last_document_id"])
+
+
+def downgrade() -> None:
+    if "analysis_batches" in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.drop_table("analysis_batches")
@@ -0,0 +1,34 @@
+"""Log documents whose topic, tag or category assignments changed.
+
+Revision ID: 20261019_0023
+Revises: 20261019_0022
+"""
+
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261019_0023"
+down_revision = "20261019_0022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Posting lists start with a full build, so existing assignments need no backfill.
+    if "posting_changes" in set(sa.inspect(op.get_bind()).get_table_names()):
+        return
+    op.create_table(
+        "posting_changes",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("document_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_posting_changes_created_at", "posting_changes", ["created_at"])
+
+
+def downgrade() -> None:
+    if "posting_changes" in set(sa.inspect(op.get_bind()).get_table_names()):
+        op.drop_table("posting_changes")
@@ -0,0 +1,75 @@
+"""Index documents for hybrid full-text search.
+
+Postgres gets a weighted generated tsvector with a GIN index, replacing the
+expression index the picker used to build at startup. SQLite gets an FTS5
+table kept in sync by triggers and filled from the existing rows.
+
+Revision ID: 20261019_0024
+Revises: 20261019_0023
+"""
+
+from __future__ import annotations
+
+from alembic import op
+
+
+revision = "20261019_0024"
+down_revision = "20261019_0023"
+branch_labels = None
+depends_on = None
+
+# Frozen copy of iris.models.sqla.DOCUMENT_SEARCH_DDL.
+POSTGRES_DDL = (
+    "ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(author, '') || ' ' || coalesce(one_liner, '') || ' ' || "
+    "coalesce(audience, '') || ' ' || coalesce(summary, '') || ' ' || coalesce(takeaways::text, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(topics::text, '')), 'C') || "
+    "setweight(to_tsvector('simple', left(coalesce(extracted_text, ''), 20000)), 'D')) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_documents_search_vector ON documents USING gin (search_vector)",
+    "DROP INDEX IF EXISTS ix_documents_picker_fts",
+)
+SQLITE_ROW = (
+    "coalesce({row}.title, ''), "
+    "coalesce({row}.author, '') || ' ' || coalesce({row}.one_liner, '') || ' ' || coalesce({row}.audience, '') "
+    "|| ' ' || coalesce({row}.summary, '') || ' ' || coalesce({row}.takeaways, ''), "
+    "coalesce({row}.topics, ''), "
+    "substr(coalesce({row}.extracted_text, ''), 1, 20000)"
+)
+SQLITE_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, details, topics, body)",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN "
+    f"INSERT INTO documents_fts(rowid, title, details, topics, body) VALUES (new.id, {SQLITE_ROW.format(row='new')}); END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN "
+    "DELETE FROM documents_fts WHERE rowid = old.id; END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF "
+    "title, author, one_liner, audience, summary, takeaways, topics, extracted_text ON documents BEGIN "
+    "DELETE FROM documents_fts WHERE rowid = old.id; "
+    f"INSERT INTO documents_fts(rowid, title, details, topics, body) VALUES (new.id, {SQLITE_ROW.format(row='new')}); END",
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        for statement in POSTGRES_DDL:
+            op.execute(statement)
+    elif bind.dialect.name == "sqlite":
+        for statement in SQLITE_DDL:
+            op.execute(statement)
+        op.execute("DELETE FROM documents_fts")
+        op.execute(
+            "INSERT INTO documents_fts(rowid, title, details, topics, body) "
+            f"SELECT documents.id, {SQLITE_ROW.format(row='documents')} FROM documents"
+        )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_documents_search_vector")
+        op.execute("ALTER TABLE documents DROP COLUMN IF EXISTS search_vector")
+    elif bind.dialect.name == "sqlite":
+        for action in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS documents_fts_{action}")
+        op.execute("DROP TABLE IF EXISTS documents_fts")
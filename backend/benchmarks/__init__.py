@@ -0,0 +1 @@
+"""Latency and relevance benchmarks for Iris retrieval paths."""
@@ -0,0 +1,200 @@
+"""Load test for concurrent agent chat streams sharing one worker event loop.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.agent_load --documents 2000 --concurrency 1,4,16,64
+
+Each simulated stream alternates a model "thinking" pause with a turn of
+parallel tool calls (keyword, semantic, tag and category search) against a
+synthetic corpus. A heartbeat task records how late the event loop wakes up,
+which is the delay every other SSE stream in the worker would see. ``--mode
+blocking`` runs the same tool work inline on the loop for comparison.
+
+The model is not called, so the results isolate tool execution cost from
+OpenAI latency.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from benchmarks.corpus import THEMES, CorpusSpec, generate_corpus
+from benchmarks.run import RESULTS_DIR, _fresh_session, _git_commit, percentile
+from iris.dao import db
+from iris.dao import search as search_dao
+from iris.models import Document
+from iris.services.retrieval.search import (
+    _agent_tool_functions,
+    _category_search,
+    _keyword_search,
+    _semantic_search,
+    _tag_search,
+    _terms,
+)
+
+
+HEARTBEAT_SECONDS = 0.01
+
+
+@dataclass(frozen=True)
+class LoadResult:
+    mode: str
+    concurrency: int
+    wall_seconds: float
+    streams_per_second: float
+    tool_turn_p50_ms: float
+    tool_turn_p95_ms: float
+    loop_lag_p95_ms: float
+    loop_lag_max_ms: float
+
+
+async def run_load(
+    documents: list[Document],
+    *,
+    mode: str,
+    concurrency: int,
+    turns: int,
+    think_seconds: float,
+) -> LoadResult:
+    """Run ``concurrency`` simulated streams at once and measure loop responsiveness."""
+    lags: list[float] = []
+    turn_timings: list[float] = []
+    stop = asyncio.Event()
+
+    async def heartbeat() -> None:
+        loop = asyncio.get_running_loop()
+        while not stop.is_set():
+            expected = loop.time() + HEARTBEAT_SECONDS
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            lags.append(max(0.0, loop.time() - expected) * 1000)
+
+    async def stream(stream_index: int) -> None:
+        tools = _agent_tool_functions(documents, [])
+        for turn in range(turns):
+            await asyncio.sleep(think_seconds)
+            theme = sorted(THEMES)[(stream_index + turn) % len(THEMES)]
+            words = THEMES[theme]
+            query = f"{words[turn % len(words)]} {words[(turn + 3) % len(words)]}"
+            started = time.perf_counter()
+            if mode == "async":
+                keyword, semantic, tags, categories = tools[:4]
+                await asyncio.gather(
+                    keyword(query),
+                    semantic(query),
+                    tags(f"{theme}, {words[0]}"),
+                    categories("software, culture"),
+                )
+            else:
+                _blocking_turn(documents, query, theme)
+            turn_timings.append((time.perf_counter() - started) * 1000)
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    started = time.perf_counter()
+    await asyncio.gather(*(stream(index) for index in range(concurrency)))
+    wall_seconds = time.perf_counter() - started
+    stop.set()
+    await heartbeat_task
+    return LoadResult(
+        mode=mode,
+        concurrency=concurrency,
+        wall_seconds=round(wall_seconds, 3),
+        streams_per_second=round(concurrency / wall_seconds, 3) if wall_seconds else 0.0,
+        tool_turn_p50_ms=round(percentile(turn_timings, 50), 2),
+        tool_turn_p95_ms=round(percentile(turn_timings, 95), 2),
+        loop_lag_p95_ms=round(percentile(lags, 95), 2),
+        loop_lag_max_ms=round(max(lags, default=0.0), 2),
+    )
+
+
+def max_streams_within_budget(results: list[LoadResult], *, mode: str, lag_budget_ms: float) -> int:
+    """Return the highest measured concurrency whose p95 loop lag stays within budget."""
+    passing = [result.concurrency for result in results if result.mode == mode and result.loop_lag_p95_ms <= lag_budget_ms]
+    return max(passing, default=0)
+
+
+def _blocking_turn(documents: list[Document], query: str, theme: str) -> None:
+    # The pre-async tool bodies, run directly on the event loop thread.
+    _keyword_search(_terms(query), documents, limit=12)
+    _semantic_search(query, documents, limit=12)
+    _tag_search({theme, THEMES[theme][0]}, documents, limit=12)
+    _category_search({"software", "culture"}, documents, limit=12)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.agent_load")
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,4,16,64", help="comma-separated concurrent stream counts")
+    parser.add_argument("--mode", choices=("async", "blocking", "both"), default="both")
+    parser.add_argument("--turns", type=int, default=3, help="tool-call turns per stream")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="simulated model latency between turns")
+    parser.add_argument("--lag-budget-ms", type=float, default=100.0, help="p95 event loop lag a stream can tolerate")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", help="scratch database URL; defaults to a temporary SQLite file")
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        # Worker threads open their own sessions, so an in-memory StaticPool
+        # connection cannot be shared; a file database gives each its own.
+        _bind_database(args.database_url or f"sqlite:///{Path(scratch) / 'agent_load.db'}")
+        with _fresh_session(commit=True):
+            generate_corpus(CorpusSpec(documents=args.documents, seed=args.seed))
+
+        modes = ["async", "blocking"] if args.mode == "both" else [args.mode]
+        levels = [int(value) for value in args.concurrency.split(",") if value.strip()]
+        results: list[LoadResult] = []
+        with _fresh_session():
+            documents = search_dao.get_searchable_documents()
+            for mode in modes:
+                for concurrency in levels:
+                    result = asyncio.run(
+                        run_load(documents, mode=mode, concurrency=concurrency, turns=args.turns, think_seconds=args.think_ms / 1000)
+                    )
+                    results.append(result)
+                    print(
+                        f"{mode:<8} streams={concurrency:<4} wall={result.wall_seconds:>7.2f}s "
+                        f"turn p95={result.tool_turn_p95_ms:>8.1f}ms loop lag p95={result.loop_lag_p95_ms:>8.1f}ms max={result.loop_lag_max_ms:>8.1f}ms"
+                    )
+        db.engine.dispose()
+
+    capacity = {mode: max_streams_within_budget(results, mode=mode, lag_budget_ms=args.lag_budget_ms) for mode in modes}
+    for mode, streams in capacity.items():
+        print(f"{mode}: up to {streams} concurrent streams within p95 loop lag {args.lag_budget_ms:.0f}ms")
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "documents": args.documents,
+        "turns": args.turns,
+        "think_ms": args.think_ms,
+        "lag_budget_ms": args.lag_budget_ms,
+        "capacity": capacity,
+        "results": [asdict(result) for result in results],
+    }
+    output = args.output or RESULTS_DIR / f"agent-load-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {output}")
+    return 0
+
+
+def _bind_database(database_url: str) -> None:
+    from iris import models  # noqa: F401
+
+    engine = create_engine(database_url, future=True, connect_args={"check_same_thread": False} if database_url.startswith("sqlite") else {})
+    db.Base.metadata.drop_all(engine)
+    db.engine = engine
+    db.SessionLocal.configure(bind=engine)
+    db.init_db()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
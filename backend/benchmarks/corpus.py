@@ -0,0 +1,230 @@
+"""Deterministic synthetic corpus generator for benchmarks.
+
+The corpus is written through the regular DAO helpers so derived rows (topic
+index, link targets, bookshelf mappings) match what the crawler and API
+produce. Every run with the same ``CorpusSpec`` yields identical rows.
+"""
+
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+
+from iris.dao import bookshelf as bookshelf_dao
+from iris.dao import db
+from iris.dao import social as social_dao
+from iris.dao.documents import upsert_document
+from iris.dao.links import upsert_link
+from iris.dao.sources import get_or_create_source
+from iris.models import User
+from iris.schemas.enums import CrawlStatus, DocumentType, SourceStatus
+from iris.services.ingestion.embedding import document_embedding_text, embed_text_local
+
+
+THEMES: dict[str, tuple[str, ...]] = {
+    "databases": ("postgres", "index", "query", "planner", "btree", "transaction", "replication", "schema", "vacuum", "sqlite", "join", "latency"),
+    "compilers": ("parser", "lexer", "bytecode", "register", "inlining", "optimizer", "grammar", "typechecker", "closure", "interpreter", "llvm", "ssa"),
+    "startups": ("founder", "fundraising", "runway", "hiring", "pricing", "customers", "churn", "seed", "pivot", "traction", "equity", "growth"),
+    "gardening": ("compost", "seedling", "tomato", "mulch", "soil", "pruning", "perennial", "greenhouse", "irrigation", "harvest", "pollinator", "orchard"),
+    "neuroscience": ("neuron", "synapse", "cortex", "dopamine", "plasticity", "hippocampus", "memory", "axon", "glia", "attention", "sleep", "perception"),
+    "economics": ("inflation", "markets", "tariff", "monetary", "interest", "labor", "productivity", "auction", "incentives", "pricing", "trade", "recession"),
+    "typography": ("serif", "kerning", "typeface", "ligature", "baseline", "grid", "leading", "glyph", "italic", "layout", "legibility", "specimen"),
+    "climbing": ("bouldering", "belay", "crimp", "anchor", "rappel", "sport", "trad", "chalk", "overhang", "route", "grade", "hangboard"),
+    "cryptography": ("cipher", "signature", "entropy", "elliptic", "hash", "nonce", "key", "protocol", "zero-knowledge", "lattice", "attack", "handshake"),
+    "urbanism": ("zoning", "transit", "density", "housing", "sidewalk", "bicycle", "parking", "streetcar", "suburb", "commute", "plaza", "infill"),
+}
+FILLER = (
+    "about", "after", "again", "always", "because", "before", "between", "careful", "change", "clear", "common", "consider",
+    "during", "early", "enough", "every", "example", "familiar", "first", "general", "happen", "idea", "important", "instead",
+    "later", "little", "maybe", "notice", "often", "order", "other", "perhaps", "place", "point", "practice", "problem",
+    "question", "reason", "simple", "small", "something", "still", "story", "system", "thing", "think", "through", "together",
+    "usually", "where", "while", "whole", "within", "without", "world", "write", "years", "yesterday", "young", "zone",
+)
+SYLLABLES = ("qua", "zor", "vel", "mir", "tak", "pex", "lun", "dro", "sif", "kai", "bry", "noz", "ulm", "fen", "gri", "jov")
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    """Size and shape of one synthetic corpus."""
+
+    documents: int
+    documents_per_source: int = 20
+    links_per_document: int = 4
+    users: int = 6
+    saves_per_user: int = 25
+    judged_queries: int = 12
+    relevant_per_query: int = 3
+    seed: int = 7
+
+    @property
+    def sources(self) -> int:
+        return max(1, -(-self.documents // self.documents_per_source))
+
+
+@dataclass(frozen=True)
+class JudgedQuery:
+    """A query whose relevant documents were planted by the generator."""
+
+    query: str
+    theme: str
+    relevant_document_ids: frozenset[int]
+
+
+@dataclass
+class Corpus:
+    """Identifiers produced by ``generate_corpus`` that benchmarks need later."""
+
+    spec: CorpusSpec
+    viewer_id: int
+    judged_queries: list[JudgedQuery] = field(default_factory=list)
+    source_ids: list[int] = field(default_factory=list)
+    document_ids: list[int] = field(default_factory=list)
+    links: int = 0
+
+
+def generate_corpus(spec: CorpusSpec, *, commit_every: int = 200) -> Corpus:
+    """Write a synthetic corpus into the current session's database."""
+    rng = random.Random(spec.seed)
+    session = db.current_session()
+    vector_column_dimensions = 1536 if session.get_bind().dialect.name == "postgresql" else None
+    themes = sorted(THEMES)
+    markers = _judged_markers(rng, spec, themes)
+    planted: dict[int, list[int]] = {index: [] for index in range(len(markers))}
+
+    sources = []
+    for index in range(spec.sources):
+        domain = f"{_pseudo_word(rng, 3)}-{index}.bench.test"
+        source = get_or_create_source(f"https://{domain}", status=SourceStatus.INDEXED.value)
+        source.name = domain.split(".")[0].title()
+        source.description = f"Writing about {themes[index % len(themes)]}"
+        sources.append(source)
+    session.flush()
+
+    corpus = Corpus(spec=spec, viewer_id=0, source_ids=[source.id for source in sources])
+    documents = []
+    for index in range(spec.documents):
+        source = sources[index % len(sources)]
+        home_theme = themes[(index % len(sources)) % len(themes)]
+        theme = home_theme if rng.random() < 0.7 else rng.choice(themes)
+        marker_index = _planted_marker(index, spec, len(markers))
+        if marker_index is not None:
+            theme = markers[marker_index][0]
+        title_words = [rng.choice(THEMES[theme]) for _ in range(3)]
+        body = _body(rng, theme, words=140)
+        if marker_index is not None:
+            marker = markers[marker_index][1]
+            title_words.insert(1, marker)
+            body = f"{marker} {body} {marker}"
+        title = " ".join(title_words).title()
+        topics = sorted({theme, *rng.sample(THEMES[theme], 2)})
+        summary = " ".join(body.split()[:32])
+        vector = embed_text_local(document_embedding_text(title=title, summary=summary, topics=topics, extracted_text=body))
+        if vector_column_dimensions:
+            # Local vectors are zero-padded to fit the pgvector column width.
+            vector = vector + [0.0] * (vector_column_dimensions - len(vector))
+        document = upsert_document(
+            source=source,
+            url=f"https://{source.canonical_domain}/posts/{index}-{title_words[0]}",
+            document_type=DocumentType.ESSAY.value,
+            crawl_status=CrawlStatus.FETCHED.value,
+            title=title,
+            author=source.name,
+            published_at=None,
+            extracted_text=body,
+            summary=summary,
+            topics=topics,
+            embedding=vector,
+            content_hash=f"bench-{spec.seed}-{index}",
+            one_liner=summary[:120],
+        )
+        documents.append(document)
+        if marker_index is not None:
+            planted[marker_index].append(document.id)
+        if (index + 1) % commit_every == 0:
+            session.commit()
+    session.commit()
+
+    for document in documents:
+        targets: set[str] = set()
+        for _ in range(spec.links_per_document):
+            if rng.random() < 0.85:
+                target_url = rng.choice(documents).url
+            else:
+                target_url = f"https://{_pseudo_word(rng, 2)}.external.test/{_pseudo_word(rng, 2)}"
+            if target_url == document.url or target_url in targets:
+                continue
+            targets.add(target_url)
+            upsert_link(source_document=document, target_url=target_url, anchor_text=None, context=None)
+            corpus.links += 1
+    session.commit()
+
+    corpus.viewer_id = _generate_social_graph(rng, spec, documents)
+    session.commit()
+
+    corpus.document_ids = [document.id for document in documents]
+    corpus.judged_queries = [
+        JudgedQuery(
+            query=f"{marker} {' '.join(THEMES[theme][:2])}",
+            theme=theme,
+            relevant_document_ids=frozenset(planted[index]),
+        )
+        for index, (theme, marker) in enumerate(markers)
+        if planted[index]
+    ]
+    return corpus
+
+
+def _generate_social_graph(rng: random.Random, spec: CorpusSpec, documents: list) -> int:
+    session = db.current_session()
+    users = []
+    for index in range(max(2, spec.users)):
+        user = User(email=f"bench-{spec.seed}-{index}@bench.test", display_name=f"Bench Reader {index}")
+        session.add(user)
+        users.append(user)
+    session.flush()
+    viewer, friends = users[0], users[1:]
+    for friend in friends:
+        friendship = social_dao.request_friendship(viewer, friend)
+        social_dao.accept_friendship(friend, friendship.id)
+    for user in users:
+        for document in rng.sample(documents, min(spec.saves_per_user, len(documents))):
+            bookshelf_dao.update_entry(
+                user,
+                document,
+                favorited=rng.random() < 0.3,
+                note=f"Returning to {document.title}" if rng.random() < 0.2 else None,
+                update_note=True,
+            )
+    return viewer.id
+
+
+def _judged_markers(rng: random.Random, spec: CorpusSpec, themes: list[str]) -> list[tuple[str, str]]:
+    markers: list[tuple[str, str]] = []
+    seen: set[str] = set()
+    while len(markers) < spec.judged_queries:
+        marker = _pseudo_word(rng, 3)
+        if marker in seen:
+            continue
+        seen.add(marker)
+        markers.append((themes[len(markers) % len(themes)], marker))
+    return markers
+
+
+def _planted_marker(index: int, spec: CorpusSpec, marker_count: int) -> int | None:
+    # Spread planted documents evenly across the corpus so every size keeps
+    # the same number of relevant documents per judged query.
+    planted_total = marker_count * spec.relevant_per_query
+    stride = max(1, spec.documents // max(1, planted_total))
+    if index % stride:
+        return None
+    slot = index // stride
+    return slot % marker_count if slot < planted_total else None
+
+
+def _body(rng: random.Random, theme: str, *, words: int) -> str:
+    vocabulary = THEMES[theme]
+    return " ".join(rng.choice(vocabulary) if rng.random() < 0.35 else rng.choice(FILLER) for _ in range(words))
+
+
+def _pseudo_word(rng: random.Random, syllables: int) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(syllables))
@@ -0,0 +1,347 @@
+"""Run retrieval latency and recall benchmarks over synthetic corpora.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.run --sizes 500,2000 --output before.json
+    python -m benchmarks.run --sizes 500,2000 --output after.json --compare before.json
+
+Each corpus size is generated into a fresh in-memory SQLite database. Pass
+``--database-url`` to benchmark Postgres instead; that database must be a
+scratch database because every table is dropped and recreated per size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from benchmarks.corpus import Corpus, CorpusSpec, generate_corpus
+from iris.dao import db
+from iris.dao import search as search_dao
+from iris.dao.admin import get_embedding_map
+from iris.dao.db import Base
+from iris.dao.directory import get_source_directory_page
+from iris.dao.social import friend_feed
+from iris.models import User
+from iris.schemas.retrieval import RankedDocument
+from iris.services.retrieval.search import (
+    _category_query_terms,
+    _category_search,
+    _keyword_search,
+    _semantic_search,
+    _tag_search,
+    _terms,
+    search_documents,
+)
+
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """One measured call; ``shared_session`` keeps ORM state across iterations."""
+
+    name: str
+    call: Callable[[int], object]
+    shared_session: bool = False
+
+
+@dataclass(frozen=True)
+class LatencyResult:
+    runs: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    alloc_peak_kib: float
+    alloc_retained_kib: float
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Return the nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(case: BenchmarkCase, *, iterations: int, warmup: int, allocation_runs: int = 3) -> LatencyResult:
+    """Time ``case`` and record tracemalloc peaks in a separate, untimed pass."""
+    timings: list[float] = []
+    with _case_sessions(case) as run:
+        for index in range(warmup):
+            run(index)
+        for index in range(iterations):
+            started = time.perf_counter()
+            run(index)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        peaks: list[float] = []
+        retained: list[float] = []
+        tracemalloc.start()
+        try:
+            for index in range(allocation_runs):
+                tracemalloc.reset_peak()
+                before, _peak = tracemalloc.get_traced_memory()
+                run(index)
+                current, peak = tracemalloc.get_traced_memory()
+                peaks.append((peak - before) / 1024)
+                retained.append((current - before) / 1024)
+        finally:
+            tracemalloc.stop()
+    return LatencyResult(
+        runs=len(timings),
+        mean_ms=round(statistics.fmean(timings), 3),
+        p50_ms=round(percentile(timings, 50), 3),
+        p95_ms=round(percentile(timings, 95), 3),
+        p99_ms=round(percentile(timings, 99), 3),
+        alloc_peak_kib=round(statistics.median(peaks), 1),
+        alloc_retained_kib=round(statistics.median(retained), 1),
+    )
+
+
+def recall_at_k(corpus: Corpus, search: Callable[[str], list[RankedDocument]], *, k: int) -> float:
+    """Return mean recall@k over the corpus's judged queries."""
+    scores = []
+    with _fresh_session():
+        for judged in corpus.judged_queries:
+            returned = {row.document.id for row in search(judged.query)[:k]}
+            scores.append(len(returned & judged.relevant_document_ids) / len(judged.relevant_document_ids))
+    return round(statistics.fmean(scores), 4) if scores else 0.0
+
+
+def benchmark_cases(corpus: Corpus, *, k: int) -> list[BenchmarkCase]:
+    """Return the measured retrieval paths for one generated corpus."""
+    queries = [judged.query for judged in corpus.judged_queries] or ["postgres planner"]
+    themes = [judged.theme for judged in corpus.judged_queries] or ["databases"]
+
+    def query(index: int) -> str:
+        return queries[index % len(queries)]
+
+    def viewer() -> User:
+        return db.current_session().get(User, corpus.viewer_id)
+
+    return [
+        BenchmarkCase("search_documents", lambda index: search_documents(query(index), limit=k, persist=False)),
+        BenchmarkCase("search_documents_for_picker", lambda index: search_dao.search_documents_for_picker(query(index), limit=k)),
+        BenchmarkCase("agent_corpus_load", lambda _index: search_dao.get_searchable_documents()),
+        _agent_tool_case("agent_keyword_search", lambda index, documents: _keyword_search(_terms(query(index)), documents, limit=12)),
+        _agent_tool_case("agent_semantic_search", lambda index, documents: _semantic_search(query(index), documents, limit=12)),
+        _agent_tool_case(
+            "agent_tag_search",
+            lambda index, documents: _tag_search({themes[index % len(themes)]}, documents, limit=12),
+        ),
+        _agent_tool_case(
+            "agent_category_search",
+            lambda _index, documents: _category_search(_category_query_terms({"software", "science"}), documents, limit=12),
+        ),
+        BenchmarkCase("friend_feed", lambda _index: friend_feed(viewer(), limit=50)),
+        BenchmarkCase(
+            "source_directory_page",
+            lambda index: get_source_directory_page(
+                q=None,
+                user_id=corpus.viewer_id,
+                text_filters=None,
+                tag_filters=[themes[index % len(themes)]] if index % 2 else None,
+                status="indexed",
+                sort="inbound",
+                direction="desc",
+                limit=50,
+                offset=0,
+            ),
+        ),
+        BenchmarkCase("embedding_map", lambda _index: get_embedding_map(limit=5000)),
+    ]
+
+
+def recall_cases() -> dict[str, Callable[[str], list[RankedDocument]]]:
+    """Return ranked retrieval paths scored against the judged query set."""
+    keyword_documents = _lazy_searchable_documents()
+    semantic_documents = _lazy_searchable_documents()
+    return {
+        "search_documents": lambda text: search_documents(text, limit=50, persist=False)[1],
+        "search_documents_for_picker": lambda text: search_dao.search_documents_for_picker(text, limit=50),
+        "agent_keyword_search": lambda text: _keyword_search(_terms(text), keyword_documents(), limit=50),
+        "agent_semantic_search": lambda text: _semantic_search(text, semantic_documents(), limit=50),
+    }
+
+
+def run_size(spec: CorpusSpec, *, database_url: str | None, iterations: int, warmup: int, k: int) -> dict:
+    """Generate one corpus and return its latency and recall results."""
+    _bind_database(database_url)
+    started = time.perf_counter()
+    with _fresh_session(commit=True):
+        corpus = generate_corpus(spec)
+    generate_seconds = time.perf_counter() - started
+    print(f"corpus documents={spec.documents} sources={spec.sources} links={corpus.links} generated_in={generate_seconds:.1f}s")
+
+    latencies = {}
+    for case in benchmark_cases(corpus, k=k):
+        latencies[case.name] = asdict(measure(case, iterations=iterations, warmup=warmup))
+        print(f"  {case.name:<28} p50={latencies[case.name]['p50_ms']:>9.2f}ms p95={latencies[case.name]['p95_ms']:>9.2f}ms")
+    recall = {name: recall_at_k(corpus, search, k=k) for name, search in recall_cases().items()}
+    for name, value in recall.items():
+        print(f"  recall@{k} {name:<28} {value:.3f}")
+    return {
+        "corpus": {**asdict(spec), "sources": spec.sources, "links": corpus.links, "judged_queries": len(corpus.judged_queries)},
+        "generate_seconds": round(generate_seconds, 3),
+        "latency": latencies,
+        f"recall_at_{k}": recall,
+    }
+
+
+def compare(current: dict, baseline: dict) -> list[str]:
+    """Return p95 and recall deltas for corpus sizes present in both reports."""
+    lines: list[str] = []
+    baseline_by_size = {item["corpus"]["documents"]: item for item in baseline.get("results", [])}
+    recall_key = f"recall_at_{current['k']}"
+    for item in current["results"]:
+        documents = item["corpus"]["documents"]
+        before = baseline_by_size.get(documents)
+        if before is None:
+            continue
+        lines.append(f"documents={documents}")
+        for name, after_latency in item["latency"].items():
+            before_latency = before["latency"].get(name)
+            if before_latency is None:
+                continue
+            ratio = after_latency["p95_ms"] / before_latency["p95_ms"] if before_latency["p95_ms"] else 0.0
+            lines.append(
+                f"  {name:<28} p95 {before_latency['p95_ms']:>9.2f}ms -> {after_latency['p95_ms']:>9.2f}ms ({ratio:.2f}x)"
+            )
+        for name, after_recall in item.get(recall_key, {}).items():
+            before_recall = before.get(recall_key, {}).get(name)
+            if before_recall is not None:
+                lines.append(f"  {recall_key} {name:<20} {before_recall:.3f} -> {after_recall:.3f}")
+    return lines
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.run")
+    parser.add_argument("--sizes", default="500,2000", help="comma-separated document counts")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", help="scratch Postgres URL; all tables are dropped per size")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--compare", type=Path, help="previous JSON report to diff against")
+    args = parser.parse_args(argv)
+
+    sizes = [int(value) for value in args.sizes.split(",") if value.strip()]
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "dialect": "postgresql" if args.database_url else "sqlite",
+        "iterations": args.iterations,
+        "k": args.k,
+        "results": [
+            run_size(
+                CorpusSpec(documents=size, seed=args.seed),
+                database_url=args.database_url,
+                iterations=args.iterations,
+                warmup=args.warmup,
+                k=args.k,
+            )
+            for size in sizes
+        ],
+    }
+    output = args.output or RESULTS_DIR / f"bench-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {output}")
+    if args.compare:
+        for line in compare(report, json.loads(args.compare.read_text())):
+            print(line)
+    return 0
+
+
+def _bind_database(database_url: str | None) -> None:
+    from iris import models  # noqa: F401
+
+    if database_url:
+        engine = create_engine(database_url, future=True)
+        Base.metadata.drop_all(engine)
+    else:
+        engine = create_engine(
+            "sqlite:///:memory:",
+            future=True,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    db.engine = engine
+    db.SessionLocal.configure(bind=engine)
+    db.init_db()
+
+
+@contextmanager
+def _fresh_session(*, commit: bool = False) -> Iterator[None]:
+    session = db.SessionLocal()
+    try:
+        with db.bind_session(session):
+            yield
+        if commit:
+            session.commit()
+    finally:
+        session.rollback()
+        session.close()
+
+
+@contextmanager
+def _case_sessions(case: BenchmarkCase) -> Iterator[Callable[[int], object]]:
+    if case.shared_session:
+        with _fresh_session():
+            yield case.call
+        return
+
+    def run(index: int) -> object:
+        with _fresh_session():
+            return case.call(index)
+
+    yield run
+
+
+def _agent_tool_case(name: str, tool: Callable[[int, list], object]) -> BenchmarkCase:
+    # Agent tools scan the corpus a chat loaded once, so the load stays untimed.
+    documents = _lazy_searchable_documents()
+    return BenchmarkCase(name, lambda index: tool(index, documents()), shared_session=True)
+
+
+def _lazy_searchable_documents() -> Callable[[], list]:
+    loaded: list = []
+
+    def documents() -> list:
+        if not loaded:
+            loaded.extend(search_dao.get_searchable_documents())
+        return loaded
+
+    return documents
+
+
+def _git_commit() -> str | None:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
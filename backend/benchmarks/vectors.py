@@ -0,0 +1,214 @@
+"""Compare the NumPy vector kernels with the pure-Python code they replaced.
+
+Usage (from ``backend/``)::
+
+    python -m benchmarks.vectors --sizes 10000,100000
+
+Three kernels are timed at every corpus size: the local hashed-token embedder
+over synthetic essay bodies, brute-force cosine top-k of one query against
+every stored vector, and the three-component projection behind the admin
+embedding map when UMAP is unavailable. The legacy Python versions are linear
+in the row count, so above ``--legacy-rows`` they are timed on a prefix and
+scaled up (the projection uses a tenth of that prefix); those rows are marked
+``legacy_extrapolated``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import re
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.corpus import THEMES, _body
+from benchmarks.run import RESULTS_DIR, _git_commit
+from iris.services.common.vectors import cosine_scores, hashed_token_embeddings, principal_components, top_k
+from iris.services.ingestion.embedding import DIMENSIONS
+
+
+@dataclass(frozen=True)
+class KernelResult:
+    kernel: str
+    rows: int
+    dimensions: int
+    legacy_ms: float
+    numpy_ms: float
+    speedup: float
+    legacy_extrapolated: bool
+
+
+def run_size(rows: int, *, dimensions: int, legacy_rows: int, k: int, repeats: int, seed: int) -> list[KernelResult]:
+    """Time every kernel at one corpus size."""
+    rng = random.Random(seed)
+    themes = sorted(THEMES)
+    texts = [_body(rng, themes[index % len(themes)], words=140) for index in range(rows)]
+    matrix = np.random.default_rng(seed).standard_normal((rows, dimensions)).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    query = matrix[0].tolist()
+    legacy_count = min(rows, legacy_rows)
+    vectors = matrix[:legacy_count].tolist()
+    # The Python projection makes 72 passes over every row, so it gets a shorter prefix.
+    projection_count = min(rows, max(1, legacy_rows // 10))
+
+    return [
+        _compare(
+            "embed_local",
+            rows,
+            DIMENSIONS,
+            legacy=lambda: [_legacy_embed(text) for text in texts[:legacy_count]],
+            vectorised=lambda: hashed_token_embeddings(texts, dimensions=DIMENSIONS),
+            legacy_count=legacy_count,
+            repeats=repeats,
+        ),
+        _compare(
+            "cosine_top_k",
+            rows,
+            dimensions,
+            legacy=lambda: _legacy_top_k(query, vectors[:legacy_count], k),
+            vectorised=lambda: top_k(cosine_scores(query, matrix), k),
+            legacy_count=legacy_count,
+            repeats=repeats,
+        ),
+        _compare(
+            "projection",
+            rows,
+            dimensions,
+            legacy=lambda: _legacy_projection(vectors[:projection_count]),
+            vectorised=lambda: principal_components(matrix, 3),
+            legacy_count=projection_count,
+            repeats=repeats,
+            legacy_repeats=1,
+        ),
+    ]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.vectors")
+    parser.add_argument("--sizes", default="10000,100000", help="comma-separated document counts")
+    parser.add_argument("--dimensions", type=int, default=1536, help="stored vector width for similarity and projection")
+    parser.add_argument("--legacy-rows", type=int, default=2000, help="rows to time the Python kernels on before scaling")
+    parser.add_argument("--k", type=int, default=80)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", type=Path)
+    args = parser.parse_args(argv)
+
+    results: list[KernelResult] = []
+    for rows in [int(value) for value in args.sizes.split(",") if value.strip()]:
+        for result in run_size(
+            rows,
+            dimensions=args.dimensions,
+            legacy_rows=args.legacy_rows,
+            k=args.k,
+            repeats=args.repeats,
+            seed=args.seed,
+        ):
+            results.append(result)
+            print(
+                f"{result.kernel:<13} rows={result.rows:<7} dims={result.dimensions:<5} "
+                f"python={result.legacy_ms:>11.1f}ms{'*' if result.legacy_extrapolated else ' '} "
+                f"numpy={result.numpy_ms:>9.1f}ms speedup={result.speedup:>7.1f}x"
+            )
+    if any(result.legacy_extrapolated for result in results):
+        print(f"* scaled from the first {args.legacy_rows} rows")
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "git_commit": _git_commit(),
+        "dimensions": args.dimensions,
+        "legacy_rows": args.legacy_rows,
+        "k": args.k,
+        "results": [asdict(result) for result in results],
+    }
+    output = args.output or RESULTS_DIR / f"vectors-{datetime.now(timezone.utc):%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {output}")
+    return 0
+
+
+def _compare(
+    kernel: str,
+    rows: int,
+    dimensions: int,
+    *,
+    legacy: Callable[[], object],
+    vectorised: Callable[[], object],
+    legacy_count: int,
+    repeats: int,
+    legacy_repeats: int | None = None,
+) -> KernelResult:
+    legacy_ms = _best_ms(legacy, legacy_repeats or repeats) * rows / max(1, legacy_count)
+    numpy_ms = _best_ms(vectorised, repeats)
+    return KernelResult(
+        kernel=kernel,
+        rows=rows,
+        dimensions=dimensions,
+        legacy_ms=round(legacy_ms, 2),
+        numpy_ms=round(numpy_ms, 2),
+        speedup=round(legacy_ms / numpy_ms, 1) if numpy_ms else 0.0,
+        legacy_extrapolated=legacy_count < rows,
+    )
+
+
+def _best_ms(call: Callable[[], object], repeats: int) -> float:
+    timings = []
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+# The implementations below are the pre-NumPy versions, kept as the baseline.
+
+
+def _legacy_embed(text: str) -> list[float]:
+    vector = [0.0] * DIMENSIONS
+    for word in re.findall(r"[a-zA-Z][a-zA-Z0-9\-]{2,}", text.lower()):
+        digest = hashlib.sha256(word.encode("utf-8")).digest()
+        vector[int.from_bytes(digest[:4], "big") % DIMENSIONS] += 1 if digest[4] % 2 == 0 else -1
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+def _legacy_top_k(query: list[float], vectors: list[list[float]], k: int) -> list[int]:
+    scores = [sum(left * right for left, right in zip(query, vector)) for vector in vectors]
+    return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+
+
+def _legacy_projection(vectors: list[list[float]]) -> list[tuple[float, ...]]:
+    dimensions = len(vectors[0])
+    means = [sum(vector[index] for vector in vectors) / len(vectors) for index in range(dimensions)]
+    centered = [[value - means[index] for index, value in enumerate(vector)] for vector in vectors]
+    components: list[list[float]] = []
+    for seed in range(3):
+        component = [0.0] * dimensions
+        component[seed] = 1.0
+        for _ in range(24):
+            next_component = [0.0] * dimensions
+            for vector in centered:
+                scale = sum(left * right for left, right in zip(vector, component))
+                for index, value in enumerate(vector):
+                    next_component[index] += scale * value
+            for existing in components:
+                existing_scale = sum(left * right for left, right in zip(next_component, existing))
+                for index, value in enumerate(existing):
+                    next_component[index] -= existing_scale * value
+            norm = math.sqrt(sum(value * value for value in next_component)) or 1.0
+            component = [value / norm for value in next_component]
+        components.append(component)
+    return [tuple(sum(left * right for left, right in zip(vector, component)) for component in components) for vector in centered]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
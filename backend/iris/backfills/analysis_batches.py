@@ -0,0 +1,394 @@
+"""Run corpus-wide document analysis through provider batches instead of live calls.
+
+The job has three restartable steps, each tracked on ``AnalysisBatch`` rows:
+
+``prepare`` pages through fetched documents in id order and writes JSONL
+request files of the same Responses API payloads the live path sends. Pages
+the classifier decides locally (non-English, spam) are applied straight away
+and never reach the provider. Each file is committed with the id range it
+covers, so a rerun continues after the last prepared document.
+
+``submit`` hands prepared files to the batch transport, and ``collect`` polls
+submitted batches, then parses finished results and writes them in chunked,
+bulk updates. Ingesting the same output twice writes the same values, so a
+collect interrupted mid-batch is simply run again. Embeddings are not
+refreshed here; run ``reembed`` or ``embed-documents`` afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections import Counter
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+from sqlalchemy import update
+
+from iris.backfills.engine import backfill_scope, log
+from iris.dao import backfills as backfills_dao
+from iris.dao import db
+from iris.dao import documents as documents_dao
+from iris.dao import maintenance as maintenance_dao
+from iris.dao import reporting as reporting_dao
+from iris.dao.categories import assign_category, get_or_create_category
+from iris.models import AnalysisBatch, Document
+from iris.models.sqla import utcnow
+from iris.schemas.backfills import AnalysisBatchCollectResult, AnalysisBatchPrepareResult
+from iris.schemas.enums import AnalysisBatchMode, AnalysisBatchStatus
+from iris.schemas.ingestion import DocumentAnalysis
+from iris.services.common.config import ANALYSIS_BATCH_DIR, ANALYSIS_BATCH_MAX_REQUESTS
+from iris.services.ingestion.analysis_batch_transport import (
+    RESPONSES_ENDPOINT,
+    BatchTransport,
+    analysis_batch_transport,
+)
+from iris.services.ingestion.document_classifier import (
+    parse_document_analysis_response_data,
+    prepare_document_analysis,
+)
+
+
+PAGE_SIZE = 200
+INGEST_CHUNK_SIZE = 200
+SUMMARY_FIELDS = ("summary", "one_liner", "audience", "takeaways")
+
+
+def analysis_batch_scope(mode: AnalysisBatchMode, *, source_domain: str | None, suspicious_only: bool) -> str:
+    """Return the batch scope for a selection; only metadata mode filters to suspicious essays."""
+    if mode == AnalysisBatchMode.METADATA:
+        return backfill_scope(source=source_domain, suspicious_only=int(suspicious_only))
+    return backfill_scope(source=source_domain)
+
+
+def prepare_analysis_batches(
+    mode: AnalysisBatchMode,
+    *,
+    source_domain: str | None = None,
+    suspicious_only: bool = True,
+    limit: int | None = None,
+    max_requests: int = ANALYSIS_BATCH_MAX_REQUESTS,
+    directory: Path = ANALYSIS_BATCH_DIR,
+) -> AnalysisBatchPrepareResult:
+    """Write request files for documents after the last prepared batch, committing one batch at a time.
+
+    ``limit`` caps the documents covered by this invocation.
+    """
+    session = db.current_session()
+    scope = analysis_batch_scope(mode, source_domain=source_domain, suspicious_only=suspicious_only)
+    include = maintenance_dao.is_suspicious_metadata if mode == AnalysisBatchMode.METADATA and suspicious_only else None
+    after_id = backfills_dao.get_analysis_batch_resume_id(mode, scope)
+    if after_id:
+        log(f"analysis batches mode={mode.value} scope={scope!r} resuming after doc={after_id}")
+    directory.mkdir(parents=True, exist_ok=True)
+    max_requests = max(1, max_requests)
+    totals: Counter = Counter()
+    requests: list[str] = []
+    decided: list[tuple[Document, DocumentAnalysis]] = []
+    first_id = after_id + 1
+    last_id = after_id
+
+    def flush() -> None:
+        nonlocal requests, decided, first_id
+        if not requests and not decided:
+            return
+        counters: Counter = Counter()
+        _apply_analyses(mode, decided, counters)
+        batch = backfills_dao.add_analysis_batch(
+            AnalysisBatch(
+                mode=mode,
+                scope=scope,
+                status=AnalysisBatchStatus.PREPARED if requests else AnalysisBatchStatus.INGESTED,
+                first_document_id=first_id,
+                last_document_id=last_id,
+                request_count=len(requests),
+                request_path="",
+                counters={"decided_locally": len(decided), **counters},
+            )
+        )
+        if requests:
+            request_path = directory / f"{mode.value}-{batch.id:06d}.jsonl"
+            request_path.write_text("".join(requests))
+            batch.request_path = str(request_path)
+        session.commit()
+        totals["batches"] += 1
+        totals["requests"] += len(requests)
+        totals["decided_locally"] += len(decided)
+        log(
+            f"analysis batch id={batch.id} mode={mode.value} docs={first_id}..{last_id} "
+            f"requests={len(requests)} decided_locally={len(decided)}"
+        )
+        requests, decided, first_id = [], [], last_id + 1
+
+    for document, link_count in _selected_documents(
+        mode, source_domain=source_domain, after_id=after_id, limit=limit, include=include
+    ):
+        prepared = prepare_document_analysis(
+            url=document.url,
+            metadata_title=document.title,
+            text=document.extracted_text or "",
+            link_count=link_count,
+            has_author=bool(document.author),
+            has_published_date=bool(document.published_at),
+        )
+        last_id = document.id
+        if isinstance(prepared, DocumentAnalysis):
+            decided.append((document, prepared))
+        else:
+            request = {"custom_id": f"doc-{document.id}", "method": "POST", "url": RESPONSES_ENDPOINT, "body": prepared}
+            requests.append(json.dumps(request) + "\n")
+        if len(requests) >= max_requests:
+            flush()
+    flush()
+    return AnalysisBatchPrepareResult(
+        batches=totals["batches"],
+        requests=totals["requests"],
+        decided_locally=totals["decided_locally"],
+        last_document_id=last_id,
+    )
+
+
+def submit_analysis_batches(
+    *,
+    mode: AnalysisBatchMode | None = None,
+    transport: BatchTransport | None = None,
+    retry_failed: bool = False,
+) -> int:
+    """Submit prepared batches, and failed ones when ``retry_failed`` is set; returns the number submitted."""
+    session = db.current_session()
+    transport = transport or analysis_batch_transport()
+    statuses = [AnalysisBatchStatus.PREPARED] + ([AnalysisBatchStatus.FAILED] if retry_failed else [])
+    submitted = 0
+    for batch in backfills_dao.get_analysis_batches(statuses, mode=mode):
+        batch.provider_batch_id = transport.submit(Path(batch.request_path))
+        batch.status = AnalysisBatchStatus.SUBMITTED
+        batch.submitted_at = utcnow()
+        batch.error = None
+        session.commit()
+        submitted += 1
+        log(f"analysis batch id={batch.id} submitted provider_batch_id={batch.provider_batch_id}")
+    return submitted
+
+
+def collect_analysis_batches(
+    *,
+    mode: AnalysisBatchMode | None = None,
+    transport: BatchTransport | None = None,
+) -> AnalysisBatchCollectResult:
+    """Poll submitted batches and ingest every batch whose results are available."""
+    session = db.current_session()
+    transport = transport or analysis_batch_transport()
+    totals: Counter = Counter()
+    statuses = [AnalysisBatchStatus.SUBMITTED, AnalysisBatchStatus.COMPLETED]
+    for batch in backfills_dao.get_analysis_batches(statuses, mode=mode):
+        if batch.status == AnalysisBatchStatus.SUBMITTED:
+            output_path = Path(batch.request_path).with_suffix(".output.jsonl")
+            poll = transport.poll(batch.provider_batch_id, output_path)
+            if poll.status == "pending":
+                totals["pending"] += 1
+                continue
+            if poll.status == "failed":
+                batch.status = AnalysisBatchStatus.FAILED
+                batch.error = poll.error
+                session.commit()
+                totals["failed_batches"] += 1
+                log(f"analysis batch id={batch.id} failed: {poll.error}")
+                continue
+            batch.status = AnalysisBatchStatus.COMPLETED
+            batch.completed_at = utcnow()
+            batch.output_path = str(output_path)
+            session.commit()
+        counters = _ingest_batch(batch)
+        batch.status = AnalysisBatchStatus.INGESTED
+        batch.ingested_at = utcnow()
+        batch.counters = {**(batch.counters or {}), **counters}
+        session.commit()
+        totals["ingested_batches"] += 1
+        totals.update(counters)
+        log(
+            f"analysis batch id={batch.id} ingested "
+            f"{' '.join(f'{key}={value}' for key, value in sorted(counters.items()))}"
+        )
+    return AnalysisBatchCollectResult(
+        pending=totals["pending"],
+        failed_batches=totals["failed_batches"],
+        ingested_batches=totals["ingested_batches"],
+        checked=totals["checked"],
+        changed=totals["changed"],
+        failed=totals["failed"],
+    )
+
+
+def _selected_documents(
+    mode: AnalysisBatchMode,
+    *,
+    source_domain: str | None,
+    after_id: int,
+    limit: int | None,
+    include: Callable[[Document], bool] | None,
+) -> Iterator[tuple[Document, int]]:
+    remaining = limit or None
+    while remaining is None or remaining > 0:
+        page = maintenance_dao.get_fetched_document_page(
+            source_domain=source_domain,
+            after_id=after_id,
+            limit=PAGE_SIZE,
+            essays_only=mode == AnalysisBatchMode.METADATA,
+        )
+        if not page:
+            return
+        selected = [document for document in page if include is None or include(document)]
+        if remaining is not None:
+            selected = selected[:remaining]
+            remaining -= len(selected)
+        link_counts = reporting_dao.count_links_by_document([document.id for document in selected])
+        for document in selected:
+            yield document, link_counts[document.id]
+        after_id = page[-1].id
+
+
+def _ingest_batch(batch: AnalysisBatch) -> Counter:
+    """Parse one batch's results and apply them a chunk of documents at a time."""
+    session = db.current_session()
+    results = _read_results(Path(batch.output_path))
+    counters: Counter = Counter()
+    document_ids = sorted(results)
+    for start in range(0, len(document_ids), INGEST_CHUNK_SIZE):
+        chunk = document_ids[start : start + INGEST_CHUNK_SIZE]
+        analyses: list[tuple[Document, DocumentAnalysis]] = []
+        for document in maintenance_dao.get_documents_with_text(chunk):
+            counters["checked"] += 1
+            result = results[document.id]
+            try:
+                response = result.get("response") or {}
+                if result.get("error") or response.get("status_code") != 200:
+                    raise RuntimeError(json.dumps(result.get("error") or response.get("body")))
+                analyses.append(
+                    (
+                        document,
+                        parse_document_analysis_response_data(
+                            response["body"],
+                            metadata_title=document.title,
+                            fallback_text=document.extracted_text or "",
+                        ),
+                    )
+                )
+            except (RuntimeError, ValueError, KeyError) as exc:
+                counters["failed"] += 1
+                log(f"analysis batch id={batch.id} doc={document.id} failed: {exc}")
+        _apply_analyses(batch.mode, analyses, counters)
+        session.commit()
+    # Requests the provider dropped never come back; count them as failures.
+    counters["failed"] += max(0, batch.request_count - len(results))
+    return counters
+
+
+def _read_results(path: Path) -> dict[int, dict]:
+    results: dict[int, dict] = {}
+    with path.open() as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            custom_id = str(result.get("custom_id") or "")
+            if custom_id.startswith("doc-"):
+                results[int(custom_id.removeprefix("doc-"))] = result
+    return results
+
+
+def _apply_analyses(mode: AnalysisBatchMode, analyses: list[tuple[Document, DocumentAnalysis]], counters: Counter) -> None:
+    """Write analyses for one chunk: summaries as a single bulk update, other modes through the document DAO."""
+    session = db.current_session()
+    if mode == AnalysisBatchMode.SUMMARIES:
+        rows = [
+            {
+                "id": document.id,
+                "summary": analysis.summary,
+                "one_liner": analysis.one_liner,
+                "audience": analysis.audience,
+                "takeaways": analysis.takeaways or [],
+            }
+            for document, analysis in analyses
+            if _summary_changed(document, analysis)
+        ]
+        if rows:
+            session.execute(update(Document), rows)
+            for document, _analysis in analyses:
+                session.expire(document, list(SUMMARY_FIELDS))
+        counters["changed"] += len(rows)
+        return
+    for document, analysis in analyses:
+        if _analysis_changed(mode, document, analysis):
+            counters["changed"] += 1
+            documents_dao.update_document_analysis(document, analysis)
+        if mode == AnalysisBatchMode.METADATA and analysis.category_slug:
+            assign_category(document, get_or_create_category(analysis.category_slug), assigned_by="llm")
+
+
+def _summary_changed(document: Document, analysis: DocumentAnalysis) -> bool:
+    return (
+        (document.summary or "") != analysis.summary
+        or (document.one_liner or "") != (analysis.one_liner or "")
+        or (document.audience or "") != (analysis.audience or "")
+        or list(document.takeaways or []) != (analysis.takeaways or [])
+    )
+
+
+def _analysis_changed(mode: AnalysisBatchMode, document: Document, analysis: DocumentAnalysis) -> bool:
+    changed = (
+        document.document_type != analysis.document_type
+        or document.title != analysis.title
+        or (document.summary or "") != analysis.summary
+        or list(document.topics or []) != analysis.topics
+    )
+    if mode == AnalysisBatchMode.METADATA:
+        return changed or _summary_changed(document, analysis)
+    return changed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m iris.backfills.analysis_batches")
+    parser.add_argument("step", choices=["prepare", "submit", "collect"])
+    parser.add_argument("--mode", choices=[mode.value for mode in AnalysisBatchMode], default=None)
+    parser.add_argument("--source")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--all", action="store_true", help="metadata mode: include documents without suspicious metadata")
+    parser.add_argument("--max-requests", type=int, default=ANALYSIS_BATCH_MAX_REQUESTS)
+    parser.add_argument("--retry-failed", action="store_true")
+    args = parser.parse_args()
+
+    with db.session_scope():
+        run_analysis_batch_step(args)
+    return 0
+
+
+def run_analysis_batch_step(args: argparse.Namespace) -> None:
+    """Run one step from parsed ``analysis-batches`` arguments."""
+    mode = AnalysisBatchMode(args.mode) if args.mode else None
+    if args.step == "prepare":
+        if mode is None:
+            raise SystemExit("--mode is required to prepare analysis batches")
+        prepared = prepare_analysis_batches(
+            mode,
+            source_domain=args.source,
+            suspicious_only=not args.all,
+            limit=args.limit,
+            max_requests=args.max_requests,
+        )
+        log(
+            f"batches={prepared.batches} requests={prepared.requests} "
+            f"decided_locally={prepared.decided_locally} last_document_id={prepared.last_document_id}"
+        )
+    elif args.step == "submit":
+        log(f"submitted={submit_analysis_batches(mode=mode, retry_failed=args.retry_failed)}")
+    else:
+        collected = collect_analysis_batches(mode=mode)
+        log(
+            f"ingested_batches={collected.ingested_batches} pending={collected.pending} "
+            f"failed_batches={collected.failed_batches} checked={collected.checked} "
+            f"changed={collected.changed} failed={collected.failed}"
+        )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,89 @@
+"""Convert SQLite JSON-text embeddings to the binary vector encoding.
+
+Readers accept both encodings, so this runs online: rows are converted in
+short id-ordered batches that commit independently and can be re-run.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+
+from sqlalchemy import text
+
+from iris.dao import db
+from iris.schemas.backfills import BinaryEmbeddingBackfillResult
+from iris.services.ingestion.embedding import loads_embedding
+from iris.services.ingestion.embedding_codec import encode_embedding
+
+
+def convert_embeddings_to_binary(
+    *,
+    batch_size: int = 500,
+    limit: int | None = None,
+    dtype: str | None = None,
+) -> BinaryEmbeddingBackfillResult:
+    """Re-encode JSON text embeddings as binary vectors, committing after each batch."""
+    session = db.current_session()
+    if session.bind is None or session.bind.dialect.name != "sqlite":
+        raise RuntimeError("binary embedding conversion only applies to SQLite databases")
+    checked = converted = skipped = bytes_before = bytes_after = 0
+    after_id = 0
+    while not limit or checked < limit:
+        size = min(batch_size, limit - checked) if limit else batch_size
+        rows = session.execute(
+            text(
+                "select id, embedding_vector from documents "
+                "where id > :after_id and typeof(embedding_vector) = 'text' "
+                "order by id limit :size"
+            ),
+            {"after_id": after_id, "size": max(1, size)},
+        ).all()
+        if not rows:
+            break
+        updates = []
+        for row in rows:
+            checked += 1
+            try:
+                vector = loads_embedding(row.embedding_vector)
+            except (TypeError, ValueError, json.JSONDecodeError):
+                skipped += 1
+                continue
+            encoded = encode_embedding(vector, dtype=dtype)
+            bytes_before += len(row.embedding_vector.encode("utf-8"))
+            bytes_after += len(encoded)
+            updates.append({"document_id": row.id, "embedding": encoded})
+        if updates:
+            session.execute(text("update documents set embedding_vector = :embedding where id = :document_id"), updates)
+            converted += len(updates)
+        after_id = rows[-1].id
+        session.commit()
+        print(f"binary embeddings converted={converted} checked={checked} through doc={after_id}", flush=True)
+    return BinaryEmbeddingBackfillResult(
+        checked=checked,
+        converted=converted,
+        skipped=skipped,
+        bytes_before=bytes_before,
+        bytes_after=bytes_after,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m iris.backfills.binary_embeddings")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--dtype", choices=("float32", "float16", "int8"), help="defaults to IRIS_EMBEDDING_STORAGE_DTYPE")
+    args = parser.parse_args()
+
+    with db.session_scope():
+        result = convert_embeddings_to_binary(batch_size=args.batch_size, limit=args.limit or None, dtype=args.dtype)
+    ratio = result.bytes_before / result.bytes_after if result.bytes_after else 0.0
+    print(
+        f"checked={result.checked} converted={result.converted} skipped={result.skipped} "
+        f"bytes {result.bytes_before}->{result.bytes_after} ({ratio:.1f}x smaller)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
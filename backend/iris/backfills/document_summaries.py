@@ -4,15 +4,20 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+from collections import Counter
 from dataclasses import dataclass
 
+from iris.backfills.engine import DEFAULT_BATCH_SIZE, BackfillSpec, backfill_scope, log, run_document_backfill
+from iris.dao import backfills as backfills_dao
 from iris.dao import db
 from iris.dao import maintenance as maintenance_dao
-from iris.dao import reporting as reporting_dao
 from iris.models import Document
 from iris.services.ingestion.document_classifier import analyze_document_async
 
 
+SUMMARY_BACKFILL_NAME = "document_summaries"
+
+
 @dataclass(frozen=True)
 class SummaryBackfillItem:
     index: int
@@ -50,11 +55,6 @@ class SummaryBackfillResult:
     dry_run: bool
 
 
-def log(message: str) -> None:
-    """Print progress immediately for long-running terminal backfills."""
-    print(message, flush=True)
-
-
 def progress_bar(completed: int, total: int, *, width: int = 24) -> str:
     """Return a compact textual progress bar for terminal backfills."""
     if total <= 0:
@@ -70,65 +70,88 @@ def backfill_document_summaries(
     dry_run: bool = False,
     max_attempts: int = 2,
     active_documents: int = 4,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    resume: bool = False,
 ) -> SummaryBackfillResult:
-    """Regenerate summaries for fetched documents and persist only the summary field."""
-    documents = maintenance_dao.get_fetched_documents(source_domain=source_domain, limit=limit)
-    items = [
-        SummaryBackfillItem(
-            index=idx,
-            total=len(documents),
-            document_id=document.id,
-            url=document.url,
-            title=document.title,
-            summary=document.summary,
-            one_liner=document.one_liner,
-            audience=document.audience,
-            takeaways=list(document.takeaways or []),
-            extracted_text=document.extracted_text,
-            author=document.author,
-            has_published_date=bool(document.published_at),
-            link_count=reporting_dao.count_document_links(document.id),
-        )
-        for idx, document in enumerate(documents, start=1)
-    ]
+    """Regenerate summaries for fetched documents and persist only the summary field.
+
+    Documents stream through in id order and each batch commits with a
+    checkpoint, so ``resume`` continues an interrupted run.
+    """
+    scope = backfill_scope(source=source_domain)
+    after_id = 0
+    if resume:
+        checkpoint = backfills_dao.get_backfill_checkpoint(SUMMARY_BACKFILL_NAME, scope)
+        after_id = checkpoint.last_document_id if checkpoint else 0
+    total = maintenance_dao.count_fetched_documents(source_domain=source_domain, after_id=after_id)
+    if limit:
+        total = min(total, limit)
     log(
-        f"summary backfill selected={len(items)} active_documents={max(1, active_documents)} "
-        f"dry_run={dry_run}"
-    )
-    outputs = asyncio.run(
-        _run_summary_workers(
-            items,
-            max_attempts=max_attempts,
-            active_documents=active_documents,
-        )
+        f"summary backfill selected={total} active_documents={max(1, active_documents)} "
+        f"batch_size={max(1, batch_size)} dry_run={dry_run} resume={resume}"
     )
 
-    changed = 0
-    failed = 0
-    documents_by_id: dict[int, Document] = {document.id: document for document in documents}
-    for processed, output in enumerate(outputs, start=1):
+    def apply(output: SummaryBackfillOutput, document: Document, counters: Counter) -> None:
         item = output.item
         if output.failed or output.summary is None:
-            failed += 1
+            counters["failed"] += 1
             log(f"{item.index}/{item.total} doc={item.document_id} failed: {output.error}")
-            continue
-        if output.changed:
-            changed += 1
-            log(f"{item.index}/{item.total} doc={item.document_id} summary changed")
-            if not dry_run:
-                document = documents_by_id[item.document_id]
-                document.summary = output.summary
-                document.one_liner = output.one_liner
-                document.audience = output.audience
-                document.takeaways = output.takeaways or []
-        else:
+            return
+        if not output.changed:
             log(f"{item.index}/{item.total} doc={item.document_id} summary unchanged")
-        if not dry_run and processed % 10 == 0:
-            db.flush()
-            log(f"progress checked={processed}/{len(documents)} changed={changed} failed={failed}")
-    if not dry_run:
-        db.flush()
-    return SummaryBackfillResult(checked=len(documents), changed=changed, failed=failed, dry_run=dry_run)
+            return
+        counters["changed"] += 1
+        log(f"{item.index}/{item.total} doc={item.document_id} summary changed")
+        if not dry_run:
+            document.summary = output.summary
+            document.one_liner = output.one_liner
+            document.audience = output.audience
+            document.takeaways = output.takeaways or []
+
+    progress = run_document_backfill(
+        BackfillSpec(
+            name=SUMMARY_BACKFILL_NAME,
+            scope=scope,
+            fetch_page=lambda after, size: maintenance_dao.get_fetched_document_page(
+                source_domain=source_domain,
+                after_id=after,
+                limit=size,
+            ),
+            build_item=lambda document, index, link_count: _summary_item(document, index=index, total=total, link_count=link_count),
+            run_batch=lambda items: _run_summary_workers(items, max_attempts=max_attempts, active_documents=active_documents),
+            apply=apply,
+            item_document_id=lambda output: output.item.document_id,
+            item_failed=lambda output: output.failed or output.summary is None,
+        ),
+        limit=limit,
+        batch_size=batch_size,
+        resume=resume,
+        dry_run=dry_run,
+    )
+    return SummaryBackfillResult(
+        checked=progress.checked,
+        changed=progress.counters["changed"],
+        failed=progress.counters["failed"],
+        dry_run=dry_run,
+    )
+
+
+def _summary_item(document: Document, *, index: int, total: int, link_count: int) -> SummaryBackfillItem:
+    return SummaryBackfillItem(
+        index=index,
+        total=total,
+        document_id=document.id,
+        url=document.url,
+        title=document.title,
+        summary=document.summary,
+        one_liner=document.one_liner,
+        audience=document.audience,
+        takeaways=list(document.takeaways or []),
+        extracted_text=document.extracted_text,
+        author=document.author,
+        has_published_date=bool(document.published_at),
+        link_count=link_count,
+    )
 
 
 async def _run_summary_workers(
@@ -222,6 +245,8 @@ def main() -> int:
     parser.add_argument("--dry-run", action="store_true")
     parser.add_argument("--max-attempts", type=int, default=2)
     parser.add_argument("--active-documents", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--resume", action="store_true", help="continue after the last committed batch")
     args = parser.parse_args()
 
     with db.session_scope():
@@ -231,6 +256,8 @@ def main() -> int:
             dry_run=args.dry_run,
             max_attempts=args.max_attempts,
             active_documents=args.active_documents,
+            batch_size=args.batch_size,
+            resume=args.resume,
         )
         log(f"checked={result.checked} changed={result.changed} failed={result.failed} dry_run={result.dry_run}")
     return 0
@@ -0,0 +1,64 @@
+"""Rebuild the normalized document topic index from `documents.topics`."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from sqlalchemy import delete, select, update
+
+from iris.dao import db
+from iris.dao.postings import mark_postings_changed
+from iris.dao.topics import topic_slug
+from iris.models import Document, DocumentTopic, Topic
+
+
+def backfill_document_topics(*, batch_size: int = 500) -> int:
+    """Rebuild document topic rows and frequencies from ``Document.topics``."""
+    session = db.current_session()
+    session.execute(delete(DocumentTopic))
+    last_id = 0
+    counts: Counter[str] = Counter()
+    names: dict[str, str] = {}
+    while True:
+        rows = session.execute(
+            select(Document.id, Document.topics)
+            .where(Document.id > last_id)
+            .where(Document.topics.is_not(None))
+            .order_by(Document.id.asc())
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        for document_id, topics in rows:
+            slugs = {}
+            for topic in topics or []:
+                slug = topic_slug(topic)
+                if slug:
+                    slugs.setdefault(slug, str(topic).strip()[:255])
+            session.add_all(DocumentTopic(document_id=document_id, topic_slug=slug) for slug in slugs)
+            counts.update(slugs.keys())
+            for slug, name in slugs.items():
+                names.setdefault(slug, name)
+            last_id = document_id
+        session.flush()
+    session.execute(update(Topic).values(document_count=0))
+    existing = {topic.slug: topic for topic in session.scalars(select(Topic))}
+    for slug, count in counts.items():
+        topic = existing.get(slug)
+        if topic is None:
+            session.add(Topic(slug=slug, name=names[slug], document_count=count))
+        else:
+            topic.document_count = count
+    mark_postings_changed(None)
+    session.flush()
+    return sum(counts.values())
+
+
+def main() -> int:
+    with db.session_scope():
+        print(f"topic_assignments={backfill_document_topics()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,197 @@
+"""Streaming, checkpointed driver shared by document backfills.
+
+Documents are read in id order one page at a time, so memory stays bounded by
+the batch size instead of the selection size. While the async workers for one
+batch run, a worker thread reads the next page on its own session and builds
+its worker inputs; results are merged into the caller's session, applied and
+committed together with the checkpoint, so an interrupted run keeps every
+finished batch and ``resume`` continues after the last one. The checkpoint
+never passes a document whose worker failed, so ``resume`` retries it. The
+session identity map only weakly references clean rows, so committed batches
+are released once the engine drops them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+from iris.dao import backfills as backfills_dao
+from iris.dao import db
+from iris.dao import reporting as reporting_dao
+from iris.models import Document
+
+
+ItemT = TypeVar("ItemT")
+OutputT = TypeVar("OutputT")
+DEFAULT_BATCH_SIZE = 50
+
+
+@dataclass
+class BackfillSpec(Generic[ItemT, OutputT]):
+    """Callbacks that adapt one backfill to the streaming engine.
+
+    ``fetch_page(after_id, size)`` returns the next documents in id order.
+    ``build_item(document, index, link_count)`` detaches the worker input.
+    ``run_batch(items)`` runs the async workers for one batch and
+    ``apply(output, document, counters)`` persists one result, and
+    ``item_failed(output)`` marks results a resumed run should retry.
+    """
+
+    name: str
+    scope: str
+    fetch_page: Callable[[int, int], Sequence[Document]]
+    build_item: Callable[[Document, int, int], ItemT]
+    run_batch: Callable[[list[ItemT]], Awaitable[list[OutputT]]]
+    apply: Callable[[OutputT, Document, Counter], None]
+    item_document_id: Callable[[OutputT], int]
+    include: Callable[[Document], bool] | None = None
+    item_failed: Callable[[OutputT], bool] | None = None
+
+
+@dataclass
+class BackfillProgress:
+    """Counters for the documents handled by one invocation of a backfill."""
+
+    checked: int = 0
+    resumed_after_id: int = 0
+    last_document_id: int = 0
+    counters: Counter = field(default_factory=Counter)
+
+
+@dataclass
+class _Batch(Generic[ItemT]):
+    documents: dict[int, Document]
+    items: list[ItemT]
+    last_document_id: int
+
+
+def log(message: str) -> None:
+    """Print progress immediately for long-running terminal backfills."""
+    print(message, flush=True)
+
+
+def backfill_scope(**filters: object) -> str:
+    """Return a stable checkpoint scope for a set of selection filters."""
+    return ";".join(f"{key}={'' if value is None else value}" for key, value in sorted(filters.items()))
+
+
+def run_document_backfill(
+    spec: BackfillSpec[ItemT, OutputT],
+    *,
+    limit: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    resume: bool = False,
+    dry_run: bool = False,
+) -> BackfillProgress:
+    """Stream selected documents through ``spec`` and commit after every batch.
+
+    ``limit`` caps the documents handled by this invocation. Dry runs read and
+    process documents but never commit results or checkpoints.
+    """
+    session = db.current_session()
+    progress = BackfillProgress()
+    checkpoint = None
+    if not dry_run:
+        checkpoint = backfills_dao.start_backfill_checkpoint(spec.name, spec.scope, resume=resume)
+        progress.resumed_after_id = checkpoint.last_document_id
+        session.commit()
+        if progress.resumed_after_id:
+            log(f"{spec.name} resuming after doc={progress.resumed_after_id} counters={checkpoint.counters}")
+    batch_size = max(1, batch_size)
+    reader = _PageReader(spec, after_id=progress.resumed_after_id, batch_size=batch_size, limit=limit or None)
+
+    # Resuming must start at or before the first failed document.
+    retry_from: int | None = None
+
+    async def drive() -> None:
+        nonlocal retry_from
+        batch = await db.run_in_worker_session(reader.next_batch)
+        while batch is not None:
+            task = asyncio.create_task(spec.run_batch(batch.items))
+            # Read the next page on a worker session while the current batch is with the workers.
+            upcoming = await db.run_in_worker_session(reader.next_batch)
+            outputs = await task
+            documents = {document_id: session.merge(document, load=False) for document_id, document in batch.documents.items()}
+            counters: Counter = Counter()
+            for output in outputs:
+                document_id = spec.item_document_id(output)
+                spec.apply(output, documents[document_id], counters)
+                if spec.item_failed is not None and spec.item_failed(output):
+                    retry_from = min(document_id, retry_from or document_id)
+            if checkpoint is not None:
+                backfills_dao.advance_backfill_checkpoint(
+                    checkpoint,
+                    last_document_id=_checkpoint_id(batch.last_document_id, retry_from),
+                    counters={"checked": len(outputs), **counters},
+                )
+                session.commit()
+            progress.checked += len(outputs)
+            progress.counters.update(counters)
+            progress.last_document_id = batch.last_document_id
+            log(
+                f"{spec.name} batch through doc={batch.last_document_id} "
+                f"checked={progress.checked} {' '.join(f'{key}={value}' for key, value in sorted(progress.counters.items()))}"
+            )
+            batch = upcoming
+
+    asyncio.run(drive())
+    if reader.exhausted:
+        progress.last_document_id = max(progress.last_document_id, reader.last_seen_id)
+        if checkpoint is not None:
+            # Trailing pages with nothing selected still count as scanned.
+            backfills_dao.advance_backfill_checkpoint(
+                checkpoint,
+                last_document_id=_checkpoint_id(reader.last_seen_id, retry_from),
+                counters={},
+            )
+            if retry_from is None:
+                backfills_dao.finish_backfill_checkpoint(checkpoint)
+            session.commit()
+    return progress
+
+
+def _checkpoint_id(last_document_id: int, retry_from: int | None) -> int:
+    return last_document_id if retry_from is None else min(last_document_id, retry_from - 1)
+
+
+class _PageReader(Generic[ItemT]):
+    """Keyset pagination over ``spec.fetch_page`` that yields worker batches."""
+
+    def __init__(self, spec: BackfillSpec[ItemT, OutputT], *, after_id: int, batch_size: int, limit: int | None) -> None:
+        self.spec = spec
+        self.last_seen_id = after_id
+        self.batch_size = batch_size
+        self.remaining = limit
+        self.selected = 0
+        self.exhausted = False
+
+    def next_batch(self) -> _Batch[ItemT] | None:
+        while self.remaining is None or self.remaining > 0:
+            size = self.batch_size if self.remaining is None else min(self.batch_size, self.remaining)
+            page = list(self.spec.fetch_page(self.last_seen_id, size))
+            if not page:
+                self.exhausted = True
+                return None
+            self.last_seen_id = page[-1].id
+            include = self.spec.include
+            selected = [document for document in page if include is None or include(document)]
+            if not selected:
+                continue
+            if self.remaining is not None:
+                selected = selected[: self.remaining]
+                self.remaining -= len(selected)
+            link_counts = reporting_dao.count_links_by_document([document.id for document in selected])
+            items = [
+                self.spec.build_item(document, index, link_counts[document.id])
+                for index, document in enumerate(selected, start=self.selected + 1)
+            ]
+            self.selected += len(selected)
+            # A batch cut short by the limit only covers up to its last document;
+            # otherwise it also covers skipped documents earlier in the page.
+            last_document_id = selected[-1].id if self.remaining == 0 else self.last_seen_id
+            return _Batch(documents={document.id: document for document in selected}, items=items, last_document_id=last_document_id)
+        return None
@@ -4,20 +4,21 @@ from __future__ import annotations
 
 import argparse
 import asyncio
+from collections import Counter
 
+from iris.backfills.engine import DEFAULT_BATCH_SIZE, BackfillSpec, backfill_scope, log, run_document_backfill
+from iris.dao import backfills as backfills_dao
 from iris.dao import db
 from iris.dao.categories import assign_category, get_or_create_category
 from iris.dao import documents as documents_dao
 from iris.dao import maintenance as maintenance_dao
-from iris.dao import reporting as reporting_dao
+from iris.models import Document
 from iris.schemas.backfills import BackfillDocumentInput, BackfillDocumentOutput, MetadataEmbeddingBackfillResult
 from iris.services.ingestion.document_classifier import analyze_document_async
 from iris.services.ingestion.embedding import document_embedding_text, embed_text_async
 
 
-def log(message: str) -> None:
-    """Print progress immediately for long-running terminal backfills."""
-    print(message, flush=True)
+METADATA_BACKFILL_NAME = "metadata_embeddings"
 
 
 def backfill_metadata_and_embeddings(
@@ -30,59 +31,34 @@ def backfill_metadata_and_embeddings(
     openai_embeddings: bool | None = True,
     max_attempts: int = 2,
     active_documents: int = 4,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    resume: bool = False,
 ) -> MetadataEmbeddingBackfillResult:
-    """Refresh LLM metadata and re-embed documents with bounded concurrency."""
-    documents = maintenance_dao.get_documents_for_metadata_backfill(
-        source_domain=source_domain,
-        limit=limit,
-        suspicious_only=suspicious_only,
-    )
-    items = [
-        BackfillDocumentInput(
-            index=idx,
-            total=len(documents),
-            document_id=document.id,
-            url=document.url,
-            title=document.title,
-            document_type=str(document.document_type),
-            summary=document.summary,
-            one_liner=document.one_liner,
-            audience=document.audience,
-            takeaways=list(document.takeaways or []),
-            topics=list(document.topics or []),
-            category_slug=None,
-            extracted_text=document.extracted_text,
-            author=document.author,
-            has_published_date=bool(document.published_at),
-            link_count=reporting_dao.count_document_links(document.id),
-        )
-        for idx, document in enumerate(documents, start=1)
-    ]
+    """Refresh LLM metadata and re-embed documents with bounded concurrency.
+
+    Essays stream through in id order and each batch commits with a
+    checkpoint, so ``resume`` continues an interrupted run.
+    """
+    scope = backfill_scope(source=source_domain, suspicious_only=int(suspicious_only))
+    after_id = 0
+    if resume:
+        checkpoint = backfills_dao.get_backfill_checkpoint(METADATA_BACKFILL_NAME, scope)
+        after_id = checkpoint.last_document_id if checkpoint else 0
+    # Suspicious metadata is detected per page, so this is an upper bound.
+    total = maintenance_dao.count_fetched_documents(source_domain=source_domain, after_id=after_id, essays_only=True)
+    if limit:
+        total = min(total, limit)
     log(
-        f"backfill selected={len(items)} active_documents={max(1, active_documents)} "
-        f"dry_run={dry_run} embed={embed and not dry_run} suspicious_only={suspicious_only}"
-    )
-    outputs = asyncio.run(
-        _run_document_workers(
-            items,
-            dry_run=dry_run,
-            embed=embed,
-            openai_embeddings=openai_embeddings,
-            max_attempts=max_attempts,
-            active_documents=active_documents,
-        )
+        f"backfill candidates={total} active_documents={max(1, active_documents)} batch_size={max(1, batch_size)} "
+        f"dry_run={dry_run} embed={embed and not dry_run} suspicious_only={suspicious_only} resume={resume}"
     )
 
-    changed = 0
-    embedded = 0
-    failed = 0
-    documents_by_id = {document.id: document for document in documents}
-    for processed, output in enumerate(outputs, start=1):
+    def apply(output: BackfillDocumentOutput, document: Document, counters: Counter) -> None:
         item = output.item
         if output.failed or output.analysis is None:
-            failed += 1
+            counters["failed"] += 1
             log(f"{item.index}/{item.total} doc={item.document_id} failed: {output.error}")
-            continue
+            return
         analysis = output.analysis
         log(
             f"{item.index}/{item.total} doc={item.document_id} "
@@ -91,30 +67,76 @@ def backfill_metadata_and_embeddings(
             f"title {item.title or item.url!r}->{analysis.title!r}"
         )
         if dry_run:
-            continue
-        document = documents_by_id[item.document_id]
+            return
         if output.changed:
-            changed += 1
+            counters["changed"] += 1
             documents_dao.update_document_analysis(document, analysis)
         if analysis.category_slug:
             assign_category(document, get_or_create_category(analysis.category_slug), assigned_by="llm")
         if output.embedding is not None:
             documents_dao.update_document_embedding(document, output.embedding)
-            embedded += 1
-        if processed % 10 == 0:
-            db.flush()
-            log(f"progress checked={processed}/{len(documents)} changed={changed} embedded={embedded} failed={failed}")
-    db.flush()
+            counters["embedded"] += 1
+
+    progress = run_document_backfill(
+        BackfillSpec(
+            name=METADATA_BACKFILL_NAME,
+            scope=scope,
+            fetch_page=lambda after, size: maintenance_dao.get_fetched_document_page(
+                source_domain=source_domain,
+                after_id=after,
+                limit=size,
+                essays_only=True,
+            ),
+            include=maintenance_dao.is_suspicious_metadata if suspicious_only else None,
+            build_item=lambda document, index, link_count: _document_input(document, index=index, total=total, link_count=link_count),
+            run_batch=lambda items: _run_document_workers(
+                items,
+                dry_run=dry_run,
+                embed=embed,
+                openai_embeddings=openai_embeddings,
+                max_attempts=max_attempts,
+                active_documents=active_documents,
+            ),
+            apply=apply,
+            item_document_id=lambda output: output.item.document_id,
+            item_failed=lambda output: output.failed or output.analysis is None,
+        ),
+        limit=limit,
+        batch_size=batch_size,
+        resume=resume,
+        dry_run=dry_run,
+    )
     return MetadataEmbeddingBackfillResult(
-        checked=len(documents),
-        changed=changed,
-        embedded=embedded,
-        failed=failed,
+        checked=progress.checked,
+        changed=progress.counters["changed"],
+        embedded=progress.counters["embedded"],
+        failed=progress.counters["failed"],
         dry_run=dry_run,
         suspicious_only=suspicious_only,
     )
 
 
+def _document_input(document: Document, *, index: int, total: int, link_count: int) -> BackfillDocumentInput:
+    return BackfillDocumentInput(
+        index=index,
+        total=total,
+        document_id=document.id,
+        url=document.url,
+        title=document.title,
+        document_type=str(document.document_type),
+        summary=document.summary,
+        one_liner=document.one_liner,
+        audience=document.audience,
+        takeaways=list(document.takeaways or []),
+        topics=list(document.topics or []),
+        category_slug=None,
+        extracted_text=document.extracted_text,
+        author=document.author,
+        has_published_date=bool(document.published_at),
+        link_count=link_count,
+    )
+
+
 async def _run_document_workers(
     items: list[BackfillDocumentInput],
     *,
@@ -230,6 +252,8 @@ def main() -> int:
     parser.add_argument("--local-embeddings", action="store_true")
     parser.add_argument("--max-attempts", type=int, default=2)
     parser.add_argument("--active-documents", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--resume", action="store_true", help="continue after the last committed batch")
     args = parser.parse_args()
 
     with db.session_scope():
@@ -242,6 +266,8 @@ def main() -> int:
             openai_embeddings=False if args.local_embeddings else True,
             max_attempts=args.max_attempts,
             active_documents=args.active_documents,
+            batch_size=args.batch_size,
+            resume=args.resume,
         )
         log(
             f"checked={result.checked} changed={result.changed} embedded={result.embedded} "
@@ -0,0 +1,202 @@
+"""Plan and run background re-embedding of the corpus under a new model.
+
+Search keeps serving the current model while target-model vectors are written
+to the embedding registry. The target is promoted once it covers the corpus,
+which re-points the document vector mirror and query routing in one step.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+
+from iris.backfills.engine import DEFAULT_BATCH_SIZE, BackfillSpec, backfill_scope, log, run_document_backfill
+from iris.dao import db
+from iris.dao import embeddings as embeddings_dao
+from iris.models import Document
+from iris.schemas.backfills import ReembedPlan, ReembedResult
+from iris.services.common.config import EMBEDDING_MODEL
+from iris.services.ingestion.embedding import (
+    LOCAL_EMBEDDING_MODEL,
+    document_embedding_text,
+    embed_text_for_model_async,
+    embed_texts_local,
+)
+
+
+REEMBED_BACKFILL_NAME = "reembed"
+
+
+@dataclass(frozen=True)
+class ReembedItem:
+    index: int
+    document_id: int
+    text: str
+
+
+@dataclass(frozen=True)
+class ReembedOutput:
+    item: ReembedItem
+    vector: list[float] | None
+    error: str | None
+
+
+def plan_reembedding(target_model: str = EMBEDDING_MODEL) -> ReembedPlan:
+    """Compare the serving model with ``target_model`` and say what is left to do."""
+    serving = embeddings_dao.get_serving_model()
+    embedded, documents = embeddings_dao.count_model_coverage(target_model)
+    missing = documents - embedded
+    if missing:
+        action = "embed"
+    elif serving is None or serving.name != target_model:
+        action = "promote"
+    else:
+        action = "up_to_date"
+    return ReembedPlan(
+        serving_model=serving.name if serving else None,
+        target_model=target_model,
+        documents=documents,
+        embedded=embedded,
+        missing=missing,
+        action=action,
+    )
+
+
+def reembed_corpus(
+    target_model: str = EMBEDDING_MODEL,
+    *,
+    limit: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    active_documents: int = 4,
+    resume: bool = False,
+    promote_at: float = 1.0,
+) -> ReembedResult:
+    """Embed documents missing ``target_model`` vectors and promote it once coverage allows."""
+    session = db.current_session()
+    # Register what the corpus is served from first, so target vectors are
+    # recorded beside it instead of bootstrapping as the serving model.
+    embeddings_dao.seed_serving_model()
+    session.commit()
+    plan = plan_reembedding(target_model)
+    log(
+        f"reembed serving={plan.serving_model} target={target_model} "
+        f"embedded={plan.embedded}/{plan.documents} action={plan.action}"
+    )
+
+    def apply(output: ReembedOutput, document: Document, counters: Counter) -> None:
+        if output.vector is None:
+            counters["failed"] += 1
+            log(f"{output.item.index} doc={output.item.document_id} failed: {output.error}")
+            return
+        embeddings_dao.store_document_embedding(document, output.vector, model=target_model)
+        counters["embedded"] += 1
+
+    progress = None
+    if plan.action == "embed":
+        progress = run_document_backfill(
+            BackfillSpec(
+                name=REEMBED_BACKFILL_NAME,
+                scope=backfill_scope(model=target_model),
+                fetch_page=lambda after, size: embeddings_dao.get_documents_missing_model_page(
+                    target_model,
+                    after_id=after,
+                    limit=size,
+                ),
+                build_item=lambda document, index, _link_count: ReembedItem(
+                    index=index,
+                    document_id=document.id,
+                    text=document_embedding_text(
+                        title=document.title,
+                        summary=document.summary,
+                        topics=document.topics,
+                        extracted_text=document.extracted_text,
+                    ),
+                ),
+                run_batch=lambda items: _embed_batch(items, model=target_model, active_documents=active_documents),
+                apply=apply,
+                item_document_id=lambda output: output.item.document_id,
+            item_failed=lambda output: output.vector is None,
+            ),
+            limit=limit,
+            batch_size=batch_size,
+            resume=resume,
+        )
+        plan = plan_reembedding(target_model)
+
+    promoted = False
+    coverage = plan.embedded / plan.documents if plan.documents else 0.0
+    if plan.action != "up_to_date" and plan.embedded and coverage >= promote_at and plan.serving_model != target_model:
+        embeddings_dao.promote_embedding_model(target_model)
+        session.commit()
+        promoted = True
+        log(f"reembed promoted {target_model} at coverage {coverage:.1%}; retired {plan.serving_model}")
+        plan = plan_reembedding(target_model)
+    return ReembedResult(
+        checked=progress.checked if progress else 0,
+        embedded=progress.counters["embedded"] if progress else 0,
+        failed=progress.counters["failed"] if progress else 0,
+        promoted=promoted,
+        plan=plan,
+    )
+
+
+async def _embed_batch(items: list[ReembedItem], *, model: str, active_documents: int) -> list[ReembedOutput]:
+    if model == LOCAL_EMBEDDING_MODEL:
+        vectors = embed_texts_local([item.text for item in items])
+        return [ReembedOutput(item=item, vector=vector, error=None) for item, vector in zip(items, vectors)]
+    semaphore = asyncio.Semaphore(max(1, active_documents))
+
+    async def embed(item: ReembedItem) -> ReembedOutput:
+        async with semaphore:
+            try:
+                vector = await embed_text_for_model_async(item.text, model)
+            except Exception as exc:
+                return ReembedOutput(item=item, vector=None, error=str(exc))
+            return ReembedOutput(item=item, vector=vector, error=None if vector else f"{model} returned no embedding")
+
+    return await asyncio.gather(*(embed(item) for item in items))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m iris.backfills.reembed")
+    parser.add_argument("--model", default=EMBEDDING_MODEL, help="target embedding model; defaults to IRIS_EMBEDDING_MODEL")
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--active-documents", type=int, default=4)
+    parser.add_argument("--resume", action="store_true", help="continue after the last committed batch")
+    parser.add_argument("--promote-at", type=float, default=1.0, help="coverage fraction at which the target starts serving")
+    parser.add_argument("--plan", action="store_true", help="only print the plan")
+    parser.add_argument("--seed-only", action="store_true", help="only register the model behind existing vectors")
+    args = parser.parse_args()
+
+    with db.session_scope():
+        if args.seed_only:
+            serving = embeddings_dao.seed_serving_model()
+            log(f"serving={serving.name if serving else None}")
+            return 0
+        if args.plan:
+            plan = plan_reembedding(args.model)
+            log(
+                f"serving={plan.serving_model} target={plan.target_model} documents={plan.documents} "
+                f"embedded={plan.embedded} missing={plan.missing} action={plan.action}"
+            )
+            return 0
+        result = reembed_corpus(
+            args.model,
+            limit=args.limit or None,
+            batch_size=args.batch_size,
+            active_documents=args.active_documents,
+            resume=args.resume,
+            promote_at=args.promote_at,
+        )
+        log(
+            f"checked={result.checked} embedded={result.embedded} failed={result.failed} "
+            f"promoted={result.promoted} serving={result.plan.serving_model}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,7 +7,8 @@ import argparse
 from iris.dao import db
 from iris.dao import source_profiles as profile_dao
 from iris.schemas.backfills import SourceProfileBackfillResult
-from iris.schemas.enums import SourceProfileAnalysisStatus
+from iris.services.common.config import SOURCE_PROFILE_JOB_CONCURRENCY
+from iris.services.retrieval.source_profile_jobs import enqueue_source_profile, run_source_profile_jobs
 from iris.services.retrieval.source_profiles import generate_source_profile
 
 
@@ -16,32 +17,29 @@ def log(message: str) -> None:
     print(message, flush=True)
 
 
-def backfill_source_profiles(*, limit: int | None = None, force: bool = False) -> SourceProfileBackfillResult:
-    """Generate cached profile analyses for indexed sources with fetched documents."""
+def backfill_source_profiles(
+    *,
+    limit: int | None = None,
+    force: bool = False,
+    concurrency: int = SOURCE_PROFILE_JOB_CONCURRENCY,
+) -> SourceProfileBackfillResult:
+    """Queue profile analyses for indexed sources with fetched documents and drain the queue.
+
+    Sources whose profile input is unchanged since a successful analysis are
+    skipped unless ``force`` is set.
+    """
     sources = profile_dao.get_sources_for_profile_backfill(limit=limit)
-    succeeded = 0
-    failed = 0
-    log(f"source profile backfill selected={len(sources)} force={force}")
+    log(f"source profile backfill selected={len(sources)} force={force} concurrency={max(1, concurrency)}")
     for idx, source in enumerate(sources, start=1):
-        analysis = generate_source_profile(source, force=force)
-        if analysis.status == SourceProfileAnalysisStatus.SUCCEEDED:
-            succeeded += 1
-        else:
-            failed += 1
-        log(
-            f"{idx}/{len(sources)} source={source.canonical_domain} status={analysis.status} "
-            f"display_name={analysis.display_name or 'none'}"
-        )
-        if analysis.error:
-            log(f"  error={analysis.error[:300]}")
+        enqueue_source_profile(source, force=force)
         if idx % 10 == 0:
-            db.flush()
-            log(f"progress checked={idx}/{len(sources)} succeeded={succeeded} failed={failed}")
-    db.flush()
+            log(f"progress enqueued={idx}/{len(sources)}")
+    db.commit()
+    result = run_source_profile_jobs(concurrency=concurrency)
     return SourceProfileBackfillResult(
         checked=len(sources),
-        succeeded=succeeded,
-        failed=failed,
+        succeeded=result.succeeded,
+        failed=result.failed,
         force=force,
     )
 
@@ -51,6 +49,7 @@ def main() -> int:
     parser.add_argument("--domain")
     parser.add_argument("--limit", type=int, default=0)
     parser.add_argument("--force", action="store_true")
+    parser.add_argument("--concurrency", type=int, default=SOURCE_PROFILE_JOB_CONCURRENCY)
     args = parser.parse_args()
     with db.session_scope():
         if args.domain:
@@ -66,7 +65,7 @@ def main() -> int:
             if analysis.error:
                 log(f"error={analysis.error}")
             return 0
-        result = backfill_source_profiles(limit=args.limit or None, force=args.force)
+        result = backfill_source_profiles(limit=args.limit or None, force=args.force, concurrency=args.concurrency)
         log(
             f"checked={result.checked} succeeded={result.succeeded} failed={result.failed} force={result.force}"
         )
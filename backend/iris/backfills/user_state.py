@@ -5,6 +5,7 @@ from __future__ import annotations
 from sqlalchemy import select
 
 from iris.dao import db
+from iris.dao.postings import mark_postings_changed
 from iris.dao.user_state import SYSTEM_NAMESPACE, classify_document_category, get_or_create_tag, tag_document
 from iris.models import Document, DocumentCategory, DocumentTag, TagScope
 
@@ -16,14 +17,15 @@ def backfill_document_categories(limit: int | None = None) -> int:
     if limit:
         statement = statement.limit(limit)
     documents = session.execute(statement).scalars().all()
-    changed = 0
+    changed_ids: list[int] = []
     for document in documents:
         category = classify_document_category(document)
         if category != document.category:
             document.category = category
-            changed += 1
+            changed_ids.append(document.id)
+    mark_postings_changed(changed_ids)
     session.flush()
-    return changed
+    return len(changed_ids)
 
 
 def backfill_system_tags_from_topics(limit: int | None = None) -> int:
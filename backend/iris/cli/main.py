@@ -13,6 +13,7 @@ from iris.dao import db
 from iris.dao import documents as documents_dao
 from iris.dao import maintenance as maintenance_dao
 from iris.dao import reporting as reporting_dao
+from iris.dao import source_profiles as profile_dao
 from iris.dao.db import init_db
 from iris.dao.sources import get_or_create_source
 from iris.models import (
@@ -21,22 +22,31 @@ from iris.models import (
     IndexRun,
     Source,
 )
-from iris.schemas.enums import CrawlJobStatus, IndexEventType, SourceStatus
+from iris.schemas.enums import AnalysisBatchMode, CrawlJobStatus, IndexEventType, SourceStatus
 from iris.schemas.indexing import PlannedSourceEvent, SourceFinishedEventPayload
 from iris.services.common.config import (
+    ANALYSIS_BATCH_MAX_REQUESTS,
     REQUEST_TIMEOUT_SECONDS,
+    SOURCE_CLASSIFIER_BATCH_SIZE,
+    SOURCE_CLASSIFIER_CONCURRENCY,
+    SOURCE_CLASSIFIER_PER_HOST,
+    SOURCE_PROFILE_JOB_CONCURRENCY,
     USER_AGENT,
     database_url,
 )
+from iris.services.indexing.authority import refresh_authority_scores
 from iris.services.indexing.indexer import plan_sources, autopilot
+from iris.services.ingestion.crawl_timing import CRAWL_STAGES, PIPELINE_STAGES, CrawlTimings
 from iris.services.ingestion.crawler import Crawler
 from iris.services.ingestion.document_classifier import analyze_document, classify_document
 from iris.services.ingestion.embedding import document_embedding_text, embed_text
+from iris.services.ingestion.source_bulk_classifier import classify_queued_sources
 from iris.services.ingestion.source_classifier import (
     classify_source_homepage,
     classify_source_url,
 )
 from iris.services.retrieval.search import search_documents, synthesize_answer
+from iris.services.retrieval.source_profile_jobs import enqueue_source_profile, run_source_profile_jobs
 
 
 def configure_logging(verbose: bool = False) -> None:
@@ -81,7 +91,8 @@ def cmd_crawl(args: argparse.Namespace) -> None:
             force_status=True,
         )
         source.description = classification.reason
-        job = Crawler().crawl_source(
+        crawler = Crawler()
+        job = crawler.crawl_source(
             source,
             max_pages=args.max_pages,
             max_depth=args.max_depth,
@@ -95,6 +106,10 @@ def cmd_crawl(args: argparse.Namespace) -> None:
         )
         if job.error:
             print(job.error)
+        if crawler.timings.pages:
+            _print_crawl_timings(crawler.timings)
+    if not args.skip_profiles:
+        _drain_profile_jobs(concurrency=SOURCE_PROFILE_JOB_CONCURRENCY)
 
 
 def cmd_search(args: argparse.Namespace) -> None:
@@ -146,21 +161,17 @@ def cmd_sql(args: argparse.Namespace) -> None:
 
 def cmd_classify_sources(args: argparse.Namespace) -> None:
     with db.session_scope():
-        sources = maintenance_dao.get_queued_sources(args.limit)
-        changed = 0
-        ignored = 0
-        for source in sources:
-            classification = classify_source_for_cli(source)
-            if (
-                source.status != classification.status
-                or source.description != classification.reason
-            ):
-                source.status = classification.status
-                source.description = classification.reason
-                changed += 1
-            if source.status == SourceStatus.IGNORED.value:
-                ignored += 1
-        print(f"classified={len(sources)} changed={changed} ignored={ignored}")
+        result = classify_queued_sources(
+            limit=args.limit or None,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            reclassify=args.reclassify,
+        )
+        print(
+            f"classified={result.checked} changed={result.changed} ignored={result.ignored} "
+            f"cached={result.cached} fetch_failed={result.fetch_failed}"
+        )
 
 
 def classify_source_for_cli(source: Source):
@@ -241,9 +252,10 @@ def cmd_audit_documents(args: argparse.Namespace) -> None:
         documents = maintenance_dao.get_fetched_documents(
             source_domain=args.source, limit=args.limit
         )
+        link_counts = reporting_dao.count_links_by_document([doc.id for doc in documents])
         print("samples")
         for doc in documents:
-            link_count = reporting_dao.count_document_links(doc.id)
+            link_count = link_counts[doc.id]
             classification = classify_document(
                 url=doc.url,
                 title=doc.title,
@@ -271,9 +283,10 @@ def cmd_reclassify_documents(args: argparse.Namespace) -> None:
         documents = maintenance_dao.get_fetched_documents(
             source_domain=args.source, limit=args.limit
         )
+        link_counts = reporting_dao.count_links_by_document([doc.id for doc in documents])
         changed = 0
         for doc in documents:
-            link_count = reporting_dao.count_document_links(doc.id)
+            link_count = link_counts[doc.id]
             analysis = analyze_document(
                 url=doc.url,
                 metadata_title=doc.title,
@@ -308,10 +321,19 @@ def cmd_backfill_summaries(args: argparse.Namespace) -> None:
             dry_run=args.dry_run,
             max_attempts=args.max_attempts,
             active_documents=args.active_documents,
+            batch_size=args.batch_size,
+            resume=args.resume,
         )
         print(f"checked={result.checked} changed={result.changed} failed={result.failed} dry_run={result.dry_run}")
 
 
+def cmd_analysis_batches(args: argparse.Namespace) -> None:
+    from iris.backfills.analysis_batches import run_analysis_batch_step
+
+    with db.session_scope():
+        run_analysis_batch_step(args)
+
+
 def cmd_source_priorities(args: argparse.Namespace) -> None:
     with db.session_scope():
         priorities = plan_sources(
@@ -327,6 +349,14 @@ def cmd_source_priorities(args: argparse.Namespace) -> None:
             print(f"   {item.reason}")
 
 
+def cmd_compute_authority(args: argparse.Namespace) -> None:
+    with db.session_scope():
+        results = refresh_authority_scores(force=args.force)
+    for result in results:
+        state = "unchanged" if result.skipped else f"iterations={result.iterations}"
+        print(f"{result.graph.value}: nodes={result.nodes} edges={result.edges} seeds={result.seeds} {state}")
+
+
 def cmd_autopilot(args: argparse.Namespace) -> None:
     print(
         "autopilot starting: "
@@ -360,6 +390,30 @@ def cmd_autopilot(args: argparse.Namespace) -> None:
             print(f"  [{event.event_type}] {event.message}")
             if event.payload and args.verbose_events:
                 print(f"    {event.payload[:1000]}")
+    if not args.dry_run and not args.skip_profiles:
+        _drain_profile_jobs(concurrency=SOURCE_PROFILE_JOB_CONCURRENCY)
+
+
+def cmd_profile_jobs(args: argparse.Namespace) -> None:
+    if args.enqueue_all:
+        with db.session_scope():
+            sources = profile_dao.get_sources_for_profile_backfill(limit=args.limit or None)
+            queued = sum(enqueue_source_profile(source, force=args.force).queued_at is not None for source in sources)
+            print(f"enqueued={queued} checked={len(sources)} force={args.force}")
+    _drain_profile_jobs(concurrency=args.concurrency, limit=args.limit or None)
+
+
+def _drain_profile_jobs(*, concurrency: int, limit: int | None = None) -> None:
+    with db.session_scope():
+        counts = profile_dao.count_queued_analyses()
+        if not counts["queued"] and not counts["running"]:
+            return
+        print(f"source profile jobs queued={counts['queued']} running={counts['running']} concurrency={concurrency}", flush=True)
+        result = run_source_profile_jobs(limit=limit, concurrency=concurrency)
+        print(
+            f"source profile jobs claimed={result.claimed} succeeded={result.succeeded} "
+            f"failed={result.failed} superseded={result.superseded}"
+        )
 
 
 def cmd_index_runs(args: argparse.Namespace) -> None:
@@ -416,6 +470,9 @@ def cmd_index_summary(args: argparse.Namespace) -> None:
             f"jobs={len(jobs)} crawled={run.crawled_sources} ignored={run.ignored_sources} "
             f"errors={run.errors} docs={run.documents_indexed} links={run.links_seen} discovered={run.sources_discovered}"
         )
+        timings = _run_timings_from_events(events)
+        if timings is not None and timings.pages:
+            _print_crawl_timings(timings)
         print("sources")
 
         rows = (
@@ -496,6 +553,50 @@ def _planned_sources_from_events(events: list[IndexEvent]) -> list[PlannedSource
     return []
 
 
+def _run_timings_from_events(events: list[IndexEvent]) -> CrawlTimings | None:
+    """Return the run's timing histograms, merging per-source ones for unfinished runs."""
+    merged: CrawlTimings | None = None
+    for event in events:
+        if event.event_type not in (IndexEventType.RUN_FINISHED.value, IndexEventType.SOURCE_FINISHED.value) or not event.payload:
+            continue
+        try:
+            payload = json.loads(event.payload)
+        except json.JSONDecodeError:
+            continue
+        timings = CrawlTimings.from_payload(payload.get("timings") if isinstance(payload, dict) else None)
+        if timings is None:
+            continue
+        if event.event_type == IndexEventType.RUN_FINISHED.value:
+            return timings
+        if merged is None:
+            merged = CrawlTimings()
+        merged.merge(timings)
+    return merged
+
+
+def _print_crawl_timings(timings: CrawlTimings) -> None:
+    summary = timings.summary()
+    queue_p90 = timings.stages["queue_wait"].quantile(0.9) if "queue_wait" in timings.stages else None
+    print(
+        f"throughput pages={summary['pages']} pages/sec={summary['pages_per_second']:.2f} "
+        f"llm_s/page={summary['llm_seconds_per_page']:.2f} queue_wait_s={summary['queue_wait_seconds']:.2f}"
+        + (f" queue_wait_p90<={queue_p90:g}s" if queue_p90 is not None else "")
+    )
+    print(
+        "stage s/page: "
+        + " ".join(f"{stage}={timings.stage_seconds_per_page(stage):.3f}" for stage in CRAWL_STAGES)
+    )
+    if timings.occupancy:
+        print(
+            "stage pages waiting/busy/blocked: "
+            + " ".join(
+                f"{stage}={occupancy.waiting:.1f}/{occupancy.busy:.1f}/{occupancy.blocked:.1f}"
+                for stage in PIPELINE_STAGES
+                for occupancy in [timings.mean_occupancy(stage)]
+            )
+        )
+
+
 def _finished_payloads_by_source(
     events: list[IndexEvent],
 ) -> dict[int, SourceFinishedEventPayload]:
@@ -555,6 +656,7 @@ def build_parser() -> argparse.ArgumentParser:
     crawl.add_argument("--max-documents", type=int, default=None)
     crawl.add_argument("--active-pages", type=int, default=4)
     crawl.add_argument("--skip-existing", action="store_true")
+    crawl.add_argument("--skip-profiles", action="store_true", help="leave queued source profile jobs for profile-jobs")
     crawl.set_defaults(func=cmd_crawl)
 
     search = subparsers.add_parser("search")
@@ -567,6 +669,10 @@ def build_parser() -> argparse.ArgumentParser:
 
     classify = subparsers.add_parser("classify-sources")
     classify.add_argument("--limit", type=int, default=0)
+    classify.add_argument("--batch-size", type=int, default=SOURCE_CLASSIFIER_BATCH_SIZE)
+    classify.add_argument("--concurrency", type=int, default=SOURCE_CLASSIFIER_CONCURRENCY)
+    classify.add_argument("--per-host", type=int, default=SOURCE_CLASSIFIER_PER_HOST)
+    classify.add_argument("--reclassify", action="store_true", help="include sources already classified from their homepage")
     classify.set_defaults(func=cmd_classify_sources)
 
     classify_one = subparsers.add_parser("classify-source")
@@ -604,13 +710,31 @@ def build_parser() -> argparse.ArgumentParser:
     backfill_summaries.add_argument("--dry-run", action="store_true")
     backfill_summaries.add_argument("--max-attempts", type=int, default=2)
     backfill_summaries.add_argument("--active-documents", type=int, default=4)
+    backfill_summaries.add_argument("--batch-size", type=int, default=50)
+    backfill_summaries.add_argument("--resume", action="store_true")
     backfill_summaries.set_defaults(func=cmd_backfill_summaries)
 
+    analysis_batches = subparsers.add_parser(
+        "analysis-batches", help="re-analyse documents through provider batches: prepare, submit, then collect"
+    )
+    analysis_batches.add_argument("step", choices=["prepare", "submit", "collect"])
+    analysis_batches.add_argument("--mode", choices=[mode.value for mode in AnalysisBatchMode], default=None)
+    analysis_batches.add_argument("--source")
+    analysis_batches.add_argument("--limit", type=int, default=0)
+    analysis_batches.add_argument("--all", action="store_true", help="metadata mode: include documents without suspicious metadata")
+    analysis_batches.add_argument("--max-requests", type=int, default=ANALYSIS_BATCH_MAX_REQUESTS)
+    analysis_batches.add_argument("--retry-failed", action="store_true", help="resubmit batches the provider failed")
+    analysis_batches.set_defaults(func=cmd_analysis_batches)
+
     priorities = subparsers.add_parser("source-priorities")
     priorities.add_argument("--limit", type=int, default=20)
     priorities.add_argument("--seed-domain", default=None)
     priorities.set_defaults(func=cmd_source_priorities)
 
+    authority = subparsers.add_parser("compute-authority", help="refresh personalised PageRank authority scores")
+    authority.add_argument("--force", action="store_true", help="recompute even if the link graph is unchanged")
+    authority.set_defaults(func=cmd_compute_authority)
+
     autopilot = subparsers.add_parser("autopilot")
     autopilot.add_argument("--budget-sources", type=int, default=5)
     autopilot.add_argument("--max-pages", type=int, default=40)
@@ -623,8 +747,16 @@ def build_parser() -> argparse.ArgumentParser:
     autopilot.add_argument("--seed-domain", default=None)
     autopilot.add_argument("--show-events", type=int, default=20)
     autopilot.add_argument("--verbose-events", action="store_true")
+    autopilot.add_argument("--skip-profiles", action="store_true", help="leave queued source profile jobs for profile-jobs")
     autopilot.set_defaults(func=cmd_autopilot)
 
+    profile_jobs = subparsers.add_parser("profile-jobs", help="drain the queued source profile jobs")
+    profile_jobs.add_argument("--limit", type=int, default=0)
+    profile_jobs.add_argument("--concurrency", type=int, default=SOURCE_PROFILE_JOB_CONCURRENCY)
+    profile_jobs.add_argument("--enqueue-all", action="store_true", help="queue every indexed source first")
+    profile_jobs.add_argument("--force", action="store_true", help="with --enqueue-all, regenerate unchanged profiles")
+    profile_jobs.set_defaults(func=cmd_profile_jobs)
+
     index_runs = subparsers.add_parser("index-runs")
     index_runs.add_argument("--limit", type=int, default=10)
     index_runs.set_defaults(func=cmd_index_runs)
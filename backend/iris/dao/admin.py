@@ -5,11 +5,18 @@ from __future__ import annotations
 import json
 from collections import Counter
 from collections import defaultdict
+from dataclasses import asdict
 
-from sqlalchemy import String, cast, desc, func, or_, select
+import numpy as np
+from sqlalchemy import desc, func, or_, select
 from sqlalchemy.orm import joinedload, load_only, selectinload
 
-from iris.dao import db
+from iris.dao import db, metrics
+from iris.dao import embeddings as embeddings_dao
+from iris.dao.agent import agent_message_match
+from iris.dao.documents import DocumentCard, document_card_load, get_document_cards
+from iris.dao.pool import pool_metrics
+from iris.dao.topics import document_topic_filter
 from iris.models import (
     AgentConversation,
     AgentMessage,
@@ -25,6 +32,8 @@ from iris.models import (
     UserProfile,
 )
 from iris.schemas.api import (
+    AdminAuthMetricsSchema,
+    AdminPoolMetricsSchema,
     AdminCrawlJobSchema,
     AdminIndexRunSchema,
     AdminLatestJobSchema,
@@ -40,7 +49,8 @@ from iris.schemas.api import (
 from iris.schemas.enums import AgentMessageRole, CrawlJobStatus, DocumentType, IndexEventType
 from iris.schemas.enums import SourceStatus
 from iris.schemas.indexing import SourceFinishedEventPayload
-from iris.services.ingestion.embedding import loads_embedding
+from iris.services.auth import auth_metrics
+from iris.services.ingestion.embedding import loads_embedding_array
 from iris.services.retrieval.embedding_map import EmbeddingProjection, project_embeddings
 
 
@@ -48,11 +58,12 @@ _embedding_projection_cache: dict[tuple[int, tuple[tuple[int, str | None], ...]]
 
 
 def get_health_counts() -> HealthCountsSchema:
-    """Return high-level source and document counts."""
-    session = db.current_session()
+    """Return high-level source and document counts from the metrics snapshot."""
+    snapshot = metrics.get_metrics()
     return HealthCountsSchema(
-        sources=session.scalar(select(func.count(Source.id))) or 0,
-        documents=session.scalar(select(func.count(Document.id))) or 0,
+        sources=snapshot.totals["sources"],
+        documents=snapshot.totals["documents"],
+        counts_as_of=snapshot.reconciled_at,
     )
 
 
@@ -83,7 +94,7 @@ def get_documents_page(
 ) -> tuple[list[Document], int]:
     """Return a filtered page of documents and total count."""
     session = db.current_session()
-    statement = select(Document).options(joinedload(Document.source)).order_by(Document.last_crawled_at.desc())
+    statement = select(Document).options(document_card_load(), joinedload(Document.source)).order_by(Document.last_crawled_at.desc())
     if source_id:
         statement = statement.where(Document.source_id == source_id)
     if document_type and document_type != "all":
@@ -98,7 +109,7 @@ def get_documents_page(
             | Document.extracted_text.ilike(pattern)
         )
     for value in (item.strip().lower() for item in tag_filters or [] if item.strip()):
-        statement = statement.where(func.lower(cast(Document.topics, String)).like(f'%"{value}"%'))
+        statement = statement.where(document_topic_filter(value))
     if crawl_job_id:
         job = session.get(CrawlJob, crawl_job_id)
         if not job:
@@ -115,41 +126,16 @@ def get_documents_page(
 
 
 def get_admin_overview() -> AdminOverviewSchema:
-    """Return aggregate counts for the admin overview."""
-    session = db.current_session()
-    source_statuses = dict(session.execute(select(Source.status, func.count(Source.id)).group_by(Source.status)).all())
-    document_types = {
-        f"{doc_type}/{status}": count
-        for doc_type, status, count in session.execute(
-            select(Document.document_type, Document.crawl_status, func.count(Document.id)).group_by(
-                Document.document_type, Document.crawl_status
-            )
-        ).all()
-    }
-    totals = {
-        "users": session.scalar(select(func.count(User.id))) or 0,
-        "conversations": session.scalar(select(func.count(AgentConversation.id))) or 0,
-        "queries": session.scalar(
-            select(func.count(AgentMessage.id)).where(AgentMessage.role == AgentMessageRole.USER)
-        ) or 0,
-        "saved_documents": session.scalar(
-            select(func.count(UserDocumentMapping.id)).where(
-                or_(
-                    UserDocumentMapping.bookshelf_status.is_not(None),
-                    UserDocumentMapping.favorited_at.is_not(None),
-                    UserDocumentMapping.note.is_not(None),
-                )
-            )
-        ) or 0,
-        "sources": session.scalar(select(func.count(Source.id))) or 0,
-        "documents": session.scalar(select(func.count(Document.id))) or 0,
-        "essay_documents": session.scalar(select(func.count(Document.id)).where(Document.document_type == DocumentType.ESSAY.value)) or 0,
-        "links": session.scalar(select(func.count(Link.id))) or 0,
-        "resolved_links": session.scalar(select(func.count(Link.id)).where(Link.target_document_id.is_not(None))) or 0,
-        "crawl_jobs": session.scalar(select(func.count(CrawlJob.id))) or 0,
-        "index_runs": session.scalar(select(func.count(IndexRun.id))) or 0,
-    }
-    return AdminOverviewSchema(totals=totals, source_statuses=source_statuses, document_types=document_types)
+    """Return aggregate counts for the admin overview from the metrics snapshot."""
+    snapshot = metrics.get_metrics()
+    return AdminOverviewSchema(
+        totals=snapshot.totals,
+        source_statuses=snapshot.source_statuses,
+        document_types=snapshot.document_types,
+        counts_as_of=snapshot.reconciled_at,
+        auth=AdminAuthMetricsSchema(**asdict(auth_metrics())),
+        pools=[AdminPoolMetricsSchema(**asdict(pool)) for pool in pool_metrics()],
+    )
 
 
 def get_admin_queries_page(
@@ -165,19 +151,23 @@ def get_admin_queries_page(
         .where(AgentMessage.role == AgentMessageRole.USER)
         .order_by(AgentMessage.created_at.desc(), AgentMessage.id.desc())
     )
-    if q:
+    if q and q.strip():
         pattern = f"%{q.strip()}%"
-        statement = statement.where(
-            AgentMessage.content.ilike(pattern)
-            | User.email.ilike(pattern)
-            | UserProfile.username.ilike(pattern)
-        )
+        # Message content goes through the full-text index; only the small user tables use ILIKE.
+        matches = [User.email.ilike(pattern), UserProfile.username.ilike(pattern)]
+        content_match = agent_message_match(q.strip())
+        if content_match is not None:
+            matches.append(content_match)
+        statement = statement.where(or_(*matches))
     if user_id is not None:
         statement = statement.where(User.id == user_id)
-    total = count_statement(statement)
-    rows = session.execute(
-        statement.limit(clamped_limit(limit)).offset(max(offset, 0))
+    page_offset = max(offset, 0)
+    # The window count returns the total with the page instead of a second full scan.
+    counted = session.execute(
+        statement.add_columns(func.count().over().label("total")).limit(clamped_limit(limit)).offset(page_offset)
     ).all()
+    rows = [(message, conversation, user, username) for message, conversation, user, username, _total in counted]
+    total = counted[0].total if counted else (count_statement(statement) if page_offset else 0)
 
     conversation_ids = {conversation.id for _message, conversation, _user, _username in rows}
     assistant_messages = (
@@ -329,17 +319,20 @@ def get_embedding_map(*, limit: int, source_id: int | None = None) -> EmbeddingM
         statement = statement.where(Document.source_id == source_id)
     documents = session.execute(statement.limit(normalized_limit)).scalars().all()
 
-    loaded: list[tuple[Document, list[float]]] = []
+    loaded: list[tuple[Document, np.ndarray]] = []
     for document in documents:
         try:
-            vector = loads_embedding(document.embedding_vector)
+            vector = loads_embedding_array(document.embedding_vector)
         except (TypeError, ValueError, json.JSONDecodeError):
             continue
-        if any(value != 0.0 for value in vector):
+        if vector.any():
             loaded.append((document, vector))
 
+    # The document mirror only holds serving-model vectors; rows written before
+    # the registry existed may still differ, so prefer the serving width.
+    serving = embeddings_dao.get_serving_model()
     dimension_counts = Counter(len(vector) for _, vector in loaded)
-    dimensions = dimension_counts.most_common(1)[0][0] if dimension_counts else 0
+    dimensions = serving.dimensions if serving else dimension_counts.most_common(1)[0][0] if dimension_counts else 0
     projected_documents = [document for document, vector in loaded if len(vector) == dimensions]
     vectors = [vector for _, vector in loaded if len(vector) == dimensions]
     cache_key = (dimensions, tuple((document.id, document.content_hash) for document in projected_documents))
@@ -616,7 +609,7 @@ def get_document_detail(document_id: int) -> tuple[Document | None, list[Link],
     return document, outgoing, incoming
 
 
-def get_graph_rows(document_id: int | None = None, *, limit: int = 120) -> tuple[list[Document], list[Link]]:
+def get_graph_rows(document_id: int | None = None, *, limit: int = 120) -> tuple[list[DocumentCard], list[Link]]:
     """Return graph documents and links for one document or a default sample."""
     session = db.current_session()
     if document_id:
@@ -638,10 +631,7 @@ def get_graph_rows(document_id: int | None = None, *, limit: int = 120) -> tuple
         ).scalars().all()
         document_ids = {link.source_document_id for link in links}
         document_ids.update(link.target_document_id for link in links if link.target_document_id)
-    documents = session.execute(
-        select(Document).options(joinedload(Document.source)).where(Document.id.in_(document_ids))
-    ).scalars().all()
-    return documents, links
+    return get_document_cards(document_ids), links
 
 
 def get_source_graph_rows(
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from sqlalchemy import desc, exists, or_, select, text
+import re
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import and_, desc, func, literal_column, or_, select, text
+from sqlalchemy.orm import selectinload
 
 from iris.dao import db
 from iris.dao.user_state import get_or_create_local_user
-from iris.models import AgentConversation, AgentMessage, AgentMessageRole, AgentSearchResult, User
+from iris.models import AgentConversation, AgentMessage, AgentMessageRole, AgentSearchResult, Document, User
 from iris.schemas.retrieval import AgentChatResult
+from iris.services.retrieval.conversation_context import ContextTurn, fold_turns, render_context, render_turn
 from iris.services.common.langfuse_tracing import agent_conversation_session_id, agent_trace_metadata, agent_user_id
 from iris.services.retrieval.search import agentic_chat
 
@@ -108,55 +114,90 @@ def finish_agent_chat(conversation: AgentConversation, result: AgentChatResult)
 
     conversation.updated_at = assistant_message.created_at
     session.flush()
+    refresh_conversation_context(conversation)
     return assistant_message
 
 
+def conversation_context(conversation: AgentConversation, *, before_message_id: int | None = None) -> str:
+    """Return the bounded agent context for messages before ``before_message_id``."""
+    refresh_conversation_context(conversation, before_message_id=before_message_id)
+    turns = [ContextTurn.from_payload(turn) for turn in conversation.context_turns or []]
+    return render_context(conversation.context_summary, turns)
+
+
+def refresh_conversation_context(conversation: AgentConversation, *, before_message_id: int | None = None) -> None:
+    """Fold messages newer than the stored context into its summary and recent window.
+
+    Only unfolded messages are loaded, with their cited documents and sources in
+    the same batch, so a normal turn touches just its own messages. Conversations
+    created before the stored context existed are folded in full once.
+    """
+    session = db.current_session()
+    query = (
+        select(AgentMessage)
+        .where(
+            AgentMessage.conversation_id == conversation.id,
+            AgentMessage.id > (conversation.context_message_id or 0),
+        )
+        .options(selectinload(AgentMessage.results).joinedload(AgentSearchResult.document).joinedload(Document.source))
+        .order_by(AgentMessage.id)
+    )
+    if before_message_id is not None:
+        query = query.where(AgentMessage.id < before_message_id)
+    messages = session.execute(query).scalars().all()
+    if not messages:
+        return
+    turns = [ContextTurn.from_payload(turn) for turn in conversation.context_turns or []]
+    summary, turns = fold_turns(conversation.context_summary, turns, [render_turn(message) for message in messages])
+    conversation.context_summary = summary
+    conversation.context_turns = [turn.as_payload() for turn in turns]
+    conversation.context_message_id = messages[-1].id
+    session.flush()
+
+
+def get_agent_message(conversation: AgentConversation, message_id: int) -> AgentMessage | None:
+    session = db.current_session()
+    message = session.get(AgentMessage, message_id)
+    return message if message is not None and message.conversation_id == conversation.id else None
+
+
+@dataclass(frozen=True)
+class AgentConversationPage:
+    """One page of conversations plus the keyset cursor for the next page."""
+
+    conversations: list[AgentConversation]
+    next_cursor: str | None
+
+
 def list_agent_conversations(
     limit: int = 30,
     offset: int = 0,
     q: str | None = None,
     *,
     user: User | None = None,
-) -> list[AgentConversation]:
-    session = db.current_session()
+    cursor: str | None = None,
+) -> AgentConversationPage:
+    """Return recent conversations, or conversations ranked by a full-text match on ``q``.
+
+    ``cursor`` continues after the last row of a previous page and takes
+    precedence over ``offset``. A malformed cursor raises ``ValueError``.
+    """
     user = user or get_or_create_local_user()
     page_limit = max(1, min(limit, 100))
-    page_offset = max(offset, 0)
+    page_offset = 0 if cursor else max(offset, 0)
     normalized_query = " ".join((q or "").split())
-    if normalized_query and session.bind and session.bind.dialect.name == "postgresql":
-        rows = session.execute(
-            text(
-                """
-                SELECT c.id
-                FROM agent_conversations c
-                WHERE c.user_id = :user_id
-                  AND to_tsvector('simple', coalesce(c.title, '') || ' ' || coalesce((
-                    SELECT string_agg(m.content, ' ')
-                    FROM agent_messages m
-                    WHERE m.conversation_id = c.id
-                  ), '')) @@ websearch_to_tsquery('simple', :q)
-                ORDER BY c.updated_at DESC, c.id DESC
-                LIMIT :limit OFFSET :offset
-                """
-            ),
-            {"user_id": user.id, "q": normalized_query, "limit": page_limit, "offset": page_offset},
-        ).all()
-        ids = [row.id for row in rows]
-        if not ids:
-            return []
-        conversations = session.execute(select(AgentConversation).where(AgentConversation.id.in_(ids))).scalars().all()
-        by_id = {conversation.id: conversation for conversation in conversations}
-        return [by_id[id_] for id_ in ids if id_ in by_id]
+    if normalized_query:
+        return _search_agent_conversations(normalized_query, user.id, page_limit, page_offset, cursor)
 
+    session = db.current_session()
     query = select(AgentConversation).where(AgentConversation.user_id == user.id)
-    if normalized_query:
-        pattern = f"%{normalized_query.lower()}%"
+    if cursor:
+        updated_at, after_id = _parse_cursor(cursor)
+        after = datetime.fromisoformat(updated_at)
         query = query.where(
             or_(
-                AgentConversation.title.ilike(pattern),
-                exists()
-                .where(AgentMessage.conversation_id == AgentConversation.id)
-                .where(AgentMessage.content.ilike(pattern)),
+                AgentConversation.updated_at < after,
+                and_(AgentConversation.updated_at == after, AgentConversation.id < after_id),
             )
         )
     conversations = list(
@@ -167,7 +208,120 @@ def list_agent_conversations(
             .offset(page_offset)
         ).scalars()
     )
-    return conversations
+    next_cursor = None
+    if len(conversations) == page_limit:
+        last = conversations[-1]
+        next_cursor = _format_cursor(last.updated_at.isoformat(), last.id)
+    return AgentConversationPage(conversations=conversations, next_cursor=next_cursor)
+
+
+def _search_agent_conversations(
+    query: str,
+    user_id: int,
+    limit: int,
+    offset: int,
+    cursor: str | None,
+) -> AgentConversationPage:
+    session = db.current_session()
+    dialect = session.bind.dialect.name if session.bind else ""
+    params: dict[str, object] = {"user_id": user_id, "limit": limit, "offset": offset}
+    if dialect == "postgresql":
+        params["q"] = query
+        ranked = """
+            SELECT c.id, ts_rank_cd(c.search_vector, query.tsquery) AS rank
+            FROM agent_conversations c, websearch_to_tsquery('simple', :q) AS query(tsquery)
+            WHERE c.user_id = :user_id AND c.search_vector @@ query.tsquery
+        """
+    else:
+        params["q"] = fts5_query(query)
+        if not params["q"]:
+            return AgentConversationPage(conversations=[], next_cursor=None)
+        # bm25() is lower for better matches; title hits count double.
+        ranked = """
+            SELECT c.id, max(hits.score) AS rank
+            FROM (
+                SELECT m.conversation_id AS conversation_id, -bm25(agent_messages_fts) AS score
+                FROM agent_messages_fts
+                JOIN agent_messages m ON m.id = agent_messages_fts.rowid
+                WHERE agent_messages_fts MATCH :q
+                UNION ALL
+                SELECT agent_conversations_fts.rowid, -2 * bm25(agent_conversations_fts)
+                FROM agent_conversations_fts
+                WHERE agent_conversations_fts MATCH :q
+            ) hits
+            JOIN agent_conversations c ON c.id = hits.conversation_id
+            WHERE c.user_id = :user_id
+            GROUP BY c.id
+        """
+    after = ""
+    if cursor:
+        rank, after_id = _parse_cursor(cursor)
+        params.update(after_rank=float(rank), after_id=after_id)
+        after = "WHERE ranked.rank < :after_rank OR (ranked.rank = :after_rank AND ranked.id < :after_id)"
+    rows = session.execute(
+        text(
+            f"""
+            SELECT ranked.id, ranked.rank
+            FROM ({ranked}) ranked
+            {after}
+            ORDER BY ranked.rank DESC, ranked.id DESC
+            LIMIT :limit OFFSET :offset
+            """
+        ),
+        params,
+    ).all()
+    if not rows:
+        return AgentConversationPage(conversations=[], next_cursor=None)
+    ids = [row.id for row in rows]
+    conversations = session.execute(select(AgentConversation).where(AgentConversation.id.in_(ids))).scalars().all()
+    by_id = {conversation.id: conversation for conversation in conversations}
+    next_cursor = _format_cursor(repr(float(rows[-1].rank)), rows[-1].id) if len(rows) == limit else None
+    return AgentConversationPage(conversations=[by_id[id_] for id_ in ids if id_ in by_id], next_cursor=next_cursor)
+
+
+def agent_message_match(query: str):
+    """Return a clause matching agent messages whose content matches ``query``, or ``None``."""
+    session = db.current_session()
+    if session.bind is not None and session.bind.dialect.name == "postgresql":
+        return text("agent_messages.search_vector @@ websearch_to_tsquery('simple', :message_query)").bindparams(
+            message_query=query
+        )
+    match = fts5_query(query)
+    if not match:
+        return None
+    return AgentMessage.id.in_(
+        select(literal_column("rowid"))
+        .select_from(text("agent_messages_fts"))
+        .where(text("agent_messages_fts MATCH :message_query").bindparams(message_query=match))
+    )
+
+
+def fts5_query(query: str) -> str:
+    """Quote each word of a free-text query as an FTS5 prefix term; all terms must match."""
+    return " ".join(f'"{term}"*' for term in re.findall(r"\w+", query))
+
+
+def count_agent_messages(conversation_ids: list[int]) -> dict[int, int]:
+    if not conversation_ids:
+        return {}
+    session = db.current_session()
+    rows = session.execute(
+        select(AgentMessage.conversation_id, func.count())
+        .where(AgentMessage.conversation_id.in_(conversation_ids))
+        .group_by(AgentMessage.conversation_id)
+    ).all()
+    return {conversation_id: count for conversation_id, count in rows}
+
+
+def _format_cursor(key: str, row_id: int) -> str:
+    return f"{key}|{row_id}"
+
+
+def _parse_cursor(cursor: str) -> tuple[str, int]:
+    key, separator, row_id = cursor.rpartition("|")
+    if not separator or not key or not row_id.isdigit():
+        raise ValueError(f"invalid conversation cursor: {cursor!r}")
+    return key, int(row_id)
 
 
 def get_agent_conversation(conversation_id: int, *, user: User | None = None) -> AgentConversation | None:
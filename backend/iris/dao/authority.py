@@ -0,0 +1,140 @@
+"""Link-graph reads and authority score storage for the PageRank job."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+from sqlalchemy import delete, distinct, func, insert, select
+from sqlalchemy.orm import aliased
+
+from iris.dao import db
+from iris.models import AuthorityRun, Document, DocumentAuthority, Link, SourceAuthority, UserDocumentMapping
+from iris.models.sqla import utcnow
+from iris.schemas.enums import AuthorityGraph, CrawlStatus, DocumentType
+
+INSERT_BATCH_SIZE = 5000
+
+_SCORE_MODELS = {
+    AuthorityGraph.SOURCES: (SourceAuthority, SourceAuthority.source_id),
+    AuthorityGraph.DOCUMENTS: (DocumentAuthority, DocumentAuthority.document_id),
+}
+
+
+def graph_fingerprint() -> str:
+    """Summarize the link graph and favourite seeds cheaply enough to detect changes."""
+    session = db.current_session()
+    links = session.execute(
+        select(
+            func.count(Link.id),
+            func.coalesce(func.max(Link.id), 0),
+            func.count(Link.target_source_id),
+            func.count(Link.target_document_id),
+        )
+    ).one()
+    essays = session.scalar(
+        select(func.count(Document.id))
+        .where(Document.document_type == DocumentType.ESSAY.value)
+        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
+    )
+    seeds = session.execute(
+        select(func.count(UserDocumentMapping.id), func.coalesce(func.sum(UserDocumentMapping.document_id), 0)).where(
+            UserDocumentMapping.favorited_at.is_not(None)
+        )
+    ).one()
+    return f"links={':'.join(str(value) for value in links)};essays={essays};seeds={seeds[0]}:{seeds[1]}"
+
+
+def get_latest_authority_run(graph: AuthorityGraph) -> AuthorityRun | None:
+    session = db.current_session()
+    return session.execute(
+        select(AuthorityRun)
+        .where(AuthorityRun.graph == graph)
+        .order_by(AuthorityRun.computed_at.desc(), AuthorityRun.id.desc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def add_authority_run(run: AuthorityRun) -> None:
+    session = db.current_session()
+    session.add(run)
+    session.flush()
+
+
+def get_source_link_edges() -> list[tuple[int, int, int]]:
+    """Return ``(from_source_id, to_source_id, linking_documents)`` across fetched essays."""
+    session = db.current_session()
+    rows = session.execute(
+        select(Document.source_id, Link.target_source_id, func.count(distinct(Link.source_document_id)))
+        .join(Document, Link.source_document_id == Document.id)
+        .where(Link.target_source_id.is_not(None))
+        .where(Link.target_source_id != Document.source_id)
+        .where(Document.document_type == DocumentType.ESSAY.value)
+        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
+        .group_by(Document.source_id, Link.target_source_id)
+    ).all()
+    return [(int(source_id), int(target_id), int(count)) for source_id, target_id, count in rows]
+
+
+def get_document_link_edges() -> list[tuple[int, int]]:
+    """Return distinct ``(from_document_id, to_document_id)`` links between fetched essays."""
+    session = db.current_session()
+    target = aliased(Document)
+    rows = session.execute(
+        select(Link.source_document_id, Link.target_document_id)
+        .join(Document, Link.source_document_id == Document.id)
+        .join(target, Link.target_document_id == target.id)
+        .where(Link.target_document_id != Link.source_document_id)
+        .where(Document.document_type == DocumentType.ESSAY.value)
+        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
+        .where(target.document_type == DocumentType.ESSAY.value)
+        .where(target.crawl_status == CrawlStatus.FETCHED.value)
+        .distinct()
+    ).all()
+    return [(int(source_id), int(target_id)) for source_id, target_id in rows]
+
+
+def get_favourite_seeds() -> tuple[dict[int, int], dict[int, int]]:
+    """Return favourite counts keyed by source id and by document id, across all users."""
+    session = db.current_session()
+    rows = session.execute(
+        select(Document.source_id, UserDocumentMapping.document_id, func.count(UserDocumentMapping.id))
+        .join(Document, UserDocumentMapping.document_id == Document.id)
+        .where(UserDocumentMapping.favorited_at.is_not(None))
+        .group_by(Document.source_id, UserDocumentMapping.document_id)
+    ).all()
+    sources: dict[int, int] = {}
+    documents: dict[int, int] = {}
+    for source_id, document_id, count in rows:
+        sources[int(source_id)] = sources.get(int(source_id), 0) + int(count)
+        documents[int(document_id)] = int(count)
+    return sources, documents
+
+
+def get_authority_scores(graph: AuthorityGraph) -> dict[int, float]:
+    session = db.current_session()
+    model, key = _SCORE_MODELS[graph]
+    return {int(node_id): float(score) for node_id, score in session.execute(select(key, model.score)).all()}
+
+
+def replace_authority_scores(graph: AuthorityGraph, scores: Mapping[int, float]) -> None:
+    """Swap the stored scores for ``graph`` for a freshly computed set."""
+    session = db.current_session()
+    model, key = _SCORE_MODELS[graph]
+    session.execute(delete(model))
+    computed_at = utcnow()
+    rows = [{key.key: node_id, "score": score, "computed_at": computed_at} for node_id, score in scores.items()]
+    for start in range(0, len(rows), INSERT_BATCH_SIZE):
+        session.execute(insert(model), rows[start : start + INSERT_BATCH_SIZE])
+    session.flush()
+
+
+def get_document_authority(document_ids: list[int]) -> dict[int, float]:
+    if not document_ids:
+        return {}
+    session = db.current_session()
+    rows = session.execute(
+        select(DocumentAuthority.document_id, DocumentAuthority.score).where(
+            DocumentAuthority.document_id.in_(document_ids)
+        )
+    ).all()
+    return {int(document_id): float(score) for document_id, score in rows}
@@ -0,0 +1,86 @@
+"""DAO helpers for resumable backfill checkpoints and provider analysis batches."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import func, select
+
+from iris.dao import db
+from iris.models import AnalysisBatch, AnalysisBatchMode, AnalysisBatchStatus, BackfillCheckpoint
+from iris.models.sqla import utcnow
+
+
+def get_backfill_checkpoint(name: str, scope: str) -> BackfillCheckpoint | None:
+    """Return the checkpoint for one backfill name and filter scope."""
+    session = db.current_session()
+    return session.execute(
+        select(BackfillCheckpoint).where(BackfillCheckpoint.name == name, BackfillCheckpoint.scope == scope)
+    ).scalar_one_or_none()
+
+
+def start_backfill_checkpoint(name: str, scope: str, *, resume: bool) -> BackfillCheckpoint:
+    """Return a checkpoint to run against, continuing the previous one when ``resume`` is set."""
+    session = db.current_session()
+    checkpoint = get_backfill_checkpoint(name, scope)
+    if checkpoint is None:
+        checkpoint = BackfillCheckpoint(name=name, scope=scope, last_document_id=0, counters={})
+        session.add(checkpoint)
+    elif not resume:
+        checkpoint.started_at = utcnow()
+        checkpoint.last_document_id = 0
+        checkpoint.counters = {}
+    checkpoint.finished_at = None
+    session.flush()
+    return checkpoint
+
+
+def advance_backfill_checkpoint(checkpoint: BackfillCheckpoint, *, last_document_id: int, counters: dict[str, int]) -> None:
+    """Record that every document up to ``last_document_id`` has been handled."""
+    checkpoint.last_document_id = max(checkpoint.last_document_id, last_document_id)
+    merged = dict(checkpoint.counters or {})
+    for key, value in counters.items():
+        merged[key] = merged.get(key, 0) + value
+    checkpoint.counters = merged
+    checkpoint.updated_at = utcnow()
+
+
+def finish_backfill_checkpoint(checkpoint: BackfillCheckpoint) -> None:
+    """Mark a checkpointed backfill as having reached the end of its selection."""
+    checkpoint.finished_at = utcnow()
+    checkpoint.updated_at = checkpoint.finished_at
+
+
+def add_analysis_batch(batch: AnalysisBatch) -> AnalysisBatch:
+    """Persist a prepared analysis batch and assign its id."""
+    session = db.current_session()
+    session.add(batch)
+    session.flush()
+    return batch
+
+
+def get_analysis_batch_resume_id(mode: AnalysisBatchMode, scope: str) -> int:
+    """Return the last document id already covered by a prepared batch for ``mode`` and ``scope``."""
+    session = db.current_session()
+    return (
+        session.scalar(
+            select(func.max(AnalysisBatch.last_document_id)).where(
+                AnalysisBatch.mode == mode,
+                AnalysisBatch.scope == scope,
+            )
+        )
+        or 0
+    )
+
+
+def get_analysis_batches(
+    statuses: Iterable[AnalysisBatchStatus],
+    *,
+    mode: AnalysisBatchMode | None = None,
+) -> list[AnalysisBatch]:
+    """Return analysis batches in the given states, oldest first."""
+    session = db.current_session()
+    statement = select(AnalysisBatch).where(AnalysisBatch.status.in_(list(statuses)))
+    if mode is not None:
+        statement = statement.where(AnalysisBatch.mode == mode)
+    return session.execute(statement.order_by(AnalysisBatch.id.asc())).scalars().all()
@@ -9,7 +9,8 @@ from sqlalchemy import delete, func, select
 from sqlalchemy.orm import joinedload
 
 from iris.dao import db
-from iris.dao.documents import upsert_document
+from iris.dao.documents import document_card_load, upsert_document
+from iris.dao.postings import mark_postings_changed
 from iris.dao.sources import get_or_create_source
 from iris.dao.user_state import get_or_create_tag, get_or_create_user_document_mapping, tag_document
 from iris.models import (
@@ -51,7 +52,7 @@ def list_entries(
     session = db.current_session()
     statement = (
         select(UserDocumentMapping)
-        .options(joinedload(UserDocumentMapping.document).joinedload(Document.source))
+        .options(joinedload(UserDocumentMapping.document).options(document_card_load(), joinedload(Document.source)))
         .where(UserDocumentMapping.user_id == user.id)
     )
     if status == BookshelfStatus.ARCHIVED:
@@ -95,7 +96,7 @@ def favorite_entries(user: User, *, limit: int = 100, offset: int = 0) -> tuple[
     session = db.current_session()
     statement = (
         select(UserDocumentMapping)
-        .options(joinedload(UserDocumentMapping.document).joinedload(Document.source))
+        .options(joinedload(UserDocumentMapping.document).options(document_card_load(), joinedload(Document.source)))
         .where(UserDocumentMapping.user_id == user.id)
         .where(UserDocumentMapping.favorited_at.is_not(None))
         .order_by(UserDocumentMapping.favorited_at.desc(), UserDocumentMapping.id.desc())
@@ -228,6 +229,7 @@ def replace_user_tags(user: User, document: Document, names: list[str]) -> None:
             DocumentTag.assignment_namespace == namespace,
         )
     )
+    mark_postings_changed([document.id])
     seen: set[str] = set()
     for name in names:
         cleaned = name.strip()
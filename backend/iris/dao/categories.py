@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable
 
 from sqlalchemy import select, update
 
 from iris.dao import db
+from iris.dao.postings import mark_postings_changed
 from iris.models import Category, Document, DocumentCategoryAssignment
 from iris.schemas.categories import SeedCategory
 
@@ -181,6 +183,24 @@ def get_or_create_category(
     return category
 
 
+def ensure_categories(slugs_or_names: Iterable[str]) -> dict[str, Category]:
+    """Create any missing categories with one ``INSERT ... ON CONFLICT DO NOTHING`` and map each input to its row."""
+    session = db.current_session()
+    slugs = {value: slugify_category(value) for value in slugs_or_names}
+    if not slugs:
+        return {}
+    session.execute(
+        db.upsert_insert(Category)
+        .values([{"slug": slug, "name": slug.title(), "status": "active"} for slug in sorted(set(slugs.values()))])
+        .on_conflict_do_nothing(index_elements=[Category.slug])
+    )
+    categories = {
+        category.slug: category
+        for category in session.execute(select(Category).where(Category.slug.in_(set(slugs.values())))).scalars()
+    }
+    return {value: categories[slug] for value, slug in slugs.items()}
+
+
 def assign_category(
     document: Document,
     category: Category,
@@ -209,6 +229,7 @@ def assign_category(
             category_id=category.id,
         )
         session.add(assignment)
+        mark_postings_changed([document.id])
     assignment.is_primary = 1 if is_primary else 0
     assignment.assigned_by = assigned_by
     session.flush()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime, timezone
 
 from sqlalchemy import select
@@ -9,6 +10,7 @@ from sqlalchemy import select
 from iris.dao import db
 from iris.models import CrawlJob, Document, Source
 from iris.schemas.enums import CrawlJobStatus, SourceStatus
+from iris.services.common.url_utils import http_scheme_variants, url_hash, url_key
 
 
 def create_crawl_job(source: Source) -> CrawlJob:
@@ -41,36 +43,44 @@ def finish_crawl_job(job: CrawlJob) -> None:
     db.current_session().flush()
 
 
-def get_crawl_job(job_id: int) -> CrawlJob | None:
-    """Fetch a crawl job by id."""
-    return db.current_session().get(CrawlJob, job_id)
-
-
-def get_source_by_domain(domain: str) -> Source | None:
-    """Find a source row by canonical domain."""
-    return db.current_session().execute(select(Source).where(Source.canonical_domain == domain)).scalar_one_or_none()
-
-
 def get_document_by_url(url: str) -> Document | None:
     """Find a document by canonical URL."""
-    return db.current_session().execute(select(Document).where(Document.url == url)).scalar_one_or_none()
+    return db.current_session().execute(
+        select(Document).where(Document.url_hash == url_hash(url)).where(Document.url == url)
+    ).scalar_one_or_none()
 
 
 def get_document_by_urls(urls: set[str]) -> Document | None:
     """Find the first document matching any URL in a set."""
-    return db.current_session().execute(select(Document).where(Document.url.in_(urls))).scalar_one_or_none()
-
-
-def set_document_link_targets(document: Document) -> None:
-    """Resolve a document's outgoing links to known source/document rows."""
-    for link in document.outgoing_links:
-        target_document = get_document_by_url(link.target_url)
-        if target_document:
-            link.target_document_id = target_document.id
-            link.target_source_id = target_document.source_id
-            continue
-        if link.target_domain:
-            target_source = get_source_by_domain(link.target_domain)
-            if target_source:
-                link.target_source_id = target_source.id
-    db.current_session().flush()
+    return db.current_session().execute(
+        select(Document)
+        .where(Document.url_hash.in_({url_hash(url) for url in urls}))
+        .where(Document.url.in_(urls))
+        .order_by(Document.id.asc())
+        .limit(1)
+    ).scalar_one_or_none()
+
+
+def get_documents_by_urls(urls: Iterable[str]) -> dict[str, Document]:
+    """Map normalised URLs to their documents, accepting the other http/https spelling.
+
+    An exact spelling wins when documents exist under both schemes.
+    """
+    spellings = {url: http_scheme_variants(url) for url in set(urls)}
+    candidates = set().union(*spellings.values())
+    if not candidates:
+        return {}
+    documents = db.current_session().execute(
+        select(Document)
+        .where(Document.url_key.in_({url_key(url) for url in candidates}))
+        .where(Document.url.in_(candidates))
+        .order_by(Document.id.asc())
+    ).scalars()
+    by_url = {document.url: document for document in documents}
+    found: dict[str, Document] = {}
+    for url, variants in spellings.items():
+        document = by_url.get(url) or next((by_url[variant] for variant in sorted(variants) if variant in by_url), None)
+        if document is not None:
+            found[url] = document
+    return found
+
@@ -2,16 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
 from contextvars import ContextVar
 from contextlib import contextmanager
 from threading import local
-from typing import Iterator
+from typing import Callable, Iterator, TypeVar
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy import inspect, text
-from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
-
-from iris.services.common.config import database_url
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import DeclarativeBase, Session, SessionTransaction, sessionmaker
+
+from iris.dao.pool import TimedQueuePool, track_pool
+from iris.services.common.config import (
+    DATABASE_MAX_OVERFLOW,
+    DATABASE_POOL_PRE_PING,
+    DATABASE_POOL_RECYCLE_SECONDS,
+    DATABASE_POOL_SIZE,
+    DATABASE_POOL_TIMEOUT_SECONDS,
+    DATABASE_READ_STATEMENT_TIMEOUT_MS,
+    DATABASE_STATEMENT_TIMEOUT_MS,
+    database_read_url,
+    database_url,
+)
 
 
 class Base(DeclarativeBase):
@@ -20,10 +34,46 @@ class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(database_url(), future=True)
+class ReadOnlySessionError(RuntimeError):
+    """Raised when a session opened by ``read_session_scope`` tries to flush writes."""
+
+
+def create_iris_engine(url: str, *, name: str, statement_timeout_ms: int) -> Engine:
+    """Create an engine with the configured pool sizing, pre-ping and statement timeout.
+
+    Server databases get a ``TimedQueuePool`` reported under ``name``; SQLite
+    keeps SQLAlchemy's default pool, which its locking makes the better fit.
+    """
+    options: dict[str, object] = {"future": True, "pool_pre_ping": DATABASE_POOL_PRE_PING}
+    backend = make_url(url).get_backend_name()
+    if backend != "sqlite":
+        options.update(
+            poolclass=TimedQueuePool,
+            pool_size=DATABASE_POOL_SIZE,
+            max_overflow=DATABASE_MAX_OVERFLOW,
+            pool_timeout=DATABASE_POOL_TIMEOUT_SECONDS,
+            pool_recycle=DATABASE_POOL_RECYCLE_SECONDS,
+            pool_logging_name=name,
+        )
+    if backend == "postgresql" and statement_timeout_ms:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout_ms}"}
+    created = create_engine(url, **options)
+    track_pool(name, created.pool)
+    return created
+
+
+engine = create_iris_engine(database_url(), name="primary", statement_timeout_ms=DATABASE_STATEMENT_TIMEOUT_MS)
+# None routes read sessions to whatever engine SessionLocal is bound to.
+read_engine: Engine | None = (
+    create_iris_engine(read_url, name="read", statement_timeout_ms=DATABASE_READ_STATEMENT_TIMEOUT_MS)
+    if (read_url := database_read_url())
+    else None
+)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False, future=True)
+_read_only_binds: dict[Engine, Engine] = {}
 _session_var: ContextVar[Session | None] = ContextVar("iris_current_session", default=None)
 _session_state = local()
+_T = TypeVar("_T")
 
 
 def init_db() -> None:
@@ -34,7 +84,7 @@ def init_db() -> None:
     Base.metadata.create_all(engine)
     ensure_embedding_vector_schema()
     ensure_user_auth_columns()
-    ensure_document_search_indexes()
+    ensure_document_topic_indexes()
 
 
 def ensure_pgvector_extension() -> None:
@@ -134,8 +184,8 @@ def ensure_user_auth_columns() -> None:
             connection.execute(text(statement))
 
 
-def ensure_document_search_indexes() -> None:
-    """Create query indexes for lightweight document picker search."""
+def ensure_document_topic_indexes() -> None:
+    """Create the JSONB GIN index used by Postgres topic containment filters."""
     if engine.dialect.name != "postgresql":
         return
     inspector = inspect(engine)
@@ -145,14 +195,9 @@ def ensure_document_search_indexes() -> None:
         connection.execute(
             text(
                 """
-                CREATE INDEX IF NOT EXISTS ix_documents_picker_fts
+                CREATE INDEX IF NOT EXISTS ix_documents_topics_lower_gin
                 ON documents
-                USING gin ((
-                    setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
-                    setweight(to_tsvector('simple', coalesce(author, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(summary, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(extracted_text, '')), 'D')
-                ))
+                USING gin ((lower(topics::text)::jsonb) jsonb_path_ops)
                 """
             )
         )
@@ -197,6 +242,69 @@ def bind_session(session: Session) -> Iterator[Session]:
         _session_state.session = previous_thread_session
 
 
+def read_session() -> Session:
+    """Return a session for reads only, on the read replica when one is configured.
+
+    Flushing pending writes raises ``ReadOnlySessionError``; on Postgres the
+    transaction is also opened ``READ ONLY`` so the primary fallback cannot be
+    written through raw SQL either.
+    """
+    bind = read_engine if read_engine is not None else SessionLocal.kw["bind"]
+    if bind.dialect.name == "postgresql":
+        # One option engine per base engine keeps per-engine caches stable.
+        bind = _read_only_binds.get(bind) or _read_only_binds.setdefault(bind, bind.execution_options(postgresql_readonly=True))
+    return SessionLocal(bind=bind, info={"read_only": True})
+
+
+@contextmanager
+def read_session_scope() -> Iterator[Session]:
+    """Open a read-only session and bind it as the current session; it never commits."""
+    session = read_session()
+    try:
+        with bind_session(session):
+            yield session
+    finally:
+        session.close()
+
+
+@event.listens_for(Session, "before_flush")
+def _reject_read_only_flush(session: Session, _flush_context, _instances) -> None:
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise ReadOnlySessionError("read-only session cannot flush writes")
+
+
+async def run_in_worker_session(fn: Callable[..., _T], /, *args, **kwargs) -> _T:
+    """Run blocking ``fn`` in a worker thread bound to its own short-lived session.
+
+    Sessions are not thread-safe, so work offloaded from the event loop must not
+    touch the caller's session; ORM objects returned by ``fn`` come back detached.
+    """
+
+    def call() -> _T:
+        session = SessionLocal()
+        try:
+            with bind_session(session):
+                return fn(*args, **kwargs)
+        finally:
+            session.close()
+
+    return await asyncio.to_thread(call)
+
+
+async def run_in_read_session(fn: Callable[..., _T], /, *args, **kwargs) -> _T:
+    """Like ``run_in_worker_session``, but on a ``read_session`` for lookups that never write."""
+
+    def call() -> _T:
+        session = read_session()
+        try:
+            with bind_session(session):
+                return fn(*args, **kwargs)
+        finally:
+            session.close()
+
+    return await asyncio.to_thread(call)
+
+
 def current_session() -> Session:
     """Return the session bound to the current thread."""
     session = _session_var.get() or getattr(_session_state, "session", None)
@@ -218,3 +326,15 @@ def commit() -> None:
 def rollback() -> None:
     """Roll back the current session."""
     current_session().rollback()
+
+
+def savepoint() -> SessionTransaction:
+    """Open a SAVEPOINT on the current session; as a context manager it rolls back only its own writes on error."""
+    return current_session().begin_nested()
+
+
+def upsert_insert(model):
+    """Return an ``INSERT`` for ``model`` carrying the current dialect's ``ON CONFLICT`` clauses."""
+    if current_session().get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -4,12 +4,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from sqlalchemy import Select, String, cast, false, func, select
+from sqlalchemy import Select, false, func, select
 from sqlalchemy.orm import aliased
 from sqlalchemy.sql.elements import ColumnElement
 
 from iris.dao import db
 from iris.dao.admin import clamped_limit, count_statement
+from iris.dao.topics import document_topic_filter
 from iris.models import BookshelfCollection, BookshelfCollectionItem, Document, Link, Source
 from iris.schemas.api import DirectorySourceSchema
 from iris.schemas.enums import DocumentType, SourceStatus
@@ -116,7 +117,7 @@ class SourceDirectoryQuery:
             statement = statement.where(
                 select(Document.id)
                 .where(Document.source_id == Source.id)
-                .where(func.lower(cast(Document.topics, String)).like(f'%"{value}"%'))
+                .where(document_topic_filter(value))
                 .exists()
             )
         return statement.order_by(*self._order_by(document_count, essay_count, inbound_count, outbound_count, essay_reference_count, external_source_count))
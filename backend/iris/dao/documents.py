@@ -2,15 +2,106 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.orm import load_only
 
 from iris.dao import db
+from iris.dao.embeddings import store_document_embedding
+from iris.dao.links import resolve_links_to_document
+from iris.dao.metrics import stage_metrics_document_types
+from iris.dao.topics import sync_document_topics
 from iris.models import Document, Source
+from iris.schemas.enums import DocumentCategory, DocumentType
 from iris.schemas.ingestion import DocumentAnalysis
-from iris.services.common.url_utils import normalize_url
-from iris.services.ingestion.embedding import coerce_embedding_vector, dumps_embedding
+from iris.services.common.url_utils import normalize_url, url_hash, url_key
+from iris.services.ingestion.embedding import coerce_embedding_vector
+
+
+# Columns read by cards, list payloads and result identity checks. Article text
+# and embeddings are deferred on the model and stay out of every list query.
+DOCUMENT_CARD_COLUMNS = (
+    Document.id,
+    Document.uuid,
+    Document.source_id,
+    Document.url,
+    Document.content_hash,
+    Document.crawl_status,
+    Document.document_type,
+    Document.category,
+    Document.title,
+    Document.author,
+    Document.published_at,
+    Document.first_seen_at,
+    Document.last_crawled_at,
+    Document.summary,
+    Document.one_liner,
+    Document.audience,
+    Document.takeaways,
+    Document.topics,
+)
+
+
+@dataclass(frozen=True)
+class DocumentCard:
+    """Card-sized read model for list endpoints that never need ORM state or article text."""
+
+    id: int
+    uuid: str
+    source_id: int
+    source_domain: str
+    url: str
+    document_type: DocumentType
+    category: DocumentCategory
+    title: str | None
+    author: str | None
+    published_at: datetime | None
+    summary: str | None
+    one_liner: str | None
+    audience: str | None
+    takeaways: list[str]
+    topics: list[str]
+    text_chars: int
+
+
+def document_card_load():
+    """Loader option restricting ``Document`` rows to ``DOCUMENT_CARD_COLUMNS``."""
+    return load_only(*DOCUMENT_CARD_COLUMNS)
+
+
+def get_document_cards(document_ids: set[int] | list[int]) -> list[DocumentCard]:
+    """Return card projections for documents, measuring text length in the database."""
+    if not document_ids:
+        return []
+    rows = db.current_session().execute(
+        select(
+            Document.id,
+            Document.uuid,
+            Document.source_id,
+            Source.canonical_domain.label("source_domain"),
+            Document.url,
+            Document.document_type,
+            Document.category,
+            Document.title,
+            Document.author,
+            Document.published_at,
+            Document.summary,
+            Document.one_liner,
+            Document.audience,
+            Document.takeaways,
+            Document.topics,
+            func.coalesce(func.length(Document.extracted_text), 0).label("text_chars"),
+        )
+        .join(Source, Source.id == Document.source_id)
+        .where(Document.id.in_(list(document_ids)))
+        .order_by(Document.id)
+    ).all()
+    return [
+        DocumentCard(**{**row._mapping, "takeaways": list(row.takeaways or []), "topics": list(row.topics or [])})
+        for row in rows
+    ]
 
 
 def upsert_document(
@@ -32,33 +123,50 @@ def upsert_document(
     audience: str | None = None,
     takeaways: list[str] | None = None,
 ) -> Document:
-    """Insert or update a document row by canonical URL."""
+    """Insert or update a document row by canonical URL.
+
+    A new URL is written by one ``INSERT ... ON CONFLICT DO NOTHING`` with no
+    lookup first; only an existing URL is loaded and updated through the ORM,
+    which keeps metrics exact for type and status changes.
+    """
     session = db.current_session()
     url = normalize_url(url)
-    document = session.execute(select(Document).where(Document.url == url)).scalar_one_or_none()
+    values = {
+        "source_id": source.id,
+        "crawl_job_id": crawl_job_id,
+        "document_type": document_type,
+        "crawl_status": crawl_status,
+        "title": title,
+        "author": author,
+        "published_at": published_at,
+        "extracted_text": extracted_text,
+        "summary": summary,
+        "one_liner": one_liner,
+        "audience": audience,
+        "takeaways": [takeaway for takeaway in takeaways or [] if takeaway],
+        "topics": [topic for topic in topics if topic],
+        "content_hash": content_hash,
+        "last_crawled_at": datetime.now(timezone.utc),
+    }
+    statement = (
+        db.upsert_insert(Document)
+        .values(url=url, url_hash=url_hash(url), url_key=url_key(url), **values)
+        .on_conflict_do_nothing(index_elements=[Document.url_hash])
+        .returning(Document)
+    )
+    document = session.scalars(statement, execution_options={"populate_existing": True}).one_or_none()
     if document is None:
-        document = Document(
-            source_id=source.id,
-            url=url,
-        )
-        session.add(document)
-    document.source_id = source.id
-    document.crawl_job_id = crawl_job_id
-    document.document_type = document_type
-    document.crawl_status = crawl_status
-    document.title = title
-    document.author = author
-    document.published_at = published_at
-    document.extracted_text = extracted_text
-    document.summary = summary
-    document.one_liner = one_liner
-    document.audience = audience
-    document.takeaways = [takeaway for takeaway in takeaways or [] if takeaway]
-    document.topics = [topic for topic in topics if topic]
-    document.embedding_vector = _store_embedding_vector(coerce_embedding_vector(embedding))
-    document.content_hash = content_hash
-    document.last_crawled_at = datetime.now(timezone.utc)
-    session.flush()
+        document = session.execute(
+            select(Document).where(Document.url_hash == url_hash(url)).where(Document.url == url)
+        ).scalar_one()
+        for key, value in values.items():
+            setattr(document, key, value)
+        session.flush()
+    else:
+        stage_metrics_document_types(session, {f"{document.document_type}/{document.crawl_status}": 1})
+    resolve_links_to_document(document)
+    store_document_embedding(document, coerce_embedding_vector(embedding))
+    sync_document_topics(document)
     return document
 
 
@@ -72,18 +180,9 @@ def update_document_analysis(document: Document, analysis: DocumentAnalysis) ->
     document.takeaways = [takeaway for takeaway in analysis.takeaways or [] if takeaway]
     document.topics = [topic for topic in analysis.topics if topic]
     db.current_session().flush()
+    sync_document_topics(document)
 
 
 def update_document_embedding(document: Document, embedding: list[float] | str | None) -> None:
     """Persist a refreshed embedding for an existing document."""
-    document.embedding_vector = _store_embedding_vector(coerce_embedding_vector(embedding))
-    db.current_session().flush()
-
-
-def _store_embedding_vector(vector: list[float] | None):
-    session = db.current_session()
-    if vector is None:
-        return None
-    if session.bind is not None and session.bind.dialect.name == "sqlite":
-        return dumps_embedding(vector)
-    return vector
+    store_document_embedding(document, coerce_embedding_vector(embedding))
@@ -0,0 +1,256 @@
+"""DAO helpers for the per-model embedding registry.
+
+Every stored vector is recorded in ``document_embeddings`` under the model that
+produced it. ``documents.embedding_vector`` mirrors the serving model only, so
+in-process scans never compare vectors from different models, and a new model
+can be filled in alongside the old one before it is promoted.
+"""
+
+from __future__ import annotations
+
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, exists, func, select, text, update
+from sqlalchemy.orm import undefer
+
+from iris.dao import db
+from iris.models import Document, DocumentEmbedding, EmbeddingModel
+from iris.schemas.enums import CrawlStatus, DocumentType, EmbeddingModelStatus
+from iris.services.common.config import EMBEDDING_MODEL, USE_OPENAI_EMBEDDINGS
+from iris.services.ingestion.embedding import LOCAL_EMBEDDING_MODEL, embedding_model_for, loads_embedding
+from iris.services.ingestion.embedding_codec import encode_embedding
+
+
+logger = logging.getLogger(__name__)
+DOCUMENT_VECTOR_DIMENSIONS = 1536
+HNSW_MAX_DIMENSIONS = 2000
+
+
+def get_embedding_model(name: str) -> EmbeddingModel | None:
+    """Return one registered embedding model by name."""
+    session = db.current_session()
+    return session.execute(select(EmbeddingModel).where(EmbeddingModel.name == name)).scalar_one_or_none()
+
+
+def get_serving_model() -> EmbeddingModel | None:
+    """Return the model whose vectors currently answer search queries."""
+    session = db.current_session()
+    return session.execute(
+        select(EmbeddingModel).where(EmbeddingModel.status == EmbeddingModelStatus.SERVING.value).limit(1)
+    ).scalar_one_or_none()
+
+
+def serving_model_name() -> str:
+    """Return the model queries should be embedded with.
+
+    Before any vector is registered this is the model new documents would be
+    embedded with, so an empty corpus still routes consistently.
+    """
+    serving = get_serving_model()
+    if serving is not None:
+        return serving.name
+    return EMBEDDING_MODEL if USE_OPENAI_EMBEDDINGS else LOCAL_EMBEDDING_MODEL
+
+
+def register_embedding_model(name: str, dimensions: int, *, status: EmbeddingModelStatus) -> EmbeddingModel:
+    """Return a registered model, creating it and its vector index when new."""
+    session = db.current_session()
+    model = get_embedding_model(name)
+    if model is not None:
+        if model.dimensions != dimensions:
+            raise ValueError(f"embedding model {name} is registered with {model.dimensions} dimensions, not {dimensions}")
+        return model
+    model = EmbeddingModel(name=name, dimensions=dimensions, status=status.value)
+    if status == EmbeddingModelStatus.SERVING:
+        model.activated_at = datetime.now(timezone.utc)
+    session.add(model)
+    session.flush()
+    _ensure_model_index(model)
+    return model
+
+
+def store_document_embedding(document: Document, vector: list[float] | None, *, model: str | None = None) -> None:
+    """Record a document vector under its model and mirror it when that model is serving.
+
+    ``None`` clears every stored vector for the document, since they all
+    describe content that no longer exists.
+    """
+    session = db.current_session()
+    if vector is None:
+        document.embedding_vector = None
+        if document.id is not None:
+            session.execute(delete(DocumentEmbedding).where(DocumentEmbedding.document_id == document.id))
+        session.flush()
+        return
+    model_name = model or embedding_model_for(vector)
+    serving = get_serving_model()
+    if serving is None:
+        serving = register_embedding_model(model_name, len(vector), status=EmbeddingModelStatus.SERVING)
+    registered = serving if serving.name == model_name else register_embedding_model(
+        model_name, len(vector), status=EmbeddingModelStatus.BUILDING
+    )
+    if registered.dimensions != len(vector):
+        raise ValueError(f"embedding model {model_name} expects {registered.dimensions} dimensions, got {len(vector)}")
+    if document.id is None:
+        session.flush()
+    row = session.get(DocumentEmbedding, (document.id, model_name))
+    if row is None:
+        row = DocumentEmbedding(document_id=document.id, model=model_name, dimensions=len(vector))
+        session.add(row)
+    row.vector = _column_value(vector)
+    row.created_at = datetime.now(timezone.utc)
+    if model_name == serving.name:
+        document.embedding_vector = _document_column_value(vector)
+    else:
+        logger.info("stored %s vector for document %s; search keeps serving %s", model_name, document.id, serving.name)
+    session.flush()
+
+
+def delete_document_embeddings(document_ids: list[int]) -> None:
+    """Remove registry vectors before documents are deleted."""
+    if not document_ids:
+        return
+    db.current_session().execute(delete(DocumentEmbedding).where(DocumentEmbedding.document_id.in_(document_ids)))
+
+
+def count_model_coverage(model: str) -> tuple[int, int]:
+    """Return (embedded, searchable) counts for fetched essays under ``model``."""
+    session = db.current_session()
+    searchable = _searchable_documents(select(func.count(Document.id)))
+    embedded = searchable.where(_has_model_vector(model))
+    return session.scalar(embedded) or 0, session.scalar(searchable) or 0
+
+
+def get_documents_missing_model_page(model: str, *, after_id: int, limit: int) -> list[Document]:
+    """Return the next fetched essays in id order that have no vector for ``model``."""
+    session = db.current_session()
+    return session.execute(
+        _searchable_documents(select(Document))
+        .options(undefer(Document.extracted_text))
+        .where(Document.id > after_id)
+        .where(~_has_model_vector(model))
+        .order_by(Document.id.asc())
+        .limit(limit)
+    ).scalars().all()
+
+
+def seed_serving_model(*, batch_size: int = 500) -> EmbeddingModel | None:
+    """Register the model behind existing document vectors and copy them into the registry."""
+    session = db.current_session()
+    serving = get_serving_model()
+    after_id = 0
+    while True:
+        rows = session.execute(
+            select(Document.id, Document.embedding_vector)
+            .where(Document.id > after_id)
+            .where(Document.embedding_vector.is_not(None))
+            .order_by(Document.id.asc())
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            return serving
+        for document_id, stored in rows:
+            vector = loads_embedding(stored)
+            if serving is None:
+                serving = register_embedding_model(embedding_model_for(vector), len(vector), status=EmbeddingModelStatus.SERVING)
+            if len(vector) != serving.dimensions or session.get(DocumentEmbedding, (document_id, serving.name)) is not None:
+                continue
+            session.add(
+                DocumentEmbedding(document_id=document_id, model=serving.name, dimensions=len(vector), vector=_column_value(vector))
+            )
+        after_id = rows[-1][0]
+        session.commit()
+
+
+def promote_embedding_model(name: str) -> EmbeddingModel:
+    """Make ``name`` the serving model and re-point the document vector mirror at it."""
+    session = db.current_session()
+    model = get_embedding_model(name)
+    if model is None:
+        raise ValueError(f"embedding model {name} is not registered")
+    session.execute(
+        update(EmbeddingModel)
+        .where(EmbeddingModel.status == EmbeddingModelStatus.SERVING.value)
+        .where(EmbeddingModel.id != model.id)
+        .values(status=EmbeddingModelStatus.RETIRED.value)
+    )
+    model.status = EmbeddingModelStatus.SERVING.value
+    model.activated_at = datetime.now(timezone.utc)
+    session.flush()
+    if session.get_bind().dialect.name == "postgresql":
+        mirror = (
+            f"e.vector::vector({DOCUMENT_VECTOR_DIMENSIONS})" if model.dimensions == DOCUMENT_VECTOR_DIMENSIONS else "null"
+        )
+        session.execute(
+            text(
+                f"update documents d set embedding_vector = {mirror} "
+                "from document_embeddings e where e.document_id = d.id and e.model = :model"
+            ),
+            {"model": model.name},
+        )
+    else:
+        session.execute(
+            text(
+                "update documents set embedding_vector = ("
+                "select vector from document_embeddings e where e.document_id = documents.id and e.model = :model"
+                ") where exists (select 1 from document_embeddings e where e.document_id = documents.id and e.model = :model)"
+            ),
+            {"model": model.name},
+        )
+    # Documents the new model has not reached must not keep old-model vectors.
+    session.execute(
+        update(Document)
+        .where(Document.embedding_vector.is_not(None))
+        .where(~_has_model_vector(model.name))
+        .values(embedding_vector=None)
+        .execution_options(synchronize_session=False)
+    )
+    session.flush()
+    session.expire_all()
+    return model
+
+
+def vector_index_name(model: EmbeddingModel) -> str:
+    """Return the name of the partial HNSW index for one model."""
+    return f"ix_document_embeddings_hnsw_{model.id}"
+
+
+def _ensure_model_index(model: EmbeddingModel) -> None:
+    session = db.current_session()
+    if session.get_bind().dialect.name != "postgresql":
+        return
+    if model.dimensions > HNSW_MAX_DIMENSIONS:
+        logger.warning("embedding model %s has %s dimensions; HNSW supports %s", model.name, model.dimensions, HNSW_MAX_DIMENSIONS)
+        return
+    quoted_name = model.name.replace("'", "''")
+    session.execute(
+        text(
+            f"create index if not exists {vector_index_name(model)} on document_embeddings "
+            f"using hnsw ((vector::vector({int(model.dimensions)})) vector_cosine_ops) "
+            f"where model = '{quoted_name}'"
+        )
+    )
+
+
+def _searchable_documents(statement):
+    return statement.where(Document.document_type == DocumentType.ESSAY.value).where(
+        Document.crawl_status == CrawlStatus.FETCHED.value
+    )
+
+
+def _has_model_vector(model: str):
+    return exists().where(DocumentEmbedding.document_id == Document.id).where(DocumentEmbedding.model == model)
+
+
+def _column_value(vector: list[float]):
+    if db.current_session().get_bind().dialect.name == "sqlite":
+        return encode_embedding(vector)
+    return vector
+
+
+def _document_column_value(vector: list[float]):
+    if db.current_session().get_bind().dialect.name == "sqlite":
+        return encode_embedding(vector)
+    # The Postgres mirror column is fixed-width; other widths are served from the registry.
+    return vector if len(vector) == DOCUMENT_VECTOR_DIMENSIONS else None
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Mapping
+from collections.abc import Collection, Mapping
 
 from sqlalchemy import distinct, func, select
-from sqlalchemy.orm import aliased
+from sqlalchemy.orm import aliased, undefer
 
 from iris.dao import db
-from iris.models import Document, IndexEvent, IndexRun, Link, Source
+from iris.models import Document, IndexEvent, IndexRun, Link, Source, SourceAuthority
 from iris.schemas.enums import CrawlStatus, DocumentType, SourceStatus
 
 
@@ -55,14 +55,58 @@ def log_event(
     return event
 
 
-def get_queued_sources_oldest_first() -> list[Source]:
-    """Return queued sources in discovery order."""
+def get_frontier_sources(
+    limit: int,
+    *,
+    seed_source_id: int | None = None,
+    exclude_domains: Collection[str] = (),
+    exclude_ids: Collection[int] = (),
+) -> list[tuple[Source, int]]:
+    """Return queued sources with the most links from fetched essays, oldest first on ties.
+
+    With ``seed_source_id`` only links from that source's essays count;
+    otherwise links from every indexed source's essays do.
+    """
     session = db.current_session()
-    return (
-        session.execute(select(Source).where(Source.status == SourceStatus.QUEUED.value).order_by(Source.first_seen_at.asc()))
-        .scalars()
-        .all()
+    links = func.count(Link.id).label("links")
+    statement = (
+        select(Source, links)
+        .join(Link, Link.target_source_id == Source.id)
+        .join(Document, Link.source_document_id == Document.id)
+        .where(Source.status == SourceStatus.QUEUED.value)
+        .where(Document.document_type == DocumentType.ESSAY.value)
+        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
+        .group_by(Source.id)
+        .order_by(links.desc(), Source.first_seen_at.asc(), Source.id.asc())
+        .limit(limit)
     )
+    if seed_source_id is not None:
+        statement = statement.where(Document.source_id == seed_source_id)
+    else:
+        referring_source = aliased(Source)
+        statement = statement.join(referring_source, Document.source_id == referring_source.id).where(
+            referring_source.status == SourceStatus.INDEXED.value
+        )
+    if exclude_domains:
+        statement = statement.where(Source.canonical_domain.not_in(list(exclude_domains)))
+    if exclude_ids:
+        statement = statement.where(Source.id.not_in(list(exclude_ids)))
+    return [(source, int(count)) for source, count in session.execute(statement).all()]
+
+
+def get_top_authority_sources(limit: int, *, exclude_domains: Collection[str] = ()) -> list[tuple[Source, float]]:
+    """Return queued sources with the highest stored authority scores."""
+    session = db.current_session()
+    statement = (
+        select(Source, SourceAuthority.score)
+        .join(SourceAuthority, SourceAuthority.source_id == Source.id)
+        .where(Source.status == SourceStatus.QUEUED.value)
+        .order_by(SourceAuthority.score.desc(), Source.id.asc())
+        .limit(limit)
+    )
+    if exclude_domains:
+        statement = statement.where(Source.canonical_domain.not_in(list(exclude_domains)))
+    return [(source, float(score)) for source, score in session.execute(statement).all()]
 
 
 def get_source_by_domain(domain: str) -> Source | None:
@@ -100,37 +144,13 @@ def count_links_for_sources(source_ids: list[int]) -> tuple[dict[int, int], dict
     return inbound_by_source, referring_by_source
 
 
-def count_bfs_links_for_sources(source_ids: list[int], seed_source_id: int) -> dict[int, int]:
-    """Count candidate links originating from a BFS seed source."""
-    if not source_ids:
-        return {}
-    session = db.current_session()
-    rows = session.execute(
-        select(
-            Link.target_source_id,
-            func.count(Link.id),
-        )
-        .join(Document, Link.source_document_id == Document.id)
-        .where(Link.target_source_id.in_(source_ids))
-        .where(Document.source_id == seed_source_id)
-        .where(Document.document_type == DocumentType.ESSAY.value)
-        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
-        .group_by(Link.target_source_id)
-    ).all()
-    bfs_links_by_source: dict[int, int] = {}
-    for source_id, bfs_links in rows:
-        if source_id is None:
-            continue
-        bfs_links_by_source[int(source_id)] = int(bfs_links or 0)
-    return bfs_links_by_source
-
-
 def get_source_documents_missing_embedding(source: Source) -> list[Document]:
     """Return fetched essay documents for a source that lack embeddings."""
     session = db.current_session()
     return (
         session.execute(
             select(Document)
+            .options(undefer(Document.extracted_text))
             .where(Document.source_id == source.id)
             .where(Document.document_type == DocumentType.ESSAY.value)
             .where(Document.crawl_status == CrawlStatus.FETCHED.value)
@@ -143,8 +163,7 @@ def get_source_documents_missing_embedding(source: Source) -> list[Document]:
 
 def set_document_embedding(document: Document, embedding: list[float] | str) -> None:
     """Store an embedding vector on a document."""
-    from iris.dao.documents import _store_embedding_vector
+    from iris.dao.embeddings import store_document_embedding
     from iris.services.ingestion.embedding import coerce_embedding_vector
 
-    document.embedding_vector = _store_embedding_vector(coerce_embedding_vector(embedding))
-    db.current_session().flush()
+    store_document_embedding(document, coerce_embedding_vector(embedding))
@@ -2,12 +2,20 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select
+from collections.abc import Iterable
+
+from sqlalchemy import select, update
 
 from iris.dao import db
+from iris.dao.crawler import get_documents_by_urls
+from iris.dao.metrics import stage_metrics_totals
 from iris.models import Document, Link, Source
 from iris.schemas.enums import LinkType
-from iris.services.common.url_utils import domain_for_url, is_valid_http_url, normalize_url
+from iris.schemas.ingestion import ExtractedLink
+from iris.services.common.url_utils import domain_for_url, http_scheme_variants, is_valid_http_url, normalize_url, url_hash, url_key
+
+
+LINK_UPSERT_BATCH_SIZE = 500
 
 
 def upsert_link(
@@ -24,10 +32,11 @@ def upsert_link(
         raise ValueError(f"invalid link URL: {target_url[:120]}")
     target_domain = domain_for_url(normalized)
     target_source = session.execute(select(Source).where(Source.canonical_domain == target_domain)).scalar_one_or_none()
-    target_document = session.execute(select(Document).where(Document.url == normalized)).scalar_one_or_none()
+    target_document = get_documents_by_urls([normalized]).get(normalized)
     link = session.execute(
         select(Link).where(
             Link.source_document_id == source_document.id,
+            Link.target_url_hash == url_hash(normalized),
             Link.target_url == normalized,
         )
     ).scalar_one_or_none()
@@ -42,3 +51,88 @@ def upsert_link(
     link.link_type = LinkType.INTERNAL.value if target_domain == source_document.source.canonical_domain else LinkType.EXTERNAL.value
     session.flush()
     return link
+
+
+def upsert_links(source_document: Document, links: Iterable[ExtractedLink]) -> int:
+    """Write a document's normalised outgoing links with one multi-row ``INSERT ... ON CONFLICT DO NOTHING``.
+
+    Target sources and documents are resolved with one query each. Links the
+    document already had are loaded together and updated through the ORM. A
+    later duplicate of a target URL wins, as it would with ``upsert_link``.
+    Returns the number of distinct links written.
+    """
+    session = db.current_session()
+    by_url = {normalize_url(link.url): link for link in links}
+    if not by_url:
+        return 0
+    source_domain = source_document.source.canonical_domain
+    domains = {url: domain_for_url(url) for url in by_url}
+    source_ids = dict(
+        session.execute(
+            select(Source.canonical_domain, Source.id).where(Source.canonical_domain.in_(set(domains.values())))
+        ).all()
+    )
+    documents = get_documents_by_urls(by_url)
+    rows = {}
+    for url, link in by_url.items():
+        target_document = documents.get(url)
+        rows[url_hash(url)] = {
+            "source_document_id": source_document.id,
+            "target_url": url,
+            "target_url_hash": url_hash(url),
+            "target_url_key": url_key(url),
+            "target_domain": domains[url],
+            "target_source_id": source_ids.get(domains[url]),
+            "target_document_id": target_document.id if target_document else None,
+            "anchor_text": link.anchor_text,
+            "context": link.context,
+            "link_type": LinkType.INTERNAL.value if domains[url] == source_domain else LinkType.EXTERNAL.value,
+        }
+    inserted: set[int] = set()
+    resolved = 0
+    batch = list(rows.values())
+    for start in range(0, len(batch), LINK_UPSERT_BATCH_SIZE):
+        statement = (
+            db.upsert_insert(Link)
+            .values(batch[start : start + LINK_UPSERT_BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=[Link.source_document_id, Link.target_url_hash])
+            .returning(Link.target_url_hash, Link.target_document_id)
+        )
+        for target_hash, target_document_id in session.execute(statement):
+            inserted.add(target_hash)
+            resolved += target_document_id is not None
+    if inserted:
+        stage_metrics_totals(session, links=len(inserted), resolved_links=resolved)
+    existing = rows.keys() - inserted
+    if existing:
+        for link in session.execute(
+            select(Link).where(Link.source_document_id == source_document.id, Link.target_url_hash.in_(existing))
+        ).scalars():
+            row = rows[link.target_url_hash]
+            if link.target_url != row["target_url"]:
+                continue
+            for key in ("target_domain", "target_source_id", "target_document_id", "anchor_text", "context", "link_type"):
+                setattr(link, key, row[key])
+    session.expire(source_document, ["outgoing_links"])
+    session.flush()
+    return len(rows)
+
+
+def resolve_links_to_document(document: Document) -> int:
+    """Point every unresolved link whose target is ``document`` at it with one indexed update.
+
+    Links whose target was crawled after them are resolved here, so the link
+    graph stays complete without re-walking older documents.
+    """
+    session = db.current_session()
+    result = session.execute(
+        update(Link)
+        .where(Link.target_url_key == url_key(document.url))
+        .where(Link.target_url.in_(http_scheme_variants(document.url)))
+        .where(Link.target_document_id.is_(None))
+        .values(target_document_id=document.id, target_source_id=document.source_id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        stage_metrics_totals(session, resolved_links=result.rowcount)
+    return result.rowcount
@@ -4,9 +4,14 @@ from __future__ import annotations
 
 from urllib.parse import urlparse
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Select, delete, func, select, update
+from sqlalchemy.orm import undefer
 
 from iris.dao import db
+from iris.dao.embeddings import delete_document_embeddings
+from iris.dao.metrics import stage_metrics_document_types, stage_metrics_totals
+from iris.dao.postings import mark_postings_changed
+from iris.dao.topics import delete_document_topics
 from iris.models import Document, Link, Source
 from iris.schemas.enums import CrawlStatus, DocumentType, SourceStatus
 
@@ -71,15 +76,6 @@ WEAK_TOPIC_MARKERS = {
 }
 
 
-def get_queued_sources(limit: int | None = None) -> list[Source]:
-    """Return queued sources in insertion order for manual classification."""
-    session = db.current_session()
-    statement = select(Source).where(Source.status == SourceStatus.QUEUED.value).order_by(Source.first_seen_at.asc())
-    if limit:
-        statement = statement.limit(limit)
-    return session.execute(statement).scalars().all()
-
-
 def set_source_ignored(domain_or_url: str, *, reason: str, delete_rows: bool) -> tuple[Source | None, int]:
     """Mark a source ignored and optionally delete its indexed documents."""
     session = db.current_session()
@@ -92,9 +88,31 @@ def set_source_ignored(domain_or_url: str, *, reason: str, delete_rows: bool) ->
         return None, 0
     document_ids = list(session.scalars(select(Document.id).where(Document.source_id == source.id)))
     if delete_rows and document_ids:
-        session.execute(delete(Link).where(Link.source_document_id.in_(document_ids)))
-        session.execute(delete(Link).where(Link.target_document_id.in_(document_ids)))
+        document_types = session.execute(
+            select(Document.document_type, Document.crawl_status, func.count(Document.id))
+            .where(Document.id.in_(document_ids))
+            .group_by(Document.document_type, Document.crawl_status)
+        ).all()
+        delete_document_topics(document_ids)
+        delete_document_embeddings(document_ids)
+        outgoing = session.execute(
+            delete(Link).where(Link.source_document_id.in_(document_ids)).returning(Link.target_document_id)
+        ).scalars().all()
+        incoming = session.execute(
+            delete(Link).where(Link.target_document_id.in_(document_ids)).returning(Link.id)
+        ).scalars().all()
         session.execute(delete(Document).where(Document.id.in_(document_ids)))
+        mark_postings_changed(document_ids)
+        # Bulk deletes bypass the flush events the metrics snapshot counts from.
+        stage_metrics_totals(
+            session,
+            links=-(len(outgoing) + len(incoming)),
+            resolved_links=-(sum(target is not None for target in outgoing) + len(incoming)),
+        )
+        stage_metrics_document_types(
+            session,
+            {f"{doc_type}/{status}": -count for doc_type, status, count in document_types},
+        )
     session.execute(update(Link).where(Link.target_source_id == source.id).values(target_source_id=None))
     source.status = SourceStatus.IGNORED.value
     source.description = reason
@@ -106,6 +124,7 @@ def get_documents_for_embedding(*, missing_only: bool, limit: int | None) -> lis
     session = db.current_session()
     statement = (
         select(Document)
+        .options(undefer(Document.extracted_text))
         .where(Document.document_type == DocumentType.ESSAY.value)
         .where(Document.crawl_status == CrawlStatus.FETCHED.value)
         .order_by(Document.last_crawled_at.desc())
@@ -122,6 +141,7 @@ def get_fetched_documents(*, source_domain: str | None, limit: int | None) -> li
     session = db.current_session()
     statement = (
         select(Document)
+        .options(undefer(Document.extracted_text))
         .join(Source, Document.source_id == Source.id)
         .where(Document.crawl_status == CrawlStatus.FETCHED.value)
         .order_by(Document.last_crawled_at.desc())
@@ -133,29 +153,52 @@ def get_fetched_documents(*, source_domain: str | None, limit: int | None) -> li
     return session.execute(statement).scalars().all()
 
 
-def get_documents_for_metadata_backfill(
+def get_fetched_document_page(
     *,
     source_domain: str | None,
-    limit: int | None,
-    suspicious_only: bool,
+    after_id: int,
+    limit: int,
+    essays_only: bool = False,
 ) -> list[Document]:
-    """Return fetched essays that should have LLM metadata refreshed."""
+    """Return the next page of fetched documents with ids above ``after_id``."""
     session = db.current_session()
     statement = (
-        select(Document)
-        .join(Source, Document.source_id == Source.id)
-        .where(Document.document_type == DocumentType.ESSAY.value)
-        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
+        _fetched_documents_statement(select(Document), source_domain=source_domain, essays_only=essays_only)
+        .options(undefer(Document.extracted_text))
+        .where(Document.id > after_id)
         .order_by(Document.id.asc())
+        .limit(limit)
     )
+    return session.execute(statement).scalars().all()
+
+
+def get_documents_with_text(document_ids: list[int]) -> list[Document]:
+    """Return documents by id with extracted text loaded."""
+    if not document_ids:
+        return []
+    session = db.current_session()
+    statement = select(Document).options(undefer(Document.extracted_text)).where(Document.id.in_(document_ids))
+    return session.execute(statement).scalars().all()
+
+
+def count_fetched_documents(*, source_domain: str | None, after_id: int = 0, essays_only: bool = False) -> int:
+    """Count fetched documents with ids above ``after_id``."""
+    session = db.current_session()
+    statement = _fetched_documents_statement(
+        select(func.count(Document.id)),
+        source_domain=source_domain,
+        essays_only=essays_only,
+    ).where(Document.id > after_id)
+    return session.scalar(statement) or 0
+
+
+def _fetched_documents_statement(statement: Select, *, source_domain: str | None, essays_only: bool) -> Select:
+    statement = statement.where(Document.crawl_status == CrawlStatus.FETCHED.value)
+    if essays_only:
+        statement = statement.where(Document.document_type == DocumentType.ESSAY.value)
     if source_domain:
-        statement = statement.where(Source.canonical_domain == source_domain)
-    documents = session.execute(statement).scalars().all()
-    if suspicious_only:
-        documents = [document for document in documents if is_suspicious_metadata(document)]
-    if limit:
-        documents = documents[:limit]
-    return documents
+        statement = statement.join(Source, Document.source_id == Source.id).where(Source.canonical_domain == source_domain)
+    return statement
 
 
 def is_suspicious_metadata(document: Document) -> bool:
@@ -0,0 +1,382 @@
+"""In-memory metrics snapshot for health checks and the admin overview.
+
+Committed writes adjust the snapshot incrementally from flush-time deltas, and a
+reconciler replaces it with exact ``count(*)`` results once it is older than
+``METRICS_RECONCILE_SECONDS`` so any drift (raw SQL writes, other processes)
+is bounded. Reconciliation is single-flight: a stale snapshot keeps being
+served while one background thread recounts, so a burst of health checks
+never stacks up full-table counts.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from threading import Lock, Thread
+
+from sqlalchemy import event, func, inspect, or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from iris.dao import db
+from iris.models import (
+    AgentConversation,
+    AgentMessage,
+    CrawlJob,
+    Document,
+    IndexRun,
+    Link,
+    Source,
+    User,
+    UserDocumentMapping,
+)
+from iris.schemas.enums import AgentMessageRole, DocumentType
+from iris.services.common.config import METRICS_RECONCILE_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "iris_metrics_pending"
+_SAVEPOINTS_KEY = "iris_metrics_savepoints"
+_UNKNOWN = object()
+_ROW_COUNTERS: dict[type, str] = {
+    User: "users",
+    AgentConversation: "conversations",
+    CrawlJob: "crawl_jobs",
+    IndexRun: "index_runs",
+}
+
+
+@dataclass
+class MetricsSnapshot:
+    """Counter state for one engine, last reconciled at ``reconciled_at``."""
+
+    engine: Engine
+    reconciled_at: datetime
+    totals: Counter[str] = field(default_factory=Counter)
+    source_statuses: Counter[str] = field(default_factory=Counter)
+    document_types: Counter[str] = field(default_factory=Counter)
+    updated_at: datetime | None = None
+
+    def apply(self, delta: MetricsDelta) -> None:
+        if delta.drifted:
+            self.reconciled_at = datetime.min.replace(tzinfo=timezone.utc)
+        self.totals.update(delta.totals)
+        self.source_statuses.update(delta.source_statuses)
+        self.document_types.update(delta.document_types)
+        self.updated_at = datetime.now(timezone.utc)
+
+
+@dataclass
+class MetricsDelta:
+    """Counter changes staged by flushes and applied when the transaction commits."""
+
+    totals: Counter[str] = field(default_factory=Counter)
+    source_statuses: Counter[str] = field(default_factory=Counter)
+    document_types: Counter[str] = field(default_factory=Counter)
+    drifted: bool = False
+
+    def copy(self) -> MetricsDelta:
+        return MetricsDelta(Counter(self.totals), Counter(self.source_statuses), Counter(self.document_types), self.drifted)
+
+    def merge(self, other: MetricsDelta) -> None:
+        self.totals.update(other.totals)
+        self.source_statuses.update(other.source_statuses)
+        self.document_types.update(other.document_types)
+        self.drifted = self.drifted or other.drifted
+
+
+@dataclass(frozen=True)
+class MetricsView:
+    """Immutable copy of the snapshot handed to API readers."""
+
+    totals: dict[str, int]
+    source_statuses: dict[str, int]
+    document_types: dict[str, int]
+    reconciled_at: datetime
+
+
+_lock = Lock()
+# Held for the whole of a reconcile, so only one recount runs at a time.
+_reconcile_lock = Lock()
+_snapshot: MetricsSnapshot | None = None
+_reconciler: Thread | None = None
+
+
+def get_metrics(*, max_age_seconds: float | None = None) -> MetricsView:
+    """Return the current snapshot.
+
+    A missing snapshot, or one for another engine, is reconciled before
+    returning. A stale one is returned as is while a background thread
+    reconciles it.
+    """
+    global _reconciler
+    engine = db.current_session().get_bind()
+    max_age = timedelta(seconds=METRICS_RECONCILE_SECONDS if max_age_seconds is None else max_age_seconds)
+    snapshot = _current_snapshot(engine)
+    if snapshot is None:
+        with _reconcile_lock:
+            # Another caller may have reconciled while this one waited.
+            snapshot = _current_snapshot(engine) or reconcile_metrics()
+    elif _is_stale(snapshot, max_age) and _reconcile_lock.acquire(blocking=False):
+        snapshot = _current_snapshot(engine) or snapshot
+        if _is_stale(snapshot, max_age):
+            _reconciler = Thread(target=_reconcile_in_background, args=(engine,), name="iris-metrics-reconcile", daemon=True)
+            _reconciler.start()
+        else:
+            _reconcile_lock.release()
+    with _lock:
+        return _view(snapshot)
+
+
+def reconcile_metrics() -> MetricsSnapshot:
+    """Replace the snapshot with exact counts from the current session's database."""
+    global _snapshot
+    session = db.current_session()
+    snapshot = MetricsSnapshot(engine=session.get_bind(), reconciled_at=datetime.now(timezone.utc))
+    snapshot.source_statuses.update(
+        {
+            str(status): count
+            for status, count in session.execute(select(Source.status, func.count(Source.id)).group_by(Source.status)).all()
+        }
+    )
+    snapshot.document_types.update(
+        {
+            f"{doc_type}/{status}": count
+            for doc_type, status, count in session.execute(
+                select(Document.document_type, Document.crawl_status, func.count(Document.id)).group_by(
+                    Document.document_type, Document.crawl_status
+                )
+            ).all()
+        }
+    )
+    snapshot.totals.update(
+        {
+            "users": session.scalar(select(func.count(User.id))) or 0,
+            "conversations": session.scalar(select(func.count(AgentConversation.id))) or 0,
+            "queries": session.scalar(
+                select(func.count(AgentMessage.id)).where(AgentMessage.role == AgentMessageRole.USER)
+            ) or 0,
+            "saved_documents": session.scalar(
+                select(func.count(UserDocumentMapping.id)).where(
+                    or_(
+                        UserDocumentMapping.bookshelf_status.is_not(None),
+                        UserDocumentMapping.favorited_at.is_not(None),
+                        UserDocumentMapping.note.is_not(None),
+                    )
+                )
+            ) or 0,
+            "links": session.scalar(select(func.count(Link.id))) or 0,
+            "resolved_links": session.scalar(select(func.count(Link.id)).where(Link.target_document_id.is_not(None))) or 0,
+            "crawl_jobs": session.scalar(select(func.count(CrawlJob.id))) or 0,
+            "index_runs": session.scalar(select(func.count(IndexRun.id))) or 0,
+        }
+    )
+    with _lock:
+        _snapshot = snapshot
+    return snapshot
+
+
+def _current_snapshot(engine: Engine) -> MetricsSnapshot | None:
+    with _lock:
+        return _snapshot if _snapshot is not None and _snapshot.engine is engine else None
+
+
+def _is_stale(snapshot: MetricsSnapshot, max_age: timedelta) -> bool:
+    return datetime.now(timezone.utc) - snapshot.reconciled_at > max_age
+
+
+def _reconcile_in_background(engine: Engine) -> None:
+    """Recount on a session of the snapshot's own engine; the caller already holds ``_reconcile_lock``."""
+    try:
+        with Session(engine) as session, db.bind_session(session):
+            reconcile_metrics()
+    except Exception:
+        logger.exception("metrics reconcile failed; serving the stale snapshot")
+    finally:
+        _reconcile_lock.release()
+
+
+def reset_metrics() -> None:
+    """Drop the snapshot so the next read reconciles from the database."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def stage_metrics_totals(session: Session, **totals: int) -> None:
+    """Stage counter changes made by bulk SQL that flush events cannot see."""
+    session.info.setdefault(_PENDING_KEY, MetricsDelta()).merge(MetricsDelta(totals=Counter(totals)))
+
+
+def stage_metrics_document_types(session: Session, changes: dict[str, int]) -> None:
+    """Stage ``type/status`` document count changes made by bulk SQL that flush events cannot see."""
+    session.info.setdefault(_PENDING_KEY, MetricsDelta()).merge(MetricsDelta(document_types=Counter(changes)))
+
+
+def _view(snapshot: MetricsSnapshot) -> MetricsView:
+    source_statuses = {key: value for key, value in snapshot.source_statuses.items() if value > 0}
+    document_types = {key: value for key, value in snapshot.document_types.items() if value > 0}
+    totals = {key: max(value, 0) for key, value in snapshot.totals.items()}
+    totals["sources"] = sum(source_statuses.values())
+    totals["documents"] = sum(document_types.values())
+    totals["essay_documents"] = sum(
+        count for key, count in document_types.items() if key.partition("/")[0] == DocumentType.ESSAY.value
+    )
+    return MetricsView(
+        totals=totals,
+        source_statuses=source_statuses,
+        document_types=document_types,
+        reconciled_at=snapshot.reconciled_at,
+    )
+
+
+def _delta_for_flush(session: Session) -> MetricsDelta:
+    delta = MetricsDelta()
+    for instance in session.new:
+        _count_instance(delta, instance, 1, new=True)
+    for instance in session.deleted:
+        _count_instance(delta, instance, -1, new=False)
+    for instance in session.dirty:
+        if instance in session.deleted:
+            continue
+        _count_changes(delta, instance)
+    return delta
+
+
+def _count_instance(delta: MetricsDelta, instance, sign: int, *, new: bool) -> None:
+    state = inspect(instance)
+    current = _current if new else _previous
+    if not new and any(_previous(state, key) is _UNKNOWN for key in _tracked_keys(instance)):
+        delta.drifted = True
+        return
+    if isinstance(instance, Source):
+        delta.source_statuses[str(current(state, "status"))] += sign
+    elif isinstance(instance, Document):
+        delta.document_types[f"{current(state, 'document_type')}/{current(state, 'crawl_status')}"] += sign
+    elif isinstance(instance, Link):
+        delta.totals["links"] += sign
+        if current(state, "target_document_id") is not None:
+            delta.totals["resolved_links"] += sign
+    elif isinstance(instance, AgentMessage):
+        if str(current(state, "role")) == AgentMessageRole.USER.value:
+            delta.totals["queries"] += sign
+    elif isinstance(instance, UserDocumentMapping):
+        if _is_saved(state, current):
+            delta.totals["saved_documents"] += sign
+    else:
+        key = _ROW_COUNTERS.get(type(instance))
+        if key:
+            delta.totals[key] += sign
+
+
+def _count_changes(delta: MetricsDelta, instance) -> None:
+    state = inspect(instance)
+    keys = _tracked_keys(instance)
+    if any(_previous(state, key) is _UNKNOWN for key in keys):
+        # An expired attribute was overwritten without loading its old value,
+        # so the delta cannot be computed; force the next read to reconcile.
+        delta.drifted = True
+        return
+    if isinstance(instance, Source):
+        before, after = str(_previous(state, "status")), str(_current(state, "status"))
+        if before != after:
+            delta.source_statuses[before] -= 1
+            delta.source_statuses[after] += 1
+    elif isinstance(instance, Document):
+        before = f"{_previous(state, 'document_type')}/{_previous(state, 'crawl_status')}"
+        after = f"{_current(state, 'document_type')}/{_current(state, 'crawl_status')}"
+        if before != after:
+            delta.document_types[before] -= 1
+            delta.document_types[after] += 1
+    elif isinstance(instance, Link):
+        before = _previous(state, "target_document_id") is not None
+        after = _current(state, "target_document_id") is not None
+        delta.totals["resolved_links"] += int(after) - int(before)
+    elif isinstance(instance, UserDocumentMapping):
+        delta.totals["saved_documents"] += int(_is_saved(state, _current)) - int(_is_saved(state, _previous))
+
+
+def _tracked_keys(instance) -> tuple[str, ...]:
+    if isinstance(instance, Source):
+        return ("status",)
+    if isinstance(instance, Document):
+        return ("document_type", "crawl_status")
+    if isinstance(instance, Link):
+        return ("target_document_id",)
+    if isinstance(instance, UserDocumentMapping):
+        return ("bookshelf_status", "favorited_at", "note")
+    return ()
+
+
+def _is_saved(state, value) -> bool:
+    return any(value(state, key) is not None for key in ("bookshelf_status", "favorited_at", "note"))
+
+
+def _current(state, key: str):
+    return state.attrs[key].value
+
+
+def _previous(state, key: str):
+    history = state.attrs[key].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    if history.added:
+        return _UNKNOWN
+    return state.attrs[key].value
+
+
+@event.listens_for(Session, "after_flush")
+def _stage_flush_delta(session: Session, _flush_context) -> None:
+    delta = _delta_for_flush(session)
+    if not (delta.totals or delta.source_statuses or delta.document_types or delta.drifted):
+        return
+    session.info.setdefault(_PENDING_KEY, MetricsDelta()).merge(delta)
+
+
+@event.listens_for(Session, "after_transaction_create")
+def _remember_savepoint_delta(session: Session, transaction) -> None:
+    if transaction.nested:
+        pending = session.info.get(_PENDING_KEY)
+        session.info.setdefault(_SAVEPOINTS_KEY, {})[transaction] = pending.copy() if pending else None
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_savepoint_delta(session: Session, transaction) -> None:
+    if transaction.nested:
+        session.info.get(_SAVEPOINTS_KEY, {}).pop(transaction, None)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed_delta(session: Session) -> None:
+    if session.in_nested_transaction():
+        # Releasing a savepoint commits nothing yet; the delta waits for the outer commit.
+        return
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending is None:
+        return
+    try:
+        engine = session.get_bind()
+    except Exception:
+        return
+    with _lock:
+        if _snapshot is not None and _snapshot.engine is engine:
+            _snapshot.apply(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_delta(session: Session) -> None:
+    savepoint = session.get_nested_transaction()
+    if savepoint is None:
+        session.info.pop(_PENDING_KEY, None)
+        return
+    # Only the savepoint rolled back: keep what was staged before it began.
+    before = session.info.get(_SAVEPOINTS_KEY, {}).get(savepoint)
+    if before is None:
+        session.info.pop(_PENDING_KEY, None)
+    else:
+        session.info[_PENDING_KEY] = before.copy()
@@ -0,0 +1,150 @@
+"""Connection pool checkout metrics for the primary and read engines.
+
+Engines on server databases use ``TimedQueuePool``, which records how long
+each checkout waited for a free connection and how many gave up at the pool
+timeout. Stats are kept per pool name (``primary`` or ``read``) so they survive
+``Pool.recreate`` after a dispose, and are reported alongside the live pool
+occupancy for the admin overview and the Prometheus endpoint.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from threading import Lock
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool, QueuePool
+
+
+POOL_WAIT_SAMPLES = 1024
+
+
+@dataclass
+class PoolStats:
+    """Checkout counters and recent wait times for one named pool."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_seconds: float = 0.0
+    wait_ms: deque[float] = field(default_factory=lambda: deque(maxlen=POOL_WAIT_SAMPLES))
+
+
+@dataclass(frozen=True)
+class PoolMetricsView:
+    """Immutable copy of one pool's ``PoolStats`` plus its current occupancy."""
+
+    name: str
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_p50_ms: float
+    wait_p95_ms: float
+
+
+_lock = Lock()
+_stats: dict[str, PoolStats] = {}
+_pools: dict[str, Pool] = {}
+
+
+class TimedQueuePool(QueuePool):
+    """A ``QueuePool`` that records checkout wait time under its ``logging_name``."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            record_checkout(self, time.perf_counter() - started, timed_out=True)
+            raise
+        record_checkout(self, time.perf_counter() - started)
+        return connection
+
+
+def track_pool(name: str, pool: Pool) -> None:
+    """Report ``pool`` under ``name``; the read pool is only tracked when it is separate."""
+    with _lock:
+        _pools[name] = pool
+        _stats.setdefault(name, PoolStats())
+
+
+def record_checkout(pool: Pool, seconds: float, *, timed_out: bool = False) -> None:
+    name = pool.logging_name or "primary"
+    with _lock:
+        # A disposed pool is recreated with the same name; follow the live one.
+        _pools[name] = pool
+        stats = _stats.setdefault(name, PoolStats())
+        if timed_out:
+            stats.timeouts += 1
+        else:
+            stats.checkouts += 1
+        stats.wait_seconds += seconds
+        stats.wait_ms.append(seconds * 1000)
+
+
+def pool_metrics() -> list[PoolMetricsView]:
+    """Return checkout counters, wait percentiles and occupancy for each tracked pool."""
+    with _lock:
+        items = [(name, _pools[name], _stats[name]) for name in sorted(_pools)]
+        snapshots = [(name, pool, stats.checkouts, stats.timeouts, stats.wait_seconds, sorted(stats.wait_ms)) for name, pool, stats in items]
+    return [
+        PoolMetricsView(
+            name=name,
+            size=_pool_value(pool, "size"),
+            checked_out=_pool_value(pool, "checkedout"),
+            overflow=max(0, _pool_value(pool, "overflow")),
+            checkouts=checkouts,
+            timeouts=timeouts,
+            wait_seconds_total=round(wait_seconds, 6),
+            wait_p50_ms=_percentile(wait_ms, 50),
+            wait_p95_ms=_percentile(wait_ms, 95),
+        )
+        for name, pool, checkouts, timeouts, wait_seconds, wait_ms in snapshots
+    ]
+
+
+def render_pool_prometheus() -> str:
+    """Render pool metrics in the Prometheus text exposition format."""
+    metrics = pool_metrics()
+    lines = [
+        "# HELP iris_db_pool_checkouts_total Connections checked out of each database pool.",
+        "# TYPE iris_db_pool_checkouts_total counter",
+        *(f'iris_db_pool_checkouts_total{{pool="{item.name}"}} {item.checkouts}' for item in metrics),
+        "# HELP iris_db_pool_timeouts_total Checkouts that gave up waiting for a free connection.",
+        "# TYPE iris_db_pool_timeouts_total counter",
+        *(f'iris_db_pool_timeouts_total{{pool="{item.name}"}} {item.timeouts}' for item in metrics),
+        "# HELP iris_db_pool_wait_seconds_total Seconds spent waiting for pooled connections.",
+        "# TYPE iris_db_pool_wait_seconds_total counter",
+        *(f'iris_db_pool_wait_seconds_total{{pool="{item.name}"}} {item.wait_seconds_total:.6f}' for item in metrics),
+        "# HELP iris_db_pool_checked_out Connections currently checked out of each pool.",
+        "# TYPE iris_db_pool_checked_out gauge",
+        *(f'iris_db_pool_checked_out{{pool="{item.name}"}} {item.checked_out}' for item in metrics),
+        "# HELP iris_db_pool_size Configured steady-state size of each pool.",
+        "# TYPE iris_db_pool_size gauge",
+        *(f'iris_db_pool_size{{pool="{item.name}"}} {item.size}' for item in metrics),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def reset_pool_metrics() -> None:
+    """Zero the counters of every tracked pool."""
+    with _lock:
+        for name in _stats:
+            _stats[name] = PoolStats()
+
+
+def _pool_value(pool: Pool, method: str) -> int:
+    # Pools without occupancy accounting (SQLite's StaticPool, NullPool) report zero.
+    getter = getattr(pool, method, None)
+    return int(getter()) if callable(getter) else 0
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1], 3)
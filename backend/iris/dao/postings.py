@@ -0,0 +1,89 @@
+"""Persistence helpers for the agent's topic, tag and category posting lists."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from sqlalchemy import delete, func, insert, select
+
+from iris.dao import db
+from iris.models import (
+    Category,
+    Document,
+    DocumentCategory,
+    DocumentCategoryAssignment,
+    DocumentTag,
+    DocumentTopic,
+    PostingChange,
+    Tag,
+)
+from iris.schemas.retrieval import PostingRows
+
+
+def mark_postings_changed(document_ids: Iterable[int] | None) -> None:
+    """Record documents whose assignments changed; ``None`` asks readers to rebuild everything."""
+    session = db.current_session()
+    if document_ids is None:
+        session.execute(insert(PostingChange), [{"document_id": None}])
+        return
+    rows = [{"document_id": document_id} for document_id in sorted(set(document_ids))]
+    if rows:
+        session.execute(insert(PostingChange), rows)
+
+
+def latest_posting_change_id() -> int:
+    """Return the newest change id, or 0 when nothing was recorded."""
+    return db.current_session().scalar(select(func.max(PostingChange.id))) or 0
+
+
+def get_posting_changes(after_id: int) -> list[tuple[int, int | None]]:
+    """Return ``(change_id, document_id)`` pairs recorded after ``after_id`` in id order."""
+    statement = (
+        select(PostingChange.id, PostingChange.document_id)
+        .where(PostingChange.id > after_id)
+        .order_by(PostingChange.id.asc())
+    )
+    return [(change_id, document_id) for change_id, document_id in db.current_session().execute(statement).all()]
+
+
+def prune_posting_changes(*, older_than: datetime) -> int:
+    """Delete change rows every live reader has already applied."""
+    result = db.current_session().execute(delete(PostingChange).where(PostingChange.created_at < older_than))
+    return result.rowcount or 0
+
+
+def get_posting_rows(document_ids: list[int] | None = None) -> PostingRows:
+    """Return assignments for ``document_ids``, or for every document when ``None``."""
+    session = db.current_session()
+
+    def scoped(statement, column):
+        return statement if document_ids is None else statement.where(column.in_(document_ids))
+
+    topics = session.execute(scoped(select(DocumentTopic.document_id, DocumentTopic.topic_slug), DocumentTopic.document_id)).all()
+    tags = session.execute(
+        scoped(
+            select(DocumentTag.document_id, Tag.slug, Tag.name).join(Tag, Tag.id == DocumentTag.tag_id),
+            DocumentTag.document_id,
+        )
+    ).all()
+    categories = session.execute(
+        scoped(
+            select(DocumentCategoryAssignment.document_id, Category.slug, Category.name).join(
+                Category, Category.id == DocumentCategoryAssignment.category_id
+            ),
+            DocumentCategoryAssignment.document_id,
+        )
+    ).all()
+    document_categories = session.execute(
+        scoped(
+            select(Document.id, Document.category).where(Document.category != DocumentCategory.UNKNOWN),
+            Document.id,
+        )
+    ).all()
+    return PostingRows(
+        topics=[(document_id, slug) for document_id, slug in topics],
+        tags=[(document_id, slug, name) for document_id, slug, name in tags],
+        categories=[(document_id, slug, name) for document_id, slug, name in categories],
+        document_categories=[(document_id, str(category)) for document_id, category in document_categories],
+    )
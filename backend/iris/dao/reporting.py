@@ -66,6 +66,21 @@ def count_document_links(document_id: int) -> int:
     return session.scalar(select(func.count(Link.id)).where(Link.source_document_id == document_id)) or 0
 
 
+def count_links_by_document(document_ids: list[int]) -> dict[int, int]:
+    """Count outgoing links for many documents in one grouped query."""
+    if not document_ids:
+        return {}
+    session = db.current_session()
+    rows = session.execute(
+        select(Link.source_document_id, func.count(Link.id))
+        .where(Link.source_document_id.in_(document_ids))
+        .group_by(Link.source_document_id)
+    )
+    counts = dict.fromkeys(document_ids, 0)
+    counts.update({document_id: count for document_id, count in rows})
+    return counts
+
+
 def get_index_events(run_id: int, *, limit: int | None = None) -> list[IndexEvent]:
     """Return events for one index run in chronological order."""
     session = db.current_session()
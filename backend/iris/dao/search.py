@@ -2,18 +2,54 @@
 
 from __future__ import annotations
 
-from sqlalchemy import select, text
-from sqlalchemy.orm import joinedload
+from collections.abc import Sequence
+
+from sqlalchemy import case, func, literal, select, text
+from sqlalchemy.orm import joinedload, selectinload, undefer, with_expression
 
 from iris.dao import db
-from iris.dao.user_state import get_or_create_local_user
+from iris.dao import authority as authority_dao
+from iris.dao import embeddings as embeddings_dao
+from iris.dao.documents import document_card_load
+from iris.dao.user_state import get_local_user_id
 from iris.models import Document, Link, UserDocumentMapping
 from iris.schemas.enums import CrawlStatus, DocumentType
-from iris.schemas.retrieval import RankedDocument
+from iris.schemas.retrieval import HybridSearchHit, RankedDocument
+from iris.services.common.config import AUTHORITY_SEARCH_WEIGHT
+from iris.services.common.rank_fusion import RRF_K, reciprocal_rank_fusion
+from iris.services.common.vectors import cosine_scores, stack_vectors, top_k
+from iris.services.ingestion.embedding import loads_embedding_array
+
+
+SEARCH_TEXT_EXCERPT_CHARS = 3000
+KEYWORD_FUSION_WEIGHT = 0.45
+SEMANTIC_FUSION_WEIGHT = 0.55
+FAVORITE_SEARCH_BONUS = 0.08
+DISMISSED_SEARCH_PENALTY = 0.18
+# Cosine floor for semantic candidates; below it a nearest neighbour is noise.
+SEMANTIC_MIN_SIMILARITY = 0.12
+# Fused relevance floor. Each hit's contribution is scaled by its strength
+# (keyword score relative to the best match, cosine similarity), so tail
+# candidates that are weak in both rankings land well below this.
+MIN_SEARCH_SCORE = 0.1
+# FTS5 bm25 column weights for title, details, topics and body.
+FTS5_COLUMN_WEIGHTS = "4.0, 2.0, 2.0, 1.0"
+
+
+def search_text_excerpt():
+    """Loader option filling ``Document.text_excerpt`` with the prefix keyword scoring reads."""
+    return with_expression(
+        Document.text_excerpt,
+        func.coalesce(func.substr(Document.extracted_text, 1, SEARCH_TEXT_EXCERPT_CHARS), ""),
+    )
 
 
 def get_searchable_documents() -> list[Document]:
-    """Return fetched essay documents eligible for search ranking."""
+    """Return fetched essay documents eligible for search ranking.
+
+    Rows carry card columns, the embedding and a text excerpt rather than the
+    full article, so in-memory corpus scans never lazy-load per document.
+    """
     session = db.current_session()
     return (
         session.execute(
@@ -21,6 +57,12 @@ def get_searchable_documents() -> list[Document]:
             .where(Document.document_type == DocumentType.ESSAY.value)
             .where(Document.crawl_status == CrawlStatus.FETCHED.value)
             .where(Document.embedding_vector.is_not(None))
+            .options(
+                document_card_load(),
+                selectinload(Document.source),
+                undefer(Document.embedding_vector),
+                search_text_excerpt(),
+            )
         )
         .scalars()
         .all()
@@ -46,30 +88,11 @@ def _postgres_document_picker_search(query: str, *, limit: int) -> list[RankedDo
             with query as (
                 select websearch_to_tsquery('simple', :query) as tsquery
             )
-            select
-                d.id,
-                ts_rank_cd(
-                    setweight(to_tsvector('simple', coalesce(d.title, '')), 'A') ||
-                    setweight(to_tsvector('simple', coalesce(d.author, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(d.one_liner, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(d.audience, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(d.summary, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(d.takeaways::text, '')), 'B') ||
-                    setweight(to_tsvector('simple', coalesce(d.extracted_text, '')), 'D'),
-                    query.tsquery
-                ) as rank
+            select d.id, ts_rank_cd(d.search_vector, query.tsquery) as rank
             from documents d, query
             where d.document_type = :document_type
               and d.crawl_status = :crawl_status
-              and (
-                setweight(to_tsvector('simple', coalesce(d.title, '')), 'A') ||
-                setweight(to_tsvector('simple', coalesce(d.author, '')), 'B') ||
-                setweight(to_tsvector('simple', coalesce(d.one_liner, '')), 'B') ||
-                setweight(to_tsvector('simple', coalesce(d.audience, '')), 'B') ||
-                setweight(to_tsvector('simple', coalesce(d.summary, '')), 'B') ||
-                setweight(to_tsvector('simple', coalesce(d.takeaways::text, '')), 'B') ||
-                setweight(to_tsvector('simple', coalesce(d.extracted_text, '')), 'D')
-              ) @@ query.tsquery
+              and d.search_vector @@ query.tsquery
             order by rank desc, d.published_at desc nulls last, d.id desc
             limit :limit
             """
@@ -88,9 +111,14 @@ def _portable_document_picker_search(query: str, *, limit: int) -> list[RankedDo
     session = db.current_session()
     terms = [term for term in query.lower().split() if term]
     pattern = f"%{query.lower()}%"
+    lowered_text = func.lower(func.coalesce(Document.extracted_text, ""))
+    text_hits = sum(
+        (case((lowered_text.contains(term, autoescape=True), 1), else_=0) for term in terms),
+        literal(0),
+    )
     statement = (
-        select(Document)
-        .options(joinedload(Document.source))
+        select(Document, text_hits.label("text_hits"))
+        .options(document_card_load(), joinedload(Document.source))
         .where(Document.document_type == DocumentType.ESSAY.value)
         .where(Document.crawl_status == CrawlStatus.FETCHED.value)
         .where(
@@ -107,23 +135,285 @@ def _portable_document_picker_search(query: str, *, limit: int) -> list[RankedDo
         .order_by(Document.published_at.desc().nullslast(), Document.id.desc())
         .limit(max(1, min(limit * 4, 200)))
     )
-    rows = session.execute(statement, {"pattern": pattern}).scalars().all()
+    rows = session.execute(statement, {"pattern": pattern}).all()
     scored: list[RankedDocument] = []
-    for document in rows:
-        score = _picker_keyword_score(terms, document)
+    for document, hits in rows:
+        score = _picker_keyword_score(terms, document, text_hits=int(hits or 0))
         if score > 0:
             scored.append(RankedDocument(document=document, score=score, reason="keyword match"))
     scored.sort(key=lambda item: item.score, reverse=True)
     return scored[: max(1, min(limit, 50))]
 
 
+def hybrid_search_documents(
+    query_terms: Sequence[str],
+    query_vector: list[float] | None,
+    *,
+    candidates: int,
+    limit: int,
+) -> list[HybridSearchHit]:
+    """Return the best fused keyword and semantic hits without loading documents.
+
+    Each side contributes its top ``candidates`` essays: full-text matches on
+    any of ``query_terms`` and nearest neighbours of ``query_vector`` under the
+    serving model. The ranks are fused by weighted reciprocal-rank fusion, then
+    the local user's favourites and dismissals and the document's authority
+    adjust the score. On Postgres this is one statement; elsewhere FTS5 ranks
+    and in-process cosines are fused by the same formula.
+    """
+    session = db.current_session()
+    terms = sorted({term.lower() for term in query_terms if term})
+    if not terms and not query_vector:
+        return []
+    if session.bind is not None and session.bind.dialect.name == "postgresql":
+        return _postgres_hybrid_search(terms, query_vector, candidates=candidates, limit=limit)
+    return _portable_hybrid_search(terms, query_vector, candidates=candidates, limit=limit)
+
+
+def _postgres_hybrid_search(terms: list[str], query_vector: list[float] | None, *, candidates: int, limit: int) -> list[HybridSearchHit]:
+    session = db.current_session()
+    params: dict[str, object] = {
+        "document_type": DocumentType.ESSAY.value,
+        "crawl_status": CrawlStatus.FETCHED.value,
+        "candidates": max(1, min(candidates, 500)),
+        "limit": max(1, limit),
+        "rrf_k": RRF_K,
+        "keyword_weight": KEYWORD_FUSION_WEIGHT,
+        "semantic_weight": SEMANTIC_FUSION_WEIGHT,
+        "favorite_bonus": FAVORITE_SEARCH_BONUS,
+        "dismissed_penalty": DISMISSED_SEARCH_PENALTY,
+        "min_score": MIN_SEARCH_SCORE,
+        "min_similarity": SEMANTIC_MIN_SIMILARITY,
+        "authority_weight": AUTHORITY_SEARCH_WEIGHT,
+        "user_id": get_local_user_id(),
+    }
+    ctes: list[str] = []
+    rankings: list[str] = []
+    if terms:
+        params["keyword_query"] = " or ".join(terms)
+        rankings.append("keyword")
+        ctes.append(
+            """
+            keyword as (
+                select matched.id, row_number() over (order by matched.score desc, matched.id desc) as rank,
+                       matched.score / max(matched.score) over () as strength
+                from (
+                    select d.id, ts_rank_cd(d.search_vector, q.tsquery) as score
+                    from documents d, websearch_to_tsquery('simple', :keyword_query) as q(tsquery)
+                    where d.document_type = :document_type
+                      and d.crawl_status = :crawl_status
+                      and d.search_vector @@ q.tsquery
+                    order by score desc, d.id desc
+                    limit :candidates
+                ) matched
+                where matched.score > 0
+            )
+            """
+        )
+    registered = embeddings_dao.get_serving_model() if query_vector else None
+    if registered is not None and registered.dimensions == len(query_vector):
+        dimensions = int(registered.dimensions)
+        params["query_vector"] = "[" + ",".join(f"{value:.8f}" for value in query_vector) + "]"
+        params["model"] = registered.name
+        rankings.append("semantic")
+        # The cast width must match the partial index expression for this model.
+        distance = f"(e.vector::vector({dimensions})) <=> cast(:query_vector as vector({dimensions}))"
+        ctes.append(
+            f"""
+            semantic as (
+                select nearest.id, row_number() over (order by nearest.distance, nearest.id) as rank,
+                       1 - nearest.distance as similarity
+                from (
+                    select e.document_id as id, {distance} as distance
+                    from document_embeddings e
+                    join documents d on d.id = e.document_id
+                    where e.model = :model
+                      and d.document_type = :document_type
+                      and d.crawl_status = :crawl_status
+                    order by {distance}
+                    limit :candidates
+                ) nearest
+                where nearest.distance <= 1 - :min_similarity
+            )
+            """
+        )
+    if not ctes:
+        return []
+    if len(ctes) == 2:
+        fused = (
+            "select coalesce(k.id, s.id) as id, k.rank as keyword_rank, k.strength as keyword_strength, "
+            "s.rank as semantic_rank, s.similarity "
+            "from keyword k full outer join semantic s on s.id = k.id"
+        )
+    elif terms:
+        fused = (
+            "select id, rank as keyword_rank, strength as keyword_strength, "
+            "null::bigint as semantic_rank, null::float8 as similarity from keyword"
+        )
+    else:
+        fused = (
+            "select id, null::bigint as keyword_rank, null::float8 as keyword_strength, "
+            "rank as semantic_rank, similarity from semantic"
+        )
+    rows = session.execute(
+        text(
+            f"""
+            with {", ".join(ctes)},
+            fused as ({fused}),
+            scored as (
+                select
+                    f.id,
+                    f.keyword_rank,
+                    f.semantic_rank,
+                    f.similarity,
+                    {_fused_relevance_sql(rankings)}
+                    + case when m.favorited_at is not null then :favorite_bonus else 0 end
+                    - case when m.dismissed_at is not null then :dismissed_penalty else 0 end as relevance,
+                    coalesce(a.score, 0) as authority
+                from fused f
+                left join user_document_mappings m on m.document_id = f.id and m.user_id = :user_id
+                left join document_authority a on a.document_id = f.id
+            )
+            select id, keyword_rank, semantic_rank, similarity,
+                   relevance + :authority_weight * authority as score
+            from scored
+            where relevance > :min_score
+            order by score desc, id desc
+            limit :limit
+            """
+        ),
+        params,
+    ).all()
+    return [
+        HybridSearchHit(
+            document_id=int(row.id),
+            score=float(row.score),
+            keyword_rank=None if row.keyword_rank is None else int(row.keyword_rank),
+            semantic_rank=None if row.semantic_rank is None else int(row.semantic_rank),
+            similarity=None if row.similarity is None else float(row.similarity),
+        )
+        for row in rows
+    ]
+
+
+def _fused_relevance_sql(rankings: list[str]) -> str:
+    """Return the SQL fusing row ``f`` of ``fused`` like ``reciprocal_rank_fusion``.
+
+    Only ranking CTEs that returned rows count towards the scale, so when no
+    keyword matches, semantic hits score the same as on the portable path.
+    """
+    weight_total = " + ".join(f"case when exists (select 1 from {name}) then :{name}_weight else 0 end" for name in rankings)
+    return (
+        "(coalesce(:keyword_weight * f.keyword_strength / (:rrf_k + f.keyword_rank), 0)"
+        " + coalesce(:semantic_weight * f.similarity / (:rrf_k + f.semantic_rank), 0))"
+        f" * (:rrf_k + 1.0) / nullif({weight_total}, 0)"
+    )
+
+
+def _portable_hybrid_search(terms: list[str], query_vector: list[float] | None, *, candidates: int, limit: int) -> list[HybridSearchHit]:
+    session = db.current_session()
+    keyword_ids: list[int] = []
+    keyword_strengths: dict[int, float] = {}
+    if terms:
+        rows = session.execute(
+            text(
+                f"""
+                select d.id, bm25(documents_fts, {FTS5_COLUMN_WEIGHTS}) as rank
+                from documents_fts
+                join documents d on d.id = documents_fts.rowid
+                where documents_fts match :query
+                  and d.document_type = :document_type
+                  and d.crawl_status = :crawl_status
+                order by rank, d.id desc
+                limit :candidates
+                """
+            ),
+            {
+                "query": " OR ".join(f'"{term}"*' for term in terms),
+                "document_type": DocumentType.ESSAY.value,
+                "crawl_status": CrawlStatus.FETCHED.value,
+                "candidates": max(1, candidates),
+            },
+        ).all()
+        # bm25 is negative and lower is better; zero means no relevant match.
+        matched = [row for row in rows if row.rank < 0]
+        best = matched[0].rank if matched else -1.0
+        keyword_ids = [int(row.id) for row in matched]
+        keyword_strengths = {int(row.id): float(row.rank) / best for row in matched}
+    semantic_ids: list[int] = []
+    similarities: dict[int, float] = {}
+    if query_vector:
+        ids, vectors = _searchable_document_vectors()
+        matrix, _present = stack_vectors([loads_embedding_array(vector) for vector in vectors], len(query_vector))
+        scores = cosine_scores(query_vector, matrix)
+        for index in top_k(scores, candidates, min_score=SEMANTIC_MIN_SIMILARITY):
+            semantic_ids.append(ids[index])
+            similarities[ids[index]] = float(scores[index])
+    fused = reciprocal_rank_fusion(
+        [keyword_ids, semantic_ids],
+        [KEYWORD_FUSION_WEIGHT, SEMANTIC_FUSION_WEIGHT],
+        strengths=[keyword_strengths, similarities],
+    )
+    saved_ids = get_favorited_document_ids()
+    dismissed_ids = get_dismissed_document_ids()
+    authority = authority_dao.get_document_authority(list(fused))
+    keyword_ranks = {document_id: rank for rank, document_id in enumerate(keyword_ids, start=1)}
+    semantic_ranks = {document_id: rank for rank, document_id in enumerate(semantic_ids, start=1)}
+    hits: list[HybridSearchHit] = []
+    for document_id, score in fused.items():
+        relevance = (
+            score
+            + (FAVORITE_SEARCH_BONUS if document_id in saved_ids else 0.0)
+            - (DISMISSED_SEARCH_PENALTY if document_id in dismissed_ids else 0.0)
+        )
+        if relevance <= MIN_SEARCH_SCORE:
+            continue
+        hits.append(
+            HybridSearchHit(
+                document_id=document_id,
+                score=relevance + AUTHORITY_SEARCH_WEIGHT * authority.get(document_id, 0.0),
+                keyword_rank=keyword_ranks.get(document_id),
+                semantic_rank=semantic_ranks.get(document_id),
+                similarity=similarities.get(document_id),
+            )
+        )
+    hits.sort(key=lambda hit: (hit.score, hit.document_id), reverse=True)
+    return hits[: max(1, limit)]
+
+
+def _searchable_document_vectors() -> tuple[list[int], list[bytes]]:
+    session = db.current_session()
+    rows = session.execute(
+        select(Document.id, Document.embedding_vector)
+        .where(Document.document_type == DocumentType.ESSAY.value)
+        .where(Document.crawl_status == CrawlStatus.FETCHED.value)
+        .where(Document.embedding_vector.is_not(None))
+    ).all()
+    return [int(document_id) for document_id, _vector in rows], [vector for _document_id, vector in rows]
+
+
+def get_ranked_documents(document_ids: Sequence[int]) -> dict[int, Document]:
+    """Load card columns, the source and the keyword text excerpt for ranked ids."""
+    if not document_ids:
+        return {}
+    session = db.current_session()
+    documents = session.execute(
+        select(Document)
+        .options(document_card_load(), joinedload(Document.source), search_text_excerpt())
+        .where(Document.id.in_(list(document_ids)))
+    ).scalars().all()
+    return {document.id: document for document in documents}
+
+
 def _ranked_documents_from_id_scores(id_scores: list[tuple[int, float]], *, reason: str) -> list[RankedDocument]:
     if not id_scores:
         return []
     session = db.current_session()
     document_ids = [document_id for document_id, _score in id_scores]
     documents = (
-        session.execute(select(Document).options(joinedload(Document.source)).where(Document.id.in_(document_ids)))
+        session.execute(
+            select(Document).options(document_card_load(), joinedload(Document.source)).where(Document.id.in_(document_ids))
+        )
         .scalars()
         .all()
     )
@@ -136,15 +426,15 @@ def _ranked_documents_from_id_scores(id_scores: list[tuple[int, float]], *, reas
     ]
 
 
-def _picker_keyword_score(terms: list[str], document: Document) -> float:
+def _picker_keyword_score(terms: list[str], document: Document, *, text_hits: int) -> float:
+    # Body matches are counted in SQL (``text_hits``) so the article text is never fetched.
     title = (document.title or "").lower()
     one_liner = (document.one_liner or "").lower()
     audience = (document.audience or "").lower()
     summary = (document.summary or "").lower()
     takeaways = " ".join(document.takeaways or []).lower()
     source = document.source.canonical_domain.lower()
-    text = (document.extracted_text or "").lower()
-    score = 0.0
+    score = 0.5 * text_hits
     for term in terms:
         if term in title:
             score += 4.0
@@ -158,19 +448,19 @@ def _picker_keyword_score(terms: list[str], document: Document) -> float:
             score += 2.0
         if term in takeaways:
             score += 2.0
-        if term in text:
-            score += 0.5
     return score
 
 
 def get_favorited_document_ids() -> set[int]:
     """Return document ids favorited by the local user."""
     session = db.current_session()
-    user = get_or_create_local_user()
+    user_id = get_local_user_id()
+    if user_id is None:
+        return set()
     return set(
         session.execute(
             select(UserDocumentMapping.document_id)
-            .where(UserDocumentMapping.user_id == user.id)
+            .where(UserDocumentMapping.user_id == user_id)
             .where(UserDocumentMapping.favorited_at.is_not(None))
         )
         .scalars()
@@ -181,11 +471,13 @@ def get_favorited_document_ids() -> set[int]:
 def get_dismissed_document_ids() -> set[int]:
     """Return document ids dismissed by the local user."""
     session = db.current_session()
-    user = get_or_create_local_user()
+    user_id = get_local_user_id()
+    if user_id is None:
+        return set()
     return set(
         session.execute(
             select(UserDocumentMapping.document_id)
-            .where(UserDocumentMapping.user_id == user.id)
+            .where(UserDocumentMapping.user_id == user_id)
             .where(UserDocumentMapping.dismissed_at.is_not(None))
         )
         .scalars()
@@ -204,25 +496,43 @@ def get_document(document_id: int) -> Document | None:
     return db.current_session().get(Document, document_id)
 
 
-def vector_search_documents(query_vector: list[float], *, limit: int, exclude_document_id: int | None = None) -> list[tuple[Document, float]]:
-    """Return nearest documents using pgvector."""
+def vector_search_documents(
+    query_vector: list[float] | None,
+    *,
+    limit: int,
+    exclude_document_id: int | None = None,
+    model: str | None = None,
+) -> list[tuple[Document, float]]:
+    """Return nearest documents from one model's pgvector HNSW index.
+
+    ``model`` defaults to the serving model. A query vector whose width does
+    not match that model returns nothing rather than comparing across models.
+    """
     session = db.current_session()
-    if session.bind is None or session.bind.dialect.name != "postgresql":
+    if not query_vector or session.bind is None or session.bind.dialect.name != "postgresql":
         return []
+    registered = embeddings_dao.get_embedding_model(model) if model else embeddings_dao.get_serving_model()
+    if registered is None or registered.dimensions != len(query_vector):
+        return []
+    dimensions = int(registered.dimensions)
     vector_literal = "[" + ",".join(f"{value:.8f}" for value in query_vector) + "]"
+    # The cast width must match the partial index expression for this model.
+    distance = f"(e.vector::vector({dimensions})) <=> cast(:query_vector as vector({dimensions}))"
     rows = session.execute(
         text(
-            "select id, 1 - (embedding_vector <=> cast(:query_vector as vector)) as similarity "
-            "from documents "
-            "where document_type = :document_type "
-            "and crawl_status = :crawl_status "
-            "and embedding_vector is not null "
-            "and (:exclude_document_id is null or id != :exclude_document_id) "
-            "order by embedding_vector <=> cast(:query_vector as vector) "
+            f"select e.document_id as id, 1 - ({distance}) as similarity "
+            "from document_embeddings e "
+            "join documents d on d.id = e.document_id "
+            "where e.model = :model "
+            "and d.document_type = :document_type "
+            "and d.crawl_status = :crawl_status "
+            "and (:exclude_document_id is null or d.id != :exclude_document_id) "
+            f"order by {distance} "
             "limit :limit"
         ),
         {
             "query_vector": vector_literal,
+            "model": registered.name,
             "document_type": DocumentType.ESSAY.value,
             "crawl_status": CrawlStatus.FETCHED.value,
             "limit": max(1, min(limit, 500)),
@@ -230,9 +540,5 @@ def vector_search_documents(query_vector: list[float], *, limit: int, exclude_do
         },
     ).all()
 
-    document_ids = [int(row.id) for row in rows]
-    if not document_ids:
-        return []
-    documents = session.execute(select(Document).options(joinedload(Document.source)).where(Document.id.in_(document_ids))).scalars().all()
-    by_id = {document.id: document for document in documents}
+    by_id = get_ranked_documents([int(row.id) for row in rows])
     return [(by_id[int(row.id)], float(row.similarity)) for row in rows if int(row.id) in by_id]
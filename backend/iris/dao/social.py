@@ -10,6 +10,7 @@ from sqlalchemy import or_, select
 from sqlalchemy.orm import joinedload
 
 from iris.dao import db
+from iris.dao.documents import document_card_load
 from iris.dao.sources import get_or_create_source
 from iris.models import (
     BookshelfStatus,
@@ -321,7 +322,7 @@ def friend_feed(
         select(UserDocumentMapping, User)
         .join(User, User.id == UserDocumentMapping.user_id)
         .options(
-            joinedload(UserDocumentMapping.document).joinedload(Document.source)
+            joinedload(UserDocumentMapping.document).options(document_card_load(), joinedload(Document.source))
         )
         .where(
             UserDocumentMapping.user_id.in_(friend_ids),
@@ -353,7 +354,7 @@ def friend_feed(
         .options(
             joinedload(DocumentHighlight.user_document_mapping)
             .joinedload(UserDocumentMapping.document)
-            .joinedload(Document.source),
+            .options(document_card_load(), joinedload(Document.source)),
             joinedload(DocumentHighlight.user_document_mapping)
             .joinedload(UserDocumentMapping.user),
         )
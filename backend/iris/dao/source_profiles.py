@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
-from sqlalchemy import or_, select
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import undefer
 
 from iris.dao import db
 from iris.models import Document, Source, SourceProfileAnalysis
@@ -73,16 +74,79 @@ def upsert_analysis(
     analysis.input_fingerprint = input_fingerprint
     analysis.error = error
     analysis.generated_at = datetime.now(timezone.utc) if status == SourceProfileAnalysisStatus.SUCCEEDED else None
+    analysis.queued_at = None
+    analysis.started_at = None
     db.flush()
     return analysis
 
 
+def enqueue_analysis(source: Source, *, fingerprint: str) -> SourceProfileAnalysis:
+    """Queue profile generation for a source, keeping the previous payload visible meanwhile."""
+    analysis = get_or_create_analysis(source)
+    analysis.status = SourceProfileAnalysisStatus.PENDING
+    analysis.input_fingerprint = fingerprint
+    analysis.queued_at = datetime.now(timezone.utc)
+    analysis.started_at = None
+    analysis.error = None
+    db.flush()
+    return analysis
+
+
+def claim_queued_analyses(*, limit: int, stale_before: datetime) -> list[SourceProfileAnalysis]:
+    """Mark the oldest queued analyses as running and return them.
+
+    Running rows claimed before ``stale_before`` belong to a worker that died
+    and are claimed again. Postgres skips rows another worker has locked.
+    """
+    rows = list(
+        db.current_session().scalars(
+            select(SourceProfileAnalysis)
+            .where(
+                or_(
+                    and_(
+                        SourceProfileAnalysis.status == SourceProfileAnalysisStatus.PENDING,
+                        SourceProfileAnalysis.queued_at.is_not(None),
+                    ),
+                    and_(
+                        SourceProfileAnalysis.status == SourceProfileAnalysisStatus.RUNNING,
+                        SourceProfileAnalysis.started_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(SourceProfileAnalysis.queued_at.asc(), SourceProfileAnalysis.id.asc())
+            .limit(max(1, limit))
+            .with_for_update(skip_locked=True)
+        )
+    )
+    started_at = datetime.now(timezone.utc)
+    for analysis in rows:
+        analysis.status = SourceProfileAnalysisStatus.RUNNING
+        analysis.started_at = started_at
+    db.flush()
+    return rows
+
+
+def count_queued_analyses() -> dict[str, int]:
+    """Return queued and running profile job counts."""
+    rows = db.current_session().execute(
+        select(SourceProfileAnalysis.status, func.count(SourceProfileAnalysis.id))
+        .where(SourceProfileAnalysis.queued_at.is_not(None))
+        .group_by(SourceProfileAnalysis.status)
+    ).all()
+    counts = {str(getattr(status, "value", status)): count for status, count in rows}
+    return {
+        "queued": counts.get(SourceProfileAnalysisStatus.PENDING.value, 0),
+        "running": counts.get(SourceProfileAnalysisStatus.RUNNING.value, 0),
+    }
+
+
 def get_documents_for_profile(source_id: int, *, limit: int = 500) -> list[Document]:
     """Return fetched source documents ordered for profile analysis."""
     session = db.current_session()
     return list(
         session.scalars(
             select(Document)
+            .options(undefer(Document.extracted_text))
             .join(Source, Source.id == Document.source_id)
             .where(Document.source_id == source_id)
             .where(Document.crawl_status == CrawlStatus.FETCHED.value)
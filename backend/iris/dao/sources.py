@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
+
 from sqlalchemy import select
 
 from iris.dao import db
-from iris.models import Source
+from iris.models import Source, SourceHomepageClassification
 from iris.schemas.enums import SourceStatus
 from iris.services.common.url_utils import domain_for_url, normalize_url, root_url_for_domain
 
@@ -40,3 +42,76 @@ def get_or_create_source(
     session.add(source)
     session.flush()
     return source
+
+
+def get_or_create_sources(
+    urls: Iterable[str],
+    *,
+    status: str = SourceStatus.QUEUED.value,
+    discovered_from_source_id: int | None = None,
+) -> tuple[dict[str, Source], int]:
+    """Return sources for many URLs by domain with one lookup, creating missing ones, and how many were created."""
+    session = db.current_session()
+    roots: dict[str, str] = {}
+    for url in urls:
+        normalized_url = normalize_url(url)
+        roots.setdefault(domain_for_url(normalized_url), root_url_for_domain(normalized_url))
+    if not roots:
+        return {}, 0
+    sources = {
+        source.canonical_domain: source
+        for source in session.execute(select(Source).where(Source.canonical_domain.in_(roots))).scalars()
+    }
+    created = 0
+    for domain, root_url in roots.items():
+        source = sources.get(domain)
+        if source is not None:
+            if source.status != SourceStatus.IGNORED.value and status == SourceStatus.IGNORED.value:
+                source.status = status
+            if source.url != root_url and source.discovered_from_source_id is not None:
+                source.url = root_url
+            continue
+        sources[domain] = Source(
+            canonical_domain=domain,
+            url=root_url,
+            status=status,
+            discovered_from_source_id=discovered_from_source_id,
+        )
+        session.add(sources[domain])
+        created += 1
+    session.flush()
+    return sources, created
+
+
+def get_sources_to_classify(*, after_id: int, limit: int, include_classified: bool = False) -> list[Source]:
+    """Return the next queued sources in id order, skipping ones already classified from their homepage."""
+    session = db.current_session()
+    statement = select(Source).where(Source.status == SourceStatus.QUEUED.value).where(Source.id > after_id)
+    if not include_classified:
+        statement = statement.where(Source.classified_at.is_(None))
+    return session.execute(statement.order_by(Source.id.asc()).limit(limit)).scalars().all()
+
+
+def get_homepage_classifications(content_hashes: Iterable[str]) -> dict[str, SourceHomepageClassification]:
+    """Return cached homepage verdicts keyed by content hash."""
+    hashes = sorted(set(content_hashes))
+    if not hashes:
+        return {}
+    session = db.current_session()
+    rows = session.execute(
+        select(SourceHomepageClassification).where(SourceHomepageClassification.content_hash.in_(hashes))
+    ).scalars()
+    return {row.content_hash: row for row in rows}
+
+
+def store_homepage_classification(content_hash: str, *, status: str, reason: str, model: str) -> SourceHomepageClassification:
+    """Cache one homepage verdict, keeping an existing row for the same hash."""
+    session = db.current_session()
+    existing = session.execute(
+        select(SourceHomepageClassification).where(SourceHomepageClassification.content_hash == content_hash)
+    ).scalar_one_or_none()
+    if existing is not None:
+        return existing
+    row = SourceHomepageClassification(content_hash=content_hash, status=status, reason=reason, model=model)
+    session.add(row)
+    return row
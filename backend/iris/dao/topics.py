@@ -0,0 +1,111 @@
+"""Persistence helpers for the normalized document topic index."""
+
+from __future__ import annotations
+
+from collections import Counter
+
+from sqlalchemy import Text, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+from iris.dao import db
+from iris.dao.postings import mark_postings_changed
+from iris.models import Document, DocumentTopic, Topic
+
+
+def topic_slug(value: str) -> str:
+    """Normalize a topic label into its lookup key."""
+    return str(value).strip().lower()[:255]
+
+
+def sync_document_topics(document: Document) -> None:
+    """Mirror ``document.topics`` into ``document_topics`` and adjust topic frequencies."""
+    session = db.current_session()
+    wanted: dict[str, str] = {}
+    for topic in document.topics or []:
+        slug = topic_slug(topic)
+        if slug:
+            wanted.setdefault(slug, str(topic).strip()[:255])
+    existing = set(session.scalars(select(DocumentTopic.topic_slug).where(DocumentTopic.document_id == document.id)))
+    added = wanted.keys() - existing
+    removed = existing - wanted.keys()
+    if not added and not removed:
+        return
+    if removed:
+        session.execute(
+            delete(DocumentTopic).where(
+                DocumentTopic.document_id == document.id,
+                DocumentTopic.topic_slug.in_(removed),
+            )
+        )
+    session.add_all(DocumentTopic(document_id=document.id, topic_slug=slug) for slug in sorted(added))
+    deltas = Counter({slug: 1 for slug in added})
+    deltas.subtract({slug: 1 for slug in removed})
+    _adjust_topic_counts(deltas, names=wanted)
+    mark_postings_changed([document.id])
+    session.flush()
+
+
+def delete_document_topics(document_ids: list[int]) -> None:
+    """Remove topic rows for documents that are about to be deleted."""
+    if not document_ids:
+        return
+    session = db.current_session()
+    counts = session.execute(
+        select(DocumentTopic.topic_slug, func.count())
+        .where(DocumentTopic.document_id.in_(document_ids))
+        .group_by(DocumentTopic.topic_slug)
+    ).all()
+    session.execute(delete(DocumentTopic).where(DocumentTopic.document_id.in_(document_ids)))
+    _adjust_topic_counts(Counter({slug: -count for slug, count in counts}), names={})
+
+
+def document_topic_filter(value: str) -> ColumnElement[bool]:
+    """Return a ``Document`` predicate matching one topic, backed by an index on every dialect."""
+    slug = topic_slug(value)
+    if db.current_session().get_bind().dialect.name == "postgresql":
+        return _lowered_topics_jsonb().contains([slug])
+    return Document.id.in_(select(DocumentTopic.document_id).where(DocumentTopic.topic_slug == slug))
+
+
+def document_topics_for_slugs(slugs: set[str], *, document_ids: list[int] | None = None) -> list[tuple[int, str]]:
+    """Return ``(document_id, topic_slug)`` pairs for the requested topics."""
+    if not slugs:
+        return []
+    statement = select(DocumentTopic.document_id, DocumentTopic.topic_slug).where(DocumentTopic.topic_slug.in_(slugs))
+    if document_ids is not None:
+        statement = statement.where(DocumentTopic.document_id.in_(document_ids))
+    return [(document_id, slug) for document_id, slug in db.current_session().execute(statement).all()]
+
+
+def get_topic_facets(*, q: str | None = None, limit: int = 50) -> list[Topic]:
+    """Return the most frequent topics, optionally narrowed by slug prefix."""
+    statement = select(Topic).where(Topic.document_count > 0)
+    if q and q.strip():
+        statement = statement.where(Topic.slug.startswith(topic_slug(q), autoescape=True))
+    statement = statement.order_by(Topic.document_count.desc(), Topic.slug.asc()).limit(max(1, min(limit, 500)))
+    return db.current_session().execute(statement).scalars().all()
+
+
+def _adjust_topic_counts(deltas: Counter[str], *, names: dict[str, str]) -> None:
+    session = db.current_session()
+    deltas = Counter({slug: delta for slug, delta in deltas.items() if delta})
+    if not deltas:
+        return
+    existing = dict(session.execute(select(Topic.slug, Topic.id).where(Topic.slug.in_(deltas))).all())
+    for slug, delta in deltas.items():
+        topic_id = existing.get(slug)
+        if topic_id is not None:
+            session.execute(
+                update(Topic)
+                .where(Topic.id == topic_id)
+                .values(document_count=Topic.document_count + delta)
+                .execution_options(synchronize_session=False)
+            )
+        elif delta > 0:
+            session.add(Topic(slug=slug, name=names.get(slug, slug), document_count=delta))
+
+
+def _lowered_topics_jsonb():
+    # Matches the expression indexed by ``ix_documents_topics_lower_gin``.
+    return cast(func.lower(cast(Document.topics, Text)), JSONB)
@@ -3,18 +3,26 @@
 from __future__ import annotations
 
 import re
+from collections import OrderedDict
 from datetime import datetime, timezone
+from threading import Lock
 
 from sqlalchemy import select
 
 from iris.dao import db
+from iris.dao.postings import mark_postings_changed
 from iris.models import Document, DocumentCategory, DocumentTag, Tag, TagScope, User, UserDocumentMapping
-from iris.services.auth import FirebaseIdentity
+from iris.services.auth import FirebaseIdentity, record_user_cache
+from iris.services.common.config import AUTH_USER_CACHE_SIZE
 
 
 LOCAL_USER_EMAIL = "local@iris.local"
 SYSTEM_NAMESPACE = "system"
 
+_firebase_user_lock = Lock()
+# Firebase uid -> Iris user id, least recently used first.
+_firebase_user_ids: OrderedDict[str, int] = OrderedDict()
+
 
 CATEGORY_KEYWORDS: dict[DocumentCategory, set[str]] = {
     DocumentCategory.SCIENCE: {"science", "biology", "physics", "chemistry", "neuroscience", "research", "statistics"},
@@ -43,27 +51,82 @@ def get_or_create_local_user() -> User:
     return user
 
 
+def get_local_user_id() -> int | None:
+    """Return the local user's id without creating it, for read-only sessions."""
+    session = db.current_session()
+    return session.scalar(select(User.id).where(User.email == LOCAL_USER_EMAIL))
+
+
 def get_or_create_firebase_user(identity: FirebaseIdentity) -> User:
-    """Return the Iris user mapped to a Firebase user, creating it when needed."""
+    """Return the Iris user mapped to a Firebase user, creating it when needed.
+
+    Known uids resolve by primary key through a small uid cache, and profile
+    fields are only written when the token carries different values.
+    """
     session = db.current_session()
-    user = session.execute(
-        select(User).where(User.firebase_uid == identity.uid)
-    ).scalar_one_or_none()
+    email = _identity_email(identity)
+    changed = False
+    user = _cached_firebase_user(identity.uid)
+    record_user_cache(user is not None)
+    if user is None:
+        user = session.execute(
+            select(User).where(User.firebase_uid == identity.uid)
+        ).scalar_one_or_none()
     if user is None:
-        email = _identity_email(identity)
         user = session.execute(select(User).where(User.email == email)).scalar_one_or_none()
         if user is None:
             user = User(email=email, firebase_uid=identity.uid)
             session.add(user)
         else:
             user.firebase_uid = identity.uid
-    user.email = _identity_email(identity)
-    user.display_name = identity.display_name or identity.email or user.email
-    user.photo_url = identity.photo_url
-    session.flush()
+        changed = True
+    profile = {
+        "email": email,
+        "display_name": identity.display_name or identity.email or email,
+        "photo_url": identity.photo_url,
+    }
+    for key, value in profile.items():
+        if getattr(user, key) != value:
+            setattr(user, key, value)
+            changed = True
+    if changed:
+        session.flush()
+    _remember_firebase_user(identity.uid, user.id)
     return user
 
 
+def forget_firebase_users() -> None:
+    """Drop cached Firebase uid to user id mappings."""
+    with _firebase_user_lock:
+        _firebase_user_ids.clear()
+
+
+def _cached_firebase_user(uid: str) -> User | None:
+    with _firebase_user_lock:
+        user_id = _firebase_user_ids.get(uid)
+        if user_id is not None:
+            _firebase_user_ids.move_to_end(uid)
+    if user_id is None:
+        return None
+    user = db.current_session().get(User, user_id)
+    if user is None or user.firebase_uid != uid:
+        # The row was deleted or relinked (or the cache outlived its database).
+        with _firebase_user_lock:
+            _firebase_user_ids.pop(uid, None)
+        return None
+    return user
+
+
+def _remember_firebase_user(uid: str, user_id: int) -> None:
+    if not AUTH_USER_CACHE_SIZE:
+        return
+    with _firebase_user_lock:
+        _firebase_user_ids[uid] = user_id
+        _firebase_user_ids.move_to_end(uid)
+        while len(_firebase_user_ids) > AUTH_USER_CACHE_SIZE:
+            _firebase_user_ids.popitem(last=False)
+
+
 def _identity_email(identity: FirebaseIdentity) -> str:
     if identity.email:
         return identity.email.lower()
@@ -151,6 +214,7 @@ def tag_document(
         assignment_namespace=assignment_namespace,
     )
     session.add(document_tag)
+    mark_postings_changed([document.id])
     session.flush()
     return document_tag
 
@@ -1,4 +1,7 @@
 from iris.schemas.enums import (
+    AnalysisBatchMode,
+    AnalysisBatchStatus,
+    AuthorityGraph,
     CrawlJobStatus,
     CrawlStatus,
     AgentMessageRole,
@@ -10,6 +13,7 @@ from iris.schemas.enums import (
     FriendshipStatus,
     DocumentCategory,
     DocumentType,
+    EmbeddingModelStatus,
     IndexEventType,
     IndexMode,
     IndexRunStatus,
@@ -18,13 +22,24 @@ from iris.schemas.enums import (
     TagScope,
 )
 from iris.models.sqla import (
+    AnalysisBatch,
+    AuthorityRun,
+    BackfillCheckpoint,
     CrawlJob,
     Document,
+    DocumentAuthority,
+    DocumentEmbedding,
+    DocumentTopic,
+    EmbeddingModel,
     IndexEvent,
     IndexRun,
     Link,
+    PostingChange,
     Source,
+    SourceAuthority,
+    SourceHomepageClassification,
     SourceProfileAnalysis,
+    Topic,
 )
 from iris.models.user import (
     AgentConversation,
@@ -45,6 +60,12 @@ from iris.models.user import (
 )
 
 __all__ = [
+    "AnalysisBatch",
+    "AnalysisBatchMode",
+    "AnalysisBatchStatus",
+    "AuthorityGraph",
+    "AuthorityRun",
+    "BackfillCheckpoint",
     "CrawlJobStatus",
     "AgentMessageRole",
     "AgentStepKind",
@@ -61,11 +82,16 @@ __all__ = [
     "CrawlStatus",
     "CrawlJob",
     "Document",
+    "DocumentAuthority",
     "DocumentCategory",
     "DocumentCategoryAssignment",
     "DocumentHighlight",
     "DocumentTag",
+    "DocumentEmbedding",
+    "DocumentTopic",
+    "EmbeddingModel",
     "DocumentType",
+    "EmbeddingModelStatus",
     "Friendship",
     "FriendshipStatus",
     "IndexEvent",
@@ -75,11 +101,15 @@ __all__ = [
     "IndexRunStatus",
     "Link",
     "LinkType",
+    "PostingChange",
     "Source",
+    "SourceAuthority",
+    "SourceHomepageClassification",
     "SourceProfileAnalysis",
     "SourceStatus",
     "Tag",
     "TagScope",
+    "Topic",
     "User",
     "UserDocumentMapping",
     "UserProfile",
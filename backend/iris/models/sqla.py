@@ -1,18 +1,23 @@
 from __future__ import annotations
 
+from collections.abc import Callable
 from datetime import datetime, timezone
 from uuid import uuid4
 from sqlalchemy import Enum as SqlEnum
-from sqlalchemy import ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import DDL, BigInteger, Float, ForeignKey, Index, Integer, JSON, LargeBinary, String, Text, UniqueConstraint, event
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 from pgvector.sqlalchemy import Vector
 
 from iris.dao.db import Base
 from iris.schemas.enums import (
+    AnalysisBatchMode,
+    AnalysisBatchStatus,
+    AuthorityGraph,
     CrawlJobStatus,
     CrawlStatus,
     DocumentCategory,
     DocumentType,
+    EmbeddingModelStatus,
     IndexEventType,
     IndexMode,
     IndexRunStatus,
@@ -21,12 +26,21 @@ from iris.schemas.enums import (
     SourceStatus,
     StringEnum,
 )
+from iris.services.common import url_utils
 
 
 def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _url_hash_default(column: str, hasher: Callable[[str], int]):
+    def default(context) -> int | None:
+        url = context.get_current_parameters().get(column)
+        return hasher(url) if url else None
+
+    return default
+
+
 def enum_values(enum_class: type[StringEnum]) -> list[str]:
     return [item.value for item in enum_class]
 
@@ -61,11 +75,25 @@ class Source(Base):
     status: Mapped[SourceStatus] = mapped_column(enum_type(SourceStatus, "source_status"), default=SourceStatus.QUEUED, index=True)
     rss_url: Mapped[str | None] = mapped_column(Text, nullable=True)
     sitemap_url: Mapped[str | None] = mapped_column(Text, nullable=True)
+    classified_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
     documents: Mapped[list["Document"]] = relationship(back_populates="source", cascade="all, delete-orphan")
     profile_analysis: Mapped["SourceProfileAnalysis | None"] = relationship(back_populates="source", cascade="all, delete-orphan", uselist=False)
 
 
+class SourceHomepageClassification(Base):
+    """A cached LLM verdict for one homepage text, shared by sources that serve the same page."""
+
+    __tablename__ = "source_homepage_classifications"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    content_hash: Mapped[str] = mapped_column(String(64), unique=True, index=True)
+    status: Mapped[SourceStatus] = mapped_column(enum_type(SourceStatus, "source_homepage_classification_status"))
+    reason: Mapped[str] = mapped_column(Text)
+    model: Mapped[str] = mapped_column(String(120))
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+
+
 class SourceProfileAnalysis(Base):
     """Generated profile analysis for one source, derived from scraped facts and indexed writing."""
 
@@ -87,6 +115,9 @@ class SourceProfileAnalysis(Base):
     model: Mapped[str | None] = mapped_column(String(120), nullable=True)
     input_fingerprint: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Job state: queued rows are pending with ``queued_at`` set; running rows record when a worker claimed them.
+    queued_at: Mapped[datetime | None] = mapped_column(nullable=True, index=True)
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
 
     display_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     bio: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -107,7 +138,7 @@ class Document(Base):
 
     __tablename__ = "documents"
     __table_args__ = (
-        UniqueConstraint("url", name="uq_documents_url"),
+        UniqueConstraint("url_hash", name="uq_documents_url_hash"),
         Index("idx_documents_type_status", "document_type", "crawl_status"),
         Index("idx_documents_uuid", "uuid", unique=True),
     )
@@ -117,8 +148,11 @@ class Document(Base):
     source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"), index=True)
     crawl_job_id: Mapped[int | None] = mapped_column(ForeignKey("crawl_jobs.id"), nullable=True, index=True)
     url: Mapped[str] = mapped_column(Text)
+    url_hash: Mapped[int] = mapped_column(BigInteger, default=_url_hash_default("url", url_utils.url_hash))
+    url_key: Mapped[int | None] = mapped_column(BigInteger, default=_url_hash_default("url", url_utils.url_key), nullable=True, index=True)
     content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
-    embedding_vector: Mapped[list[float] | None] = mapped_column(Vector(1536).with_variant(Text(), "sqlite"), nullable=True)
+    # Heavy columns are deferred: list and search queries load them only on request.
+    embedding_vector: Mapped[list[float] | None] = mapped_column(Vector(1536).with_variant(LargeBinary(), "sqlite"), nullable=True, deferred=True)
 
     crawl_status: Mapped[CrawlStatus] = mapped_column(enum_type(CrawlStatus, "crawl_status"), default=CrawlStatus.PENDING, index=True)
     first_seen_at: Mapped[datetime] = mapped_column(default=utcnow)
@@ -130,12 +164,13 @@ class Document(Base):
     
     title: Mapped[str | None] = mapped_column(Text, nullable=True)
     author: Mapped[str | None] = mapped_column(String(255), nullable=True)
-    extracted_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    extracted_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
     summary: Mapped[str | None] = mapped_column(Text, nullable=True)
     one_liner: Mapped[str | None] = mapped_column(Text, nullable=True)
     audience: Mapped[str | None] = mapped_column(Text, nullable=True)
     takeaways: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
     topics: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    text_excerpt: Mapped[str | None] = query_expression()
     
     source: Mapped[Source] = relationship(back_populates="documents")
     outgoing_links: Mapped[list["Link"]] = relationship(
@@ -145,12 +180,107 @@ class Document(Base):
     )
 
 
+# Document full-text search is maintained by the database, outside the ORM
+# mapping, and indexes the first DOCUMENT_SEARCH_TEXT_CHARS of the article.
+# Postgres keeps a weighted generated tsvector with a GIN index; SQLite keeps
+# an FTS5 table with title, details, topics and body columns in sync with
+# triggers.
+DOCUMENT_SEARCH_TEXT_CHARS = 20000
+_SQLITE_DOCUMENT_SEARCH_ROW = (
+    "coalesce({row}.title, ''), "
+    "coalesce({row}.author, '') || ' ' || coalesce({row}.one_liner, '') || ' ' || coalesce({row}.audience, '') "
+    "|| ' ' || coalesce({row}.summary, '') || ' ' || coalesce({row}.takeaways, ''), "
+    "coalesce({row}.topics, ''), "
+    f"substr(coalesce({{row}}.extracted_text, ''), 1, {DOCUMENT_SEARCH_TEXT_CHARS})"
+)
+DOCUMENT_SEARCH_DDL: dict[str, tuple[str, ...]] = {
+    "postgresql": (
+        "ALTER TABLE documents ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(author, '') || ' ' || coalesce(one_liner, '') || ' ' || "
+        "coalesce(audience, '') || ' ' || coalesce(summary, '') || ' ' || coalesce(takeaways::text, '')), 'B') || "
+        "setweight(to_tsvector('simple', coalesce(topics::text, '')), 'C') || "
+        f"setweight(to_tsvector('simple', left(coalesce(extracted_text, ''), {DOCUMENT_SEARCH_TEXT_CHARS})), 'D')"
+        ") STORED",
+        "CREATE INDEX IF NOT EXISTS ix_documents_search_vector ON documents USING gin (search_vector)",
+    ),
+    "sqlite": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(title, details, topics, body)",
+        "CREATE TRIGGER IF NOT EXISTS documents_fts_insert AFTER INSERT ON documents BEGIN "
+        f"INSERT INTO documents_fts(rowid, title, details, topics, body) VALUES (new.id, {_SQLITE_DOCUMENT_SEARCH_ROW.format(row='new')}); END",
+        "CREATE TRIGGER IF NOT EXISTS documents_fts_delete AFTER DELETE ON documents BEGIN "
+        "DELETE FROM documents_fts WHERE rowid = old.id; END",
+        "CREATE TRIGGER IF NOT EXISTS documents_fts_update AFTER UPDATE OF "
+        "title, author, one_liner, audience, summary, takeaways, topics, extracted_text ON documents BEGIN "
+        "DELETE FROM documents_fts WHERE rowid = old.id; "
+        f"INSERT INTO documents_fts(rowid, title, details, topics, body) VALUES (new.id, {_SQLITE_DOCUMENT_SEARCH_ROW.format(row='new')}); END",
+    ),
+}
+
+for _dialect, _statements in DOCUMENT_SEARCH_DDL.items():
+    for _statement in _statements:
+        event.listen(Document.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
+class Topic(Base):
+    """A normalized document topic with the number of documents that carry it."""
+
+    __tablename__ = "topics"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    slug: Mapped[str] = mapped_column(String(255), unique=True, index=True)
+    name: Mapped[str] = mapped_column(String(255))
+    document_count: Mapped[int] = mapped_column(Integer, default=0, index=True)
+
+
+class DocumentTopic(Base):
+    """One normalized topic assignment mirrored from ``Document.topics``."""
+
+    __tablename__ = "document_topics"
+    __table_args__ = (Index("idx_document_topics_slug_document", "topic_slug", "document_id"),)
+
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), primary_key=True)
+    topic_slug: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+
+class EmbeddingModel(Base):
+    """An embedding model registered for document vectors and its serving state."""
+
+    __tablename__ = "embedding_models"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(120), unique=True, index=True)
+    dimensions: Mapped[int] = mapped_column(Integer)
+    status: Mapped[EmbeddingModelStatus] = mapped_column(
+        enum_type(EmbeddingModelStatus, "embedding_model_status"),
+        default=EmbeddingModelStatus.BUILDING,
+        index=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+    activated_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+
+class DocumentEmbedding(Base):
+    """One document vector produced by one registered embedding model."""
+
+    __tablename__ = "document_embeddings"
+    __table_args__ = (Index("idx_document_embeddings_model_document", "model", "document_id"),)
+
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), primary_key=True)
+    model: Mapped[str] = mapped_column(String(120), primary_key=True)
+    dimensions: Mapped[int] = mapped_column(Integer)
+    # Untyped on Postgres so models of any width share the table; each model
+    # gets its own partial HNSW index over ``vector::vector(dimensions)``.
+    vector: Mapped[list[float]] = mapped_column(Vector().with_variant(LargeBinary(), "sqlite"))
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+
+
 class Link(Base):
     """A normalized hyperlink extracted from one document to another URL."""
 
     __tablename__ = "links"
     __table_args__ = (
-        UniqueConstraint("source_document_id", "target_url", name="uq_links_source_target"),
+        UniqueConstraint("source_document_id", "target_url_hash", name="uq_links_source_target_hash"),
         Index("idx_links_target_domain", "target_domain"),
     )
 
@@ -162,6 +292,10 @@ class Link(Base):
     first_seen_at: Mapped[datetime] = mapped_column(default=utcnow)
 
     target_url: Mapped[str] = mapped_column(Text)
+    target_url_hash: Mapped[int] = mapped_column(BigInteger, default=_url_hash_default("target_url", url_utils.url_hash))
+    target_url_key: Mapped[int | None] = mapped_column(
+        BigInteger, default=_url_hash_default("target_url", url_utils.url_key), nullable=True, index=True
+    )
     target_domain: Mapped[str | None] = mapped_column(String(255), nullable=True)
     anchor_text: Mapped[str | None] = mapped_column(Text, nullable=True)
     context: Mapped[str | None] = mapped_column(Text, nullable=True)
@@ -170,6 +304,43 @@ class Link(Base):
     source_document: Mapped[Document] = relationship(foreign_keys=[source_document_id], back_populates="outgoing_links")
 
 
+class SourceAuthority(Base):
+    """Personalised PageRank authority of a source in the source link graph, scaled so the top source is 1."""
+
+    __tablename__ = "source_authority"
+
+    source_id: Mapped[int] = mapped_column(ForeignKey("sources.id"), primary_key=True)
+    score: Mapped[float] = mapped_column(Float, index=True)
+    computed_at: Mapped[datetime] = mapped_column(default=utcnow)
+
+
+class DocumentAuthority(Base):
+    """Personalised PageRank authority of a document in the document link graph, scaled so the top document is 1."""
+
+    __tablename__ = "document_authority"
+
+    document_id: Mapped[int] = mapped_column(ForeignKey("documents.id"), primary_key=True)
+    score: Mapped[float] = mapped_column(Float, index=True)
+    computed_at: Mapped[datetime] = mapped_column(default=utcnow)
+
+
+class AuthorityRun(Base):
+    """One authority computation over a link graph, with the fingerprint it saw."""
+
+    __tablename__ = "authority_runs"
+    __table_args__ = (Index("idx_authority_runs_graph_computed", "graph", "computed_at"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    graph: Mapped[AuthorityGraph] = mapped_column(enum_type(AuthorityGraph, "authority_graph", length=20))
+    fingerprint: Mapped[str] = mapped_column(String(255))
+    nodes: Mapped[int] = mapped_column(Integer, default=0)
+    edges: Mapped[int] = mapped_column(Integer, default=0)
+    seeds: Mapped[int] = mapped_column(Integer, default=0)
+    iterations: Mapped[int] = mapped_column(Integer, default=0)
+    residual: Mapped[float] = mapped_column(Float, default=0.0)
+    computed_at: Mapped[datetime] = mapped_column(default=utcnow)
+
+
 class CrawlJob(Base):
     """One crawl attempt for a source, optionally attached to an autopilot index run."""
 
@@ -189,6 +360,11 @@ class CrawlJob(Base):
     documents_indexed: Mapped[int] = mapped_column(Integer, default=0)
     links_seen: Mapped[int] = mapped_column(Integer, default=0)
     sources_discovered: Mapped[int] = mapped_column(Integer, default=0)
+    # Page concurrency the host settled at, the most it reached, and how often it pushed back.
+    active_pages: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    peak_active_pages: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    fetch_retries: Mapped[int] = mapped_column(Integer, default=0)
+    throttled_responses: Mapped[int] = mapped_column(Integer, default=0)
     error: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
@@ -219,6 +395,62 @@ class IndexRun(Base):
     stop_reason: Mapped[str | None] = mapped_column(Text, nullable=True)
 
 
+class BackfillCheckpoint(Base):
+    """Resumable progress for one named backfill over documents in id order."""
+
+    __tablename__ = "backfill_checkpoints"
+    __table_args__ = (UniqueConstraint("name", "scope", name="uq_backfill_checkpoints_name_scope"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(120))
+    scope: Mapped[str] = mapped_column(String(255), default="")
+
+    started_at: Mapped[datetime] = mapped_column(default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(default=utcnow, onupdate=utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    last_document_id: Mapped[int] = mapped_column(Integer, default=0)
+    counters: Mapped[dict] = mapped_column(JSON, default=dict)
+
+
+class AnalysisBatch(Base):
+    """One provider batch of document analysis requests, covering a contiguous id range."""
+
+    __tablename__ = "analysis_batches"
+    __table_args__ = (Index("idx_analysis_batches_mode_scope_last", "mode", "scope", "last_document_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    mode: Mapped[AnalysisBatchMode] = mapped_column(enum_type(AnalysisBatchMode, "analysis_batch_mode", length=20))
+    scope: Mapped[str] = mapped_column(String(255), default="")
+    status: Mapped[AnalysisBatchStatus] = mapped_column(
+        enum_type(AnalysisBatchStatus, "analysis_batch_status", length=20), default=AnalysisBatchStatus.PREPARED, index=True
+    )
+
+    created_at: Mapped[datetime] = mapped_column(default=utcnow)
+    submitted_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    completed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    ingested_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    first_document_id: Mapped[int] = mapped_column(Integer)
+    last_document_id: Mapped[int] = mapped_column(Integer)
+    request_count: Mapped[int] = mapped_column(Integer, default=0)
+    request_path: Mapped[str] = mapped_column(String(1024))
+    output_path: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    provider_batch_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    counters: Mapped[dict] = mapped_column(JSON, default=dict)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+
+
+class PostingChange(Base):
+    """A document whose topic, tag or category assignments changed; a null document rebuilds every posting list."""
+
+    __tablename__ = "posting_changes"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    document_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=utcnow, index=True)
+
+
 class IndexEvent(Base):
     """Structured telemetry emitted while planning and crawling an index run."""
 
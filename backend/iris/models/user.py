@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint
+from sqlalchemy import DDL, DateTime, Float, ForeignKey, Index, Integer, JSON, String, Text, UniqueConstraint, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from iris.dao.db import Base
@@ -389,6 +389,12 @@ class AgentConversation(Base):
 
     title: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
+    # Rolling agent context: a summary of older turns, the recent rendered turns,
+    # and the last message folded into either.
+    context_summary: Mapped[str | None] = mapped_column(Text, nullable=True)
+    context_turns: Mapped[list[dict] | None] = mapped_column(JSON, nullable=True)
+    context_message_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
     user: Mapped[User] = relationship(back_populates="agent_conversations")
     messages: Mapped[list["AgentMessage"]] = relationship(
         back_populates="conversation", cascade="all, delete-orphan", order_by="AgentMessage.id"
@@ -418,6 +424,70 @@ class AgentMessage(Base):
     )
 
 
+# Chat history full-text search is maintained by the database, outside the ORM
+# mapping. Postgres keeps a generated tsvector per message and a title-weighted
+# rollup per conversation, both GIN-indexed; SQLite keeps external-content FTS5
+# tables over message content and conversation titles in sync with triggers.
+AGENT_SEARCH_DDL: dict[str, tuple[str, ...]] = {
+    "postgresql": (
+        "ALTER TABLE agent_messages ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(content, ''))) STORED",
+        "ALTER TABLE agent_conversations ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        "CREATE INDEX IF NOT EXISTS ix_agent_messages_search_vector ON agent_messages USING gin (search_vector)",
+        "CREATE INDEX IF NOT EXISTS ix_agent_conversations_search_vector ON agent_conversations USING gin (search_vector)",
+        """
+        CREATE OR REPLACE FUNCTION agent_conversations_search_title() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector := setweight(to_tsvector('simple', coalesce(NEW.title, '')), 'A');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS agent_conversations_search_title ON agent_conversations",
+        "CREATE TRIGGER agent_conversations_search_title BEFORE INSERT ON agent_conversations "
+        "FOR EACH ROW EXECUTE FUNCTION agent_conversations_search_title()",
+        """
+        CREATE OR REPLACE FUNCTION agent_messages_search_rollup() RETURNS trigger AS $$
+        BEGIN
+            UPDATE agent_conversations
+            SET search_vector = coalesce(search_vector, ''::tsvector) || NEW.search_vector
+            WHERE id = NEW.conversation_id;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS agent_messages_search_rollup ON agent_messages",
+        "CREATE TRIGGER agent_messages_search_rollup AFTER INSERT ON agent_messages "
+        "FOR EACH ROW EXECUTE FUNCTION agent_messages_search_rollup()",
+    ),
+    "sqlite": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS agent_messages_fts "
+        "USING fts5(content, content='agent_messages', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS agent_messages_fts_insert AFTER INSERT ON agent_messages BEGIN "
+        "INSERT INTO agent_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+        "CREATE TRIGGER IF NOT EXISTS agent_messages_fts_delete AFTER DELETE ON agent_messages BEGIN "
+        "INSERT INTO agent_messages_fts(agent_messages_fts, rowid, content) VALUES ('delete', old.id, old.content); END",
+        "CREATE TRIGGER IF NOT EXISTS agent_messages_fts_update AFTER UPDATE OF content ON agent_messages BEGIN "
+        "INSERT INTO agent_messages_fts(agent_messages_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "INSERT INTO agent_messages_fts(rowid, content) VALUES (new.id, new.content); END",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS agent_conversations_fts "
+        "USING fts5(title, content='agent_conversations', content_rowid='id')",
+        "CREATE TRIGGER IF NOT EXISTS agent_conversations_fts_insert AFTER INSERT ON agent_conversations BEGIN "
+        "INSERT INTO agent_conversations_fts(rowid, title) VALUES (new.id, new.title); END",
+        "CREATE TRIGGER IF NOT EXISTS agent_conversations_fts_delete AFTER DELETE ON agent_conversations BEGIN "
+        "INSERT INTO agent_conversations_fts(agent_conversations_fts, rowid, title) VALUES ('delete', old.id, old.title); END",
+        "CREATE TRIGGER IF NOT EXISTS agent_conversations_fts_update AFTER UPDATE OF title ON agent_conversations BEGIN "
+        "INSERT INTO agent_conversations_fts(agent_conversations_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        "INSERT INTO agent_conversations_fts(rowid, title) VALUES (new.id, new.title); END",
+    ),
+}
+
+for _dialect, _statements in AGENT_SEARCH_DDL.items():
+    for _statement in _statements:
+        # agent_messages is created after agent_conversations, so both tables exist here.
+        event.listen(AgentMessage.__table__, "after_create", DDL(_statement).execute_if(dialect=_dialect))
+
+
 class AgentSearchResult(Base):
     """A ranked document citation stored for an assistant message."""
 
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 import json
+import time
 from contextlib import asynccontextmanager
 from typing import TypeVar
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response, status
+from fastapi import BackgroundTasks, Depends, FastAPI, Header, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import StreamingResponse
@@ -20,6 +21,9 @@ from iris.dao import directory as directory_dao
 from iris.dao import search as search_dao
 from iris.dao import social as social_dao
 from iris.dao import source_profiles as profile_dao
+from iris.dao import topics as topics_dao
+from iris.dao.documents import DocumentCard
+from iris.dao.pool import render_pool_prometheus
 from iris.dao.user_state import get_or_create_firebase_user, get_or_create_local_user
 from iris.models import (
     BookshelfCollection,
@@ -32,9 +36,10 @@ from iris.models import (
     UserProfile,
     UserWebsite,
 )
+from iris.services.ingestion.crawl_timing import render_prometheus
 from iris.services.ingestion.crawler import Crawler
 from iris.dao.db import init_db
-from iris.schemas.enums import AgentMessageRole, CrawlJobStatus, SourceStatus
+from iris.schemas.enums import CrawlJobStatus, SourceStatus
 from iris.dao.sources import get_or_create_source
 from iris.schemas.api import (
     AdminCrawlJobSchema,
@@ -88,20 +93,21 @@ from iris.schemas.api import (
     SourceCreateSchema,
     SourceProfileAnalysisSchema,
     SourceSchema,
+    TopicFacetSchema,
     UserSchema,
     UserProfileSchema,
     UserProfileUpdateSchema,
     UserWebsiteCreateSchema,
     UserWebsiteSchema,
 )
-from iris.services.auth import verify_firebase_token, warm_firebase_token_verifier
+from iris.services.auth import record_auth_latency, verify_firebase_token, warm_firebase_token_verifier
 from iris.services.common.config import ADMIN_EMAILS, cors_origins, firebase_auth_enabled, openai_api_key
 from iris.services.common.langfuse_tracing import agent_conversation_session_id, agent_trace_metadata, agent_user_id
 from iris.services.retrieval.search import search_documents, stream_openai_agentic_chat, synthesize_answer
-from iris.services.retrieval.source_profiles import generate_source_profile
+from iris.services.retrieval.source_profile_jobs import drain_source_profile_jobs, enqueue_source_profile
 from iris.routes.dumps import dump_bookshelf_collection, dump_bookshelf_entry, dump_crawl_job, dump_document, dump_highlight, dump_source, dump_source_profile_analysis
 from iris.services.ingestion.source_classifier import classify_source_url
-from iris.services.common.url_utils import normalize_url
+from iris.services.common.url_utils import normalize_url, url_hash
 
 
 @asynccontextmanager
@@ -119,6 +125,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -131,6 +138,17 @@ async def get_session():
         yield
 
 
+async def get_read_session():
+    """Bind a read-only session, on the read replica when configured, for endpoints that never write.
+
+    Declare it after any user dependency: users resolve on the primary session,
+    and the endpoint sees whichever session was bound last.
+    """
+    init_db()
+    with db.read_session_scope():
+        yield
+
+
 def _bearer_token(authorization: str | None) -> str | None:
     if not authorization:
         return None
@@ -140,13 +158,21 @@ def _bearer_token(authorization: str | None) -> str | None:
     return token
 
 
+def _firebase_user(token: str) -> User:
+    started = time.perf_counter()
+    try:
+        return get_or_create_firebase_user(verify_firebase_token(token))
+    finally:
+        record_auth_latency(time.perf_counter() - started)
+
+
 def get_current_user(
     authorization: str | None = Header(default=None),
     _bound_session=Depends(get_session),
 ) -> User:
     token = _bearer_token(authorization)
     if token:
-        return get_or_create_firebase_user(verify_firebase_token(token))
+        return _firebase_user(token)
     if firebase_auth_enabled():
         raise HTTPException(status_code=401, detail="Authentication required")
     return get_or_create_local_user()
@@ -158,7 +184,7 @@ def get_optional_user(
 ) -> User | None:
     token = _bearer_token(authorization)
     if token:
-        return get_or_create_firebase_user(verify_firebase_token(token))
+        return _firebase_user(token)
     if firebase_auth_enabled():
         return None
     return get_or_create_local_user()
@@ -244,7 +270,13 @@ def _dump_friendship(viewer: User, friendship: Friendship) -> FriendshipSchema:
 @app.get("/health", response_model=HealthSchema)
 def health(_bound_session=Depends(get_session)) -> HealthSchema:
     counts = admin.get_health_counts()
-    return HealthSchema(ok=True, sources=counts.sources, documents=counts.documents)
+    return HealthSchema(ok=True, sources=counts.sources, documents=counts.documents, counts_as_of=counts.counts_as_of)
+
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics() -> Response:
+    """Crawl stage histograms and database pool checkouts for this process, in Prometheus text format."""
+    return Response(render_prometheus() + render_pool_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 @app.get("/api/me", response_model=UserSchema)
@@ -486,7 +518,7 @@ def disconnect_friend(
 
 
 @app.post("/api/sources", response_model=SourceSchema)
-def create_source(payload: SourceCreateSchema, _bound_session=Depends(get_session)) -> SourceSchema:
+def create_source(payload: SourceCreateSchema, background_tasks: BackgroundTasks, _bound_session=Depends(get_session)) -> SourceSchema:
     classification = classify_source_url(payload.url)
     source = get_or_create_source(
         payload.url,
@@ -501,6 +533,7 @@ def create_source(payload: SourceCreateSchema, _bound_session=Depends(get_sessio
             max_depth=payload.max_depth,
             active_pages=payload.active_pages,
         )
+        _drain_source_profiles_after_response(background_tasks)
     return dump_source(source)
 
 
@@ -508,7 +541,7 @@ def create_source(payload: SourceCreateSchema, _bound_session=Depends(get_sessio
 def get_sources(
     status: str | None = SourceStatus.INDEXED.value,
     limit: int = 100,
-    _bound_session=Depends(get_session),
+    _bound_session=Depends(get_read_session),
 ) -> list[SourceSchema]:
     return [dump_source(source) for source in admin.get_sources(status=status, limit=limit)]
 
@@ -516,6 +549,7 @@ def get_sources(
 @app.post("/api/sources/{source_id}/crawl", response_model=CrawlSchema)
 def crawl_source_endpoint(
     source_id: int,
+    background_tasks: BackgroundTasks,
     max_pages: int = 80,
     max_depth: int = 3,
     active_pages: int = 4,
@@ -525,6 +559,7 @@ def crawl_source_endpoint(
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
     job = Crawler().crawl_source(source, max_pages=max_pages, max_depth=max_depth, active_pages=active_pages)
+    _drain_source_profiles_after_response(background_tasks)
     return dump_crawl_job(job)
 
 
@@ -538,7 +573,7 @@ def list_documents(
     index_run_id: int | None = None,
     text_filter: list[str] = Query(default=[]),
     tag: list[str] = Query(default=[]),
-    _bound_session=Depends(get_session),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[DocumentSchema]:
     documents, total = admin.get_documents_page(
         limit=limit,
@@ -553,12 +588,24 @@ def list_documents(
     return _page_response([dump_document(document) for document in documents], total, limit, offset)
 
 
+@app.get("/api/topics", response_model=list[TopicFacetSchema])
+def list_topics(
+    q: str | None = None,
+    limit: int = 50,
+    _bound_session=Depends(get_read_session),
+) -> list[TopicFacetSchema]:
+    return [
+        TopicFacetSchema(slug=topic.slug, name=topic.name, document_count=topic.document_count)
+        for topic in topics_dao.get_topic_facets(q=q, limit=limit)
+    ]
+
+
 @app.get("/api/documents/search", response_model=SearchSchema)
 def search_documents_picker(
     q: str,
     limit: int = 8,
-    _bound_session=Depends(get_session),
     user: User | None = Depends(get_optional_user),
+    _bound_session=Depends(get_read_session),
 ) -> SearchSchema:
     ranked = search_dao.search_documents_for_picker(q, limit=limit)
     return SearchSchema(
@@ -579,8 +626,8 @@ def admin_sources(
     q: str | None = None,
     limit: int = 200,
     offset: int = 0,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[AdminSourceSchema]:
     items, total = admin.get_admin_sources_page(status=status, q=q, limit=limit, offset=offset)
     return _page_response(items, total, limit, offset)
@@ -592,8 +639,8 @@ def admin_queries(
     user_id: int | None = None,
     limit: int = 50,
     offset: int = 0,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[AdminQuerySchema]:
     items, total = admin.get_admin_queries_page(
         q=q, user_id=user_id, limit=limit, offset=offset
@@ -606,8 +653,8 @@ def admin_users(
     q: str | None = None,
     limit: int = 50,
     offset: int = 0,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[AdminUserSchema]:
     items, total = admin.get_admin_users_page(q=q, limit=limit, offset=offset)
     return _page_response(items, total, limit, offset)
@@ -618,8 +665,8 @@ def admin_user_library(
     user_id: int,
     limit: int = 50,
     offset: int = 0,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> AdminUserLibrarySchema:
     user = db.current_session().get(User, user_id)
     if not user:
@@ -643,8 +690,8 @@ def admin_user_library(
 @app.get("/api/admin/conversations/{conversation_uuid}", response_model=AdminConversationSchema)
 def admin_conversation(
     conversation_uuid: str,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> AdminConversationSchema:
     conversation = admin.get_admin_conversation(conversation_uuid)
     if not conversation:
@@ -694,8 +741,8 @@ def directory_sources(
     offset: int = 0,
     text_filter: list[str] = Query(default=[]),
     tag: list[str] = Query(default=[]),
-    _bound_session=Depends(get_session),
     user: User | None = Depends(get_optional_user),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[DirectorySourceSchema]:
     items, total = directory_dao.get_source_directory_page(
         status=status,
@@ -712,7 +759,7 @@ def directory_sources(
 
 
 @app.get("/api/sources/{source_id}/profile-analysis", response_model=SourceProfileAnalysisSchema | None)
-def get_source_profile_analysis(source_id: int, _bound_session=Depends(get_session)) -> SourceProfileAnalysisSchema | None:
+def get_source_profile_analysis(source_id: int, _bound_session=Depends(get_read_session)) -> SourceProfileAnalysisSchema | None:
     source = profile_dao.get_source(source_id)
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
@@ -721,11 +768,25 @@ def get_source_profile_analysis(source_id: int, _bound_session=Depends(get_sessi
 
 
 @app.post("/api/sources/{source_id}/profile-analysis", response_model=SourceProfileAnalysisSchema)
-def generate_source_profile_analysis(source_id: int, force: bool = False, _bound_session=Depends(get_session)) -> SourceProfileAnalysisSchema:
+def generate_source_profile_analysis(
+    source_id: int,
+    background_tasks: BackgroundTasks,
+    force: bool = False,
+    _bound_session=Depends(get_session),
+) -> SourceProfileAnalysisSchema:
+    """Queue profile generation; poll the GET endpoint until the status leaves pending/running."""
     source = profile_dao.get_source(source_id)
     if not source:
         raise HTTPException(status_code=404, detail="Source not found")
-    return dump_source_profile_analysis(generate_source_profile(source, force=force))
+    analysis = enqueue_source_profile(source, force=force)
+    _drain_source_profiles_after_response(background_tasks)
+    return dump_source_profile_analysis(analysis)
+
+
+def _drain_source_profiles_after_response(background_tasks: BackgroundTasks) -> None:
+    # Queued jobs must be visible to the drain's own session.
+    db.commit()
+    background_tasks.add_task(drain_source_profile_jobs)
 
 
 @app.get("/api/admin/crawl-jobs", response_model=PageSchema[AdminCrawlJobSchema])
@@ -735,8 +796,8 @@ def admin_crawl_jobs(
     status: str | None = None,
     source_id: int | None = None,
     index_run_id: int | None = None,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[AdminCrawlJobSchema]:
     crawl_status = CrawlJobStatus(status) if status and status != "all" else None
     items, total = admin.get_admin_crawl_jobs_page(
@@ -839,15 +900,15 @@ def admin_index_runs(
     limit: int = 50,
     offset: int = 0,
     status: str | None = None,
-    _bound_session=Depends(get_session),
     _admin_user: User = Depends(require_admin),
+    _bound_session=Depends(get_read_session),
 ) -> PageSchema[AdminIndexRunSchema]:
     items, total = admin.get_admin_index_runs_page(limit=limit, offset=offset, status=status)
     return _page_response(items, total, limit, offset)
 
 
 @app.get("/api/documents/{document_uuid}", response_model=DocumentDetailSchema)
-def get_document(document_uuid: str, _bound_session=Depends(get_session)) -> DocumentDetailSchema:
+def get_document(document_uuid: str, _bound_session=Depends(get_read_session)) -> DocumentDetailSchema:
     resolved = _resolve_document_uuid(document_uuid)
     document, outgoing, incoming = admin.get_document_detail(resolved.id) if resolved else (None, [], [])
     if not document:
@@ -884,8 +945,8 @@ def get_document(document_uuid: str, _bound_session=Depends(get_session)) -> Doc
 def search(
     q: str,
     limit: int = 12,
-    _bound_session=Depends(get_session),
     user: User | None = Depends(get_optional_user),
+    _bound_session=Depends(get_read_session),
 ) -> SearchSchema:
     _search_row, ranked = search_documents(q, limit=limit, persist=False)
     answer = synthesize_answer(q, ranked)
@@ -972,11 +1033,11 @@ async def _agent_chat_stream_events(payload: AgentChatRequestSchema, authorizati
             if conversation is None:
                 yield _sse("error", {"message": "Conversation not found", "type": "ConversationNotFoundError"})
                 return
-            user_message = next((message for message in conversation.messages if message.id == user_message_id), None)
+            user_message = agent_dao.get_agent_message(conversation, user_message_id)
             if user_message is None:
                 yield _sse("error", {"message": "User message not found", "type": "UserMessageNotFoundError"})
                 return
-            conversation_context = _agent_conversation_context(conversation, current_user_message_id=user_message_id)
+            conversation_context = agent_dao.conversation_context(conversation, before_message_id=user_message_id)
             async for event in stream_openai_agentic_chat(
                 payload.message,
                 limit=payload.limit,
@@ -999,7 +1060,7 @@ async def _agent_chat_stream_events(payload: AgentChatRequestSchema, authorizati
 def _current_user_from_header(authorization: str | None) -> User:
     token = _bearer_token(authorization)
     if token:
-        return get_or_create_firebase_user(verify_firebase_token(token))
+        return _firebase_user(token)
     if firebase_auth_enabled():
         raise HTTPException(status_code=401, detail="Authentication required")
     return get_or_create_local_user()
@@ -1077,43 +1138,27 @@ def _agent_step_payload(step) -> dict[str, object]:
     }
 
 
-def _agent_conversation_context(conversation, *, current_user_message_id: int) -> str:
-    lines: list[str] = []
-    prior_messages = [message for message in conversation.messages if message.id != current_user_message_id]
-    for message in prior_messages:
-        role = "User" if message.role == AgentMessageRole.USER else "Iris"
-        content = " ".join(message.content.split())
-        if len(content) > 700:
-            content = f"{content[:697]}..."
-        lines.append(f"{role}: {content}")
-        if message.role == AgentMessageRole.ASSISTANT and message.results:
-            lines.append("Iris recommended links:")
-            for result in message.results[:8]:
-                document = result.document
-                title = document.title or document.url
-                summary = " ".join((document.summary or "").split())
-                if len(summary) > 260:
-                    summary = f"{summary[:257]}..."
-                lines.append(
-                    f"- internal_ref={document.id}; title={title}; source={document.source.canonical_domain}; "
-                    f"url={document.url}; summary={summary}"
-                )
-    return "\n".join(lines)
-
-
 def _sse(event: str, data: dict[str, object]) -> str:
     return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
 @app.get("/api/agent-conversations", response_model=list[AgentConversationSummarySchema])
 def agent_conversations(
+    response: Response,
     limit: int = 30,
     offset: int = 0,
     q: str | None = None,
+    cursor: str | None = None,
     _bound_session=Depends(get_session),
     user: User = Depends(get_current_user),
 ) -> list[AgentConversationSummarySchema]:
-    conversations = agent_dao.list_agent_conversations(limit=limit, offset=offset, q=q, user=user)
+    try:
+        page = agent_dao.list_agent_conversations(limit=limit, offset=offset, q=q, user=user, cursor=cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    message_counts = agent_dao.count_agent_messages([conversation.id for conversation in page.conversations])
     return [
         AgentConversationSummarySchema(
             id=conversation.id,
@@ -1121,9 +1166,9 @@ def agent_conversations(
             title=conversation.title,
             created_at=conversation.created_at,
             updated_at=conversation.updated_at,
-            message_count=len(conversation.messages),
+            message_count=message_counts.get(conversation.id, 0),
         )
-        for conversation in conversations
+        for conversation in page.conversations
     ]
 
 
@@ -1279,7 +1324,9 @@ def capture_browser_page(payload: BrowserCaptureSchema, _bound_session=Depends(g
 @app.get("/api/browser/pages/resolve", response_model=BrowserPageSchema)
 def resolve_browser_page(url: str, _bound_session=Depends(get_session), user: User = Depends(get_current_user)) -> BrowserPageSchema:
     normalized = normalize_url(url)
-    document = db.current_session().scalar(select(Document).where(Document.url == normalized))
+    document = db.current_session().scalar(
+        select(Document).where(Document.url_hash == url_hash(normalized)).where(Document.url == normalized)
+    )
     if not document:
         return BrowserPageSchema(saved=False)
     mapping = db.current_session().scalar(
@@ -1445,7 +1492,7 @@ def remove_bookshelf_collection_item(
 @app.get("/api/shared/bookshelf/collections/{share_token}", response_model=BookshelfCollectionSchema)
 def get_shared_bookshelf_collection(
     share_token: str,
-    _bound_session=Depends(get_session),
+    _bound_session=Depends(get_read_session),
 ) -> BookshelfCollectionSchema:
     collection = bookshelf_dao.get_shared_collection(share_token)
     if collection is None:
@@ -1457,7 +1504,7 @@ def get_shared_bookshelf_collection(
 def embedding_map(
     limit: int = 3000,
     source_id: int | None = None,
-    _bound_session=Depends(get_session),
+    _bound_session=Depends(get_read_session),
 ) -> EmbeddingMapSchema:
     return admin.get_embedding_map(limit=limit, source_id=source_id)
 
@@ -1470,7 +1517,7 @@ def graph(
     domain: str | None = None,
     limit: int = 120,
     depth: int = 1,
-    _bound_session=Depends(get_session),
+    _bound_session=Depends(get_read_session),
 ) -> GraphSchema:
     if mode == "sources":
         sources, edges = admin.get_source_graph_rows(source_id=source_id, domain=domain, limit=limit, depth=depth)
@@ -1507,13 +1554,13 @@ def graph(
     nodes = [
         GraphNodeSchema(
             id=f"doc:{document.uuid}",
-            label=document.title or document.source.canonical_domain,
+            label=document.title or document.source_domain,
             type=document.document_type,
-            domain=document.source.canonical_domain,
+            domain=document.source_domain,
             url=document.url,
-            subtitle=document.author or document.source.canonical_domain,
+            subtitle=document.author or document.source_domain,
             summary=document.summary,
-            size=1.0 + min(9.0, len((document.summary or document.extracted_text or "").split()) ** 0.25),
+            size=1.0 + min(9.0, _graph_word_count(document) ** 0.25),
         )
         for document in documents
     ]
@@ -1525,10 +1572,17 @@ def graph(
     return GraphSchema(nodes=nodes, edges=edges)
 
 
+def _graph_word_count(document: DocumentCard) -> int:
+    if document.summary:
+        return len(document.summary.split())
+    # Cards carry the text length rather than the text; assume ~6 characters per word.
+    return document.text_chars // 6
+
+
 @app.get("/api/graph/sources/search", response_model=list[AdminSourceSchema])
 def graph_source_search(
     q: str,
     limit: int = 20,
-    _bound_session=Depends(get_session),
+    _bound_session=Depends(get_read_session),
 ) -> list[AdminSourceSchema]:
     return admin.search_graph_sources(q, limit=limit)
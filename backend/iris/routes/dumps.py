@@ -48,6 +48,7 @@ def dump_source_profile_analysis(analysis: SourceProfileAnalysis) -> SourceProfi
         generated_at=analysis.generated_at,
         model=analysis.model,
         input_fingerprint=analysis.input_fingerprint,
+        queued_at=analysis.queued_at,
         bio=analysis.bio,
         audiences=analysis.audiences,
         themes=analysis.themes,
@@ -113,5 +114,9 @@ def dump_crawl_job(job: CrawlJob) -> CrawlSchema:
         documents_indexed=job.documents_indexed,
         links_seen=job.links_seen,
         sources_discovered=job.sources_discovered,
+        active_pages=job.active_pages,
+        peak_active_pages=job.peak_active_pages,
+        fetch_retries=job.fetch_retries,
+        throttled_responses=job.throttled_responses,
         error=job.error,
     )
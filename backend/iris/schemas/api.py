@@ -31,11 +31,13 @@ class HealthSchema(BaseModel):
     ok: bool
     sources: int
     documents: int
+    counts_as_of: datetime | None = None
 
 
 class HealthCountsSchema(BaseModel):
     sources: int
     documents: int
+    counts_as_of: datetime | None = None
 
 
 class UserSchema(BaseModel):
@@ -413,13 +415,44 @@ class CrawlSchema(BaseModel):
     documents_indexed: int
     links_seen: int
     sources_discovered: int
+    active_pages: int | None = None
+    peak_active_pages: int | None = None
+    fetch_retries: int = 0
+    throttled_responses: int = 0
     error: str | None
 
 
+class AdminAuthMetricsSchema(BaseModel):
+    identity_cache_hits: int
+    identity_cache_misses: int
+    identity_cache_size: int
+    user_cache_hits: int
+    user_cache_misses: int
+    verify_p50_ms: float
+    verify_p95_ms: float
+    resolve_p50_ms: float
+    resolve_p95_ms: float
+
+
+class AdminPoolMetricsSchema(BaseModel):
+    name: str
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_p50_ms: float
+    wait_p95_ms: float
+
+
 class AdminOverviewSchema(BaseModel):
     totals: dict[str, int]
     source_statuses: dict[str, int]
     document_types: dict[str, int]
+    counts_as_of: datetime | None = None
+    auth: AdminAuthMetricsSchema | None = None
+    pools: list[AdminPoolMetricsSchema] = []
 
 
 class AdminQuerySchema(BaseModel):
@@ -522,6 +555,12 @@ class SourceProfileOpinionSchema(BaseModel):
     opinion: str
 
 
+class TopicFacetSchema(BaseModel):
+    slug: str
+    name: str
+    document_count: int
+
+
 class SourceProfileTopicSchema(BaseModel):
     topic: str
     count: int
@@ -556,6 +595,7 @@ class SourceProfileAnalysisSchema(BaseModel):
     generated_at: datetime | None
     model: str | None
     input_fingerprint: str | None
+    queued_at: datetime | None = None
     bio: str | None
     audiences: list[str] | None
     themes: list[str] | None
@@ -67,3 +67,59 @@ class PgvectorBackfillResult:
     updated: int
     skipped: int
     dimensions: int
+
+
+@dataclass(frozen=True)
+class BinaryEmbeddingBackfillResult:
+    """Summary counters for converting JSON text embeddings to binary vectors."""
+
+    checked: int
+    converted: int
+    skipped: int
+    bytes_before: int
+    bytes_after: int
+
+
+@dataclass(frozen=True)
+class ReembedPlan:
+    """Where the corpus stands relative to a target embedding model."""
+
+    serving_model: str | None
+    target_model: str
+    documents: int
+    embedded: int
+    missing: int
+    action: str
+
+
+@dataclass(frozen=True)
+class ReembedResult:
+    """Summary counters for one re-embedding run."""
+
+    checked: int
+    embedded: int
+    failed: int
+    promoted: bool
+    plan: ReembedPlan
+
+
+@dataclass(frozen=True)
+class AnalysisBatchPrepareResult:
+    """Counters for writing provider batch request files."""
+
+    batches: int
+    requests: int
+    decided_locally: int
+    last_document_id: int
+
+
+@dataclass(frozen=True)
+class AnalysisBatchCollectResult:
+    """Counters for polling provider batches and ingesting finished ones."""
+
+    pending: int
+    failed_batches: int
+    ingested_batches: int
+    checked: int
+    changed: int
+    failed: int
@@ -79,6 +79,7 @@ class IndexEventType(StringEnum):
     SOURCE_HOMEPAGE_NORMALIZED = "source_homepage_normalized"
     SOURCE_STARTED = "source_started"
     SOURCE_FINISHED = "source_finished"
+    RUN_FINISHED = "run_finished"
 
 
 class TagScope(StringEnum):
@@ -141,6 +142,7 @@ class LLMProvider(StringEnum):
 
 class SourceProfileAnalysisStatus(StringEnum):
     PENDING = "pending"
+    RUNNING = "running"
     SUCCEEDED = "succeeded"
     FAILED = "failed"
 
@@ -150,3 +152,28 @@ class SourceProfileLinkKind(StringEnum):
     PROFILE = "profile"
     VISIBLE_LINK = "visible_link"
     EMAIL = "email"
+
+
+class EmbeddingModelStatus(StringEnum):
+    BUILDING = "building"
+    SERVING = "serving"
+    RETIRED = "retired"
+
+
+class AuthorityGraph(StringEnum):
+    SOURCES = "sources"
+    DOCUMENTS = "documents"
+
+
+class AnalysisBatchMode(StringEnum):
+    RECLASSIFY = "reclassify"
+    SUMMARIES = "summaries"
+    METADATA = "metadata"
+
+
+class AnalysisBatchStatus(StringEnum):
+    PREPARED = "prepared"
+    SUBMITTED = "submitted"
+    COMPLETED = "completed"
+    INGESTED = "ingested"
+    FAILED = "failed"
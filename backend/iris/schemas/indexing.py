@@ -3,6 +3,8 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from iris.schemas.enums import AuthorityGraph
+
 if TYPE_CHECKING:
     from iris.models import Source
 
@@ -33,6 +35,16 @@ class SourcePriorityPayload:
     reason: str
 
 
+@dataclass(frozen=True)
+class AuthorityGraphResult:
+    graph: AuthorityGraph
+    nodes: int
+    edges: int
+    seeds: int
+    iterations: int
+    skipped: bool
+
+
 @dataclass(frozen=True)
 class PlannedSourceEvent:
     source_id: int
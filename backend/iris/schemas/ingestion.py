@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 
 
@@ -11,6 +11,18 @@ class ExtractedLink:
     context: str
 
 
+@dataclass(frozen=True)
+class ParsedPage:
+    """HTML metadata, article text and links before LLM document analysis."""
+
+    title: str | None
+    author: str | None
+    published_at: datetime | None
+    text: str
+    content_link_count: int
+    links: list[ExtractedLink]
+
+
 @dataclass(frozen=True)
 class ExtractedPage:
     title: str | None
@@ -57,6 +69,15 @@ class SourceClassifierResult:
     reason: str
 
 
+@dataclass(frozen=True)
+class SourceClassificationRunResult:
+    checked: int
+    changed: int
+    ignored: int
+    cached: int
+    fetch_failed: int
+
+
 @dataclass(frozen=True)
 class FetchResult:
     url: str
@@ -75,3 +96,4 @@ class PagePipelineResult:
     content_hash: str | None
     embedding: list[float] | None
     error: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
@@ -91,3 +91,28 @@ class AgentSearchOutput(BaseModel):
         default_factory=list,
         description="Internal document ids from tool results for the most relevant link cards. Never mention these ids in the answer. Leave empty when no documents are worth showing.",
     )
+
+
+@dataclass(frozen=True)
+class PostingRows:
+    """Current topic, tag and category assignments for building posting lists."""
+
+    topics: list[tuple[int, str]]
+    tags: list[tuple[int, str, str]]
+    categories: list[tuple[int, str, str]]
+    document_categories: list[tuple[int, str]]
+
+
+@dataclass(frozen=True)
+class HybridSearchHit:
+    """A fused keyword and semantic search hit, before its document is loaded.
+
+    Ranks are 1-based positions in each candidate list, or None when the
+    document was not a candidate there.
+    """
+
+    document_id: int
+    score: float
+    keyword_rank: int | None
+    semantic_rank: int | None
+    similarity: float | None
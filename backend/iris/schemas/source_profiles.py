@@ -13,3 +13,13 @@ class ProfileInput:
     fingerprint: str
     scraped_facts: dict
     documents: list[dict]
+
+
+@dataclass(frozen=True)
+class SourceProfileJobResult:
+    """Summary counters for one drain of the source profile job queue."""
+
+    claimed: int
+    succeeded: int
+    failed: int
+    superseded: int
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import logging
+import math
 import time
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
 from functools import lru_cache
+from threading import Lock
 
 import firebase_admin
 from fastapi import HTTPException
@@ -13,6 +17,7 @@ from firebase_admin import auth, credentials
 from google.auth.exceptions import DefaultCredentialsError
 
 from iris.services.common.config import (
+    AUTH_IDENTITY_CACHE_SIZE,
     FIREBASE_HTTP_TIMEOUT_SECONDS,
     FIREBASE_PROJECT_ID,
     FIREBASE_SERVICE_ACCOUNT_FILE,
@@ -22,6 +27,7 @@ from iris.services.common.config import (
 
 
 logger = logging.getLogger(__name__)
+AUTH_LATENCY_SAMPLES = 1024
 
 
 @dataclass(frozen=True)
@@ -32,6 +38,39 @@ class FirebaseIdentity:
     photo_url: str | None = None
 
 
+@dataclass
+class AuthStats:
+    """Cache counters and recent latencies for bearer-token authentication."""
+
+    identity_hits: int = 0
+    identity_misses: int = 0
+    user_hits: int = 0
+    user_misses: int = 0
+    verify_ms: deque[float] = field(default_factory=lambda: deque(maxlen=AUTH_LATENCY_SAMPLES))
+    resolve_ms: deque[float] = field(default_factory=lambda: deque(maxlen=AUTH_LATENCY_SAMPLES))
+
+
+@dataclass(frozen=True)
+class AuthMetricsView:
+    """Immutable copy of ``AuthStats`` handed to API readers."""
+
+    identity_cache_hits: int
+    identity_cache_misses: int
+    identity_cache_size: int
+    user_cache_hits: int
+    user_cache_misses: int
+    verify_p50_ms: float
+    verify_p95_ms: float
+    resolve_p50_ms: float
+    resolve_p95_ms: float
+
+
+_lock = Lock()
+# Token digest -> (identity, token expiry as a unix timestamp), least recently used first.
+_identities: OrderedDict[str, tuple[FirebaseIdentity, float]] = OrderedDict()
+_stats = AuthStats()
+
+
 @lru_cache(maxsize=1)
 def _firebase_app():
     options = {"httpTimeout": FIREBASE_HTTP_TIMEOUT_SECONDS}
@@ -51,6 +90,80 @@ def _firebase_app():
 
 
 def verify_firebase_token(token: str) -> FirebaseIdentity:
+    """Return the identity for a Firebase ID token, reusing verified tokens until they expire."""
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+    now = time.time()
+    with _lock:
+        cached = _identities.get(key)
+        if cached is not None and cached[1] > now:
+            _identities.move_to_end(key)
+            _stats.identity_hits += 1
+            return cached[0]
+        if cached is not None:
+            del _identities[key]
+        _stats.identity_misses += 1
+
+    started = time.perf_counter()
+    identity, expires_at = _verify_firebase_token(token)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _lock:
+        _stats.verify_ms.append(elapsed_ms)
+        if AUTH_IDENTITY_CACHE_SIZE and expires_at > time.time():
+            _identities[key] = (identity, expires_at)
+            _identities.move_to_end(key)
+            while len(_identities) > AUTH_IDENTITY_CACHE_SIZE:
+                _identities.popitem(last=False)
+    return identity
+
+
+def record_user_cache(hit: bool) -> None:
+    """Count a Firebase uid to Iris user lookup served from, or missing, the user cache."""
+    with _lock:
+        if hit:
+            _stats.user_hits += 1
+        else:
+            _stats.user_misses += 1
+
+
+def record_auth_latency(seconds: float) -> None:
+    """Record the full cost of resolving a bearer token to an Iris user."""
+    with _lock:
+        _stats.resolve_ms.append(seconds * 1000)
+
+
+def auth_metrics() -> AuthMetricsView:
+    """Return authentication cache counters and latency percentiles."""
+    with _lock:
+        verify_ms = sorted(_stats.verify_ms)
+        resolve_ms = sorted(_stats.resolve_ms)
+        return AuthMetricsView(
+            identity_cache_hits=_stats.identity_hits,
+            identity_cache_misses=_stats.identity_misses,
+            identity_cache_size=len(_identities),
+            user_cache_hits=_stats.user_hits,
+            user_cache_misses=_stats.user_misses,
+            verify_p50_ms=_percentile(verify_ms, 50),
+            verify_p95_ms=_percentile(verify_ms, 95),
+            resolve_p50_ms=_percentile(resolve_ms, 50),
+            resolve_p95_ms=_percentile(resolve_ms, 95),
+        )
+
+
+def reset_auth_caches() -> None:
+    """Forget cached identities and zero the counters."""
+    global _stats
+    with _lock:
+        _identities.clear()
+        _stats = AuthStats()
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    return round(ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1], 3)
+
+
+def _verify_firebase_token(token: str) -> tuple[FirebaseIdentity, float]:
     try:
         decoded = auth.verify_id_token(token, app=_firebase_app())
     except DefaultCredentialsError as exc:
@@ -77,12 +190,13 @@ def verify_firebase_token(token: str) -> FirebaseIdentity:
     uid = decoded.get("uid") or decoded.get("sub")
     if not uid:
         raise HTTPException(status_code=401, detail="Firebase token is missing uid")
-    return FirebaseIdentity(
+    identity = FirebaseIdentity(
         uid=uid,
         email=decoded.get("email"),
         display_name=decoded.get("name"),
         photo_url=decoded.get("picture"),
     )
+    return identity, float(decoded.get("exp") or 0)
 
 
 def warm_firebase_token_verifier() -> None:
@@ -16,11 +16,31 @@ load_dotenv(BACKEND_DIR / ".env")
 
 def database_url() -> str:
     value = os.getenv("DATABASE_URL") or os.getenv("DEV_DATABASE_URL") or f"sqlite:///{BACKEND_DIR / 'iris.db'}"
+    return _sqlalchemy_url(value)
+
+
+def database_read_url() -> str | None:
+    """Return the read replica URL, or None when reads share the primary."""
+    value = os.getenv("DATABASE_READ_URL")
+    return _sqlalchemy_url(value) if value else None
+
+
+def _sqlalchemy_url(value: str) -> str:
     if value.startswith("postgres://"):
         return value.replace("postgres://", "postgresql://", 1)
     return value
 
 
+DATABASE_POOL_SIZE = max(1, int(os.getenv("IRIS_DATABASE_POOL_SIZE", "5")))
+DATABASE_MAX_OVERFLOW = max(0, int(os.getenv("IRIS_DATABASE_MAX_OVERFLOW", "10")))
+DATABASE_POOL_TIMEOUT_SECONDS = float(os.getenv("IRIS_DATABASE_POOL_TIMEOUT_SECONDS", "30"))
+DATABASE_POOL_RECYCLE_SECONDS = int(os.getenv("IRIS_DATABASE_POOL_RECYCLE_SECONDS", "1800"))
+DATABASE_POOL_PRE_PING = os.getenv("IRIS_DATABASE_POOL_PRE_PING", "1").lower() in {"1", "true", "yes"}
+# Zero leaves the server default (no timeout) in place.
+DATABASE_STATEMENT_TIMEOUT_MS = max(0, int(os.getenv("IRIS_DATABASE_STATEMENT_TIMEOUT_MS", "0")))
+DATABASE_READ_STATEMENT_TIMEOUT_MS = max(0, int(os.getenv("IRIS_DATABASE_READ_STATEMENT_TIMEOUT_MS", "30000")))
+
+
 DEFAULT_CORS_ORIGINS = [
     "http://localhost:5173",
     "http://127.0.0.1:5173",
@@ -47,13 +67,36 @@ REQUEST_TIMEOUT_SECONDS = float(os.getenv("IRIS_REQUEST_TIMEOUT_SECONDS", "12"))
 MAX_HTML_BYTES = int(os.getenv("IRIS_MAX_HTML_BYTES", "3000000"))
 DEFAULT_MAX_PAGES = int(os.getenv("IRIS_DEFAULT_MAX_PAGES", "80"))
 DEFAULT_MAX_DEPTH = int(os.getenv("IRIS_DEFAULT_MAX_DEPTH", "3"))
+CRAWL_MAX_ACTIVE_PAGES = int(os.getenv("IRIS_CRAWL_MAX_ACTIVE_PAGES", "16"))
+CRAWL_FETCH_RETRIES = int(os.getenv("IRIS_CRAWL_FETCH_RETRIES", "2"))
+CRAWL_RETRY_BACKOFF_SECONDS = float(os.getenv("IRIS_CRAWL_RETRY_BACKOFF_SECONDS", "0.5"))
+CRAWL_MAX_RETRY_AFTER_SECONDS = float(os.getenv("IRIS_CRAWL_MAX_RETRY_AFTER_SECONDS", "60"))
+CRAWL_PARSE_CONCURRENCY = int(os.getenv("IRIS_CRAWL_PARSE_CONCURRENCY", "2"))
+CRAWL_ANALYSIS_CONCURRENCY = int(os.getenv("IRIS_CRAWL_ANALYSIS_CONCURRENCY", "8"))
+CRAWL_EMBED_CONCURRENCY = int(os.getenv("IRIS_CRAWL_EMBED_CONCURRENCY", "4"))
+CRAWL_STAGE_QUEUE_SIZE = int(os.getenv("IRIS_CRAWL_STAGE_QUEUE_SIZE", "8"))
+CRAWL_PERSIST_BATCH_SIZE = int(os.getenv("IRIS_CRAWL_PERSIST_BATCH_SIZE", "16"))
+CRAWL_PERSIST_BATCH_SECONDS = float(os.getenv("IRIS_CRAWL_PERSIST_BATCH_SECONDS", "0.5"))
 SOURCE_CLASSIFIER_MODEL = os.getenv("IRIS_SOURCE_CLASSIFIER_MODEL", "gpt-5-nano-2025-08-07")
 SOURCE_CLASSIFIER_TIMEOUT_SECONDS = float(os.getenv("IRIS_SOURCE_CLASSIFIER_TIMEOUT_SECONDS", "20"))
+SOURCE_CLASSIFIER_CONCURRENCY = int(os.getenv("IRIS_SOURCE_CLASSIFIER_CONCURRENCY", "32"))
+SOURCE_CLASSIFIER_PER_HOST = int(os.getenv("IRIS_SOURCE_CLASSIFIER_PER_HOST", "2"))
+SOURCE_CLASSIFIER_BATCH_SIZE = int(os.getenv("IRIS_SOURCE_CLASSIFIER_BATCH_SIZE", "100"))
+AUTHORITY_DAMPING = float(os.getenv("IRIS_AUTHORITY_DAMPING", "0.85"))
+AUTHORITY_TOLERANCE = float(os.getenv("IRIS_AUTHORITY_TOLERANCE", "1e-6"))
+AUTHORITY_MAX_ITERATIONS = int(os.getenv("IRIS_AUTHORITY_MAX_ITERATIONS", "100"))
+AUTHORITY_REFRESH_AFTER_RUN = os.getenv("IRIS_AUTHORITY_REFRESH_AFTER_RUN", "1").lower() in {"1", "true", "yes"}
+AUTHORITY_SEARCH_WEIGHT = float(os.getenv("IRIS_AUTHORITY_SEARCH_WEIGHT", "0.05"))
 DOCUMENT_CLASSIFIER_MODEL = os.getenv("IRIS_DOCUMENT_CLASSIFIER_MODEL", "gpt-5-nano-2025-08-07")
 DOCUMENT_CLASSIFIER_TIMEOUT_SECONDS = float(os.getenv("IRIS_DOCUMENT_CLASSIFIER_TIMEOUT_SECONDS", "20"))
+ANALYSIS_BATCH_DIR = Path(os.getenv("IRIS_ANALYSIS_BATCH_DIR", str(BACKEND_DIR / "analysis_batches")))
+ANALYSIS_BATCH_MAX_REQUESTS = int(os.getenv("IRIS_ANALYSIS_BATCH_MAX_REQUESTS", "2000"))
+ANALYSIS_BATCH_TRANSPORT = os.getenv("IRIS_ANALYSIS_BATCH_TRANSPORT", "openai")
+ANALYSIS_BATCH_COMPLETION_WINDOW = os.getenv("IRIS_ANALYSIS_BATCH_COMPLETION_WINDOW", "24h")
 EMBEDDING_MODEL = os.getenv("IRIS_EMBEDDING_MODEL", "text-embedding-3-small")
 USE_OPENAI_EMBEDDINGS = os.getenv("IRIS_USE_OPENAI_EMBEDDINGS", "0").lower() in {"1", "true", "yes"}
 EMBEDDING_TIMEOUT_SECONDS = float(os.getenv("IRIS_EMBEDDING_TIMEOUT_SECONDS", "20"))
+EMBEDDING_STORAGE_DTYPE = os.getenv("IRIS_EMBEDDING_STORAGE_DTYPE", "float32").lower()
 USE_PGVECTOR_SEARCH = os.getenv("IRIS_USE_PGVECTOR_SEARCH", "0").lower() in {"1", "true", "yes"}
 SEARCH_RERANK_MODEL = os.getenv("IRIS_SEARCH_RERANK_MODEL", "gpt-5-nano-2025-08-07")
 USE_LLM_RERANKER = os.getenv("IRIS_USE_LLM_RERANKER", "0").lower() in {"1", "true", "yes"}
@@ -61,14 +104,23 @@ SEARCH_RERANK_TIMEOUT_SECONDS = float(os.getenv("IRIS_SEARCH_RERANK_TIMEOUT_SECO
 AGENT_SEARCH_MODEL = os.getenv("IRIS_AGENT_SEARCH_MODEL", "gpt-5.4-mini")
 AGENT_SEARCH_REASONING_EFFORT = os.getenv("IRIS_AGENT_SEARCH_REASONING_EFFORT", "low")
 AGENT_SEARCH_MAX_TURNS = int(os.getenv("IRIS_AGENT_SEARCH_MAX_TURNS", "8"))
+AGENT_PARALLEL_TOOL_CALLS = os.getenv("IRIS_AGENT_PARALLEL_TOOL_CALLS", "1").lower() in {"1", "true", "yes"}
+AGENT_CONTEXT_TOKEN_BUDGET = max(256, int(os.getenv("IRIS_AGENT_CONTEXT_TOKEN_BUDGET", "3000")))
+AGENT_CONTEXT_RECENT_TURNS = max(1, int(os.getenv("IRIS_AGENT_CONTEXT_RECENT_TURNS", "6")))
+POSTING_CHANGE_RETENTION_HOURS = float(os.getenv("IRIS_POSTING_CHANGE_RETENTION_HOURS", "24"))
 SOURCE_PROFILE_MODEL = os.getenv("IRIS_SOURCE_PROFILE_MODEL", "gpt-5.4-mini")
 SOURCE_PROFILE_PROVIDER = LLMProvider(os.getenv("IRIS_SOURCE_PROFILE_PROVIDER", LLMProvider.OPENAI.value).lower())
 SOURCE_PROFILE_TIMEOUT_SECONDS = float(os.getenv("IRIS_SOURCE_PROFILE_TIMEOUT_SECONDS", "45"))
+SOURCE_PROFILE_JOB_CONCURRENCY = int(os.getenv("IRIS_SOURCE_PROFILE_JOB_CONCURRENCY", "2"))
+SOURCE_PROFILE_JOB_STALE_SECONDS = float(os.getenv("IRIS_SOURCE_PROFILE_JOB_STALE_SECONDS", "600"))
 DEEPSEEK_API_BASE = os.getenv("DEEPSEEK_API_BASE", "https://api.deepseek.com")
 FIREBASE_PROJECT_ID = os.getenv("FIREBASE_PROJECT_ID") or os.getenv("GOOGLE_CLOUD_PROJECT")
 FIREBASE_SERVICE_ACCOUNT_FILE = os.getenv("FIREBASE_SERVICE_ACCOUNT_FILE") or os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
 FIREBASE_SERVICE_ACCOUNT_JSON = os.getenv("FIREBASE_SERVICE_ACCOUNT_JSON")
 FIREBASE_HTTP_TIMEOUT_SECONDS = max(1.0, float(os.getenv("FIREBASE_HTTP_TIMEOUT_SECONDS", "10")))
+AUTH_IDENTITY_CACHE_SIZE = max(0, int(os.getenv("IRIS_AUTH_IDENTITY_CACHE_SIZE", "4096")))
+AUTH_USER_CACHE_SIZE = max(0, int(os.getenv("IRIS_AUTH_USER_CACHE_SIZE", "4096")))
+METRICS_RECONCILE_SECONDS = max(0.0, float(os.getenv("IRIS_METRICS_RECONCILE_SECONDS", "300")))
 RAILWAY_SERVICE_ID = os.getenv("RAILWAY_SERVICE_ID")
 ADMIN_EMAILS = {
     email.strip().lower()
@@ -0,0 +1,49 @@
+"""Reciprocal-rank fusion shared by hybrid search and agent tool merging.
+
+A document at 1-based ``rank`` in a ranking earns ``weight / (RRF_K + rank)``.
+Hybrid search also passes each hit's strength in ``[0, 1]`` and multiplies it
+in, so a strong hit from one ranking is not outranked by documents that are
+middling in both. Fused scores are scaled by ``rrf_scale`` so a document
+ranked first at full strength by every ranking scores 1.0, which keeps
+favourite, dismiss and authority adjustments on the same footing whichever
+rankings took part. The Postgres hybrid query computes the same formula in SQL
+from these constants.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+
+
+RRF_K = 60
+
+
+def rrf_scale(weights: Iterable[float], *, k: int = RRF_K) -> float:
+    """Return the factor that maps a first place in every weighted ranking to 1.0."""
+    total = sum(weights)
+    return (k + 1) / total if total > 0 else 0.0
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]],
+    weights: Sequence[float] | None = None,
+    *,
+    strengths: Sequence[Mapping[int, float]] | None = None,
+    k: int = RRF_K,
+) -> dict[int, float]:
+    """Fuse id rankings, best first, into scaled scores in descending order.
+
+    ``strengths`` optionally maps items of each ranking to a factor in
+    ``[0, 1]``; items without one count at full strength.
+    """
+    weights = [1.0] * len(rankings) if weights is None else list(weights)
+    strengths = [{}] * len(rankings) if strengths is None else list(strengths)
+    if len(weights) != len(rankings) or len(strengths) != len(rankings):
+        raise ValueError("reciprocal_rank_fusion needs one weight and strength map per ranking")
+    scale = rrf_scale(weight for weight, ranking in zip(weights, rankings) if ranking)
+    scores: dict[int, float] = {}
+    for ranking, weight, strength in zip(rankings, weights, strengths):
+        # Only an item's best rank in each ranking counts.
+        for rank, item in enumerate(dict.fromkeys(ranking), start=1):
+            scores[item] = scores.get(item, 0.0) + weight * strength.get(item, 1.0) / (k + rank)
+    return dict(sorted(((item, score * scale) for item, score in scores.items()), key=lambda entry: entry[1], reverse=True))
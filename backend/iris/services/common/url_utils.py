@@ -77,6 +77,35 @@ def same_domain(a: str, b: str) -> bool:
     return domain_for_url(a) == domain_for_url(b)
 
 
+def url_hash(url: str) -> int:
+    """Return a signed 64-bit hash of a normalised URL, used as its unique lookup key."""
+    return _hash64(url)
+
+
+def url_key(url: str) -> int:
+    """Return a signed 64-bit lookup key for a normalised URL that ignores http/https.
+
+    Equal keys only nominate candidates; callers still compare the URL itself.
+    """
+    scheme, separator, rest = url.partition(":")
+    if separator and scheme.lower() in {"http", "https"}:
+        url = rest
+    return _hash64(url)
+
+
+def http_scheme_variants(url: str) -> set[str]:
+    """Return a URL with both its http and https spellings."""
+    parsed = urlparse(url)
+    if parsed.scheme not in {"http", "https"}:
+        return {url}
+    other = "https" if parsed.scheme == "http" else "http"
+    return {url, urlunparse((other, parsed.netloc, parsed.path, "", parsed.query, ""))}
+
+
+def _hash64(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big", signed=True)
+
+
 def content_hash(text: str) -> str:
     return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
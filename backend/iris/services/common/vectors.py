@@ -0,0 +1,118 @@
+"""Vectorised NumPy kernels for local embeddings, similarity and projection.
+
+These back the paths used when OpenAI embeddings or UMAP are unavailable: the
+hashed-token embedder, in-process cosine ranking over the searchable corpus,
+and the admin embedding map fallback projection.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import chain, repeat
+
+import numpy as np
+
+
+TOKEN_PATTERN = re.compile(r"[a-zA-Z][a-zA-Z0-9\-]{2,}")
+TOKEN_CACHE_SIZE = 1 << 17
+
+
+def hashed_token_embeddings(texts: Sequence[str], *, dimensions: int) -> np.ndarray:
+    """Embed texts as L2-normalised signed token-hash counts, one row per text.
+
+    Each distinct word is hashed once and cached, and every token of every
+    text is scattered into the output matrix with a single ``bincount``.
+    """
+    token_lists = [TOKEN_PATTERN.findall(text.lower()) for text in texts]
+    lengths = np.fromiter(map(len, token_lists), dtype=np.int64, count=len(token_lists))
+    total = int(lengths.sum())
+    slots = np.fromiter(
+        map(_token_slot, chain.from_iterable(token_lists), repeat(dimensions)),
+        dtype=np.int64,
+        count=total,
+    )
+    rows = np.repeat(np.arange(len(token_lists), dtype=np.int64), lengths)
+    signs = 1.0 - 2.0 * (slots & 1)
+    matrix = np.bincount(
+        rows * dimensions + (slots >> 1),
+        weights=signs,
+        minlength=len(token_lists) * dimensions,
+    ).reshape(len(token_lists), dimensions)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def stack_vectors(vectors: Sequence[np.ndarray | Sequence[float] | None], dimensions: int) -> tuple[np.ndarray, np.ndarray]:
+    """Stack vectors into a float32 matrix and a mask of rows that had ``dimensions`` values.
+
+    Missing or differently sized vectors leave a zero row, so they score 0.
+    """
+    matrix = np.zeros((len(vectors), dimensions), dtype=np.float32)
+    present = np.zeros(len(vectors), dtype=bool)
+    for row, vector in enumerate(vectors):
+        if vector is None or len(vector) != dimensions:
+            continue
+        matrix[row] = vector
+        present[row] = True
+    return matrix, present
+
+
+def cosine_scores(query: Sequence[float] | np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    """Return the cosine of ``query`` with every row; stored vectors are unit length."""
+    return matrix @ np.asarray(query, dtype=matrix.dtype)
+
+
+def top_k(scores: np.ndarray, k: int, *, min_score: float | None = None) -> np.ndarray:
+    """Return row indices of the ``k`` best scores, best first and stable on ties."""
+    candidates = np.arange(len(scores)) if min_score is None else np.flatnonzero(scores > min_score)
+    if k <= 0 or not len(candidates):
+        return candidates[:0]
+    if k < len(candidates):
+        candidates = np.sort(candidates[np.argpartition(-scores[candidates], k - 1)[:k]])
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+def principal_components(
+    matrix: np.ndarray,
+    components: int,
+    *,
+    oversample: int = 8,
+    power_iterations: int = 2,
+    seed: int = 42,
+) -> np.ndarray:
+    """Project centred rows onto their top principal components with randomised SVD.
+
+    Returns an ``(rows, components)`` array; components beyond the rank of
+    ``matrix`` are zero. Signs are fixed so repeated calls agree.
+    """
+    centered = np.asarray(matrix, dtype=np.float64)
+    centered = centered - centered.mean(axis=0, keepdims=True)
+    rows, columns = centered.shape
+    rank = min(components, rows, columns)
+    projected = np.zeros((rows, components))
+    if rank == 0:
+        return projected
+    sketch_width = min(rank + oversample, columns)
+    sketch = centered @ np.random.default_rng(seed).standard_normal((columns, sketch_width))
+    for _ in range(power_iterations):
+        sketch, _ = np.linalg.qr(sketch)
+        sketch = centered @ (centered.T @ sketch)
+    basis, _ = np.linalg.qr(sketch)
+    _, _, right = np.linalg.svd(basis.T @ centered, full_matrices=False)
+    axes = right[:rank]
+    peaks = np.abs(axes).argmax(axis=1)
+    axes = axes * np.sign(axes[np.arange(rank), peaks])[:, None]
+    projected[:, :rank] = centered @ axes.T
+    return projected
+
+
+@lru_cache(maxsize=TOKEN_CACHE_SIZE)
+def _token_slot(word: str, dimensions: int) -> int:
+    # Bucket in the high bits, sign in the low bit.
+    digest = hashlib.sha256(word.encode("utf-8")).digest()
+    bucket = int.from_bytes(digest[:4], "big") % dimensions
+    return (bucket << 1) | (digest[4] & 1)
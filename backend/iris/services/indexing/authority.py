@@ -0,0 +1,151 @@
+"""Personalised PageRank authority over the source and document link graphs.
+
+Edges come from links on fetched essays: source edges are weighted by how many
+documents link from one source to another, document edges are unweighted. The
+teleport vector is seeded from favourited documents (and their sources) across
+all users, falling back to uniform PageRank when nothing is favourited yet.
+Power iteration runs over edge arrays with ``numpy.bincount`` as the sparse
+matrix-vector product, warm-started from the stored scores, so refreshing
+after an index run that added a few links converges in a few iterations. A
+graph fingerprint lets an unchanged graph skip the refresh entirely.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+
+import numpy as np
+
+from iris.dao import authority as authority_dao
+from iris.models import AuthorityRun
+from iris.schemas.enums import AuthorityGraph
+from iris.schemas.indexing import AuthorityGraphResult
+from iris.services.common.config import AUTHORITY_DAMPING, AUTHORITY_MAX_ITERATIONS, AUTHORITY_TOLERANCE
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PageRankResult:
+    scores: np.ndarray
+    iterations: int
+    residual: float
+
+
+def personalized_pagerank(
+    nodes: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    weights: np.ndarray,
+    personalization: np.ndarray,
+    *,
+    damping: float = AUTHORITY_DAMPING,
+    tolerance: float = AUTHORITY_TOLERANCE,
+    max_iterations: int = AUTHORITY_MAX_ITERATIONS,
+    start: np.ndarray | None = None,
+) -> PageRankResult:
+    """Run power iteration for PageRank with teleport vector ``personalization``.
+
+    Mass on dangling nodes is returned through the teleport vector, so scores
+    stay a probability distribution. Iteration stops once the L1 change drops
+    below ``tolerance``.
+    """
+    if nodes == 0:
+        return PageRankResult(scores=np.zeros(0), iterations=0, residual=0.0)
+    teleport = personalization / personalization.sum()
+    out_weight = np.bincount(sources, weights=weights, minlength=nodes)
+    transition = weights / out_weight[sources] if len(sources) else weights
+    dangling = out_weight == 0
+    rank = teleport.copy() if start is None else start / start.sum()
+    residual = 0.0
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        spread = np.bincount(targets, weights=rank[sources] * transition, minlength=nodes)
+        updated = damping * (spread + rank[dangling].sum() * teleport) + (1.0 - damping) * teleport
+        residual = float(np.abs(updated - rank).sum())
+        rank = updated
+        if residual < tolerance:
+            break
+    return PageRankResult(scores=rank, iterations=iterations, residual=residual)
+
+
+def refresh_authority_scores(*, force: bool = False) -> list[AuthorityGraphResult]:
+    """Recompute and store source and document authority when the link graph changed."""
+    fingerprint = authority_dao.graph_fingerprint()
+    source_seeds, document_seeds = authority_dao.get_favourite_seeds()
+    return [
+        _refresh_graph(
+            AuthorityGraph.SOURCES, fingerprint, authority_dao.get_source_link_edges, source_seeds, force=force
+        ),
+        _refresh_graph(AuthorityGraph.DOCUMENTS, fingerprint, _weighted_document_edges, document_seeds, force=force),
+    ]
+
+
+def _weighted_document_edges() -> list[tuple[int, int, int]]:
+    return [(source_id, target_id, 1) for source_id, target_id in authority_dao.get_document_link_edges()]
+
+
+def _refresh_graph(
+    graph: AuthorityGraph,
+    fingerprint: str,
+    load_edges: Callable[[], list[tuple[int, int, int]]],
+    seeds: Mapping[int, int],
+    *,
+    force: bool,
+) -> AuthorityGraphResult:
+    latest = authority_dao.get_latest_authority_run(graph)
+    if latest is not None and latest.fingerprint == fingerprint and not force:
+        return AuthorityGraphResult(graph, latest.nodes, latest.edges, latest.seeds, 0, skipped=True)
+
+    edges = load_edges()
+    edge_array = np.array(edges, dtype=np.int64).reshape(-1, 3)
+    node_ids = np.unique(np.concatenate([edge_array[:, 0], edge_array[:, 1], np.fromiter(seeds, dtype=np.int64)]))
+    sources = np.searchsorted(node_ids, edge_array[:, 0])
+    targets = np.searchsorted(node_ids, edge_array[:, 1])
+    personalization = np.ones(len(node_ids))
+    if seeds:
+        personalization = np.zeros(len(node_ids))
+        personalization[np.searchsorted(node_ids, np.fromiter(seeds, dtype=np.int64))] = list(seeds.values())
+
+    previous = authority_dao.get_authority_scores(graph)
+    start = None
+    if previous and len(node_ids):
+        start = np.array([previous.get(int(node_id), 0.0) for node_id in node_ids])
+        # Nodes new to the graph start from the mean of the known scores.
+        start[start == 0.0] = start[start > 0.0].mean() if (start > 0.0).any() else 1.0
+    result = personalized_pagerank(
+        len(node_ids),
+        sources,
+        targets,
+        edge_array[:, 2].astype(np.float64),
+        personalization,
+        start=start,
+    )
+    peak = result.scores.max() if len(node_ids) else 0.0
+    scaled = result.scores / peak if peak > 0 else result.scores
+    authority_dao.replace_authority_scores(graph, dict(zip(node_ids.tolist(), scaled.tolist())))
+    authority_dao.add_authority_run(
+        AuthorityRun(
+            graph=graph,
+            fingerprint=fingerprint,
+            nodes=len(node_ids),
+            edges=len(edges),
+            seeds=len(seeds),
+            iterations=result.iterations,
+            residual=result.residual,
+        )
+    )
+    logger.info(
+        "authority graph=%s nodes=%s edges=%s seeds=%s iterations=%s residual=%.2e warm_start=%s",
+        graph.value,
+        len(node_ids),
+        len(edges),
+        len(seeds),
+        result.iterations,
+        result.residual,
+        start is not None,
+    )
+    return AuthorityGraphResult(graph, len(node_ids), len(edges), len(seeds), result.iterations, skipped=False)
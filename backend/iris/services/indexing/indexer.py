@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import logging
 from dataclasses import asdict
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from iris.dao import db
 from iris.dao import indexing as indexing_dao
+from iris.dao import postings as postings_dao
 from iris.dao.sources import get_or_create_source
+from iris.services.ingestion.crawl_timing import CrawlTimings
 from iris.services.ingestion.crawler import Crawler
 from iris.models import CrawlJob, IndexRun, Source
 from iris.schemas.enums import (
@@ -19,7 +21,9 @@ from iris.schemas.enums import (
     SourceStatus,
 )
 from iris.schemas.indexing import SourcePriority, SourcePriorityPayload
+from iris.services.common.config import AUTHORITY_REFRESH_AFTER_RUN, POSTING_CHANGE_RETENTION_HOURS
 from iris.services.common.url_utils import root_url_for_domain
+from iris.services.indexing.authority import refresh_authority_scores
 from iris.services.ingestion.embedding import document_embedding_text, embed_text
 
 
@@ -81,6 +85,7 @@ def autopilot(
             max_pages=max_pages,
             max_depth=max_depth,
         )
+        run_timings = CrawlTimings()
         try:
             indexing_dao.add_index_run(run)
             if seed_domain:
@@ -103,6 +108,7 @@ def autopilot(
                         skip_existing=skip_existing,
                         openai_embeddings=openai_embeddings,
                         active_pages=active_pages,
+                        run_timings=run_timings,
                     )
             planned = plan_sources(
                 limit=budget_sources,
@@ -153,18 +159,27 @@ def autopilot(
                     skip_existing=skip_existing,
                     openai_embeddings=openai_embeddings,
                     active_pages=active_pages,
+                    run_timings=run_timings,
                 )
                 db.commit()
 
+            if planned:
+                refresh_authority_after_run(run)
+            # Readers that have not refreshed within the retention window rebuild in full.
+            postings_dao.prune_posting_changes(
+                older_than=datetime.now(timezone.utc) - timedelta(hours=POSTING_CHANGE_RETENTION_HOURS)
+            )
             run.status = IndexRunStatus.SUCCEEDED.value
             run.stop_reason = "budget_exhausted" if planned else "no_queued_sources"
             run.finished_at = datetime.now(timezone.utc)
+            _log_run_finished(run, run_timings)
             db.commit()
             return run
         except KeyboardInterrupt:
             run.status = IndexRunStatus.STOPPED.value
             run.stop_reason = "interrupted"
             run.finished_at = datetime.now(timezone.utc)
+            _log_run_finished(run, run_timings)
             db.commit()
             logger.info("index run %s stopped by user", run.id)
             raise
@@ -173,6 +188,7 @@ def autopilot(
             run.errors += 1
             run.stop_reason = str(exc)
             run.finished_at = datetime.now(timezone.utc)
+            _log_run_finished(run, run_timings)
             db.commit()
             return run
 
@@ -188,6 +204,7 @@ def _run_one_source(
     skip_existing: bool,
     openai_embeddings: bool | None,
     active_pages: int,
+    run_timings: CrawlTimings,
 ) -> CrawlJob:
     """Crawl one planned source and fold the crawl result into its index run.
 
@@ -215,7 +232,8 @@ def _run_one_source(
         payload=asdict(get_priority_payload(priority)),
     )
     db.commit()
-    job = Crawler().crawl_source(
+    crawler = Crawler()
+    job = crawler.crawl_source(
         source,
         max_pages=max_pages,
         max_depth=max_depth,
@@ -224,6 +242,7 @@ def _run_one_source(
         active_pages=active_pages,
     )
     job.index_run_id = run.id
+    run_timings.merge(crawler.timings)
     after_docs = indexing_dao.count_documents_for_source(source)
     new_docs = max(0, after_docs - before_docs)
     if job.status == CrawlJobStatus.SUCCEEDED.value:
@@ -266,12 +285,17 @@ def _run_one_source(
             "documents_indexed": job.documents_indexed,
             "pages_fetched": job.pages_fetched,
             "pages_failed": job.pages_failed,
+            "active_pages": job.active_pages,
+            "peak_active_pages": job.peak_active_pages,
+            "fetch_retries": job.fetch_retries,
+            "throttled_responses": job.throttled_responses,
             "max_documents_per_source": max_documents_per_source,
             "skip_existing": skip_existing,
             "links_seen": job.links_seen,
             "sources_discovered": job.sources_discovered,
             "embedded": embedded,
             "error": job.error,
+            "timings": crawler.timings.as_payload(),
         },
     )
     return job
@@ -288,6 +312,7 @@ def _crawl_seed_source(
     skip_existing: bool,
     openai_embeddings: bool | None,
     active_pages: int,
+    run_timings: CrawlTimings,
 ) -> CrawlJob:
     """Refresh an explicitly requested seed source before planning outward."""
     if source.status != SourceStatus.QUEUED.value:
@@ -301,7 +326,8 @@ def _crawl_seed_source(
     )
     db.commit()
     before_docs = indexing_dao.count_documents_for_source(source)
-    job = Crawler().crawl_source(
+    crawler = Crawler()
+    job = crawler.crawl_source(
         source,
         max_pages=max_pages,
         max_depth=max_depth,
@@ -310,6 +336,7 @@ def _crawl_seed_source(
         active_pages=active_pages,
     )
     job.index_run_id = run.id
+    run_timings.merge(crawler.timings)
     after_docs = indexing_dao.count_documents_for_source(source)
     new_docs = max(0, after_docs - before_docs)
     embedded = 0
@@ -339,12 +366,17 @@ def _crawl_seed_source(
             "documents_indexed": job.documents_indexed,
             "pages_fetched": job.pages_fetched,
             "pages_failed": job.pages_failed,
+            "active_pages": job.active_pages,
+            "peak_active_pages": job.peak_active_pages,
+            "fetch_retries": job.fetch_retries,
+            "throttled_responses": job.throttled_responses,
             "max_documents_per_source": max_documents_per_source,
             "skip_existing": skip_existing,
             "links_seen": job.links_seen,
             "sources_discovered": job.sources_discovered,
             "embedded": embedded,
             "error": job.error,
+            "timings": crawler.timings.as_payload(),
             "seed_domain": seed_domain,
             "seed_refresh": True,
         },
@@ -353,49 +385,111 @@ def _crawl_seed_source(
     return job
 
 
+def _log_run_finished(run: IndexRun, timings: CrawlTimings) -> None:
+    summary = timings.summary()
+    logger.info(
+        "index run %s throughput pages=%s pages_per_second=%s llm_seconds_per_page=%s queue_wait_seconds=%s",
+        run.id,
+        summary["pages"],
+        summary["pages_per_second"],
+        summary["llm_seconds_per_page"],
+        summary["queue_wait_seconds"],
+    )
+    indexing_dao.log_event(
+        run,
+        IndexEventType.RUN_FINISHED.value,
+        f"finished run: {run.status}",
+        payload={"status": run.status, "stop_reason": run.stop_reason, "timings": timings.as_payload()},
+    )
+
+
 def plan_sources(
     limit: int = 20,
     *,
     seed_domain: str | None = None,
 ) -> list[SourcePriority]:
-    """Rank queued sources by direct link proximity to an optional seed source.
+    """Rank queued sources for the next crawl, selecting the top ``limit`` in SQL.
 
     With a seed domain, only queued sources directly linked from that exact
-    source domain's fetched essay documents are eligible. Without a seed, the
-    frontier falls back to links from all indexed essay sources. Exact-domain
-    platform blocks are filtered before the final score sort.
+    source domain's fetched essay documents are eligible, ranked by link count.
+    Without a seed, queued sources are ranked by their stored personalised
+    PageRank authority; sources discovered since the last authority refresh
+    fill any remaining slots by inbound links from indexed essay sources.
+    Exact-domain platform blocks are filtered in the query.
     """
-    seed_source = None
     if seed_domain:
         normalized_seed_domain = seed_domain.strip().lower()
         seed_source = indexing_dao.get_source_by_domain(normalized_seed_domain)
         if not seed_source:
             raise ValueError(f"seed source domain not found: {normalized_seed_domain}")
-    sources = indexing_dao.get_queued_sources_oldest_first()
-    source_ids = [source.id for source in sources]
-    inbound_by_source, referring_by_source = (
-        indexing_dao.count_links_for_sources(source_ids) if source_ids else ({}, {})
-    )
-    bfs_links_by_source = (
-        indexing_dao.count_bfs_links_for_sources(source_ids, seed_source.id)
-        if seed_source
-        else inbound_by_source
+        frontier = indexing_dao.get_frontier_sources(
+            limit, seed_source_id=seed_source.id, exclude_domains=DOMAIN_SKIP_LIST
+        )
+        inbound_by_source, referring_by_source = indexing_dao.count_links_for_sources(
+            [source.id for source, _links in frontier]
+        )
+        return [
+            _score_source_from_counts(
+                source,
+                inbound_links=inbound_by_source.get(source.id, 0),
+                referring_sources=referring_by_source.get(source.id, 0),
+                bfs_links=bfs_links,
+                bfs_seed_source_id=seed_source.id,
+                bfs_seed_domain=seed_source.canonical_domain,
+            )
+            for source, bfs_links in frontier
+        ]
+
+    authoritative = indexing_dao.get_top_authority_sources(limit, exclude_domains=DOMAIN_SKIP_LIST)
+    frontier = indexing_dao.get_frontier_sources(
+        limit - len(authoritative),
+        exclude_domains=DOMAIN_SKIP_LIST,
+        exclude_ids={source.id for source, _score in authoritative},
+    ) if len(authoritative) < limit else []
+    inbound_by_source, referring_by_source = indexing_dao.count_links_for_sources(
+        [source.id for source, _score in authoritative] + [source.id for source, _links in frontier]
     )
     priorities = [
-        _score_source_from_counts(
+        _score_source_from_authority(
             source,
+            authority=authority,
             inbound_links=inbound_by_source.get(source.id, 0),
             referring_sources=referring_by_source.get(source.id, 0),
-            bfs_links=bfs_links_by_source.get(source.id, 0),
-            bfs_seed_source_id=seed_source.id if seed_source else None,
-            bfs_seed_domain=seed_source.canonical_domain if seed_source else None,
         )
-        for source in sources
-        if bfs_links_by_source.get(source.id, 0) > 0
-        and source.canonical_domain not in DOMAIN_SKIP_LIST
+        for source, authority in authoritative
     ]
-    priorities.sort(key=lambda item: item.score, reverse=True)
-    return priorities[:limit]
+    priorities.extend(
+        _score_source_from_counts(
+            source,
+            inbound_links=inbound_by_source.get(source.id, 0),
+            referring_sources=referring_by_source.get(source.id, 0),
+            bfs_links=links,
+            bfs_seed_source_id=None,
+            bfs_seed_domain=None,
+        )
+        for source, links in frontier
+    )
+    return priorities
+
+
+def refresh_authority_after_run(run: IndexRun) -> None:
+    """Refresh link-graph authority once an index run has added documents and links."""
+    if not AUTHORITY_REFRESH_AFTER_RUN:
+        return
+    try:
+        results = refresh_authority_scores()
+    except Exception:
+        logger.exception("index run %s could not refresh authority scores", run.id)
+        return
+    for result in results:
+        logger.info(
+            "index run %s authority graph=%s nodes=%s iterations=%s skipped=%s",
+            run.id,
+            result.graph.value,
+            result.nodes,
+            result.iterations,
+            result.skipped,
+        )
 
 
 def embed_source_documents(source: Source, *, openai: bool | None = None) -> int:
@@ -428,6 +522,34 @@ def get_priority_payload(priority: SourcePriority) -> SourcePriorityPayload:
     )
 
 
+def _score_source_from_authority(
+    source: Source,
+    *,
+    authority: float,
+    inbound_links: int,
+    referring_sources: int,
+) -> SourcePriority:
+    """Build a priority from a stored personalised PageRank score."""
+    return SourcePriority(
+        source=source,
+        score=authority,
+        inbound_links=inbound_links,
+        referring_sources=referring_sources,
+        bfs_links=inbound_links,
+        bfs_seed_source_id=None,
+        bfs_seed_domain=None,
+        reason=", ".join(
+            [
+                "algorithm=pagerank",
+                f"authority={authority:.4f}",
+                f"inbound={inbound_links}",
+                f"ref_sources={referring_sources}",
+                "seed=favourites",
+            ]
+        ),
+    )
+
+
 def _score_source_from_counts(
     source: Source,
     *,
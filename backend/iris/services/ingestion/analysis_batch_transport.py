@@ -0,0 +1,158 @@
+"""Transports that run JSONL files of document analysis requests as provider batches.
+
+A transport only moves files: ``submit`` hands over a request file and returns
+the provider's batch id, ``poll`` reports whether the batch finished and, once
+it has, writes the result lines to a local output file. Request and result
+lines follow the OpenAI Batch API shape (``custom_id``, ``body`` in;
+``custom_id``, ``response.status_code``, ``response.body``, ``error`` out),
+so the local stand-in produces files the collector parses the same way.
+"""
+
+from __future__ import annotations
+
+import json
+import shutil
+import uuid
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+import httpx
+
+from iris.services.common.config import (
+    ANALYSIS_BATCH_COMPLETION_WINDOW,
+    ANALYSIS_BATCH_DIR,
+    ANALYSIS_BATCH_TRANSPORT,
+    DOCUMENT_CLASSIFIER_TIMEOUT_SECONDS,
+    require_openai_api_key,
+)
+
+
+OPENAI_API_URL = "https://api.openai.com/v1"
+RESPONSES_ENDPOINT = "/v1/responses"
+PENDING_OPENAI_STATUSES = frozenset({"validating", "in_progress", "finalizing", "cancelling"})
+
+
+@dataclass(frozen=True)
+class BatchPoll:
+    """Provider state for one submitted batch; ``status`` is pending, completed or failed."""
+
+    status: str
+    error: str | None = None
+
+
+class BatchTransport(Protocol):
+    def submit(self, request_path: Path) -> str: ...
+
+    def poll(self, batch_id: str, output_path: Path) -> BatchPoll: ...
+
+
+class OpenAIBatchTransport:
+    """Upload request files to the OpenAI Files API and run them through the Batch API."""
+
+    def __init__(self, *, completion_window: str = ANALYSIS_BATCH_COMPLETION_WINDOW) -> None:
+        self.completion_window = completion_window
+
+    def submit(self, request_path: Path) -> str:
+        with self._client() as client:
+            with request_path.open("rb") as handle:
+                upload = client.post(
+                    "/files",
+                    data={"purpose": "batch"},
+                    files={"file": (request_path.name, handle, "application/jsonl")},
+                )
+            upload.raise_for_status()
+            batch = client.post(
+                "/batches",
+                json={
+                    "input_file_id": upload.json()["id"],
+                    "endpoint": RESPONSES_ENDPOINT,
+                    "completion_window": self.completion_window,
+                },
+            )
+            batch.raise_for_status()
+        return str(batch.json()["id"])
+
+    def poll(self, batch_id: str, output_path: Path) -> BatchPoll:
+        with self._client() as client:
+            response = client.get(f"/batches/{batch_id}")
+            response.raise_for_status()
+            batch = response.json()
+            status = batch.get("status")
+            if status in PENDING_OPENAI_STATUSES:
+                return BatchPoll("pending")
+            # Expired and cancelled batches still return the requests that finished.
+            file_ids = [batch.get("output_file_id"), batch.get("error_file_id")]
+            if not any(file_ids):
+                return BatchPoll("failed", error=json.dumps(batch.get("errors") or {"status": status}))
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            with output_path.open("wb") as output:
+                for file_id in filter(None, file_ids):
+                    content = client.get(f"/files/{file_id}/content")
+                    content.raise_for_status()
+                    output.write(content.content.rstrip(b"\n") + b"\n")
+        return BatchPoll("completed")
+
+    @staticmethod
+    def _client() -> httpx.Client:
+        key = require_openai_api_key("document analysis batches")
+        return httpx.Client(
+            base_url=OPENAI_API_URL,
+            headers={"Authorization": f"Bearer {key}"},
+            timeout=max(DOCUMENT_CLASSIFIER_TIMEOUT_SECONDS, 60.0),
+        )
+
+
+class LocalBatchTransport:
+    """File-based stand-in that keeps batches in a directory.
+
+    With ``respond`` set, polling answers every request body through it;
+    otherwise a batch stays pending until ``<batch id>.output.jsonl`` appears
+    in the directory, written by whatever process serves the requests.
+    """
+
+    def __init__(self, directory: Path, *, respond: Callable[[Mapping[str, object]], Mapping[str, object]] | None = None):
+        self.directory = directory
+        self.respond = respond
+
+    def submit(self, request_path: Path) -> str:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        batch_id = f"local-{uuid.uuid4().hex}"
+        shutil.copyfile(request_path, self.directory / f"{batch_id}.input.jsonl")
+        return batch_id
+
+    def poll(self, batch_id: str, output_path: Path) -> BatchPoll:
+        input_path = self.directory / f"{batch_id}.input.jsonl"
+        result_path = self.directory / f"{batch_id}.output.jsonl"
+        if not input_path.exists():
+            return BatchPoll("failed", error=f"unknown local batch {batch_id}")
+        if not result_path.exists():
+            if self.respond is None:
+                return BatchPoll("pending")
+            self._answer(input_path, result_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(result_path, output_path)
+        return BatchPoll("completed")
+
+    def _answer(self, input_path: Path, result_path: Path) -> None:
+        with input_path.open() as requests, result_path.open("w") as results:
+            for line in requests:
+                if not line.strip():
+                    continue
+                request = json.loads(line)
+                try:
+                    result = {"status_code": 200, "body": dict(self.respond(request["body"]))}
+                    error = None
+                except Exception as exc:
+                    result, error = None, {"message": str(exc)}
+                results.write(json.dumps({"custom_id": request["custom_id"], "response": result, "error": error}) + "\n")
+
+
+def analysis_batch_transport(name: str = ANALYSIS_BATCH_TRANSPORT) -> BatchTransport:
+    """Return the configured transport: ``openai`` or the directory-backed ``local`` stand-in."""
+    if name == "openai":
+        return OpenAIBatchTransport()
+    if name == "local":
+        return LocalBatchTransport(ANALYSIS_BATCH_DIR / "local")
+    raise ValueError(f"unknown analysis batch transport: {name}")
@@ -0,0 +1,269 @@
+"""Per-stage timing histograms for the crawl pipeline.
+
+Each page records how long it spent waiting in the crawl frontier and in each
+pipeline stage. A crawler folds page timings into a ``CrawlTimings`` for its
+job; index runs merge job timings and store both in ``IndexEvent`` payloads.
+Staged crawls also record stage occupancy: the page-seconds spent queued
+for each pipeline stage, being processed by it, and blocked handing off to a
+full downstream queue. Divided by wall time these are the mean number of pages
+in each state. Every finished crawl is also merged into a process-wide
+registry that the API exposes in the Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import time
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from threading import Lock
+
+
+CRAWL_STAGES = ("queue_wait", "connect", "download", "parse", "analysis", "embedding", "persist")
+PIPELINE_STAGES = ("fetch", "parse", "analysis", "embedding")
+OCCUPANCY_STATES = ("waiting", "busy", "blocked")
+# Upper bounds in seconds; the implicit last bucket is +Inf.
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@dataclass
+class StageHistogram:
+    """Per-bucket (non-cumulative) counts plus the sum and count for one stage."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (len(STAGE_BUCKETS) + 1))
+    total_seconds: float = 0.0
+    observations: int = 0
+
+    def observe(self, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        self.counts[bisect_left(STAGE_BUCKETS, seconds)] += 1
+        self.total_seconds += seconds
+        self.observations += 1
+
+    def merge(self, other: StageHistogram) -> None:
+        self.counts = [left + right for left, right in zip(self.counts, other.counts)]
+        self.total_seconds += other.total_seconds
+        self.observations += other.observations
+
+    def quantile(self, q: float) -> float | None:
+        """Return the upper bound of the bucket holding quantile ``q``."""
+        if not self.observations:
+            return None
+        rank = q * self.observations
+        seen = 0
+        for bound, count in zip((*STAGE_BUCKETS, float("inf")), self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+
+@dataclass
+class StageOccupancy:
+    """Page-seconds one pipeline stage's pages spent waiting, busy and blocked."""
+
+    waiting: float = 0.0
+    busy: float = 0.0
+    blocked: float = 0.0
+
+    def merge(self, other: StageOccupancy) -> None:
+        self.waiting += other.waiting
+        self.busy += other.busy
+        self.blocked += other.blocked
+
+
+@dataclass
+class CrawlTimings:
+    """Stage histograms, page count and crawl wall time for one crawl job or run."""
+
+    stages: dict[str, StageHistogram] = field(default_factory=lambda: {stage: StageHistogram() for stage in CRAWL_STAGES})
+    pages: int = 0
+    wall_seconds: float = 0.0
+    occupancy: dict[str, StageOccupancy] = field(default_factory=dict)
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.stages.setdefault(stage, StageHistogram()).observe(seconds)
+
+    def observe_page(self, timings: Mapping[str, float]) -> None:
+        self.pages += 1
+        for stage, seconds in timings.items():
+            self.observe(stage, seconds)
+
+    def observe_occupancy(self, stage: str, *, waiting: float = 0.0, busy: float = 0.0, blocked: float = 0.0) -> None:
+        self.occupancy.setdefault(stage, StageOccupancy()).merge(
+            StageOccupancy(max(0.0, waiting), max(0.0, busy), max(0.0, blocked))
+        )
+
+    def merge(self, other: CrawlTimings) -> None:
+        for stage, histogram in other.stages.items():
+            self.stages.setdefault(stage, StageHistogram()).merge(histogram)
+        for stage, occupancy in other.occupancy.items():
+            self.occupancy.setdefault(stage, StageOccupancy()).merge(occupancy)
+        self.pages += other.pages
+        self.wall_seconds += other.wall_seconds
+
+    def stage_seconds_per_page(self, stage: str) -> float:
+        histogram = self.stages.get(stage)
+        return histogram.total_seconds / self.pages if histogram and self.pages else 0.0
+
+    def mean_occupancy(self, stage: str) -> StageOccupancy:
+        """Mean pages waiting for, busy in and blocked after ``stage`` over the crawl wall time."""
+        occupancy = self.occupancy.get(stage)
+        if not occupancy or not self.wall_seconds:
+            return StageOccupancy()
+        return StageOccupancy(
+            occupancy.waiting / self.wall_seconds,
+            occupancy.busy / self.wall_seconds,
+            occupancy.blocked / self.wall_seconds,
+        )
+
+    def summary(self) -> dict[str, float]:
+        queue_wait = self.stages.get("queue_wait") or StageHistogram()
+        return {
+            "pages": self.pages,
+            "pages_per_second": round(self.pages / self.wall_seconds, 3) if self.wall_seconds else 0.0,
+            "llm_seconds_per_page": round(self.stage_seconds_per_page("analysis"), 3),
+            "queue_wait_seconds": round(queue_wait.total_seconds / queue_wait.observations, 3) if queue_wait.observations else 0.0,
+        }
+
+    def as_payload(self) -> dict[str, object]:
+        return {
+            "pages": self.pages,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "buckets": list(STAGE_BUCKETS),
+            "stages": {
+                stage: {
+                    "counts": list(histogram.counts),
+                    "sum": round(histogram.total_seconds, 6),
+                    "count": histogram.observations,
+                }
+                for stage, histogram in self.stages.items()
+            },
+            "occupancy": {
+                stage: {state: round(getattr(occupancy, state), 6) for state in OCCUPANCY_STATES}
+                for stage, occupancy in self.occupancy.items()
+            },
+            "summary": self.summary(),
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object] | None) -> CrawlTimings | None:
+        """Rebuild timings from ``as_payload`` output; ``None`` when absent or from other buckets."""
+        if not isinstance(payload, Mapping) or list(payload.get("buckets") or []) != list(STAGE_BUCKETS):
+            return None
+        timings = cls(pages=int(payload.get("pages") or 0), wall_seconds=float(payload.get("wall_seconds") or 0.0))
+        stages = payload.get("stages")
+        for stage, values in (stages.items() if isinstance(stages, Mapping) else []):
+            counts = values.get("counts") if isinstance(values, Mapping) else None
+            if not isinstance(counts, list) or len(counts) != len(STAGE_BUCKETS) + 1:
+                continue
+            timings.stages[stage] = StageHistogram(
+                counts=[int(count) for count in counts],
+                total_seconds=float(values.get("sum") or 0.0),
+                observations=int(values.get("count") or 0),
+            )
+        occupancy = payload.get("occupancy")
+        for stage, values in (occupancy.items() if isinstance(occupancy, Mapping) else []):
+            if isinstance(values, Mapping):
+                timings.occupancy[stage] = StageOccupancy(
+                    *(float(values.get(state) or 0.0) for state in OCCUPANCY_STATES)
+                )
+        return timings
+
+
+class PageTimer:
+    """Accumulates stage durations for one page."""
+
+    CONNECT_TRACE_EVENTS = ("connection.connect_tcp", "connection.start_tls")
+
+    def __init__(self) -> None:
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - started)
+
+    def add(self, name: str, seconds: float) -> None:
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def connect_tracer(self):
+        """Return an httpx ``trace`` extension that adds DNS, TCP and TLS setup time to ``connect``."""
+        started: dict[str, float] = {}
+
+        async def trace(event_name: str, _info: Mapping[str, object]) -> None:
+            step, _, phase = event_name.rpartition(".")
+            if step not in self.CONNECT_TRACE_EVENTS:
+                return
+            if phase == "started":
+                started[step] = time.perf_counter()
+            elif step in started:
+                self.add("connect", time.perf_counter() - started.pop(step))
+
+        return trace
+
+
+_lock = Lock()
+_process_timings = CrawlTimings()
+
+
+def record_process_timings(timings: CrawlTimings) -> None:
+    """Fold one finished crawl into the process-wide metrics."""
+    with _lock:
+        _process_timings.merge(timings)
+
+
+def reset_process_timings() -> None:
+    global _process_timings
+    with _lock:
+        _process_timings = CrawlTimings()
+
+
+def render_prometheus() -> str:
+    """Render process-wide crawl metrics in the Prometheus text exposition format."""
+    with _lock:
+        stages = {
+            stage: StageHistogram(list(histogram.counts), histogram.total_seconds, histogram.observations)
+            for stage, histogram in _process_timings.stages.items()
+        }
+        occupancy = {
+            stage: StageOccupancy(value.waiting, value.busy, value.blocked)
+            for stage, value in _process_timings.occupancy.items()
+        }
+        pages = _process_timings.pages
+        wall_seconds = _process_timings.wall_seconds
+    lines = [
+        "# HELP iris_crawl_stage_seconds Time crawled pages spent in each pipeline stage.",
+        "# TYPE iris_crawl_stage_seconds histogram",
+    ]
+    for stage, histogram in stages.items():
+        cumulative = 0
+        for bound, count in zip((*STAGE_BUCKETS, float("inf")), histogram.counts):
+            cumulative += count
+            label = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'iris_crawl_stage_seconds_bucket{{stage="{stage}",le="{label}"}} {cumulative}')
+        lines.append(f'iris_crawl_stage_seconds_sum{{stage="{stage}"}} {histogram.total_seconds:.6f}')
+        lines.append(f'iris_crawl_stage_seconds_count{{stage="{stage}"}} {histogram.observations}')
+    lines += [
+        "# HELP iris_crawl_stage_occupancy_seconds_total Page-seconds crawled pages spent waiting for, busy in, "
+        "or blocked after each pipeline stage.",
+        "# TYPE iris_crawl_stage_occupancy_seconds_total counter",
+    ]
+    for stage, value in occupancy.items():
+        for state in OCCUPANCY_STATES:
+            lines.append(
+                f'iris_crawl_stage_occupancy_seconds_total{{stage="{stage}",state="{state}"}} {getattr(value, state):.6f}'
+            )
+    lines += [
+        "# HELP iris_crawl_pages_total Pages processed by crawls in this process.",
+        "# TYPE iris_crawl_pages_total counter",
+        f"iris_crawl_pages_total {pages}",
+        "# HELP iris_crawl_wall_seconds_total Wall-clock seconds spent crawling in this process.",
+        "# TYPE iris_crawl_wall_seconds_total counter",
+        f"iris_crawl_wall_seconds_total {wall_seconds:.6f}",
+    ]
+    return "\n".join(lines) + "\n"
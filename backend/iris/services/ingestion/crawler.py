@@ -2,9 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import random
+import time
 import xml.etree.ElementTree as ET
 from urllib.parse import urljoin, urlparse
-from urllib.parse import urlunparse
 
 import httpx
 from bs4 import BeautifulSoup
@@ -12,18 +13,44 @@ from bs4 import BeautifulSoup
 from iris.dao import db
 from iris.dao import crawler as crawler_dao
 from iris.dao.documents import upsert_document
-from iris.dao.categories import assign_category, get_or_create_category
-from iris.dao.links import upsert_link
-from iris.dao.sources import get_or_create_source
-from iris.services.common.config import DEFAULT_MAX_DEPTH, DEFAULT_MAX_PAGES, MAX_HTML_BYTES, REQUEST_TIMEOUT_SECONDS, USER_AGENT
+from iris.dao.categories import assign_category, ensure_categories, get_or_create_category
+from iris.dao.links import upsert_links
+from iris.dao.sources import get_or_create_sources
+from iris.services.common.config import (
+    CRAWL_ANALYSIS_CONCURRENCY,
+    CRAWL_EMBED_CONCURRENCY,
+    CRAWL_FETCH_RETRIES,
+    CRAWL_MAX_RETRY_AFTER_SECONDS,
+    CRAWL_PARSE_CONCURRENCY,
+    CRAWL_PERSIST_BATCH_SECONDS,
+    CRAWL_PERSIST_BATCH_SIZE,
+    CRAWL_RETRY_BACKOFF_SECONDS,
+    CRAWL_STAGE_QUEUE_SIZE,
+    DEFAULT_MAX_DEPTH,
+    DEFAULT_MAX_PAGES,
+    MAX_HTML_BYTES,
+    REQUEST_TIMEOUT_SECONDS,
+    USER_AGENT,
+)
+from iris.services.ingestion.crawl_timing import CrawlTimings, PageTimer, record_process_timings
 from iris.services.ingestion.embedding import document_embedding_text, embed_text_async
-from iris.services.ingestion.extract import extract_page_async
-from iris.models import CrawlJob, Document, Source
+from iris.services.ingestion.extract import analyze_parsed_page_async, parse_page
+from iris.services.ingestion.host_concurrency import TRANSIENT_STATUS_CODES, HostConcurrency, retry_after_seconds
+from iris.services.ingestion.page_pipeline import PagePipeline, PageWork, PipelineStage
+from iris.models import Category, CrawlJob, Document, Source
 from iris.schemas.enums import CrawlJobStatus, CrawlStatus, DocumentType, LinkType, SourceStatus
-from iris.schemas.ingestion import ExtractedPage, FetchResult, PagePipelineResult
+from iris.schemas.ingestion import ExtractedLink, ExtractedPage, FetchResult, PagePipelineResult
 from iris.services.ingestion.source_classifier import classify_source_homepage
-from iris.services.retrieval.source_profiles import generate_source_profile
-from iris.services.common.url_utils import content_hash, is_probably_static, is_valid_http_url, normalize_url, same_domain
+from iris.services.retrieval.source_profile_jobs import enqueue_source_profile
+from iris.services.common.url_utils import (
+    content_hash,
+    domain_for_url,
+    http_scheme_variants,
+    is_probably_static,
+    is_valid_http_url,
+    normalize_url,
+    same_domain,
+)
 
 
 logger = logging.getLogger("iris.crawler")
@@ -38,6 +65,8 @@ class Crawler:
             headers={"User-Agent": USER_AGENT},
         )
         self.async_client: httpx.AsyncClient | None = None
+        self.timings = CrawlTimings()
+        self.concurrency = HostConcurrency.start(4)
 
     def crawl_source(
         self,
@@ -49,7 +78,12 @@ class Crawler:
         max_documents: int | None = None,
         active_pages: int = 4,
     ) -> CrawlJob:
-        """Crawl one source with bounded in-source async page concurrency."""
+        """Crawl one source with adaptive in-source async page concurrency.
+
+        ``active_pages`` is the starting concurrency; it grows while the host
+        answers quickly and shrinks on throttling, errors or rising latency.
+        Per-stage page timings for the crawl are left on ``self.timings``.
+        """
         return asyncio.run(
             self._crawl_source_async(
                 source,
@@ -71,6 +105,9 @@ class Crawler:
         max_documents: int | None,
         active_pages: int,
     ) -> CrawlJob:
+        self.timings = CrawlTimings()
+        self.concurrency = HostConcurrency.start(active_pages)
+        crawl_started = time.perf_counter()
         job = crawler_dao.create_crawl_job(source)
         if source.status == SourceStatus.IGNORED.value:
             crawler_dao.skip_crawl_job(job, "source is ignored")
@@ -86,7 +123,7 @@ class Crawler:
                 max_depth,
                 max_documents or "none",
                 skip_existing,
-                max(1, active_pages),
+                self.concurrency.active_limit,
             )
             homepage_result = self._fetch(source.url)
             classification = classify_source_homepage(homepage_result.final_url, homepage_result.text)
@@ -125,7 +162,6 @@ class Crawler:
                     max_pages=max_pages,
                     max_documents=max_documents,
                     skip_existing=skip_existing,
-                    active_pages=active_pages,
                 )
                 if not self._limits_reached(job, max_pages=max_pages, max_documents=max_documents):
                     await self._bfs_async(
@@ -136,7 +172,6 @@ class Crawler:
                         max_documents=max_documents,
                         skip_existing=skip_existing,
                         initial_visited=visited,
-                        active_pages=active_pages,
                     )
                 elif max_documents and job.documents_indexed >= max_documents:
                     logger.info(
@@ -157,7 +192,6 @@ class Crawler:
                     max_depth=max_depth,
                     max_documents=max_documents,
                     skip_existing=skip_existing,
-                    active_pages=active_pages,
                 )
                 if exhausted:
                     logger.info("crawl stop domain=%s reason=queue_exhausted", source.canonical_domain)
@@ -177,15 +211,21 @@ class Crawler:
             job.status = CrawlJobStatus.FAILED.value
             job.error = str(exc)
         finally:
+            job.active_pages = self.concurrency.active_limit
+            job.peak_active_pages = self.concurrency.peak
+            job.fetch_retries = self.concurrency.retries
+            job.throttled_responses = self.concurrency.throttled
             crawler_dao.finish_crawl_job(job)
+            self.timings.wall_seconds = time.perf_counter() - crawl_started
+            record_process_timings(self.timings)
             if self.async_client:
                 await self.async_client.aclose()
                 self.async_client = None
         if job.status == CrawlJobStatus.SUCCEEDED.value and source.status == SourceStatus.INDEXED.value:
             try:
-                generate_source_profile(source)
+                enqueue_source_profile(source)
             except Exception as exc:
-                logger.warning("Source profile generation failed for %s: %s", source.canonical_domain, exc)
+                logger.warning("Source profile enqueue failed for %s: %s", source.canonical_domain, exc)
         return job
 
     def _fetch(self, url: str) -> FetchResult:
@@ -201,9 +241,11 @@ class Crawler:
             text=text,
         )
 
-    async def _fetch_async(self, url: str) -> FetchResult:
+    async def _fetch_async(self, url: str, timer: PageTimer | None = None) -> FetchResult:
+        timer = timer or PageTimer()
         if self._uses_injected_client:
-            return await asyncio.to_thread(self._fetch, url)
+            with timer.stage("download"):
+                return await asyncio.to_thread(self._fetch, url)
         if self.async_client is None:
             self.async_client = httpx.AsyncClient(
                 follow_redirects=True,
@@ -211,7 +253,13 @@ class Crawler:
                 headers={"User-Agent": USER_AGENT},
             )
         normalized = normalize_url(url)
-        response = await self.async_client.get(normalized)
+        connect_before = timer.timings.get("connect", 0.0)
+        started = time.perf_counter()
+        try:
+            response = await self.async_client.get(normalized, extensions={"trace": timer.connect_tracer()})
+        finally:
+            connect = timer.timings.get("connect", 0.0) - connect_before
+            timer.add("download", max(0.0, time.perf_counter() - started - connect))
         response.raise_for_status()
         content = response.content[:MAX_HTML_BYTES]
         text = content.decode(response.encoding or "utf-8", errors="replace")
@@ -370,44 +418,37 @@ class Crawler:
         max_pages: int,
         max_documents: int | None,
         skip_existing: bool,
-        active_pages: int,
     ) -> set[str]:
         visited: set[str] = set()
-        pending: set[asyncio.Task[PagePipelineResult]] = set()
         url_index = 0
-        active_pages = max(1, active_pages)
-
-        def effective_active_limit() -> int:
-            if not max_documents:
-                return active_pages
-            remaining_documents = max_documents - job.documents_indexed
-            return max(0, min(active_pages, remaining_documents))
-
-        def schedule_available() -> None:
-            nonlocal url_index
-            while (
-                url_index < len(urls)
-                and len(pending) < effective_active_limit()
-                and not self._limits_reached(job, max_pages=max_pages, max_documents=max_documents)
-            ):
-                url = urls[url_index]
-                url_index += 1
-                normalized = normalize_url(url)
-                if normalized in visited or is_probably_static(normalized):
-                    continue
-                visited.add(normalized)
-                if skip_existing and self._existing_document_for_url(normalized):
-                    logger.debug("Skipping already fetched URL: %s", normalized)
-                    continue
-                job.pages_queued += 1
-                pending.add(asyncio.create_task(self._process_page_async(normalized)))
+        queued_at = time.perf_counter()
+
+        async with self._page_pipeline() as pipeline:
+
+            def schedule_available() -> None:
+                nonlocal url_index
+                while (
+                    url_index < len(urls)
+                    and pipeline.in_flight < self._admission_limit(pipeline, job, max_pages, max_documents)
+                    and not self._limits_reached(job, max_pages=max_pages, max_documents=max_documents)
+                ):
+                    url = urls[url_index]
+                    url_index += 1
+                    normalized = normalize_url(url)
+                    if normalized in visited or is_probably_static(normalized):
+                        continue
+                    visited.add(normalized)
+                    if skip_existing and self._existing_document_for_url(normalized):
+                        logger.debug("Skipping already fetched URL: %s", normalized)
+                        continue
+                    job.pages_queued += 1
+                    self.timings.observe("queue_wait", time.perf_counter() - queued_at)
+                    pipeline.submit(normalized)
 
-        schedule_available()
-        while pending:
-            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
-            for task in done:
-                self._persist_page_result(source, job, task.result())
             schedule_available()
+            while pipeline.in_flight:
+                self._persist_page_results(source, job, await self._next_result_batch(pipeline))
+                schedule_available()
         return visited
 
     async def _bfs_async(
@@ -420,20 +461,12 @@ class Crawler:
         max_documents: int | None = None,
         skip_existing: bool = False,
         initial_visited: set[str] | None = None,
-        active_pages: int = 4,
     ) -> bool:
-        queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
-        queue.put_nowait((source.url, 0))
+        queue: asyncio.Queue[tuple[str, int, float]] = asyncio.Queue()
+        queue.put_nowait((source.url, 0, time.perf_counter()))
         queued = {normalize_url(source.url)}
         visited: set[str] = set(initial_visited or set())
-        pending: dict[asyncio.Task[PagePipelineResult], int] = {}
-        active_pages = max(1, active_pages)
-
-        def effective_active_limit() -> int:
-            if not max_documents:
-                return active_pages
-            remaining_documents = max_documents - job.documents_indexed
-            return max(0, min(active_pages, remaining_documents))
+        depths: dict[str, int] = {}
 
         def expand_document(document: Document, depth: int) -> None:
             if depth >= max_depth or self._limits_reached(job, max_pages=max_pages, max_documents=max_documents):
@@ -442,52 +475,89 @@ class Crawler:
                 target = normalize_url(link.target_url)
                 if link.link_type != LinkType.INTERNAL.value or target in queued or is_probably_static(target):
                     continue
-                queue.put_nowait((target, depth + 1))
+                queue.put_nowait((target, depth + 1, time.perf_counter()))
                 queued.add(target)
                 job.pages_queued += 1
 
-        def schedule_available() -> None:
-            while (
-                not queue.empty()
-                and len(pending) < effective_active_limit()
-                and not self._limits_reached(job, max_pages=max_pages, max_documents=max_documents)
-            ):
-                url, depth = queue.get_nowait()
-                normalized = normalize_url(url)
-                if normalized in visited or is_probably_static(normalized):
-                    continue
-                visited.add(normalized)
-                if skip_existing:
-                    existing = self._existing_document_for_url(normalized)
-                    if existing and existing.crawl_status == CrawlStatus.FETCHED.value:
-                        logger.debug("Skipping already fetched URL: %s", normalized)
-                        expand_document(existing, depth)
+        async with self._page_pipeline() as pipeline:
+
+            def schedule_available() -> None:
+                while (
+                    not queue.empty()
+                    and pipeline.in_flight < self._admission_limit(pipeline, job, max_pages, max_documents)
+                    and not self._limits_reached(job, max_pages=max_pages, max_documents=max_documents)
+                ):
+                    url, depth, queued_at = queue.get_nowait()
+                    normalized = normalize_url(url)
+                    if normalized in visited or is_probably_static(normalized):
                         continue
-                pending[asyncio.create_task(self._process_page_async(normalized))] = depth
-
-        schedule_available()
-        while pending:
-            done, _ = await asyncio.wait(set(pending), return_when=asyncio.FIRST_COMPLETED)
-            for task in done:
-                depth = pending.pop(task)
-                document = self._persist_page_result(source, job, task.result())
-                if document:
-                    expand_document(document, depth)
+                    visited.add(normalized)
+                    if skip_existing:
+                        existing = self._existing_document_for_url(normalized)
+                        if existing and existing.crawl_status == CrawlStatus.FETCHED.value:
+                            logger.debug("Skipping already fetched URL: %s", normalized)
+                            expand_document(existing, depth)
+                            continue
+                    self.timings.observe("queue_wait", time.perf_counter() - queued_at)
+                    depths[normalized] = depth
+                    pipeline.submit(normalized)
+
             schedule_available()
+            while pipeline.in_flight:
+                results = await self._next_result_batch(pipeline)
+                for result, document in zip(results, self._persist_page_results(source, job, results)):
+                    depth = depths.pop(result.requested_url)
+                    if document:
+                        expand_document(document, depth)
+                schedule_available()
         return queue.empty()
 
-    async def _process_page_async(self, url: str) -> PagePipelineResult:
-        try:
-            normalized = normalize_url(url)
-            if not is_valid_http_url(normalized):
-                logger.debug("Skipping invalid URL: %s", url)
-                return PagePipelineResult(url, None, None, None, None)
-            fetched = await self._fetch_async(url)
-            if "html" not in fetched.content_type and not fetched.text.lstrip().startswith("<"):
-                return PagePipelineResult(url, fetched, None, None, None)
-            extracted = await extract_page_async(fetched.text, fetched.final_url)
-            text_hash = content_hash(extracted.text)
-            embedding = await embed_text_async(
+    def _page_pipeline(self) -> PagePipeline:
+        """Build the fetch → parse → analysis → embedding pipeline; fetches follow the host's concurrency window."""
+        return PagePipeline(
+            [
+                PipelineStage(
+                    "fetch", self._fetch_stage, self.concurrency.ceiling, limit=lambda: self.concurrency.active_limit
+                ),
+                PipelineStage("parse", self._parse_stage, CRAWL_PARSE_CONCURRENCY),
+                PipelineStage("analysis", self._analysis_stage, CRAWL_ANALYSIS_CONCURRENCY),
+                PipelineStage("embedding", self._embedding_stage, CRAWL_EMBED_CONCURRENCY),
+            ],
+            queue_size=CRAWL_STAGE_QUEUE_SIZE,
+            timings=self.timings,
+        )
+
+    def _admission_limit(
+        self, pipeline: PagePipeline, job: CrawlJob, max_pages: int, max_documents: int | None
+    ) -> int:
+        """Pages to keep in flight: the pipeline's capacity, capped by the pages and accepted essays still wanted."""
+        limit = min(pipeline.capacity, max_pages - job.pages_fetched)
+        if max_documents:
+            limit = min(limit, max_documents - job.documents_indexed)
+        return max(0, limit)
+
+    async def _fetch_stage(self, work: PageWork) -> bool:
+        if not is_valid_http_url(work.url):
+            logger.debug("Skipping invalid URL: %s", work.url)
+            return False
+        work.fetched = await self._fetch_with_retries(work.url, work.timer)
+        return "html" in work.fetched.content_type or work.fetched.text.lstrip().startswith("<")
+
+    async def _parse_stage(self, work: PageWork) -> bool:
+        with work.timer.stage("parse"):
+            work.parsed = await asyncio.to_thread(parse_page, work.fetched.text, work.fetched.final_url)
+        return True
+
+    async def _analysis_stage(self, work: PageWork) -> bool:
+        with work.timer.stage("analysis"):
+            work.extracted = await analyze_parsed_page_async(work.parsed, work.fetched.final_url)
+        work.content_hash = content_hash(work.extracted.text)
+        return True
+
+    async def _embedding_stage(self, work: PageWork) -> bool:
+        extracted = work.extracted
+        with work.timer.stage("embedding"):
+            work.embedding = await embed_text_async(
                 document_embedding_text(
                     title=extracted.title,
                     summary=extracted.summary,
@@ -495,131 +565,198 @@ class Crawler:
                     extracted_text=extracted.text,
                 )
             )
-            return PagePipelineResult(url, fetched, extracted, text_hash, embedding)
+        return True
+
+    async def _fetch_with_retries(self, url: str, timer: PageTimer) -> FetchResult:
+        """Fetch a page, retrying throttled or transient failures and feeding the host's concurrency window."""
+        attempt = 0
+        while True:
+            await self.concurrency.wait_turn()
+            started = time.monotonic()
+            retry_after: float | None = None
+            try:
+                fetched = await self._fetch_async(url, timer)
+            except httpx.HTTPStatusError as exc:
+                if exc.response.status_code not in TRANSIENT_STATUS_CODES:
+                    self.concurrency.observe_response(started, time.monotonic() - started)
+                    raise
+                retry_after = retry_after_seconds(exc.response.headers.get("retry-after"))
+                self.concurrency.observe_failure(started, retry_after=retry_after)
+                error: Exception = exc
+            except httpx.TransportError as exc:
+                self.concurrency.observe_failure(started)
+                error = exc
+            else:
+                self.concurrency.observe_response(started, time.monotonic() - started)
+                return fetched
+            if attempt >= CRAWL_FETCH_RETRIES or (retry_after or 0.0) > CRAWL_MAX_RETRY_AFTER_SECONDS:
+                raise error
+            attempt += 1
+            self.concurrency.retries += 1
+            logger.debug(
+                "fetch retry url=%s attempt=%s limit=%s error=%s", url, attempt, self.concurrency.active_limit, error
+            )
+            if retry_after is None:
+                # A Retry-After already paused the host in wait_turn; otherwise back off with jitter.
+                await asyncio.sleep(CRAWL_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1) * random.uniform(0.5, 1.5))
+
+    async def _next_result_batch(self, pipeline: PagePipeline) -> list[PagePipelineResult]:
+        return await pipeline.next_results(CRAWL_PERSIST_BATCH_SIZE, CRAWL_PERSIST_BATCH_SECONDS)
+
+    def _persist_page_results(
+        self,
+        source: Source,
+        job: CrawlJob,
+        results: list[PagePipelineResult],
+    ) -> list[Document | None]:
+        """Persist a micro-batch of finished pages in one transaction, each page inside its own savepoint.
+
+        A failing page rolls back to its savepoint and is counted as failed
+        without touching the rest of the batch; the batch then commits once.
+        """
+        page_seconds: list[float] = []
+        categories = self._ensure_batch_categories(results)
+        documents: list[Document | None] = []
+        for result in results:
+            started = time.perf_counter()
+            documents.append(self._store_page_result(source, job, result, categories))
+            page_seconds.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        try:
+            db.commit()
+        except Exception as exc:
+            logger.warning("Failed to commit %s crawled pages for %s: %s", len(results), source.canonical_domain, exc)
+            db.rollback()
+            job.pages_failed += len(results)
+            db.commit()
+            documents = [None] * len(results)
+        commit_share = (time.perf_counter() - started) / len(results)
+        for result, seconds in zip(results, page_seconds):
+            self.timings.observe_page({**result.timings, "persist": seconds + commit_share})
+        return documents
+
+    def _ensure_batch_categories(self, results: list[PagePipelineResult]) -> dict[str, Category]:
+        slugs = {result.extracted.category_slug for result in results if result.extracted and result.extracted.category_slug}
+        if not slugs:
+            return {}
+        try:
+            with db.savepoint():
+                return ensure_categories(slugs)
         except Exception as exc:
-            return PagePipelineResult(url, None, None, None, None, error=str(exc))
+            # Pages fall back to creating their own category inside their savepoint.
+            logger.warning("Failed to create crawl categories %s: %s", sorted(slugs), exc)
+            return {}
 
-    def _persist_page_result(
+    def _store_page_result(
         self,
         source: Source,
         job: CrawlJob,
         result: PagePipelineResult,
+        categories: dict[str, Category],
     ) -> Document | None:
         try:
             if result.error:
                 raise RuntimeError(result.error)
             if not result.fetched or not result.extracted:
                 return None
-            fetched = result.fetched
-            extracted = result.extracted
-            document = upsert_document(
-                source=source,
-                crawl_job_id=job.id,
-                url=fetched.final_url,
-                document_type=extracted.document_type,
-                crawl_status=CrawlStatus.FETCHED.value,
-                title=extracted.title,
-                author=extracted.author,
-                published_at=extracted.published_at,
-                extracted_text=extracted.text,
-                summary=extracted.summary,
-                one_liner=extracted.one_liner,
-                audience=extracted.audience,
-                takeaways=extracted.takeaways,
-                topics=extracted.topics,
-                embedding=result.embedding,
-                content_hash=result.content_hash,
-            )
-            if extracted.category_slug:
-                assign_category(document, get_or_create_category(extracted.category_slug), assigned_by="llm")
-            job.pages_fetched += 1
-            if extracted.document_type == DocumentType.ESSAY.value:
-                job.documents_indexed += 1
-                logger.info(
-                    "doc accepted domain=%s docs=%s fetched=%s title=%s",
-                    source.canonical_domain,
-                    job.documents_indexed,
-                    job.pages_fetched,
-                    _short_log_text(extracted.title or fetched.final_url),
-                )
-                print(
-                    f"doc done domain={source.canonical_domain} "
-                    f"docs={job.documents_indexed} fetched={job.pages_fetched} "
-                    f"type={extracted.document_type} title={_short_log_text(extracted.title or fetched.final_url)}",
-                    flush=True,
-                )
-            elif job.pages_fetched % 25 == 0:
-                logger.info(
-                    "crawl progress domain=%s fetched=%s docs=%s links=%s",
-                    source.canonical_domain,
-                    job.pages_fetched,
-                    job.documents_indexed,
-                    job.links_seen,
-                )
-                print(
-                    f"doc done domain={source.canonical_domain} "
-                    f"docs={job.documents_indexed} fetched={job.pages_fetched} "
-                    f"type={extracted.document_type} title={_short_log_text(extracted.title or fetched.final_url)}",
-                    flush=True,
-                )
-            for extracted_link in extracted.links:
-                normalized_target = normalize_url(extracted_link.url, fetched.final_url)
-                if not is_valid_http_url(normalized_target) or is_probably_static(normalized_target):
-                    continue
-                link = upsert_link(
-                    source_document=document,
-                    target_url=extracted_link.url,
-                    anchor_text=extracted_link.anchor_text,
-                    context=extracted_link.context,
-                )
-                job.links_seen += 1
-                if link.link_type == LinkType.EXTERNAL.value and link.target_domain:
-                    before = crawler_dao.get_source_by_domain(link.target_domain)
-                    discovered = get_or_create_source(
-                        normalized_target,
-                        status=SourceStatus.QUEUED.value,
-                        discovered_from_source_id=source.id,
-                    )
-                    link.target_source_id = discovered.id
-                    if before is None:
-                        job.sources_discovered += 1
-            crawler_dao.set_document_link_targets(document)
-            db.flush()
-            db.commit()
-            return document
+            with db.savepoint():
+                return self._write_page(source, job, result, categories)
         except Exception as exc:
             logger.warning("Failed to crawl %s: %s", result.requested_url, exc)
-            db.rollback()
-            persisted_job = crawler_dao.get_crawl_job(job.id)
-            if persisted_job:
-                persisted_job.pages_failed += 1
-                db.flush()
-                db.commit()
-                print(
-                    f"doc failed domain={source.canonical_domain} "
-                    f"failed={persisted_job.pages_failed} url={_short_log_text(result.requested_url)} "
-                    f"error={_short_log_text(str(exc))}",
-                    flush=True,
-                )
+            job.pages_failed += 1
+            print(
+                f"doc failed domain={source.canonical_domain} "
+                f"failed={job.pages_failed} url={_short_log_text(result.requested_url)} "
+                f"error={_short_log_text(str(exc))}",
+                flush=True,
+            )
             return None
 
+    def _write_page(
+        self,
+        source: Source,
+        job: CrawlJob,
+        result: PagePipelineResult,
+        categories: dict[str, Category],
+    ) -> Document:
+        fetched = result.fetched
+        extracted = result.extracted
+        document = upsert_document(
+            source=source,
+            crawl_job_id=job.id,
+            url=fetched.final_url,
+            document_type=extracted.document_type,
+            crawl_status=CrawlStatus.FETCHED.value,
+            title=extracted.title,
+            author=extracted.author,
+            published_at=extracted.published_at,
+            extracted_text=extracted.text,
+            summary=extracted.summary,
+            one_liner=extracted.one_liner,
+            audience=extracted.audience,
+            takeaways=extracted.takeaways,
+            topics=extracted.topics,
+            embedding=result.embedding,
+            content_hash=result.content_hash,
+        )
+        if extracted.category_slug:
+            category = categories.get(extracted.category_slug) or get_or_create_category(extracted.category_slug)
+            assign_category(document, category, assigned_by="llm")
+        links: list[ExtractedLink] = []
+        for extracted_link in extracted.links:
+            normalized_target = normalize_url(extracted_link.url, fetched.final_url)
+            if not is_valid_http_url(normalized_target) or is_probably_static(normalized_target):
+                continue
+            links.append(ExtractedLink(normalized_target, extracted_link.anchor_text, extracted_link.context))
+        # Discover external sources first so the link upsert resolves them in the same statement.
+        external = [link.url for link in links if domain_for_url(link.url) != source.canonical_domain]
+        _sources, discovered = get_or_create_sources(
+            external,
+            status=SourceStatus.QUEUED.value,
+            discovered_from_source_id=source.id,
+        )
+        upsert_links(document, links)
+        job.links_seen += len(links)
+        job.sources_discovered += discovered
+        job.pages_fetched += 1
+        if extracted.document_type == DocumentType.ESSAY.value:
+            job.documents_indexed += 1
+            logger.info(
+                "doc accepted domain=%s docs=%s fetched=%s title=%s",
+                source.canonical_domain,
+                job.documents_indexed,
+                job.pages_fetched,
+                _short_log_text(extracted.title or fetched.final_url),
+            )
+            print(
+                f"doc done domain={source.canonical_domain} "
+                f"docs={job.documents_indexed} fetched={job.pages_fetched} "
+                f"type={extracted.document_type} title={_short_log_text(extracted.title or fetched.final_url)}",
+                flush=True,
+            )
+        elif job.pages_fetched % 25 == 0:
+            logger.info(
+                "crawl progress domain=%s fetched=%s docs=%s links=%s",
+                source.canonical_domain,
+                job.pages_fetched,
+                job.documents_indexed,
+                job.links_seen,
+            )
+            print(
+                f"doc done domain={source.canonical_domain} "
+                f"docs={job.documents_indexed} fetched={job.pages_fetched} "
+                f"type={extracted.document_type} title={_short_log_text(extracted.title or fetched.final_url)}",
+                flush=True,
+            )
+        return document
+
     def _limits_reached(self, job: CrawlJob, *, max_pages: int, max_documents: int | None) -> bool:
         if job.pages_fetched >= max_pages:
             return True
         return bool(max_documents and job.documents_indexed >= max_documents)
 
     def _existing_document_for_url(self, normalized_url: str) -> Document | None:
-        candidates = {normalized_url, _alternate_http_scheme(normalized_url)}
-        return crawler_dao.get_document_by_urls(candidates)
-
-
-def _alternate_http_scheme(url: str) -> str:
-    parsed = urlparse(url)
-    if parsed.scheme == "http":
-        return urlunparse(("https", parsed.netloc, parsed.path, "", parsed.query, ""))
-    if parsed.scheme == "https":
-        return urlunparse(("http", parsed.netloc, parsed.path, "", parsed.query, ""))
-    return url
+        return crawler_dao.get_document_by_urls(http_scheme_variants(normalized_url))
 
 
 def _short_log_text(value: str, max_chars: int = 96) -> str:
@@ -199,6 +199,32 @@ def analyze_document(
     has_published_date: bool = False,
 ) -> DocumentAnalysis:
     """Analyze extracted document text into typed metadata and document type."""
+    prepared = prepare_document_analysis(
+        url=url,
+        metadata_title=metadata_title,
+        text=text,
+        link_count=link_count,
+        has_author=has_author,
+        has_published_date=has_published_date,
+    )
+    if isinstance(prepared, DocumentAnalysis):
+        return prepared
+    return _analyze_document_with_llm(url=url, metadata_title=metadata_title, text=text, payload=prepared)
+
+
+def prepare_document_analysis(
+    *,
+    url: str,
+    metadata_title: str | None,
+    text: str,
+    link_count: int,
+    has_author: bool = False,
+    has_published_date: bool = False,
+) -> DocumentAnalysis | dict[str, object]:
+    """Return the Responses API payload for a page, or its analysis when no LLM call is needed.
+
+    Non-English and gambling-spam pages are decided locally as ``ignore``.
+    """
     words = re.findall(r"\w+", text)
     word_count = len(words)
     sentence_count = len(re.findall(r"[.!?](?:\s|$)", text))
@@ -224,8 +250,7 @@ def analyze_document(
         link_count=link_count,
         link_density=link_density,
     )
-    hints = _page_hints(path=path, title_lower=title_lower, word_count=word_count)
-    return _analyze_document_with_llm(
+    return _document_analysis_payload(
         url=url,
         metadata_title=metadata_title,
         text=text,
@@ -235,7 +260,7 @@ def analyze_document(
         link_count=link_count,
         link_density=link_density,
         heuristic=heuristic,
-        hints=hints,
+        hints=_page_hints(path=path, title_lower=title_lower, word_count=word_count),
         path_label=path_label,
     )
 
@@ -340,29 +365,9 @@ def _analyze_document_with_llm(
     url: str,
     metadata_title: str | None,
     text: str,
-    word_count: int,
-    sentence_count: int,
-    paragraph_count: int,
-    link_count: int,
-    link_density: float,
-    heuristic: DocumentClassification,
-    hints: list[str],
-    path_label: str | None,
+    payload: dict[str, object],
 ) -> DocumentAnalysis:
     key = require_openai_api_key(f"document analysis ({url})")
-    payload = _document_analysis_payload(
-        url=url,
-        metadata_title=metadata_title,
-        text=text,
-        word_count=word_count,
-        sentence_count=sentence_count,
-        paragraph_count=paragraph_count,
-        link_count=link_count,
-        link_density=link_density,
-        heuristic=heuristic,
-        hints=hints,
-        path_label=path_label,
-    )
     with httpx.Client(timeout=DOCUMENT_CLASSIFIER_TIMEOUT_SECONDS) as client:
         response = client.post(
             "https://api.openai.com/v1/responses",
@@ -370,7 +375,7 @@ def _analyze_document_with_llm(
             json=payload,
         )
         response.raise_for_status()
-    return _parse_document_analysis_response_data(
+    return parse_document_analysis_response_data(
         response.json(),
         metadata_title=metadata_title,
         fallback_text=text,
@@ -387,54 +392,25 @@ async def analyze_document_async(
     has_published_date: bool = False,
 ) -> DocumentAnalysis:
     """Analyze extracted document text using the async OpenAI path."""
-    words = re.findall(r"\w+", text)
-    word_count = len(words)
-    sentence_count = len(re.findall(r"[.!?](?:\s|$)", text))
-    paragraph_count = len([part for part in re.split(r"\n{2,}", text.strip()) if len(part.split()) >= 8])
-    title_lower = (metadata_title or "").lower()
-    combined_text = f"{metadata_title or ''}\n{text}"
-    path = urlparse(url).path.lower()
-    path_label = _path_label(path)
-    link_density = link_count / max(word_count / 100.0, 1.0)
-
-    if looks_non_english(combined_text):
-        return _fallback_analysis(metadata_title, text, DocumentType.IGNORE.value)
-
-    if _looks_like_gambling_spam(combined_text):
-        return _fallback_analysis(metadata_title, text, DocumentType.IGNORE.value)
-
-    heuristic = _heuristic_document_guess(
-        path=path,
-        title_lower=title_lower,
-        word_count=word_count,
-        sentence_count=sentence_count,
-        paragraph_count=paragraph_count,
-        link_count=link_count,
-        link_density=link_density,
-    )
-    hints = _page_hints(path=path, title_lower=title_lower, word_count=word_count)
-    key = require_openai_api_key(f"document analysis ({url})")
-    payload = _document_analysis_payload(
+    prepared = prepare_document_analysis(
         url=url,
         metadata_title=metadata_title,
         text=text,
-        word_count=word_count,
-        sentence_count=sentence_count,
-        paragraph_count=paragraph_count,
         link_count=link_count,
-        link_density=link_density,
-        heuristic=heuristic,
-        hints=hints,
-        path_label=path_label,
+        has_author=has_author,
+        has_published_date=has_published_date,
     )
+    if isinstance(prepared, DocumentAnalysis):
+        return prepared
+    key = require_openai_api_key(f"document analysis ({url})")
     async with httpx.AsyncClient(timeout=DOCUMENT_CLASSIFIER_TIMEOUT_SECONDS) as client:
         response = await client.post(
             "https://api.openai.com/v1/responses",
             headers={"Authorization": f"Bearer {key}", "Content-Type": "application/json"},
-            json=payload,
+            json=prepared,
         )
         response.raise_for_status()
-    return _parse_document_analysis_response_data(
+    return parse_document_analysis_response_data(
         response.json(),
         metadata_title=metadata_title,
         fallback_text=text,
@@ -542,7 +518,7 @@ def _document_analysis_payload(
     }
 
 
-def _parse_document_analysis_response_data(
+def parse_document_analysis_response_data(
     data: Mapping[str, object],
     *,
     metadata_title: str | None,
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
-import hashlib
 import json
 import math
-import re
 
 import httpx
+import numpy as np
 
 from iris.services.common.config import EMBEDDING_MODEL, EMBEDDING_TIMEOUT_SECONDS, USE_OPENAI_EMBEDDINGS, openai_api_key
+from iris.services.common.vectors import hashed_token_embeddings
+from iris.services.ingestion.embedding_codec import decode_embedding, is_encoded_embedding
 
 
 DIMENSIONS = 96
+LOCAL_EMBEDDING_MODEL = f"local-hash-{DIMENSIONS}"
 MAX_EMBED_TEXT_CHARS = 8000
 EMBED_BODY_CHARS = 5000
 
@@ -34,6 +36,25 @@ async def embed_text_async(text: str, *, prefer_openai: bool | None = None) -> l
     return embed_text_local(text)
 
 
+def embedding_model_for(vector: list[float]) -> str:
+    """Return the registry model name for a vector produced by ``embed_text``."""
+    return LOCAL_EMBEDDING_MODEL if len(vector) == DIMENSIONS else EMBEDDING_MODEL
+
+
+def embed_text_for_model(text: str, model: str) -> list[float] | None:
+    """Embed text with one specific model, or return None when it is unavailable."""
+    if model == LOCAL_EMBEDDING_MODEL:
+        return embed_text_local(text)
+    return _embed_openai(text, model=model)
+
+
+async def embed_text_for_model_async(text: str, model: str) -> list[float] | None:
+    """Async variant of ``embed_text_for_model``."""
+    if model == LOCAL_EMBEDDING_MODEL:
+        return embed_text_local(text)
+    return await _embed_openai_async(text, model=model)
+
+
 def document_embedding_text(
     *,
     title: str | None,
@@ -55,23 +76,22 @@ def document_embedding_text(
 
 
 def embed_text_local(text: str) -> list[float]:
-    vector = [0.0] * DIMENSIONS
-    words = re.findall(r"[a-zA-Z][a-zA-Z0-9\-]{2,}", text.lower())
-    for word in words:
-        digest = hashlib.sha256(word.encode("utf-8")).digest()
-        idx = int.from_bytes(digest[:4], "big") % DIMENSIONS
-        sign = 1 if digest[4] % 2 == 0 else -1
-        vector[idx] += sign
-    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
-    return [value / norm for value in vector]
-
-
-def _embed_openai(text: str) -> list[float] | None:
+    return hashed_token_embeddings([text], dimensions=DIMENSIONS)[0].tolist()
+
+
+def embed_texts_local(texts: list[str]) -> list[list[float]]:
+    """Embed many texts with the local hashed-token model in one vectorised pass."""
+    if not texts:
+        return []
+    return hashed_token_embeddings(texts, dimensions=DIMENSIONS).tolist()
+
+
+def _embed_openai(text: str, *, model: str = EMBEDDING_MODEL) -> list[float] | None:
     key = openai_api_key()
     if not key:
         return None
     payload = {
-        "model": EMBEDDING_MODEL,
+        "model": model,
         "input": text[:MAX_EMBED_TEXT_CHARS],
     }
     try:
@@ -89,12 +109,12 @@ def _embed_openai(text: str) -> list[float] | None:
         return None
 
 
-async def _embed_openai_async(text: str) -> list[float] | None:
+async def _embed_openai_async(text: str, *, model: str = EMBEDDING_MODEL) -> list[float] | None:
     key = openai_api_key()
     if not key:
         return None
     payload = {
-        "model": EMBEDDING_MODEL,
+        "model": model,
         "input": text[:MAX_EMBED_TEXT_CHARS],
     }
     try:
@@ -116,17 +136,19 @@ def dumps_embedding(vector: list[float]) -> str:
     return json.dumps([round(value, 6) for value in vector])
 
 
-def coerce_embedding_vector(value: list[float] | str | None) -> list[float] | None:
+def coerce_embedding_vector(value: list[float] | str | bytes | None) -> list[float] | None:
     if value is None:
         return None
-    if isinstance(value, str):
+    if isinstance(value, (str, bytes, bytearray, memoryview)):
         return loads_embedding(value)
     if hasattr(value, "tolist"):
         value = value.tolist()
     return [float(item) for item in value]
 
 
-def loads_embedding(value: str | list[float] | tuple[float, ...] | None) -> list[float]:
+def loads_embedding(value: str | bytes | list[float] | tuple[float, ...] | None) -> list[float]:
+    if is_encoded_embedding(value):
+        return decode_embedding(value).tolist()
     if hasattr(value, "tolist"):
         value = value.tolist()
     if not value:
@@ -137,7 +159,14 @@ def loads_embedding(value: str | list[float] | tuple[float, ...] | None) -> list
     return [float(item) for item in loaded]
 
 
+def loads_embedding_array(value: str | bytes | list[float] | tuple[float, ...] | None) -> np.ndarray:
+    """Return a stored embedding as a float32 array, without copying binary float32 rows."""
+    if is_encoded_embedding(value):
+        return decode_embedding(value)
+    return np.asarray(loads_embedding(value), dtype=np.float32)
+
+
 def cosine(a: list[float], b: list[float]) -> float:
     if len(a) != len(b):
         return 0.0
-    return sum(left * right for left, right in zip(a, b))
+    return float(np.dot(a, b))
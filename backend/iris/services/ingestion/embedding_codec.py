@@ -0,0 +1,61 @@
+"""Compact binary encoding for embeddings stored outside pgvector.
+
+An encoded vector is an 8-byte header followed by little-endian values:
+three magic bytes, one dtype code, and a float32 scale that is only used by
+int8 quantisation. The header keeps the payload 8-byte aligned, so float32
+vectors decode with ``numpy.frombuffer`` without copying.
+"""
+
+from __future__ import annotations
+
+import struct
+
+import numpy as np
+
+from iris.services.common.config import EMBEDDING_STORAGE_DTYPE
+
+
+MAGIC = b"IVE"
+HEADER = struct.Struct("<3sBf")
+DTYPES: dict[str, tuple[int, np.dtype]] = {
+    "float32": (0, np.dtype("<f4")),
+    "float16": (1, np.dtype("<f2")),
+    "int8": (2, np.dtype("i1")),
+}
+_DTYPE_BY_CODE = {code: (name, dtype) for name, (code, dtype) in DTYPES.items()}
+
+
+def encode_embedding(vector, *, dtype: str | None = None) -> bytes:
+    """Encode a vector as float32, float16, or symmetric int8 bytes."""
+    name = dtype or EMBEDDING_STORAGE_DTYPE
+    if name not in DTYPES:
+        raise ValueError(f"unsupported embedding storage dtype: {name}")
+    code, numpy_dtype = DTYPES[name]
+    values = np.asarray(vector, dtype=np.float32).ravel()
+    scale = 1.0
+    if name == "int8":
+        peak = float(np.max(np.abs(values))) if values.size else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        values = np.rint(values / scale)
+    return HEADER.pack(MAGIC, code, scale) + values.astype(numpy_dtype).tobytes()
+
+
+def decode_embedding(value: bytes | bytearray | memoryview) -> np.ndarray:
+    """Decode bytes from ``encode_embedding``; float32 payloads share the input buffer."""
+    if len(value) < HEADER.size:
+        raise ValueError("not an encoded embedding")
+    magic, code, scale = HEADER.unpack_from(value)
+    if magic != MAGIC or code not in _DTYPE_BY_CODE:
+        raise ValueError("not an encoded embedding")
+    name, numpy_dtype = _DTYPE_BY_CODE[code]
+    values = np.frombuffer(value, dtype=numpy_dtype, offset=HEADER.size)
+    if name == "float32":
+        return values
+    if name == "int8":
+        return values.astype(np.float32) * np.float32(scale)
+    return values.astype(np.float32)
+
+
+def is_encoded_embedding(value: object) -> bool:
+    """Return whether a stored value uses the binary encoding."""
+    return isinstance(value, (bytes, bytearray, memoryview)) and bytes(value[:3]) == MAGIC
@@ -7,7 +7,7 @@ from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 
-from iris.schemas.ingestion import ExtractedLink, ExtractedPage
+from iris.schemas.ingestion import DocumentAnalysis, ExtractedLink, ExtractedPage, ParsedPage
 from iris.services.ingestion.document_classifier import analyze_document, analyze_document_async
 
 
@@ -49,47 +49,32 @@ def _parse_date(value: str | None) -> datetime | None:
 
 def extract_page(html: str, final_url: str) -> ExtractedPage:
     """Extract page text, metadata, links, and sync LLM document analysis."""
-    parsed = _parse_html_page(html, final_url)
-    analysis = analyze_document(
-        url=final_url,
-        metadata_title=parsed["title"],
-        text=parsed["text"],
-        link_count=parsed["content_link_count"],
-        has_author=bool(parsed["author"]),
-        has_published_date=bool(parsed["published_at"]),
-    )
-    return ExtractedPage(
-        title=analysis.title,
-        author=parsed["author"],
-        published_at=parsed["published_at"],
-        text=parsed["text"],
-        summary=analysis.summary,
-        one_liner=analysis.one_liner,
-        audience=analysis.audience,
-        takeaways=analysis.takeaways,
-        topics=analysis.topics,
-        document_type=analysis.document_type,
-        category_slug=analysis.category_slug,
-        links=parsed["links"],
-    )
+    parsed = parse_page(html, final_url)
+    return _extracted_page(parsed, analyze_document(**_analysis_inputs(parsed, final_url)))
 
 
-async def extract_page_async(html: str, final_url: str) -> ExtractedPage:
-    """Extract page text, metadata, links, and async LLM document analysis."""
-    parsed = _parse_html_page(html, final_url)
-    analysis = await analyze_document_async(
-        url=final_url,
-        metadata_title=parsed["title"],
-        text=parsed["text"],
-        link_count=parsed["content_link_count"],
-        has_author=bool(parsed["author"]),
-        has_published_date=bool(parsed["published_at"]),
-    )
+async def analyze_parsed_page_async(parsed: ParsedPage, final_url: str) -> ExtractedPage:
+    """Run async LLM document analysis over an already parsed page."""
+    return _extracted_page(parsed, await analyze_document_async(**_analysis_inputs(parsed, final_url)))
+
+
+def _analysis_inputs(parsed: ParsedPage, final_url: str) -> dict:
+    return {
+        "url": final_url,
+        "metadata_title": parsed.title,
+        "text": parsed.text,
+        "link_count": parsed.content_link_count,
+        "has_author": bool(parsed.author),
+        "has_published_date": bool(parsed.published_at),
+    }
+
+
+def _extracted_page(parsed: ParsedPage, analysis: DocumentAnalysis) -> ExtractedPage:
     return ExtractedPage(
         title=analysis.title,
-        author=parsed["author"],
-        published_at=parsed["published_at"],
-        text=parsed["text"],
+        author=parsed.author,
+        published_at=parsed.published_at,
+        text=parsed.text,
         summary=analysis.summary,
         one_liner=analysis.one_liner,
         audience=analysis.audience,
@@ -97,11 +82,11 @@ async def extract_page_async(html: str, final_url: str) -> ExtractedPage:
         topics=analysis.topics,
         document_type=analysis.document_type,
         category_slug=analysis.category_slug,
-        links=parsed["links"],
+        links=parsed.links,
     )
 
 
-def _parse_html_page(html: str, final_url: str) -> dict:
+def parse_page(html: str, final_url: str) -> ParsedPage:
     """Parse HTML into extracted metadata before document analysis."""
     soup = BeautifulSoup(html, "html.parser")
     title = _meta(soup, "og:title", "twitter:title")
@@ -128,11 +113,11 @@ def _parse_html_page(html: str, final_url: str) -> dict:
     text = article.get_text("\n", strip=True)
     text = re.sub(r"\n{3,}", "\n\n", text)
     text = re.sub(r"[ \t]{2,}", " ", text)
-    return {
-        "title": title,
-        "author": author,
-        "published_at": published_at,
-        "text": text,
-        "content_link_count": content_link_count,
-        "links": links,
-    }
+    return ParsedPage(
+        title=title,
+        author=author,
+        published_at=published_at,
+        text=text,
+        content_link_count=content_link_count,
+        links=links,
+    )
@@ -0,0 +1,103 @@
+"""Adaptive page concurrency for crawling one host.
+
+The crawler starts each source at the requested ``active_pages`` and lets a
+``HostConcurrency`` window move it: every healthy response adds ``1/limit``
+(about one page per window of responses), while throttling, transient errors
+and response latency climbing well above the fastest latency seen so far halve
+it. Only one decrease is applied per window, so a burst of failures from
+requests already in flight counts once. ``Retry-After`` pauses new fetches to
+the host until the requested time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from iris.services.common.config import CRAWL_MAX_ACTIVE_PAGES, CRAWL_MAX_RETRY_AFTER_SECONDS
+
+
+TRANSIENT_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+# Latency above this multiple of the host's fastest response counts as congestion.
+LATENCY_BACKOFF_FACTOR = 3.0
+# Below this, latency swings are noise rather than a struggling host.
+MIN_BACKOFF_LATENCY_SECONDS = 0.5
+LATENCY_SMOOTHING = 0.3
+
+
+@dataclass
+class HostConcurrency:
+    limit: float
+    ceiling: int = CRAWL_MAX_ACTIVE_PAGES
+    floor: int = 1
+    peak: int = 0
+    retries: int = 0
+    throttled: int = 0
+    baseline_seconds: float | None = None
+    latency_seconds: float | None = None
+    resume_at: float = 0.0
+    _decreased_at: float = field(default=0.0, repr=False)
+
+    @classmethod
+    def start(cls, active_pages: int) -> HostConcurrency:
+        """Start at ``active_pages``; the ceiling never drops below the requested start."""
+        initial = max(1, active_pages)
+        return cls(limit=float(initial), ceiling=max(initial, CRAWL_MAX_ACTIVE_PAGES), peak=initial)
+
+    @property
+    def active_limit(self) -> int:
+        return max(self.floor, int(self.limit))
+
+    def observe_response(self, started_at: float, latency: float) -> None:
+        """Record a response the host served normally, growing the window unless it is slowing down."""
+        self.baseline_seconds = latency if self.baseline_seconds is None else min(self.baseline_seconds, latency)
+        if self.latency_seconds is None:
+            self.latency_seconds = latency
+        else:
+            self.latency_seconds += LATENCY_SMOOTHING * (latency - self.latency_seconds)
+        congested = self.latency_seconds > max(
+            MIN_BACKOFF_LATENCY_SECONDS, LATENCY_BACKOFF_FACTOR * self.baseline_seconds
+        )
+        if congested:
+            self._decrease(started_at)
+            return
+        self.limit = min(float(self.ceiling), self.limit + 1.0 / self.limit)
+        self.peak = max(self.peak, self.active_limit)
+
+    def observe_failure(self, started_at: float, *, retry_after: float | None = None) -> None:
+        """Record a throttled or transiently failed fetch."""
+        if retry_after is not None:
+            self.throttled += 1
+            pause = min(max(0.0, retry_after), CRAWL_MAX_RETRY_AFTER_SECONDS)
+            self.resume_at = max(self.resume_at, time.monotonic() + pause)
+        self._decrease(started_at)
+
+    async def wait_turn(self) -> None:
+        delay = self.resume_at - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _decrease(self, started_at: float) -> None:
+        if started_at < self._decreased_at:
+            return
+        self.limit = max(float(self.floor), self.limit / 2)
+        self._decreased_at = time.monotonic()
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    """Parse a ``Retry-After`` header given either as seconds or as an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
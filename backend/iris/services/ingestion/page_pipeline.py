@@ -0,0 +1,162 @@
+"""Staged page pipeline for one crawl.
+
+Pages move through fetch, parse, analysis and embedding stages joined by
+bounded asyncio queues. Each stage has its own worker pool, so slow LLM
+analysis no longer holds network fetches hostage: fetching runs ahead until
+the queues in front of analysis fill, then blocks instead of buffering without
+bound. A stage may also carry a dynamic limit below its worker count, which is
+how the fetch stage follows the host's adaptive concurrency window.
+
+Finished pages, including failures and pages that leave early (invalid URLs,
+non-HTML responses), land on a results queue that the crawler drains in
+micro-batches and persists on its own session, one transaction per batch. Every stage reports page-seconds waiting, busy
+and blocked into the crawl's ``CrawlTimings``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+
+from iris.schemas.ingestion import ExtractedPage, FetchResult, PagePipelineResult, ParsedPage
+from iris.services.ingestion.crawl_timing import CrawlTimings, PageTimer
+
+
+@dataclass
+class PageWork:
+    """One page's state as it moves between pipeline stages."""
+
+    url: str
+    timer: PageTimer = field(default_factory=PageTimer)
+    fetched: FetchResult | None = None
+    parsed: ParsedPage | None = None
+    extracted: ExtractedPage | None = None
+    content_hash: str | None = None
+    embedding: list[float] | None = None
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+    def result(self, error: str | None = None) -> PagePipelineResult:
+        return PagePipelineResult(
+            self.url,
+            self.fetched,
+            self.extracted,
+            self.content_hash,
+            self.embedding,
+            error=error,
+            timings=self.timer.timings,
+        )
+
+
+@dataclass(frozen=True)
+class PipelineStage:
+    """A named stage; ``run`` returns False when the page is finished and should skip later stages."""
+
+    name: str
+    run: Callable[[PageWork], Awaitable[bool]]
+    workers: int
+    limit: Callable[[], int] | None = None
+
+
+class PagePipeline:
+    def __init__(self, stages: Sequence[PipelineStage], *, queue_size: int, timings: CrawlTimings):
+        self.stages = list(stages)
+        self.queue_size = max(1, queue_size)
+        self.timings = timings
+        self.in_flight = 0
+        # Admission bounds the first queue; later queues are bounded for backpressure.
+        self._queues: list[asyncio.Queue[PageWork]] = [asyncio.Queue()] + [
+            asyncio.Queue(maxsize=self.queue_size) for _ in self.stages[1:]
+        ]
+        self._results: asyncio.Queue[PagePipelineResult] = asyncio.Queue()
+        self._active = [0] * len(self.stages)
+        self._released = [asyncio.Condition() for _ in self.stages]
+        self._workers: list[asyncio.Task[None]] = []
+
+    async def __aenter__(self) -> PagePipeline:
+        self._workers = [
+            asyncio.create_task(self._work(index))
+            for index, stage in enumerate(self.stages)
+            for _ in range(max(1, stage.workers))
+        ]
+        return self
+
+    async def __aexit__(self, *_exc: object) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    @property
+    def capacity(self) -> int:
+        """Pages the pipeline holds at full occupancy: the first stage's limit plus every later worker and queue slot."""
+        downstream = sum(max(1, stage.workers) + self.queue_size for stage in self.stages[1:])
+        return self._limit(0) + downstream
+
+    def submit(self, url: str) -> None:
+        self.in_flight += 1
+        self._queues[0].put_nowait(PageWork(url))
+
+    async def next_result(self) -> PagePipelineResult:
+        result = await self._results.get()
+        self.in_flight -= 1
+        return result
+
+    async def next_results(self, max_count: int, window_seconds: float) -> list[PagePipelineResult]:
+        """Wait for one finished page, then gather more until ``max_count`` or ``window_seconds`` after the first."""
+        results = [await self.next_result()]
+        deadline = time.perf_counter() + window_seconds
+        while len(results) < max_count and self.in_flight:
+            if self._results.empty():
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    result = await asyncio.wait_for(self._results.get(), remaining)
+                except TimeoutError:
+                    break
+            else:
+                result = self._results.get_nowait()
+            self.in_flight -= 1
+            results.append(result)
+        return results
+
+    def _limit(self, index: int) -> int:
+        stage = self.stages[index]
+        workers = max(1, stage.workers)
+        return max(1, min(workers, stage.limit())) if stage.limit else workers
+
+    async def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        inbox = self._queues[index]
+        released = self._released[index]
+        while True:
+            work = await inbox.get()
+            async with released:
+                await released.wait_for(lambda: self._active[index] < self._limit(index))
+                self._active[index] += 1
+            started = time.perf_counter()
+            waiting = started - work.enqueued_at
+            error: str | None = None
+            try:
+                keep_going = await stage.run(work)
+            except Exception as exc:
+                keep_going = False
+                error = str(exc)
+            finally:
+                async with released:
+                    self._active[index] -= 1
+                    released.notify_all()
+            finished = time.perf_counter()
+            if keep_going and index + 1 < len(self.stages):
+                await self._queues[index + 1].put(work)
+                work.enqueued_at = time.perf_counter()
+            else:
+                self._results.put_nowait(work.result(error))
+            self.timings.observe_occupancy(
+                stage.name,
+                waiting=waiting,
+                busy=finished - started,
+                blocked=time.perf_counter() - finished,
+            )
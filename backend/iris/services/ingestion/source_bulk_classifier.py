@@ -0,0 +1,262 @@
+"""Classify queued sources in bulk with pooled, bounded-concurrency fetching.
+
+Sources are read in id order one batch at a time. Homepages for a batch are
+fetched over one pooled async client, capped globally and per host group, and
+the next batch is fetched while the current one is being classified. The
+deterministic homepage rules run first; the remaining homepages are hashed and
+only hashes missing from ``source_homepage_classifications`` go to the LLM,
+once per distinct hash. Each batch commits its verdicts and cache rows
+together, and sources classified from their homepage are stamped with
+``classified_at`` so an interrupted run resumes where it stopped.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import httpx
+
+from iris.dao import db
+from iris.dao import sources as sources_dao
+from iris.models import Source
+from iris.schemas.enums import SourceStatus
+from iris.schemas.ingestion import SourceClassification, SourceClassificationRunResult
+from iris.services.common.config import (
+    MAX_HTML_BYTES,
+    REQUEST_TIMEOUT_SECONDS,
+    SOURCE_CLASSIFIER_BATCH_SIZE,
+    SOURCE_CLASSIFIER_CONCURRENCY,
+    SOURCE_CLASSIFIER_MODEL,
+    SOURCE_CLASSIFIER_PER_HOST,
+    USER_AGENT,
+)
+from iris.services.common.url_utils import content_hash
+from iris.services.ingestion.source_classifier import (
+    classify_homepage_context_async,
+    classify_source_url,
+    homepage_precheck,
+)
+
+
+logger = logging.getLogger("iris.source_classifier")
+
+
+@dataclass(frozen=True)
+class _Target:
+    source_id: int
+    url: str
+    domain: str
+
+
+@dataclass(frozen=True)
+class _Homepage:
+    target: _Target
+    final_url: str | None
+    html: str | None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class _Verdict:
+    classification: SourceClassification
+    from_homepage: bool
+    cached: bool = False
+    fetch_failed: bool = False
+
+
+class _Limiter:
+    """A global slot pool plus one smaller pool per host group."""
+
+    def __init__(self, concurrency: int, per_host: int) -> None:
+        self.slots = asyncio.Semaphore(max(1, concurrency))
+        self.per_host = max(1, per_host)
+        self.hosts: dict[str, asyncio.Semaphore] = defaultdict(lambda: asyncio.Semaphore(self.per_host))
+
+    def host(self, domain: str) -> asyncio.Semaphore:
+        return self.hosts[host_group(domain)]
+
+
+def host_group(domain: str) -> str:
+    """Group subdomains that share hosting, such as ``*.substack.com``."""
+    return ".".join(domain.split(".")[-2:])
+
+
+def classify_queued_sources(
+    *,
+    limit: int | None = None,
+    batch_size: int = SOURCE_CLASSIFIER_BATCH_SIZE,
+    concurrency: int = SOURCE_CLASSIFIER_CONCURRENCY,
+    per_host: int = SOURCE_CLASSIFIER_PER_HOST,
+    reclassify: bool = False,
+) -> SourceClassificationRunResult:
+    """Classify queued sources, committing after every batch.
+
+    Without ``reclassify`` sources that already have a homepage verdict are
+    skipped, so rerunning after an interruption continues with the rest.
+    Sources whose homepage could not be fetched or classified fall back to the
+    URL rules and stay unstamped, so a later run retries them.
+    """
+    session = db.current_session()
+    counters: Counter = Counter()
+    batch_size = max(1, batch_size)
+    reader = _SourceReader(limit=limit or None, batch_size=batch_size, reclassify=reclassify)
+
+    async def drive() -> None:
+        limiter = _Limiter(concurrency, per_host)
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=REQUEST_TIMEOUT_SECONDS,
+            headers={"User-Agent": USER_AGENT},
+            limits=httpx.Limits(max_connections=max(1, concurrency), max_keepalive_connections=max(1, concurrency)),
+        ) as client:
+            targets = reader.next_batch()
+            fetching = _start_fetch(client, limiter, targets)
+            while targets:
+                homepages = await fetching
+                # Fetch the next batch while this one is classified and written.
+                targets = reader.next_batch()
+                fetching = _start_fetch(client, limiter, targets)
+                verdicts = await _classify_batch(client, limiter, homepages)
+                _apply_batch(verdicts, counters)
+                session.commit()
+                logger.info(
+                    "classified sources through id=%s %s",
+                    reader.after_id,
+                    " ".join(f"{key}={value}" for key, value in sorted(counters.items())),
+                )
+            await fetching
+
+    asyncio.run(drive())
+    return SourceClassificationRunResult(
+        checked=counters["checked"],
+        changed=counters["changed"],
+        ignored=counters["ignored"],
+        cached=counters["cached"],
+        fetch_failed=counters["fetch_failed"],
+    )
+
+
+class _SourceReader:
+    """Keyset pagination over queued sources that yields detached targets."""
+
+    def __init__(self, *, limit: int | None, batch_size: int, reclassify: bool) -> None:
+        self.after_id = 0
+        self.remaining = limit
+        self.batch_size = batch_size
+        self.reclassify = reclassify
+
+    def next_batch(self) -> list[_Target]:
+        if self.remaining is not None and self.remaining <= 0:
+            return []
+        size = self.batch_size if self.remaining is None else min(self.batch_size, self.remaining)
+        sources = sources_dao.get_sources_to_classify(
+            after_id=self.after_id, limit=size, include_classified=self.reclassify
+        )
+        if not sources:
+            return []
+        self.after_id = sources[-1].id
+        if self.remaining is not None:
+            self.remaining -= len(sources)
+        return [_Target(source_id=source.id, url=source.url, domain=source.canonical_domain) for source in sources]
+
+
+def _start_fetch(client: httpx.AsyncClient, limiter: _Limiter, targets: list[_Target]) -> asyncio.Task:
+    async def fetch_all() -> list[_Homepage]:
+        return list(await asyncio.gather(*(_fetch_limited(client, limiter, target) for target in targets)))
+
+    return asyncio.create_task(fetch_all())
+
+
+async def _fetch_limited(client: httpx.AsyncClient, limiter: _Limiter, target: _Target) -> _Homepage:
+    async with limiter.host(target.domain), limiter.slots:
+        try:
+            final_url, html = await _fetch_homepage(client, target.url)
+        except Exception as exc:
+            logger.warning("Could not fetch homepage for %s: %s", target.domain, exc)
+            return _Homepage(target=target, final_url=None, html=None, error=str(exc))
+    return _Homepage(target=target, final_url=final_url, html=html)
+
+
+async def _fetch_homepage(client: httpx.AsyncClient, url: str) -> tuple[str, str]:
+    response = await client.get(url)
+    response.raise_for_status()
+    content = response.content[:MAX_HTML_BYTES]
+    return str(response.url), content.decode(response.encoding or "utf-8", errors="replace")
+
+
+async def _classify_batch(
+    client: httpx.AsyncClient,
+    limiter: _Limiter,
+    homepages: list[_Homepage],
+) -> dict[int, _Verdict]:
+    verdicts: dict[int, _Verdict] = {}
+    pending: dict[str, list[_Homepage]] = defaultdict(list)
+    contexts: dict[str, tuple[str, str]] = {}
+    for homepage in homepages:
+        target = homepage.target
+        if homepage.html is None:
+            verdicts[target.source_id] = _Verdict(classify_source_url(target.url), from_homepage=False, fetch_failed=True)
+            continue
+        try:
+            verdict, context = homepage_precheck(homepage.final_url or target.url, homepage.html)
+        except ValueError as exc:
+            logger.warning("Could not classify homepage for %s: %s", target.domain, exc)
+            verdicts[target.source_id] = _Verdict(classify_source_url(target.url), from_homepage=False)
+            continue
+        if verdict is not None:
+            verdicts[target.source_id] = _Verdict(verdict, from_homepage=True)
+            continue
+        key = content_hash(context)
+        pending[key].append(homepage)
+        contexts.setdefault(key, (homepage.final_url or target.url, context))
+
+    cached = sources_dao.get_homepage_classifications(pending)
+    for key, row in cached.items():
+        classification = SourceClassification(status=row.status, reason=row.reason)
+        for homepage in pending.pop(key):
+            verdicts[homepage.target.source_id] = _Verdict(classification, from_homepage=True, cached=True)
+
+    async def classify(key: str) -> tuple[str, SourceClassification | None]:
+        url, context = contexts[key]
+        async with limiter.slots:
+            try:
+                return key, await classify_homepage_context_async(url, context, client=client)
+            except Exception:
+                return key, None
+
+    for key, classification in await asyncio.gather(*(classify(key) for key in pending)):
+        if classification is None:
+            for homepage in pending[key]:
+                verdicts[homepage.target.source_id] = _Verdict(classify_source_url(homepage.target.url), from_homepage=False)
+            continue
+        sources_dao.store_homepage_classification(
+            key, status=classification.status, reason=classification.reason, model=SOURCE_CLASSIFIER_MODEL
+        )
+        for index, homepage in enumerate(pending[key]):
+            # Later sources with the same homepage in this batch reuse the first verdict.
+            verdicts[homepage.target.source_id] = _Verdict(classification, from_homepage=True, cached=index > 0)
+    return verdicts
+
+
+def _apply_batch(verdicts: dict[int, _Verdict], counters: Counter) -> None:
+    session = db.current_session()
+    classified_at = datetime.now(timezone.utc)
+    for source_id, verdict in sorted(verdicts.items()):
+        source = session.get(Source, source_id)
+        if source is None:
+            continue
+        classification = verdict.classification
+        if source.status != classification.status or source.description != classification.reason:
+            source.status = classification.status
+            source.description = classification.reason
+            counters["changed"] += 1
+        if verdict.from_homepage:
+            source.classified_at = classified_at
+        counters["checked"] += 1
+        counters["ignored"] += source.status == SourceStatus.IGNORED.value
+        counters["cached"] += verdict.cached
+        counters["fetch_failed"] += verdict.fetch_failed
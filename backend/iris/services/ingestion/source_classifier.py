@@ -15,6 +15,7 @@ from iris.services.common.language import looks_non_english
 from iris.services.common.url_utils import domain_for_url, normalize_url
 
 logger = logging.getLogger("iris.source_classifier")
+OPENAI_RESPONSES_URL = "https://api.openai.com/v1/responses"
 
 
 OBVIOUS_IGNORED_EXACT_DOMAINS: dict[str, str] = {
@@ -165,13 +166,48 @@ def classify_source_url(url: str) -> SourceClassification:
 
 
 def classify_source_homepage(url: str, html: str) -> SourceClassification:
+    verdict, homepage_context = homepage_precheck(url, html)
+    if verdict is not None:
+        return verdict
+    key = require_openai_api_key(f"source homepage classification ({url})")
+
+    try:
+        result = _classify_with_openai(key, url, homepage_context)
+        return _normalize_llm_result(result)
+    except Exception as exc:
+        logger.warning("Homepage source classifier failed for %s: %s", url, exc)
+        raise
+
+
+async def classify_homepage_context_async(
+    url: str,
+    homepage_context: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> SourceClassification:
+    """Classify homepage context that ``homepage_precheck`` left undecided."""
+    key = require_openai_api_key(f"source homepage classification ({url})")
+    try:
+        result = await _classify_with_openai_async(key, url, homepage_context, client=client)
+        return _normalize_llm_result(result)
+    except Exception as exc:
+        logger.warning("Homepage source classifier failed for %s: %s", url, exc)
+        raise
+
+
+def homepage_precheck(url: str, html: str) -> tuple[SourceClassification | None, str]:
+    """Apply the deterministic homepage rules.
+
+    Returns a verdict when the rules decide the source, otherwise ``None`` and
+    the homepage context the LLM classifier should see.
+    """
     domain = domain_for_url(normalize_url(url))
     if domain.endswith(".test"):
-        return SourceClassification(status=SourceStatus.QUEUED.value, reason="test fixture domain")
+        return SourceClassification(status=SourceStatus.QUEUED.value, reason="test fixture domain"), ""
 
     obvious = classify_source_url(url)
     if obvious.status == SourceStatus.IGNORED.value:
-        return obvious
+        return obvious, ""
 
     homepage_context = _homepage_context(html)
     if not homepage_context.strip():
@@ -180,26 +216,19 @@ def classify_source_homepage(url: str, html: str) -> SourceClassification:
         return SourceClassification(
             status=SourceStatus.IGNORED.value,
             reason="homepage appears to be primarily non-English text",
-        )
+        ), homepage_context
 
     if _looks_like_professional_service_site(homepage_context):
         return SourceClassification(
             status=SourceStatus.IGNORED.value,
             reason="professional service/clinic site, not a personal blog or essay archive",
-        )
+        ), homepage_context
     if _looks_like_gambling_spam_site(homepage_context):
         return SourceClassification(
             status=SourceStatus.IGNORED.value,
             reason="casino/betting spam or gambling SEO content, not personal essays",
-        )
-    key = require_openai_api_key(f"source homepage classification ({url})")
-
-    try:
-        result = _classify_with_openai(key, url, homepage_context)
-        return _normalize_llm_result(result)
-    except Exception as exc:
-        logger.warning("Homepage source classifier failed for %s: %s", url, exc)
-        raise
+        ), homepage_context
+    return None, homepage_context
 
 
 def _homepage_context(html: str) -> str:
@@ -256,7 +285,40 @@ def _looks_like_gambling_spam_site(homepage_context: str) -> bool:
 
 def _classify_with_openai(api_key: str, url: str, homepage_context: str) -> SourceClassifierResult:
     """Classify a source homepage with structured LLM output."""
-    payload = {
+    with httpx.Client(timeout=SOURCE_CLASSIFIER_TIMEOUT_SECONDS) as client:
+        response = client.post(
+            OPENAI_RESPONSES_URL,
+            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+            json=_classifier_payload(url, homepage_context),
+        )
+        response.raise_for_status()
+        data = response.json()
+    return _classifier_result(data)
+
+
+async def _classify_with_openai_async(
+    api_key: str,
+    url: str,
+    homepage_context: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+) -> SourceClassifierResult:
+    """Async variant of ``_classify_with_openai`` that can share a pooled client."""
+    if client is None:
+        async with httpx.AsyncClient(timeout=SOURCE_CLASSIFIER_TIMEOUT_SECONDS) as owned_client:
+            return await _classify_with_openai_async(api_key, url, homepage_context, client=owned_client)
+    response = await client.post(
+        OPENAI_RESPONSES_URL,
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+        json=_classifier_payload(url, homepage_context),
+        timeout=SOURCE_CLASSIFIER_TIMEOUT_SECONDS,
+    )
+    response.raise_for_status()
+    return _classifier_result(response.json())
+
+
+def _classifier_payload(url: str, homepage_context: str) -> dict[str, object]:
+    return {
         "model": SOURCE_CLASSIFIER_MODEL,
         "instructions": (
             "Classify whether Iris should crawl this source. Iris wants personal opinions, personal blogs, "
@@ -279,14 +341,9 @@ def _classify_with_openai(api_key: str, url: str, homepage_context: str) -> Sour
         "max_output_tokens": 2000,
         "store": False,
     }
-    with httpx.Client(timeout=SOURCE_CLASSIFIER_TIMEOUT_SECONDS) as client:
-        response = client.post(
-            "https://api.openai.com/v1/responses",
-            headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-            json=payload,
-        )
-        response.raise_for_status()
-        data = response.json()
+
+
+def _classifier_result(data: Mapping[str, object]) -> SourceClassifierResult:
     if data.get("status") == "incomplete":
         reason = data.get("incomplete_details") or {}
         raise RuntimeError(f"source classifier response incomplete: {reason}")
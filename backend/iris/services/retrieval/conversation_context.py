@@ -0,0 +1,116 @@
+"""Bounded conversation context for agent chat turns.
+
+Each conversation stores a window of recently rendered turns plus a rolling
+summary of older ones. New messages are rendered once, when they are folded
+in; turns that fall out of the window or overflow the token budget collapse
+into one summary line each, and the oldest summary lines are dropped once the
+summary no longer fits. Building the agent prompt then only reads the stored
+state, whatever the length of the conversation.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+
+from iris.models import AgentMessage, AgentMessageRole
+from iris.services.common.config import AGENT_CONTEXT_RECENT_TURNS, AGENT_CONTEXT_TOKEN_BUDGET
+
+
+MESSAGE_CHARS = 700
+LINK_SUMMARY_CHARS = 260
+LINKS_PER_TURN = 8
+SUMMARY_MESSAGE_CHARS = 200
+SUMMARY_LINKS_PER_TURN = 5
+# The recent-turns window may use this share of the budget; the summary gets the rest.
+TURNS_BUDGET_SHARE = 0.75
+
+
+@dataclass(frozen=True)
+class ContextTurn:
+    """One rendered message plus the line it collapses to once summarized."""
+
+    message_id: int
+    text: str
+    summary: str
+
+    def as_payload(self) -> dict[str, object]:
+        return {"message_id": self.message_id, "text": self.text, "summary": self.summary}
+
+    @classmethod
+    def from_payload(cls, payload: Mapping[str, object]) -> ContextTurn:
+        return cls(
+            message_id=int(payload["message_id"]),
+            text=str(payload.get("text") or ""),
+            summary=str(payload.get("summary") or ""),
+        )
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count; about four characters per token for English prose."""
+    return (len(text) + 3) // 4
+
+
+def render_turn(message: AgentMessage) -> ContextTurn:
+    """Render a message with its cited documents, which should be eagerly loaded."""
+    is_user = message.role == AgentMessageRole.USER
+    content = " ".join(message.content.split())
+    lines = [f"{'User' if is_user else 'Iris'}: {_clip(content, MESSAGE_CHARS)}"]
+    cited: list[str] = []
+    if not is_user and message.results:
+        lines.append("Iris recommended links:")
+        for result in message.results[:LINKS_PER_TURN]:
+            document = result.document
+            title = document.title or document.url
+            summary = _clip(" ".join((document.summary or "").split()), LINK_SUMMARY_CHARS)
+            lines.append(
+                f"- internal_ref={document.id}; title={title}; source={document.source.canonical_domain}; "
+                f"url={document.url}; summary={summary}"
+            )
+            if len(cited) < SUMMARY_LINKS_PER_TURN:
+                cited.append(f"{title} (internal_ref={document.id})")
+    summary = f"{'User asked' if is_user else 'Iris answered'}: {_clip(content, SUMMARY_MESSAGE_CHARS)}"
+    if cited:
+        summary = f"{summary} Cited: {'; '.join(cited)}"
+    return ContextTurn(message_id=message.id, text="\n".join(lines), summary=summary)
+
+
+def fold_turns(
+    summary: str | None,
+    turns: list[ContextTurn],
+    new_turns: Iterable[ContextTurn],
+    *,
+    token_budget: int = AGENT_CONTEXT_TOKEN_BUDGET,
+    recent_turns: int = AGENT_CONTEXT_RECENT_TURNS,
+) -> tuple[str | None, list[ContextTurn]]:
+    """Append ``new_turns`` to the window and summarize whatever no longer fits."""
+    window = [*turns, *new_turns]
+    turns_budget = int(token_budget * TURNS_BUDGET_SHARE)
+    evicted: list[ContextTurn] = []
+    while len(window) > max(1, recent_turns) or (
+        len(window) > 1 and sum(estimate_tokens(turn.text) for turn in window) > turns_budget
+    ):
+        evicted.append(window.pop(0))
+    if window and estimate_tokens(window[0].text) > turns_budget:
+        turn = window[0]
+        window[0] = ContextTurn(turn.message_id, _clip(turn.text, turns_budget * 4), turn.summary)
+
+    lines = [*(summary.splitlines() if summary else []), *(turn.summary for turn in evicted)]
+    summary_budget = token_budget - sum(estimate_tokens(turn.text) for turn in window)
+    while lines and estimate_tokens("\n".join(lines)) > summary_budget:
+        lines.pop(0)
+    return ("\n".join(lines) or None), window
+
+
+def render_context(summary: str | None, turns: list[ContextTurn]) -> str:
+    sections: list[str] = []
+    if summary:
+        sections.append(f"Summary of earlier turns:\n{summary}")
+    if turns:
+        recent = "\n".join(turn.text for turn in turns)
+        sections.append(f"Recent turns:\n{recent}" if summary else recent)
+    return "\n\n".join(sections)
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else f"{text[: limit - 3]}..."
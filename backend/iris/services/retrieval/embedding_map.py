@@ -3,7 +3,10 @@ from __future__ import annotations
 import math
 import warnings
 
+import numpy as np
+
 from iris.schemas.retrieval import EmbeddingProjection, ProjectedEmbedding
+from iris.services.common.vectors import principal_components
 
 
 def project_embeddings(vectors: list[list[float]], *, radius: float = 42.0) -> EmbeddingProjection:
@@ -16,7 +19,7 @@ def project_embeddings(vectors: list[list[float]], *, radius: float = 42.0) -> E
     try:
         return _project_with_umap(vectors, radius=radius)
     except Exception:
-        return _project_with_power_iteration(vectors, radius=radius)
+        return _project_with_randomized_svd(vectors, radius=radius)
 
 
 def _project_with_umap(vectors: list[list[float]], *, radius: float) -> EmbeddingProjection:
@@ -24,7 +27,6 @@ def _project_with_umap(vectors: list[list[float]], *, radius: float) -> Embeddin
     if len(vectors) < 8:
         raise ValueError("UMAP needs a larger sample")
 
-    import numpy as np
     import umap
     from sklearn.cluster import KMeans
     from sklearn.decomposition import PCA
@@ -67,8 +69,6 @@ def _project_with_umap(vectors: list[list[float]], *, radius: float) -> Embeddin
 
 
 def _scale_numpy_points(points, *, radius: float):
-    import numpy as np
-
     centered = points - points.mean(axis=0, keepdims=True)
     distances = np.linalg.norm(centered, axis=1)
     scale_distance = float(np.percentile(distances, 95)) or 1.0
@@ -76,74 +76,28 @@ def _scale_numpy_points(points, *, radius: float):
     return np.clip(scaled, -radius * 1.35, radius * 1.35)
 
 
-def _project_with_power_iteration(vectors: list[list[float]], *, radius: float) -> EmbeddingProjection:
-    """Fallback projection using deterministic PCA-style power iteration."""
+def _project_with_randomized_svd(vectors: list[list[float]], *, radius: float) -> EmbeddingProjection:
+    """Fallback projection onto the top three principal components via randomised SVD."""
     dimensions = min(len(vector) for vector in vectors)
-    trimmed = [vector[:dimensions] for vector in vectors if len(vector) >= dimensions]
-    means = [sum(vector[index] for vector in trimmed) / len(trimmed) for index in range(dimensions)]
-    centered = [[value - means[index] for index, value in enumerate(vector)] for vector in trimmed]
-
-    components: list[list[float]] = []
-    for seed in range(min(3, dimensions)):
-        components.append(_principal_component(centered, components, seed))
-
-    projected = [
-        tuple(_dot(vector, component) for component in components) + (0.0,) * (3 - len(components))
-        for vector in centered
-    ]
-    coordinates = _normalize(projected, radius)
+    matrix = np.stack([np.asarray(vector, dtype=np.float32)[:dimensions] for vector in vectors])
+    coordinates = _normalize(principal_components(matrix, 3), radius)
     cluster_ids = _fallback_cluster_ids(coordinates)
     return EmbeddingProjection(
         points=[
             ProjectedEmbedding(x=x, y=y, z=z, cluster_id=cluster_id)
-            for (x, y, z), cluster_id in zip(coordinates, cluster_ids)
+            for (x, y, z), cluster_id in zip(coordinates.tolist(), cluster_ids)
         ],
-        method="power_iteration_fallback",
+        method="randomized_svd_fallback",
     )
 
 
-def _fallback_cluster_ids(points: list[tuple[float, float, float]]) -> list[int | None]:
+def _fallback_cluster_ids(points: np.ndarray) -> list[int | None]:
     if len(points) < 4:
         return [None for _ in points]
-    return [int((x >= 0)) + (2 * int(y >= 0)) + (4 * int(z >= 0)) for x, y, z in points]
-
-
-def _principal_component(vectors: list[list[float]], previous: list[list[float]], seed: int) -> list[float]:
-    dimensions = len(vectors[0])
-    component = [0.0] * dimensions
-    component[seed % dimensions] = 1.0
-
-    for _ in range(24):
-        next_component = [0.0] * dimensions
-        for vector in vectors:
-            scale = _dot(vector, component)
-            for index, value in enumerate(vector):
-                next_component[index] += scale * value
-        for existing in previous:
-            existing_scale = _dot(next_component, existing)
-            for index, value in enumerate(existing):
-                next_component[index] -= existing_scale * value
-        component = _unit(next_component)
-    return component
-
-
-def _normalize(points: list[tuple[float, ...]], radius: float) -> list[tuple[float, float, float]]:
-    max_distance = max(math.sqrt(sum(value * value for value in point)) for point in points) or 1.0
-    scale = radius / max_distance
-    return [
-        (
-            round(point[0] * scale, 4),
-            round(point[1] * scale, 4),
-            round(point[2] * scale, 4),
-        )
-        for point in points
-    ]
-
-
-def _dot(left: list[float] | tuple[float, ...], right: list[float]) -> float:
-    return sum(left_value * right_value for left_value, right_value in zip(left, right))
-
-
-def _unit(vector: list[float]) -> list[float]:
-    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
-    return [value / norm for value in vector]
+    octants = (points[:, 0] >= 0).astype(int) + 2 * (points[:, 1] >= 0) + 4 * (points[:, 2] >= 0)
+    return octants.tolist()
+
+
+def _normalize(points: np.ndarray, radius: float) -> np.ndarray:
+    max_distance = float(np.linalg.norm(points, axis=1).max()) or 1.0
+    return np.round(points * (radius / max_distance), 4)
@@ -0,0 +1,179 @@
+"""Shared in-memory posting lists for the agent's tag and category tools.
+
+Each topic slug, tag slug and category maps to a sorted ``int64`` array of
+document ids, so a tool call is a few dictionary lookups plus a NumPy
+union instead of an ``IN`` list as large as the corpus.
+
+One ``PostingLists`` is kept per database engine and shared across
+conversations and worker threads. Writers append the ids of documents whose
+assignments changed to ``posting_changes`` in the same transaction; a read
+first checks the newest change id and, when it moved, reloads assignments for
+just those documents. Recent changes are replayed because ids can commit out
+of order, and a null document id (a full topic rebuild) or a gap longer than
+the change retention triggers a full rebuild.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import weakref
+from collections.abc import Iterable
+
+import numpy as np
+
+from iris.dao import db
+from iris.dao import postings as postings_dao
+from iris.services.common.config import POSTING_CHANGE_RETENTION_HOURS
+
+
+# Changes just below the watermark are re-read in case they committed late.
+REPLAY_CHANGES = 64
+EMPTY_POSTING = np.zeros(0, dtype=np.int64)
+
+
+class PostingIndex:
+    """Sorted document-id arrays per term, plus each document's terms for incremental updates."""
+
+    def __init__(self) -> None:
+        self.postings: dict[str, np.ndarray] = {}
+        self.by_document: dict[int, frozenset[str]] = {}
+
+    def build(self, pairs: Iterable[tuple[int, str]]) -> None:
+        grouped: dict[str, list[int]] = {}
+        by_document: dict[int, set[str]] = {}
+        for document_id, term in pairs:
+            grouped.setdefault(term, []).append(document_id)
+            by_document.setdefault(document_id, set()).add(term)
+        self.postings = {term: np.unique(np.array(ids, dtype=np.int64)) for term, ids in grouped.items()}
+        self.by_document = {document_id: frozenset(terms) for document_id, terms in by_document.items()}
+
+    def replace_documents(self, document_ids: Iterable[int], pairs: Iterable[tuple[int, str]]) -> None:
+        """Swap the terms of ``document_ids`` for the current ``pairs``, touching only the affected arrays."""
+        current: dict[int, set[str]] = {document_id: set() for document_id in document_ids}
+        for document_id, term in pairs:
+            current.setdefault(document_id, set()).add(term)
+        added: dict[str, list[int]] = {}
+        removed: dict[str, list[int]] = {}
+        for document_id, terms in current.items():
+            previous = self.by_document.get(document_id, frozenset())
+            for term in terms - previous:
+                added.setdefault(term, []).append(document_id)
+            for term in previous - terms:
+                removed.setdefault(term, []).append(document_id)
+            if terms:
+                self.by_document[document_id] = frozenset(terms)
+            else:
+                self.by_document.pop(document_id, None)
+        for term in added.keys() | removed.keys():
+            posting = self.postings.get(term, EMPTY_POSTING)
+            if term in removed:
+                posting = np.setdiff1d(posting, np.array(removed[term], dtype=np.int64), assume_unique=True)
+            if term in added:
+                posting = np.union1d(posting, np.array(added[term], dtype=np.int64))
+            # Rebinding keeps readers in other threads on a consistent array.
+            if len(posting):
+                self.postings[term] = posting
+            else:
+                self.postings.pop(term, None)
+
+    def get(self, term: str) -> np.ndarray:
+        return self.postings.get(term, EMPTY_POSTING)
+
+    def document_frequency(self, term: str) -> int:
+        return len(self.get(term))
+
+    def match_counts(self, terms: Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Return the documents carrying any of ``terms`` and how many of the terms each carries."""
+        postings = [self.get(term) for term in terms]
+        postings = [posting for posting in postings if len(posting)]
+        if not postings:
+            return EMPTY_POSTING, EMPTY_POSTING
+        return np.unique(np.concatenate(postings), return_counts=True)
+
+
+class PostingLists:
+    """Topic, tag and category posting lists with the display names that resolve to each slug."""
+
+    def __init__(self) -> None:
+        self.topics = PostingIndex()
+        self.tags = PostingIndex()
+        self.categories = PostingIndex()
+        self.document_categories = PostingIndex()
+        self.tag_names: dict[str, set[str]] = {}
+        self.category_slugs: dict[str, str] = {}
+        self.watermark: int | None = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def refresh(self) -> None:
+        """Bring the lists up to date with ``posting_changes`` on the current session."""
+        with self._lock:
+            latest = postings_dao.latest_posting_change_id()
+            now = time.monotonic()
+            stale = now - self.checked_at > POSTING_CHANGE_RETENTION_HOURS * 3600
+            if self.watermark is None or (latest > self.watermark and stale):
+                self._rebuild(latest)
+            elif latest > self.watermark:
+                changes = postings_dao.get_posting_changes(max(0, self.watermark - REPLAY_CHANGES))
+                if any(document_id is None for change_id, document_id in changes if change_id > self.watermark):
+                    self._rebuild(latest)
+                else:
+                    self._apply({document_id for _change_id, document_id in changes if document_id is not None})
+                    self.watermark = max(change_id for change_id, _document_id in changes)
+            self.checked_at = now
+
+    def tag_matches_term(self, slug: str, term: str) -> bool:
+        """Return whether ``term`` names tag ``slug`` directly or through a tag's display name."""
+        return bool(self.tags.document_frequency(slug)) and (term == slug or term in self.tag_names.get(slug, ()))
+
+    def category_slug_for_term(self, term: str) -> str | None:
+        if self.categories.document_frequency(term):
+            return term
+        return self.category_slugs.get(term)
+
+    def _rebuild(self, latest: int) -> None:
+        rows = postings_dao.get_posting_rows()
+        self.topics.build(rows.topics)
+        self.tags.build(_slug_pairs(rows.tags))
+        self.categories.build(_slug_pairs(rows.categories))
+        self.document_categories.build(rows.document_categories)
+        self.tag_names = {}
+        self.category_slugs = {}
+        self._remember_names(rows.tags, rows.categories)
+        self.watermark = latest
+
+    def _apply(self, document_ids: set[int]) -> None:
+        ids = sorted(document_ids)
+        rows = postings_dao.get_posting_rows(ids)
+        self.topics.replace_documents(ids, rows.topics)
+        self.tags.replace_documents(ids, _slug_pairs(rows.tags))
+        self.categories.replace_documents(ids, _slug_pairs(rows.categories))
+        self.document_categories.replace_documents(ids, rows.document_categories)
+        self._remember_names(rows.tags, rows.categories)
+
+    def _remember_names(self, tags: list[tuple[int, str, str]], categories: list[tuple[int, str, str]]) -> None:
+        for _document_id, slug, name in tags:
+            self.tag_names.setdefault(slug.lower(), set()).add(str(name).lower())
+        for _document_id, slug, name in categories:
+            self.category_slugs[str(name).lower()] = slug.lower()
+
+
+def _slug_pairs(rows: list[tuple[int, str, str]]) -> Iterable[tuple[int, str]]:
+    return ((document_id, str(slug).lower()) for document_id, slug, _name in rows)
+
+
+_shared: weakref.WeakKeyDictionary[object, PostingLists] = weakref.WeakKeyDictionary()
+_shared_lock = threading.Lock()
+
+
+def current_posting_lists() -> PostingLists:
+    """Return the refreshed posting lists shared by every session on the current engine."""
+    bind = db.current_session().get_bind()
+    engine = getattr(bind, "engine", bind)
+    with _shared_lock:
+        lists = _shared.get(engine)
+        if lists is None:
+            lists = _shared[engine] = PostingLists()
+    lists.refresh()
+    return lists
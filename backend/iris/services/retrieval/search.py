@@ -1,16 +1,23 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import logging
 import os
 import re
-from collections.abc import Mapping
+from collections.abc import Awaitable, Callable, Mapping
 
 import httpx
+import numpy as np
 from sqlalchemy import select
 
 from iris.dao import db
+from iris.dao import embeddings as embeddings_dao
 from iris.dao import search as search_dao
+from iris.dao import topics as topics_dao
+from iris.dao.user_state import slugify_tag_name
 from iris.services.common.config import (
+    AGENT_PARALLEL_TOOL_CALLS,
     AGENT_SEARCH_MAX_TURNS,
     AGENT_SEARCH_MODEL,
     AGENT_SEARCH_REASONING_EFFORT,
@@ -20,12 +27,27 @@ from iris.services.common.config import (
     openai_api_key,
 )
 from iris.services.common.langfuse_tracing import agent_search_observation, finish_agent_search_observation, instrument_openai_agents
-from iris.services.ingestion.embedding import cosine, embed_text, loads_embedding
-from iris.models import Category, Document, DocumentCategoryAssignment, DocumentTag, Source, Tag
+from iris.services.common.rank_fusion import reciprocal_rank_fusion
+from iris.services.common.vectors import cosine_scores, stack_vectors, top_k
+from iris.services.ingestion.embedding import embed_text_for_model, embed_text_for_model_async, loads_embedding_array
+from iris.services.retrieval.posting_lists import current_posting_lists
+from iris.models import Document, Source
 from iris.schemas.enums import AgentStepKind, AgentToolName, DocumentType
-from iris.schemas.retrieval import AgentChatResult, AgentChatStreamEvent, AgentInspectedDocument, AgentSearchOutput, AgentStep, AgentToolRun, RankedDocument
+from iris.schemas.retrieval import (
+    AgentChatResult,
+    AgentChatStreamEvent,
+    AgentInspectedDocument,
+    AgentSearchOutput,
+    AgentStep,
+    AgentToolRun,
+    HybridSearchHit,
+    RankedDocument,
+)
 
+logger = logging.getLogger(__name__)
 AGENT_RESULT_SAFETY_CAP = 20
+# Tool merging fuses plain ranks, so it keeps a floor on the unweighted RRF scale.
+MIN_AGENT_MERGE_SCORE = 0.03
 AGENT_INSTRUCTIONS = (
     "You are the search intelligence for Iris, a personal corpus search engine for indexed blogs and essays. "
     "You have retrieval tools plus metadata tools: keyword_search, semantic_search, tag_search, category_search, "
@@ -165,7 +187,7 @@ def _keyword_score(query_terms: set[str], document: Document) -> float:
             " ".join(document.takeaways or []),
             " ".join(document.topics or []),
             str(document.category.value if hasattr(document.category, "value") else document.category),
-            document.extracted_text[:3000] if document.extracted_text else "",
+            _document_search_text(document),
             document.source.name,
             document.source.canonical_domain,
         )
@@ -176,6 +198,12 @@ def _keyword_score(query_terms: set[str], document: Document) -> float:
     return hits / len(query_terms)
 
 
+def _document_search_text(document: Document) -> str:
+    if document.text_excerpt is not None:
+        return document.text_excerpt
+    return (document.extracted_text or "")[: search_dao.SEARCH_TEXT_EXCERPT_CHARS]
+
+
 def _document_search_payload(document: Document) -> dict[str, object]:
     return {
         "document_id": document.id,
@@ -192,42 +220,37 @@ def _document_search_payload(document: Document) -> dict[str, object]:
 
 
 def search_documents(query: str, limit: int = 12, persist: bool = True) -> tuple[None, list[RankedDocument]]:
-    query_vector = embed_text(query)
-    query_terms = _terms(query)
-    vector_rows = search_dao.vector_search_documents(query_vector, limit=max(limit * 8, 80))
-    documents = [document for document, _score in vector_rows] if vector_rows else search_dao.get_searchable_documents()
-    vector_scores = {document.id: score for document, score in vector_rows}
-    saved_ids = search_dao.get_favorited_document_ids()
-    dismissed_ids = search_dao.get_dismissed_document_ids()
-
-    ranked: list[RankedDocument] = []
-    for document in documents:
-        semantic = vector_scores.get(document.id)
-        if semantic is None:
-            semantic = cosine(query_vector, loads_embedding(document.embedding_vector))
-        keyword = _keyword_score(query_terms, document)
-        favorite_bonus = 0.08 if document.id in saved_ids else 0.0
-        dismissed_penalty = 0.18 if document.id in dismissed_ids else 0.0
-        score = (0.55 * semantic) + (0.45 * keyword) + favorite_bonus - dismissed_penalty
-        if score <= 0.03:
-            continue
-        reason_bits = []
-        if keyword > 0:
-            reason_bits.append(f"keyword overlap {keyword:.0%}")
-        if semantic > 0.12:
-            reason_bits.append("semantic match")
-        if not reason_bits:
-            reason_bits.append("related corpus item")
-        ranked.append(RankedDocument(document=document, score=score, reason=", ".join(reason_bits)))
-
-    ranked.sort(key=lambda item: item.score, reverse=True)
-    candidate_pool = ranked[: max(limit * 3, 24)]
+    # Only the LLM reranker looks past the first ``limit`` hits, so only it widens what is loaded.
+    pool = max(limit * 3, 24) if USE_LLM_RERANKER else limit
+    hits = search_dao.hybrid_search_documents(
+        sorted(_terms(query)),
+        _query_vector(query),
+        candidates=max(limit * 8, 80),
+        limit=pool,
+    )
+    documents = search_dao.get_ranked_documents([hit.document_id for hit in hits])
+    candidate_pool = [
+        RankedDocument(document=documents[hit.document_id], score=hit.score, reason=_hybrid_reason(hit))
+        for hit in hits
+        if hit.document_id in documents
+    ]
     candidate_pool = _rerank_candidates(query, candidate_pool)
     ranked = _dedupe_ranked_documents(_expand_with_graph_neighbors(candidate_pool[:limit], limit))
 
     return None, ranked[:limit]
 
 
+def _hybrid_reason(hit: HybridSearchHit) -> str:
+    reason_bits = []
+    if hit.keyword_rank is not None:
+        reason_bits.append(f"keyword rank {hit.keyword_rank}")
+    if hit.similarity is not None and hit.similarity > search_dao.SEMANTIC_MIN_SIMILARITY:
+        reason_bits.append("semantic match")
+    if not reason_bits:
+        reason_bits.append("related corpus item")
+    return ", ".join(reason_bits)
+
+
 def agentic_chat(
     message: str,
     limit: int | None = None,
@@ -267,93 +290,20 @@ async def stream_openai_agentic_chat(
         os.environ.setdefault("OPENAI_API_KEY", key)
 
     documents = search_dao.get_searchable_documents()
-    documents_by_id = {document.id: document for document in documents}
     tool_runs: list[AgentToolRun] = []
     steps: list[AgentStep] = []
 
-    def serialize_rows(rows: list[RankedDocument]) -> str:
-        return json.dumps(
-            [
-                {
-                    **_document_search_payload(row.document),
-                    "score": round(row.score, 4),
-                    "reason": row.reason,
-                }
-                for row in rows
-            ],
-            ensure_ascii=False,
-        )
-
-    @function_tool
-    def keyword_search(query: str, max_results: int = 12) -> str:
-        """Search Iris documents by lexical overlap using a standalone resolved query that preserves the user's specific subject and constraints."""
-        rows = _keyword_search(_terms(query), documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.KEYWORD, query=query, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def semantic_search(query: str, max_results: int = 12) -> str:
-        """Search Iris documents by semantic similarity using a standalone resolved query that preserves the user's specific subject and constraints."""
-        rows = _semantic_search(query, documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.SEMANTIC, query=query, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def tag_search(terms: str, max_results: int = 12) -> str:
-        """Search Iris documents by comma-separated topic or tag terms."""
-        normalized = {term.strip().lower() for term in terms.split(",") if term.strip()}
-        rows = _tag_search(normalized, documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.TAGS, query=terms, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def category_search(categories: str, max_results: int = 12) -> str:
-        """Search Iris documents by comma-separated high-level categories like startups, software, culture, or personal."""
-        normalized = {term.strip().lower() for term in categories.split(",") if term.strip()}
-        rows = _category_search(normalized, documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.CATEGORIES, query=categories, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def get_document_metadata(document_id: int) -> str:
-        """Fetch metadata and a short excerpt for one Iris document by document_id."""
-        document = documents_by_id.get(document_id)
-        if document is None:
-            tool_runs.append(AgentToolRun(tool=AgentToolName.DOCUMENT_METADATA, query=str(document_id), rows=[]))
-            return json.dumps({"error": "document not found", "document_id": document_id})
-        tool_runs.append(
-            AgentToolRun(
-                tool=AgentToolName.DOCUMENT_METADATA,
-                query=str(document_id),
-                rows=[RankedDocument(document=document, score=1.0, reason="document metadata lookup")],
-            )
-        )
-        return _serialize_document_metadata(document)
-
-    @function_tool
-    def get_source_metadata(domain: str) -> str:
-        """Fetch metadata about a source/blog by canonical domain."""
-        normalized = domain.strip().lower()
-        source = db.current_session().scalar(select(Source).where(Source.canonical_domain == normalized))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.SOURCE_METADATA, query=normalized, rows=[]))
-        if source is None:
-            return json.dumps({"error": "source not found", "domain": normalized})
-        return _serialize_source_metadata(source)
-
     agent = Agent(
         name="Iris corpus search agent",
         model=AGENT_SEARCH_MODEL,
         output_type=AgentSearchOutput,
         instructions=AGENT_INSTRUCTIONS,
-        model_settings=ModelSettings(tool_choice="auto", reasoning={"effort": AGENT_SEARCH_REASONING_EFFORT}),
-        tools=[
-            keyword_search,
-            semantic_search,
-            tag_search,
-            category_search,
-            get_document_metadata,
-            get_source_metadata,
-        ],
+        model_settings=ModelSettings(
+            tool_choice="auto",
+            parallel_tool_calls=AGENT_PARALLEL_TOOL_CALLS,
+            reasoning={"effort": AGENT_SEARCH_REASONING_EFFORT},
+        ),
+        tools=[function_tool(tool) for tool in _agent_tool_functions(documents, tool_runs)],
     )
     agent_input = _agent_input(message, conversation_context)
     with agent_search_observation(
@@ -425,92 +375,19 @@ def _openai_agentic_chat(
         os.environ.setdefault("OPENAI_API_KEY", key)
 
     documents = search_dao.get_searchable_documents()
-    documents_by_id = {document.id: document for document in documents}
     tool_runs: list[AgentToolRun] = []
 
-    def serialize_rows(rows: list[RankedDocument]) -> str:
-        return json.dumps(
-            [
-                {
-                    **_document_search_payload(row.document),
-                    "score": round(row.score, 4),
-                    "reason": row.reason,
-                }
-                for row in rows
-            ],
-            ensure_ascii=False,
-        )
-
-    @function_tool
-    def keyword_search(query: str, max_results: int = 12) -> str:
-        """Search Iris documents by lexical overlap using a standalone resolved query that preserves the user's specific subject and constraints."""
-        rows = _keyword_search(_terms(query), documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.KEYWORD, query=query, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def semantic_search(query: str, max_results: int = 12) -> str:
-        """Search Iris documents by semantic similarity using a standalone resolved query that preserves the user's specific subject and constraints."""
-        rows = _semantic_search(query, documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.SEMANTIC, query=query, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def tag_search(terms: str, max_results: int = 12) -> str:
-        """Search Iris documents by comma-separated topic or tag terms."""
-        normalized = {term.strip().lower() for term in terms.split(",") if term.strip()}
-        rows = _tag_search(normalized, documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.TAGS, query=terms, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def category_search(categories: str, max_results: int = 12) -> str:
-        """Search Iris documents by comma-separated high-level categories like startups, software, culture, or personal."""
-        normalized = {term.strip().lower() for term in categories.split(",") if term.strip()}
-        rows = _category_search(normalized, documents, limit=max(1, min(max_results, 30)))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.CATEGORIES, query=categories, rows=rows))
-        return serialize_rows(rows)
-
-    @function_tool
-    def get_document_metadata(document_id: int) -> str:
-        """Fetch metadata and a short excerpt for one Iris document by document_id."""
-        document = documents_by_id.get(document_id)
-        if document is None:
-            tool_runs.append(AgentToolRun(tool=AgentToolName.DOCUMENT_METADATA, query=str(document_id), rows=[]))
-            return json.dumps({"error": "document not found", "document_id": document_id})
-        tool_runs.append(
-            AgentToolRun(
-                tool=AgentToolName.DOCUMENT_METADATA,
-                query=str(document_id),
-                rows=[RankedDocument(document=document, score=1.0, reason="document metadata lookup")],
-            )
-        )
-        return _serialize_document_metadata(document)
-
-    @function_tool
-    def get_source_metadata(domain: str) -> str:
-        """Fetch metadata about a source/blog by canonical domain."""
-        normalized = domain.strip().lower()
-        source = db.current_session().scalar(select(Source).where(Source.canonical_domain == normalized))
-        tool_runs.append(AgentToolRun(tool=AgentToolName.SOURCE_METADATA, query=normalized, rows=[]))
-        if source is None:
-            return json.dumps({"error": "source not found", "domain": normalized})
-        return _serialize_source_metadata(source)
-
     agent = Agent(
         name="Iris corpus search agent",
         model=AGENT_SEARCH_MODEL,
         output_type=AgentSearchOutput,
         instructions=AGENT_INSTRUCTIONS,
-        model_settings=ModelSettings(tool_choice="auto", reasoning={"effort": AGENT_SEARCH_REASONING_EFFORT}),
-        tools=[
-            keyword_search,
-            semantic_search,
-            tag_search,
-            category_search,
-            get_document_metadata,
-            get_source_metadata,
-        ],
+        model_settings=ModelSettings(
+            tool_choice="auto",
+            parallel_tool_calls=AGENT_PARALLEL_TOOL_CALLS,
+            reasoning={"effort": AGENT_SEARCH_REASONING_EFFORT},
+        ),
+        tools=[function_tool(tool) for tool in _agent_tool_functions(documents, tool_runs)],
     )
     agent_input = _agent_input(message, conversation_context)
     with agent_search_observation(
@@ -548,13 +425,104 @@ def _openai_agentic_chat(
     return AgentChatResult(answer=answer, results=ranked, steps=steps)
 
 
+def _agent_tool_functions(
+    documents: list[Document],
+    tool_runs: list[AgentToolRun],
+    *,
+    query_model: str | None = None,
+) -> list[Callable[..., Awaitable[str]]]:
+    """Build the async agent tools over a preloaded document list.
+
+    Corpus scans run in worker threads and database lookups use a worker-owned
+    read session, on the replica when one is configured, so a heavy tool call
+    never blocks the event loop streaming other conversations or competes with
+    crawler writes, and tool calls from one model turn can run concurrently.
+    Semantic queries are embedded with ``query_model``, which defaults to the
+    serving model at build time.
+    """
+    documents_by_id = {document.id: document for document in documents}
+    query_model = query_model or embeddings_dao.serving_model_name()
+
+    async def keyword_search(query: str, max_results: int = 12) -> str:
+        """Search Iris documents by lexical overlap using a standalone resolved query that preserves the user's specific subject and constraints."""
+        rows = await asyncio.to_thread(_keyword_search, _terms(query), documents, limit=max(1, min(max_results, 30)))
+        tool_runs.append(AgentToolRun(tool=AgentToolName.KEYWORD, query=query, rows=rows))
+        return _serialize_ranked_rows(rows)
+
+    async def semantic_search(query: str, max_results: int = 12) -> str:
+        """Search Iris documents by semantic similarity using a standalone resolved query that preserves the user's specific subject and constraints."""
+        query_vector = await embed_text_for_model_async(query, query_model)
+        rows = await db.run_in_read_session(_semantic_search_vector, query_vector, documents, limit=max(1, min(max_results, 30)))
+        tool_runs.append(AgentToolRun(tool=AgentToolName.SEMANTIC, query=query, rows=rows))
+        return _serialize_ranked_rows(rows)
+
+    async def tag_search(terms: str, max_results: int = 12) -> str:
+        """Search Iris documents by comma-separated topic or tag terms."""
+        normalized = {term.strip().lower() for term in terms.split(",") if term.strip()}
+        rows = await db.run_in_read_session(_tag_search, normalized, documents_by_id, limit=max(1, min(max_results, 30)))
+        tool_runs.append(AgentToolRun(tool=AgentToolName.TAGS, query=terms, rows=rows))
+        return _serialize_ranked_rows(rows)
+
+    async def category_search(categories: str, max_results: int = 12) -> str:
+        """Search Iris documents by comma-separated high-level categories like startups, software, culture, or personal."""
+        normalized = {term.strip().lower() for term in categories.split(",") if term.strip()}
+        rows = await db.run_in_read_session(_category_search, normalized, documents_by_id, limit=max(1, min(max_results, 30)))
+        tool_runs.append(AgentToolRun(tool=AgentToolName.CATEGORIES, query=categories, rows=rows))
+        return _serialize_ranked_rows(rows)
+
+    async def get_document_metadata(document_id: int) -> str:
+        """Fetch metadata and a short excerpt for one Iris document by document_id."""
+        document = documents_by_id.get(document_id)
+        if document is None:
+            tool_runs.append(AgentToolRun(tool=AgentToolName.DOCUMENT_METADATA, query=str(document_id), rows=[]))
+            return json.dumps({"error": "document not found", "document_id": document_id})
+        tool_runs.append(
+            AgentToolRun(
+                tool=AgentToolName.DOCUMENT_METADATA,
+                query=str(document_id),
+                rows=[RankedDocument(document=document, score=1.0, reason="document metadata lookup")],
+            )
+        )
+        return _serialize_document_metadata(document)
+
+    async def get_source_metadata(domain: str) -> str:
+        """Fetch metadata about a source/blog by canonical domain."""
+        normalized = domain.strip().lower()
+        tool_runs.append(AgentToolRun(tool=AgentToolName.SOURCE_METADATA, query=normalized, rows=[]))
+        return await db.run_in_read_session(_source_metadata_for_domain, normalized)
+
+    return [keyword_search, semantic_search, tag_search, category_search, get_document_metadata, get_source_metadata]
+
+
+def _serialize_ranked_rows(rows: list[RankedDocument]) -> str:
+    return json.dumps(
+        [
+            {
+                **_document_search_payload(row.document),
+                "score": round(row.score, 4),
+                "reason": row.reason,
+            }
+            for row in rows
+        ],
+        ensure_ascii=False,
+    )
+
+
+def _source_metadata_for_domain(domain: str) -> str:
+    source = db.current_session().scalar(select(Source).where(Source.canonical_domain == domain))
+    if source is None:
+        return json.dumps({"error": "source not found", "domain": domain})
+    return _serialize_source_metadata(source)
+
+
 def _agent_input(message: str, conversation_context: str | None) -> str:
     if not conversation_context:
         return message
     return (
-        "Use this full conversation transcript to interpret the current user message. "
+        "Use this conversation context to interpret the current user message. "
+        "It holds a summary of earlier turns and the most recent turns in full. "
         "The current message may be elliptical and may depend on earlier user constraints.\n\n"
-        "Conversation transcript before the current message:\n"
+        "Conversation before the current message:\n"
         f"{conversation_context}\n\n"
         "Current user message:\n"
         f"{message}"
@@ -562,7 +530,7 @@ def _agent_input(message: str, conversation_context: str | None) -> str:
 
 
 def _serialize_document_metadata(document: Document) -> str:
-    text = " ".join((document.extracted_text or "").split())
+    text = " ".join(_document_search_text(document).split())
     excerpt = text[:1800] if text else None
     return json.dumps(
         {
@@ -693,39 +661,36 @@ def _agent_sdk_steps(tool_runs: list[AgentToolRun], ranked: list[RankedDocument]
 
 
 def _merge_tool_outputs(tool_outputs: list[tuple[str, list[RankedDocument]]], query: str, limit: int) -> list[RankedDocument]:
-    merged: dict[int, RankedDocument] = {}
     tool_weights = {
         AgentToolName.KEYWORD: 1.0,
         AgentToolName.SEMANTIC: 0.95,
         AgentToolName.TAGS: 0.35,
         AgentToolName.CATEGORIES: 0.4,
     }
+    documents: dict[int, Document] = {}
+    reasons: dict[int, list[str]] = {}
     for tool_name, rows in tool_outputs:
-        tool_weight = tool_weights.get(tool_name, 0.5)
-        for rank, row in enumerate(rows):
-            score = max(0.0, row.score) * tool_weight + max(0.0, (len(rows) - rank) / max(1, len(rows))) * 0.04 * tool_weight
-            reason = f"{tool_name.value}: {row.reason}"
-            existing = merged.get(row.document.id)
-            if existing is None or score > existing.score:
-                merged[row.document.id] = RankedDocument(document=row.document, score=score, reason=reason)
-            else:
-                merged[row.document.id] = RankedDocument(
-                    document=existing.document,
-                    score=existing.score + min(0.08, score * 0.18),
-                    reason=f"{existing.reason}; {reason}",
-                )
+        for row in rows:
+            documents.setdefault(row.document.id, row.document)
+            reasons.setdefault(row.document.id, []).append(f"{tool_name.value}: {row.reason}")
+    fused = reciprocal_rank_fusion(
+        [[row.document.id for row in rows if row.score > 0] for _tool_name, rows in tool_outputs],
+        [tool_weights.get(tool_name, 0.5) for tool_name, _rows in tool_outputs],
+    )
 
     saved_ids = search_dao.get_favorited_document_ids()
     dismissed_ids = search_dao.get_dismissed_document_ids()
     adjusted = [
         RankedDocument(
-            document=row.document,
-            score=row.score + (0.08 if row.document.id in saved_ids else 0.0) - (0.18 if row.document.id in dismissed_ids else 0.0),
-            reason=row.reason,
+            document=documents[document_id],
+            score=score
+            + (search_dao.FAVORITE_SEARCH_BONUS if document_id in saved_ids else 0.0)
+            - (search_dao.DISMISSED_SEARCH_PENALTY if document_id in dismissed_ids else 0.0),
+            reason="; ".join(reasons[document_id]),
         )
-        for row in merged.values()
-        if row.score > 0.02
+        for document_id, score in fused.items()
     ]
+    adjusted = [row for row in adjusted if row.score > MIN_AGENT_MERGE_SCORE]
     adjusted.sort(key=lambda item: item.score, reverse=True)
     candidate_pool = _rerank_candidates(query, adjusted[: max(limit * 3, 24)])
     return _dedupe_ranked_documents(_expand_with_graph_neighbors(candidate_pool[:limit], limit))[:limit]
@@ -740,82 +705,119 @@ def _keyword_search(query_terms: set[str], documents: list[Document], *, limit:
 
 
 def _semantic_search(query: str, documents: list[Document], *, limit: int) -> list[RankedDocument]:
-    query_vector = embed_text(query)
+    return _semantic_search_vector(_query_vector(query), documents, limit=limit)
+
+
+def _query_vector(query: str) -> list[float] | None:
+    """Embed a query with the model the corpus is currently served from."""
+    model = embeddings_dao.serving_model_name()
+    vector = embed_text_for_model(query, model)
+    if vector is None:
+        logger.warning("query embedding with %s is unavailable; semantic scores are skipped", model)
+    return vector
+
+
+def _semantic_search_vector(query_vector: list[float] | None, documents: list[Document], *, limit: int) -> list[RankedDocument]:
+    if not query_vector:
+        return []
     vector_rows = search_dao.vector_search_documents(query_vector, limit=limit)
     if vector_rows:
+        # Prefer the caller's preloaded instances; rows from a worker session are detached.
+        docs_by_id = {document.id: document for document in documents}
         return [
-            RankedDocument(document=document, score=similarity, reason=f"pgvector cosine {similarity:.2f}")
+            RankedDocument(document=docs_by_id.get(document.id, document), score=similarity, reason=f"pgvector cosine {similarity:.2f}")
             for document, similarity in vector_rows
             if similarity > 0.04
         ]
-    rows: list[RankedDocument] = []
-    for document in documents:
-        if not document.embedding_vector:
-            continue
-        semantic = cosine(query_vector, loads_embedding(document.embedding_vector))
-        if semantic > 0.04:
-            rows.append(RankedDocument(document=document, score=semantic, reason=f"embedding cosine {semantic:.2f}"))
-    rows.sort(key=lambda item: item.score, reverse=True)
-    return rows[:limit]
+    scores = _document_cosines(query_vector, documents)
+    return [
+        RankedDocument(document=documents[index], score=float(scores[index]), reason=f"embedding cosine {scores[index]:.2f}")
+        for index in top_k(scores, limit, min_score=0.04)
+    ]
+
+
+def _document_cosines(query_vector: list[float], documents: list[Document]) -> np.ndarray:
+    """Score every document's stored vector against the query in one matrix product."""
+    matrix, _present = stack_vectors(
+        [
+            None if document.embedding_vector is None else loads_embedding_array(document.embedding_vector)
+            for document in documents
+        ],
+        len(query_vector),
+    )
+    return cosine_scores(query_vector, matrix)
 
 
-def _tag_search(tag_terms: set[str], documents: list[Document], *, limit: int) -> list[RankedDocument]:
+def _tag_search(tag_terms: set[str], documents_by_id: Mapping[int, Document], *, limit: int) -> list[RankedDocument]:
     if not tag_terms:
         return []
-    docs_by_id = {document.id: document for document in documents}
-    document_ids = list(docs_by_id)
-    rows: dict[int, RankedDocument] = {}
-    for document in documents:
-        topics = {topic.lower() for topic in document.topics or []}
-        overlap = tag_terms & topics
-        if overlap:
-            rows[document.id] = RankedDocument(document=document, score=0.28 + 0.12 * (len(overlap) / max(1, len(tag_terms))), reason=f"topic match: {', '.join(sorted(overlap))}")
-    session = db.current_session()
-    tag_rows = session.execute(
-        select(DocumentTag.document_id, Tag.name, Tag.slug)
-        .join(Tag, Tag.id == DocumentTag.tag_id)
-        .where(DocumentTag.document_id.in_(document_ids))
-    ).all()
-    for document_id, name, slug in tag_rows:
-        terms = {str(name).lower(), str(slug).lower()}
-        overlap = tag_terms & terms
-        if not overlap or document_id not in docs_by_id:
-            continue
-        existing = rows.get(document_id)
-        score = 0.38 + 0.12 * (len(overlap) / max(1, len(tag_terms)))
-        reason = f"tag match: {', '.join(sorted(overlap))}"
-        rows[document_id] = RankedDocument(document=docs_by_id[document_id], score=max(score, existing.score if existing else 0.0), reason=reason)
-    return sorted(rows.values(), key=lambda item: item.score, reverse=True)[:limit]
+    postings = current_posting_lists()
+    topic_terms = {topics_dao.topic_slug(term) for term in tag_terms}
+    tag_slugs = {
+        term: slug for term in tag_terms if postings.tag_matches_term(slug := slugify_tag_name(term), term)
+    }
+    topic_ids, topic_counts = postings.topics.match_counts(topic_terms)
+    tag_ids, tag_counts = postings.tags.match_counts(set(tag_slugs.values()))
+    document_ids = np.union1d(topic_ids, tag_ids)
+    scale = 0.12 / max(1, len(tag_terms))
+    scores = np.zeros(len(document_ids))
+    scores[np.searchsorted(document_ids, topic_ids)] = 0.28 + scale * topic_counts
+    tagged = np.searchsorted(document_ids, tag_ids)
+    scores[tagged] = np.maximum(scores[tagged], 0.38 + scale * tag_counts)
+    rows: list[RankedDocument] = []
+    for document_id, score in _top_documents(document_ids, scores, documents_by_id, limit=limit):
+        tag_overlap = {term for term, slug in tag_slugs.items() if slug in postings.tags.by_document.get(document_id, ())}
+        if tag_overlap:
+            reason = f"tag match: {', '.join(sorted(tag_overlap))}"
+        else:
+            reason = f"topic match: {', '.join(sorted(topic_terms & postings.topics.by_document.get(document_id, frozenset())))}"
+        rows.append(RankedDocument(document=documents_by_id[document_id], score=score, reason=reason))
+    return rows
 
 
-def _category_search(category_terms: set[str], documents: list[Document], *, limit: int) -> list[RankedDocument]:
+def _category_search(category_terms: set[str], documents_by_id: Mapping[int, Document], *, limit: int) -> list[RankedDocument]:
     if not category_terms:
         return []
-    docs_by_id = {document.id: document for document in documents}
-    document_ids = list(docs_by_id)
-    rows: dict[int, RankedDocument] = {}
-    for document in documents:
-        category = str(document.category.value if hasattr(document.category, "value") else document.category).lower()
-        if category in category_terms:
-            rows[document.id] = RankedDocument(document=document, score=0.42, reason=f"document category: {category}")
-    session = db.current_session()
-    category_rows = session.execute(
-        select(DocumentCategoryAssignment.document_id, Category.slug, Category.name)
-        .join(Category, Category.id == DocumentCategoryAssignment.category_id)
-        .where(DocumentCategoryAssignment.document_id.in_(document_ids))
-    ).all()
-    for document_id, slug, name in category_rows:
-        terms = {str(slug).lower(), str(name).lower()}
-        overlap = category_terms & terms
-        if not overlap or document_id not in docs_by_id:
-            continue
-        rows[document_id] = RankedDocument(document=docs_by_id[document_id], score=0.48, reason=f"category match: {', '.join(sorted(overlap))}")
-    return sorted(rows.values(), key=lambda item: item.score, reverse=True)[:limit]
-
-
-def _tag_query_terms(query_terms: set[str], documents: list[Document]) -> set[str]:
-    known_topics = {topic.lower() for document in documents for topic in (document.topics or [])}
-    return {term for term in query_terms if term in known_topics}
+    postings = current_posting_lists()
+    category_slugs = {term: slug for term in category_terms if (slug := postings.category_slug_for_term(term))}
+    column_ids, _counts = postings.document_categories.match_counts(category_terms)
+    assigned_ids, _counts = postings.categories.match_counts(set(category_slugs.values()))
+    document_ids = np.union1d(column_ids, assigned_ids)
+    scores = np.zeros(len(document_ids))
+    scores[np.searchsorted(document_ids, column_ids)] = 0.42
+    scores[np.searchsorted(document_ids, assigned_ids)] = 0.48
+    rows: list[RankedDocument] = []
+    for document_id, score in _top_documents(document_ids, scores, documents_by_id, limit=limit):
+        overlap = {term for term, slug in category_slugs.items() if slug in postings.categories.by_document.get(document_id, ())}
+        if overlap:
+            reason = f"category match: {', '.join(sorted(overlap))}"
+        else:
+            reason = f"document category: {next(iter(postings.document_categories.by_document[document_id]))}"
+        rows.append(RankedDocument(document=documents_by_id[document_id], score=score, reason=reason))
+    return rows
+
+
+def _top_documents(
+    document_ids: np.ndarray,
+    scores: np.ndarray,
+    documents_by_id: Mapping[int, Document],
+    *,
+    limit: int,
+) -> list[tuple[int, float]]:
+    """Return the best-scoring ids present in the tool's corpus with their scores, ties broken by id."""
+    chosen: list[tuple[int, float]] = []
+    for index in np.lexsort((document_ids, -scores)):
+        document_id = int(document_ids[index])
+        if document_id in documents_by_id:
+            chosen.append((document_id, float(scores[index])))
+            if len(chosen) >= limit:
+                break
+    return chosen
+
+
+def _tag_query_terms(query_terms: set[str]) -> set[str]:
+    topics = current_posting_lists().topics
+    return {term for term in query_terms if topics_dao.topic_slug(term) == term and topics.document_frequency(term)}
 
 
 def _category_query_terms(query_terms: set[str]) -> set[str]:
@@ -895,27 +897,6 @@ def _top_unique_documents(groups: list[list[RankedDocument]], *, limit: int) ->
     return documents
 
 
-def _candidate_topic_terms(documents: list[Document], *, max_terms: int) -> set[str]:
-    counts: dict[str, int] = {}
-    for document in documents:
-        for topic in document.topics or []:
-            normalized = topic.strip().lower()
-            if len(normalized) < 3:
-                continue
-            counts[normalized] = counts.get(normalized, 0) + 1
-    return {term for term, _count in sorted(counts.items(), key=lambda item: item[1], reverse=True)[:max_terms]}
-
-
-def _candidate_category_terms(documents: list[Document], *, max_terms: int) -> set[str]:
-    counts: dict[str, int] = {}
-    for document in documents:
-        category = str(document.category.value if hasattr(document.category, "value") else document.category).lower()
-        if category == "unknown":
-            continue
-        counts[category] = counts.get(category, 0) + 1
-    return {term for term, _count in sorted(counts.items(), key=lambda item: item[1], reverse=True)[:max_terms]}
-
-
 def _rerank_candidates(query: str, candidates: list[RankedDocument]) -> list[RankedDocument]:
     if not USE_LLM_RERANKER or len(candidates) <= 1:
         return candidates
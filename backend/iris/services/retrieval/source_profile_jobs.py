@@ -0,0 +1,140 @@
+"""Queue and run source profile generation off the crawl path.
+
+Crawls and the profile API only enqueue: the source's analysis row is marked
+pending with the input fingerprint, so repeated requests for unchanged input
+coalesce onto one job. Workers claim queued rows, run the LLM calls in threads
+with bounded concurrency, and persist results on the caller's session.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from iris.dao import db
+from iris.dao import source_profiles as profile_dao
+from iris.models import Source, SourceProfileAnalysis
+from iris.schemas.enums import SourceProfileAnalysisStatus
+from iris.schemas.source_profiles import ProfileInput, SourceProfileJobResult
+from iris.services.common.config import SOURCE_PROFILE_JOB_CONCURRENCY, SOURCE_PROFILE_JOB_STALE_SECONDS
+from iris.services.retrieval.source_profiles import (
+    analyze_profile,
+    build_profile_input,
+    normalize_profile_payload,
+    store_profile_result,
+)
+
+
+logger = logging.getLogger(__name__)
+_drain_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class _Job:
+    analysis: SourceProfileAnalysis
+    claimed_fingerprint: str | None
+    profile_input: ProfileInput
+
+
+@dataclass(frozen=True)
+class _Outcome:
+    payload: dict | None
+    error: str | None
+
+
+def enqueue_source_profile(source: Source, *, force: bool = False) -> SourceProfileAnalysis:
+    """Queue profile generation unless an identical job is queued or already succeeded."""
+    profile_input = build_profile_input(source, profile_dao.get_documents_for_profile(source.id))
+    existing = profile_dao.get_analysis(source.id)
+    if existing and existing.input_fingerprint == profile_input.fingerprint:
+        if existing.queued_at is not None and existing.status in (
+            SourceProfileAnalysisStatus.PENDING,
+            SourceProfileAnalysisStatus.RUNNING,
+        ):
+            return existing
+        if existing.status == SourceProfileAnalysisStatus.SUCCEEDED and not force:
+            return existing
+    return profile_dao.enqueue_analysis(source, fingerprint=profile_input.fingerprint)
+
+
+def run_source_profile_jobs(
+    *,
+    limit: int | None = None,
+    concurrency: int = SOURCE_PROFILE_JOB_CONCURRENCY,
+) -> SourceProfileJobResult:
+    """Run queued profile jobs until the queue is empty or ``limit`` jobs were claimed.
+
+    Each finished job commits on its own, so a crash loses at most the jobs in
+    flight; those are reclaimed once their claim goes stale.
+    """
+    session = db.current_session()
+    counters = {"claimed": 0, "succeeded": 0, "failed": 0, "superseded": 0}
+    concurrency = max(1, concurrency)
+
+    def claim(slots: int) -> list[_Job]:
+        if limit is not None:
+            slots = min(slots, limit - counters["claimed"])
+        if slots <= 0:
+            return []
+        stale_before = datetime.now(timezone.utc) - timedelta(seconds=SOURCE_PROFILE_JOB_STALE_SECONDS)
+        claimed = profile_dao.claim_queued_analyses(limit=slots, stale_before=stale_before)
+        session.commit()
+        counters["claimed"] += len(claimed)
+        return [
+            _Job(
+                analysis=analysis,
+                claimed_fingerprint=analysis.input_fingerprint,
+                profile_input=build_profile_input(analysis.source, profile_dao.get_documents_for_profile(analysis.source_id)),
+            )
+            for analysis in claimed
+        ]
+
+    def finish(job: _Job, outcome: _Outcome) -> None:
+        analysis = job.analysis
+        session.refresh(analysis)
+        if analysis.status != SourceProfileAnalysisStatus.RUNNING or analysis.input_fingerprint != job.claimed_fingerprint:
+            # Re-queued with newer input while this job ran; the newer job replaces it.
+            counters["superseded"] += 1
+            return
+        stored = store_profile_result(analysis.source, job.profile_input, payload=outcome.payload, error=outcome.error)
+        counters["succeeded" if stored.status == SourceProfileAnalysisStatus.SUCCEEDED else "failed"] += 1
+        logger.info("source profile job source=%s status=%s", analysis.source.canonical_domain, stored.status)
+
+    async def drive() -> None:
+        in_flight: dict[asyncio.Task, _Job] = {}
+        for job in claim(concurrency):
+            in_flight[asyncio.create_task(asyncio.to_thread(_analyze, job.profile_input))] = job
+        while in_flight:
+            done, _pending = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                finish(in_flight.pop(task), task.result())
+                session.commit()
+            for job in claim(concurrency - len(in_flight)):
+                in_flight[asyncio.create_task(asyncio.to_thread(_analyze, job.profile_input))] = job
+
+    asyncio.run(drive())
+    return SourceProfileJobResult(**counters)
+
+
+def drain_source_profile_jobs() -> SourceProfileJobResult | None:
+    """Drain the queue in a fresh session unless this process is already draining it."""
+    if not _drain_lock.acquire(blocking=False):
+        return None
+    try:
+        with db.session_scope():
+            return run_source_profile_jobs()
+    except Exception:
+        logger.exception("source profile job drain failed")
+        return None
+    finally:
+        _drain_lock.release()
+
+
+def _analyze(profile_input: ProfileInput) -> _Outcome:
+    try:
+        return _Outcome(payload=normalize_profile_payload(analyze_profile(profile_input), profile_input), error=None)
+    except Exception as exc:
+        return _Outcome(payload=None, error=str(exc))
@@ -81,26 +81,21 @@ def generate_source_profile(source: Source, *, force: bool = False) -> SourcePro
         return existing
 
     try:
-        payload = analyze_profile(profile_input)
-        payload = normalize_profile_payload(payload, profile_input)
-        return profile_dao.upsert_analysis(
-            source,
-            status=SourceProfileAnalysisStatus.SUCCEEDED,
-            display_name=payload.get("display_name"),
-            bio=payload.get("bio"),
-            audiences=payload.get("audiences"),
-            themes=payload.get("themes"),
-            writing_style=payload.get("writing_style"),
-            strong_takes=payload.get("opinions") or payload.get("strong_takes"),
-            public_links=payload.get("public_links"),
-            public_contact=payload.get("public_contact"),
-            caveats=payload.get("caveats"),
-            scraped_facts=profile_input.scraped_facts,
-            model=source_profile_model_label(),
-            input_fingerprint=profile_input.fingerprint,
-            error=None,
-        )
+        payload = normalize_profile_payload(analyze_profile(profile_input), profile_input)
     except Exception as exc:
+        return store_profile_result(source, profile_input, payload=None, error=str(exc))
+    return store_profile_result(source, profile_input, payload=payload)
+
+
+def store_profile_result(
+    source: Source,
+    profile_input: ProfileInput,
+    *,
+    payload: dict | None,
+    error: str | None = None,
+) -> SourceProfileAnalysis:
+    """Persist a normalized profile payload, or a failure when ``payload`` is None."""
+    if payload is None:
         return profile_dao.upsert_analysis(
             source,
             status=SourceProfileAnalysisStatus.FAILED,
@@ -116,8 +111,25 @@ def generate_source_profile(source: Source, *, force: bool = False) -> SourcePro
             scraped_facts=profile_input.scraped_facts,
             model=source_profile_model_label(),
             input_fingerprint=profile_input.fingerprint,
-            error=str(exc),
+            error=error,
         )
+    return profile_dao.upsert_analysis(
+        source,
+        status=SourceProfileAnalysisStatus.SUCCEEDED,
+        display_name=payload.get("display_name"),
+        bio=payload.get("bio"),
+        audiences=payload.get("audiences"),
+        themes=payload.get("themes"),
+        writing_style=payload.get("writing_style"),
+        strong_takes=payload.get("opinions") or payload.get("strong_takes"),
+        public_links=payload.get("public_links"),
+        public_contact=payload.get("public_contact"),
+        caveats=payload.get("caveats"),
+        scraped_facts=profile_input.scraped_facts,
+        model=source_profile_model_label(),
+        input_fingerprint=profile_input.fingerprint,
+        error=None,
+    )
 
 
 def build_profile_input(source: Source, documents: list[Document]) -> ProfileInput:
@@ -92,6 +92,15 @@ def test_admin_query_and_user_inspection_are_admin_only(session, monkeypatch):
     assert queries.json()["items"][0]["content"] == "What should I build this weekend?"
     assert queries.json()["items"][0]["answer_preview"] == "Try a tiny personal utility."
     assert queries.json()["items"][0]["step_count"] == 1
+    assert queries.json()["total"] == 1
+
+    matched = client.get("/api/admin/queries", params={"q": "build weekend"}, headers=admin_headers)
+    assert [item["content"] for item in matched.json()["items"]] == ["What should I build this weekend?"]
+    assert matched.json()["total"] == 1
+    by_email = client.get("/api/admin/queries", params={"q": "reader@"}, headers=admin_headers)
+    assert by_email.json()["total"] == 1
+    missed = client.get("/api/admin/queries", params={"q": "utility"}, headers=admin_headers)
+    assert missed.json()["items"] == [] and missed.json()["total"] == 0
 
     users = client.get("/api/admin/users", params={"q": "reader"}, headers=admin_headers)
     assert users.status_code == 200
@@ -120,3 +129,133 @@ def test_admin_query_and_user_inspection_are_admin_only(session, monkeypatch):
         "user",
         "assistant",
     ]
+
+
+def test_metrics_snapshot_tracks_commits_and_reconciles(session):
+    from sqlalchemy import text
+
+    from iris.dao import admin, metrics
+    from iris.dao.documents import upsert_document
+    from iris.dao.links import upsert_link
+    from iris.dao.sources import get_or_create_source
+
+    metrics.reset_metrics()
+    assert admin.get_health_counts().documents == 0
+    reconciled_at = admin.get_health_counts().counts_as_of
+
+    source = get_or_create_source("https://metrics.test", status="indexed")
+    document = upsert_document(
+        source=source, url="https://metrics.test/essay", document_type="essay", crawl_status="fetched",
+        title="Essay", author=None, published_at=None, extracted_text="text", summary="Summary.",
+        topics=[], embedding=None, content_hash="metrics-essay",
+    )
+    upsert_link(source_document=document, target_url="https://metrics.test/essay", anchor_text=None, context=None)
+    assert admin.get_health_counts().documents == 0
+    session.commit()
+
+    overview = admin.get_admin_overview()
+    assert overview.counts_as_of == reconciled_at
+    assert overview.totals["documents"] == 1
+    assert overview.totals["essay_documents"] == 1
+    assert overview.totals["links"] == 1
+    assert overview.totals["resolved_links"] == 1
+    assert overview.source_statuses == {"indexed": 1}
+    assert overview.document_types == {"essay/fetched": 1}
+
+    source.status = "failed"
+    get_or_create_source("https://rolled-back.test")
+    session.flush()
+    session.rollback()
+    session.execute(text("UPDATE sources SET status = 'failed'"))
+    session.commit()
+    assert admin.get_admin_overview().source_statuses == {"indexed": 1}
+
+    # While a reconcile is in flight, stale reads neither block nor start another.
+    reconciler = metrics._reconciler
+    with metrics._reconcile_lock:
+        assert metrics.get_metrics(max_age_seconds=0).source_statuses == {"indexed": 1}
+    assert metrics._reconciler is reconciler
+
+    # Otherwise the stale snapshot is served while one background thread recounts.
+    assert metrics.get_metrics(max_age_seconds=0).source_statuses == {"indexed": 1}
+    metrics._reconciler.join(timeout=5)
+    reconciled = metrics.get_metrics()
+    assert reconciled.source_statuses == {"failed": 1}
+    assert reconciled.reconciled_at > reconciled_at
+
+
+def test_ignoring_a_source_with_deleted_rows_updates_metrics(session):
+    from iris.dao import metrics
+    from iris.dao.documents import upsert_document
+    from iris.dao.links import upsert_link
+    from iris.dao.maintenance import set_source_ignored
+    from iris.dao.sources import get_or_create_source
+
+    def add_document(source, path, crawl_status="fetched"):
+        return upsert_document(
+            source=source, url=f"https://{source.canonical_domain}/{path}", document_type="essay", crawl_status=crawl_status,
+            title=path, author=None, published_at=None, extracted_text="text", summary="Summary.",
+            topics=[], embedding=None, content_hash=f"{source.canonical_domain}-{path}",
+        )
+
+    spam = get_or_create_source("https://spam.test", status="indexed")
+    kept = get_or_create_source("https://kept.test", status="indexed")
+    first = add_document(spam, "first")
+    second = add_document(spam, "second", crawl_status="pending")
+    other = add_document(kept, "other")
+    upsert_link(source_document=first, target_url=second.url, anchor_text=None, context=None)
+    upsert_link(source_document=first, target_url="https://elsewhere.test/a", anchor_text=None, context=None)
+    upsert_link(source_document=other, target_url=first.url, anchor_text=None, context=None)
+    upsert_link(source_document=other, target_url="https://elsewhere.test/b", anchor_text=None, context=None)
+    session.commit()
+    metrics.reset_metrics()
+    assert metrics.get_metrics().totals["links"] == 4
+
+    _source, deleted = set_source_ignored("spam.test", reason="spam", delete_rows=True)
+    session.commit()
+
+    assert deleted == 2
+    counts = metrics.get_metrics()
+    assert counts.document_types == {"essay/fetched": 1}
+    assert counts.source_statuses == {"ignored": 1, "indexed": 1}
+    assert (counts.totals["links"], counts.totals["resolved_links"]) == (1, 0)
+    exact = metrics._view(metrics.reconcile_metrics())
+    assert (counts.totals, counts.document_types) == (exact.totals, exact.document_types)
+
+
+def test_read_sessions_reject_writes_and_pools_report_checkout_waits(session, tmp_path):
+    import pytest
+    from sqlalchemy import create_engine, exc, select
+
+    from iris.dao import db, pool
+    from iris.dao.sources import get_or_create_source
+    from iris.models import Source
+
+    get_or_create_source("https://read.test", status="indexed")
+    session.commit()
+    with db.read_session_scope() as read_session:
+        assert db.current_session() is read_session
+        source = read_session.scalar(select(Source).where(Source.canonical_domain == "read.test"))
+        source.status = "failed"
+        with pytest.raises(db.ReadOnlySessionError):
+            read_session.flush()
+    assert db.current_session() is session
+
+    pool.reset_pool_metrics()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=pool.TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+        pool_logging_name="test",
+    )
+    pool.track_pool("test", engine.pool)
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+        (metrics,) = [item for item in pool.pool_metrics() if item.name == "test"]
+        assert (metrics.size, metrics.checked_out, metrics.checkouts, metrics.timeouts) == (1, 1, 1, 1)
+        assert metrics.wait_seconds_total >= 0.01
+    assert 'iris_db_pool_timeouts_total{pool="test"} 1' in pool.render_pool_prometheus()
+    engine.dispose()
@@ -1,3 +1,4 @@
+import sqlite3
 from datetime import datetime, timedelta, timezone
 
 from uuid import UUID
@@ -795,6 +796,123 @@ def test_agent_conversations_are_scoped_to_firebase_user(session, monkeypatch):
     assert first_history.json()[0]["uuid"] == first.json()["conversation_uuid"]
 
 
+def test_agent_conversation_search_is_ranked_and_keyset_paginated(session, monkeypatch):
+    from iris.dao import agent as agent_dao
+    from iris.dao.user_state import get_or_create_firebase_user
+    from iris.models import AgentConversation, AgentMessage, AgentMessageRole
+
+    headers = _bookshelf_auth(monkeypatch)
+    user = get_or_create_firebase_user(
+        FirebaseIdentity(uid="bookshelf-user", email="bookshelf@example.com", display_name="Bookshelf User")
+    )
+    contents = {
+        "Compiler notes": ["How do parsers recover from errors?", "Parsers resynchronise on statement boundaries."],
+        "Gardening": ["Which tomatoes grow well in shade?"],
+        "Language tooling": ["Recommend essays about incremental parsers for editors"],
+    }
+    for title, messages in contents.items():
+        conversation = AgentConversation(user_id=user.id, title=title)
+        session.add(conversation)
+        session.flush()
+        for index, content in enumerate(messages):
+            role = AgentMessageRole.USER if index % 2 == 0 else AgentMessageRole.ASSISTANT
+            session.add(AgentMessage(conversation_id=conversation.id, role=role, content=content))
+    session.commit()
+
+    client = TestClient(app)
+    first = client.get("/api/agent-conversations", params={"q": "parsers", "limit": 1}, headers=headers)
+    assert first.status_code == 200
+    assert [item["title"] for item in first.json()] == ["Compiler notes"]
+    assert first.json()[0]["message_count"] == 2
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/api/agent-conversations", params={"q": "parsers", "limit": 1, "cursor": cursor}, headers=headers)
+    assert [item["title"] for item in second.json()] == ["Language tooling"]
+    third = client.get(
+        "/api/agent-conversations",
+        params={"q": "parsers", "limit": 1, "cursor": second.headers["X-Next-Cursor"]},
+        headers=headers,
+    )
+    assert third.json() == []
+    assert "X-Next-Cursor" not in third.headers
+
+    assert [item["title"] for item in client.get(
+        "/api/agent-conversations", params={"q": "gardening"}, headers=headers
+    ).json()] == ["Gardening"]
+    recent = client.get("/api/agent-conversations", params={"limit": 2}, headers=headers)
+    older = client.get(
+        "/api/agent-conversations", params={"limit": 2, "cursor": recent.headers["X-Next-Cursor"]}, headers=headers
+    )
+    assert len({item["id"] for item in recent.json() + older.json()}) == 3
+    assert client.get("/api/agent-conversations", params={"cursor": "nope"}, headers=headers).status_code == 400
+
+    assert agent_dao.fts5_query('"shade" OR tomato-') == '"shade"* "OR"* "tomato"*'
+
+
+def test_agent_conversation_context_is_stored_incrementally_and_bounded(session):
+    from sqlalchemy import event
+
+    from iris.dao import agent as agent_dao
+    from iris.schemas.retrieval import AgentChatResult, RankedDocument
+    from iris.services.retrieval.conversation_context import estimate_tokens, fold_turns, render_context
+
+    source = get_or_create_source("https://context.test", status="indexed")
+    document = upsert_document(
+        source=source,
+        url="https://context.test/doc",
+        document_type="essay",
+        crawl_status="fetched",
+        title="Context result",
+        author=None,
+        published_at=None,
+        extracted_text="context result",
+        summary="Context result.",
+        topics=["context"],
+        embedding=dumps_embedding(embed_text("context result")),
+        content_hash="context-result",
+    )
+    conversation = None
+    for turn in range(5):
+        conversation, _user_message = agent_dao.start_agent_chat(
+            f"question {turn}", conversation_id=conversation.id if conversation else None
+        )
+        agent_dao.finish_agent_chat(
+            conversation,
+            AgentChatResult(
+                answer=f"answer {turn}",
+                results=[RankedDocument(document=document, score=1.0, reason="test")],
+                steps=[],
+            ),
+        )
+    session.commit()
+    assert len(conversation.context_turns) == 6
+    assert conversation.context_summary.splitlines()[:2] == [
+        "User asked: question 0",
+        f"Iris answered: answer 0 Cited: Context result (internal_ref={document.id})",
+    ]
+
+    conversation, user_message = agent_dao.start_agent_chat("question 5", conversation_id=conversation.id)
+    conversation_id, user_message_id = conversation.id, user_message.id
+    session.expire_all()
+    conversation = agent_dao.get_agent_conversation(conversation_id)
+    statements: list[str] = []
+    listener = lambda _conn, _cursor, statement, *_args: statements.append(statement)  # noqa: E731
+    event.listen(session.bind, "before_cursor_execute", listener)
+    try:
+        context = agent_dao.conversation_context(conversation, before_message_id=user_message_id)
+    finally:
+        event.remove(session.bind, "before_cursor_execute", listener)
+    assert len(statements) == 1
+    assert "User asked: question 1" in context
+    assert f"internal_ref={document.id}; title=Context result; source=context.test" in context
+    assert "answer 4" in context
+    assert "question 5" not in context
+
+    summary, turns = fold_turns(conversation.context_summary, [], [], token_budget=40, recent_turns=1)
+    assert estimate_tokens(render_context(summary, turns)) <= 60
+    assert summary is None or "question 0" not in summary
+
+
 def test_embedding_map_api_projects_embedded_documents(session):
     source = get_or_create_source("https://map.test", status="indexed")
     for index, text in enumerate(["systems design", "personal knowledge", "search ranking"], start=1):
@@ -1182,3 +1300,107 @@ def test_documents_api_can_scope_to_crawl_job_and_index_run(session):
     assert [item["title"] for item in job_response.json()["items"]] == ["Inside job one"]
     assert run_response.status_code == 200
     assert {item["title"] for item in run_response.json()["items"]} == {"Inside job one", "Inside job two"}
+
+
+class _ByteCountingCursor(sqlite3.Cursor):
+    fetched_bytes = 0
+
+    def fetchone(self):
+        row = super().fetchone()
+        self._count([row] if row is not None else [])
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(size if size is not None else self.arraysize)
+        self._count(rows)
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._count(rows)
+        return rows
+
+    @classmethod
+    def _count(cls, rows) -> None:
+        for row in rows:
+            cls.fetched_bytes += sum(len(value) if isinstance(value, (str, bytes)) else 8 for value in row if value is not None)
+
+
+class _ByteCountingConnection(sqlite3.Connection):
+    def cursor(self, factory=_ByteCountingCursor):
+        return super().cursor(factory)
+
+
+def test_hot_list_endpoints_do_not_fetch_article_text(monkeypatch):
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+    from sqlalchemy.pool import StaticPool
+
+    from iris.dao import bookshelf as bookshelf_dao
+    from iris.dao import db, social as social_dao
+    from iris.dao.user_state import get_or_create_local_user
+    from iris.models import User
+    from iris.routes import api as api_routes
+
+    engine = create_engine(
+        "sqlite://",
+        future=True,
+        connect_args={"check_same_thread": False, "factory": _ByteCountingConnection},
+        poolclass=StaticPool,
+    )
+    db.engine = engine
+    db.SessionLocal.configure(bind=engine)
+    db.Base.metadata.create_all(engine)
+    monkeypatch.setattr(api_routes, "init_db", lambda: None)
+    article = " ".join(["coordination"] * 8000)
+    with Session(engine, future=True) as session, db.bind_session(session):
+        source = get_or_create_source("https://heavy.test", status="indexed")
+        documents = [
+            upsert_document(
+                source=source,
+                url=f"https://heavy.test/{index}",
+                document_type="essay",
+                crawl_status="fetched",
+                title=f"Heavy {index}",
+                author="Heavy Author",
+                published_at=None,
+                extracted_text=article,
+                summary="Small teams and coordination.",
+                topics=["teams"],
+                embedding=dumps_embedding(embed_text(f"small teams {index}")),
+                content_hash=f"heavy-{index}",
+            )
+            for index in range(6)
+        ]
+        for document in documents[1:]:
+            upsert_link(source_document=documents[0], target_url=document.url, anchor_text="next", context=None)
+        viewer = get_or_create_local_user()
+        friend = User(email="friend@heavy.test", display_name="Friend")
+        session.add(friend)
+        session.flush()
+        social_dao.accept_friendship(friend, social_dao.request_friendship(viewer, friend).id)
+        for document in documents:
+            bookshelf_dao.save_document(viewer, document)
+            bookshelf_dao.save_document(friend, document)
+        session.commit()
+
+    client = TestClient(app)
+    budgets = {
+        "/api/documents": ("items", 4_000),
+        "/api/bookshelf": ("items", 4_000),
+        "/api/friends/feed": ("items", 4_000),
+        "/api/graph": ("nodes", 4_000),
+        "/api/documents/search?q=teams": ("results", 4_000),
+        # Ranking scans embeddings and a bounded text excerpt, never whole articles.
+        "/api/search?q=small+teams": ("results", 8_000),
+    }
+    for path, (key, bytes_per_row) in budgets.items():
+        _ByteCountingCursor.fetched_bytes = 0
+        response = client.get(path)
+        assert response.status_code == 200, path
+        rows = len(response.json()[key])
+        assert rows >= len(documents), path
+        assert _ByteCountingCursor.fetched_bytes / rows < bytes_per_row, (path, _ByteCountingCursor.fetched_bytes / rows)
+
+    assert len(article) > 80_000
+    engine.dispose()
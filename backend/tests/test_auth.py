@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from types import SimpleNamespace
 
 import pytest
@@ -7,7 +8,9 @@ from fastapi import HTTPException
 from firebase_admin import auth
 from google.auth.exceptions import DefaultCredentialsError
 
+from iris.dao.user_state import forget_firebase_users, get_or_create_firebase_user
 from iris.services import auth as auth_service
+from iris.services.auth import FirebaseIdentity
 
 
 def _raise(error: Exception):
@@ -134,3 +137,55 @@ def test_warmup_handles_missing_credentials(monkeypatch, caplog):
     auth_service.warm_firebase_token_verifier()
 
     assert "Firebase application credentials are unavailable during warmup" in caplog.text
+
+
+def test_verified_identities_are_cached_until_token_expiry(monkeypatch):
+    calls = []
+    expires = {"fresh": time.time() + 3600, "stale": time.time() - 1}
+
+    def verify(token, **_kwargs):
+        calls.append(token)
+        return {"uid": f"uid-{token}", "email": f"{token}@example.com", "exp": expires[token]}
+
+    monkeypatch.setattr(auth_service.auth, "verify_id_token", verify)
+    monkeypatch.setattr(auth_service, "_firebase_app", lambda: None)
+    auth_service.reset_auth_caches()
+
+    try:
+        first = auth_service.verify_firebase_token("fresh")
+        second = auth_service.verify_firebase_token("fresh")
+        auth_service.verify_firebase_token("stale")
+        auth_service.verify_firebase_token("stale")
+        metrics = auth_service.auth_metrics()
+    finally:
+        auth_service.reset_auth_caches()
+
+    assert first == second == FirebaseIdentity(uid="uid-fresh", email="fresh@example.com")
+    assert calls == ["fresh", "stale", "stale"]
+    assert metrics.identity_cache_hits == 1
+    assert metrics.identity_cache_misses == 3
+    assert metrics.identity_cache_size == 1
+
+
+def test_firebase_user_lookup_is_cached_and_skips_unchanged_profile_writes(session):
+    identity = FirebaseIdentity(uid="firebase-reader", email="reader@example.com", display_name="Reader")
+    auth_service.reset_auth_caches()
+    forget_firebase_users()
+
+    try:
+        created = get_or_create_firebase_user(identity)
+        session.commit()
+        again = get_or_create_firebase_user(identity)
+        dirty = set(session.dirty)
+        renamed = get_or_create_firebase_user(FirebaseIdentity(uid="firebase-reader", email="reader@example.com", display_name="Renamed"))
+        metrics = auth_service.auth_metrics()
+    finally:
+        auth_service.reset_auth_caches()
+        forget_firebase_users()
+
+    assert again.id == created.id
+    assert dirty == set()
+    assert renamed.id == created.id
+    assert renamed.display_name == "Renamed"
+    assert metrics.user_cache_hits == 2
+    assert metrics.user_cache_misses == 1
@@ -1,19 +1,31 @@
 from __future__ import annotations
 
 import asyncio
+import json
+import math
 import os
 import subprocess
 import sys
+import time
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+import pytest
+from sqlalchemy import text
+
+from iris.backfills.binary_embeddings import convert_embeddings_to_binary
 from iris.backfills.document_crawl_job_fk import migrate_document_crawl_job_fk
-from iris.backfills import document_summaries, metadata_embeddings
+from iris.backfills import analysis_batches, document_summaries, metadata_embeddings, reembed
+from iris.dao import embeddings as embeddings_dao
+from iris.dao.backfills import get_backfill_checkpoint
 from iris.dao.documents import upsert_document
+from iris.dao.links import upsert_link
 from iris.dao.sources import get_or_create_source
-from iris.models import CrawlJob
+from iris.models import AnalysisBatch, AnalysisBatchMode, AnalysisBatchStatus, CrawlJob, Document, DocumentEmbedding, Source
 from iris.schemas.ingestion import DocumentAnalysis
-from iris.services.retrieval import source_profiles
+from iris.services.ingestion.analysis_batch_transport import LocalBatchTransport
+from iris.services.ingestion.embedding import LOCAL_EMBEDDING_MODEL, dumps_embedding, embed_text_local, loads_embedding
+from iris.services.retrieval import source_profile_jobs, source_profiles
 
 
 def test_metadata_backfill_respects_active_documents(monkeypatch):
@@ -160,6 +172,63 @@ def test_source_profile_normalization_filters_controlled_lists():
     ]
 
 
+def test_source_profile_jobs_coalesce_and_run_with_bounded_concurrency(session, monkeypatch):
+    sources = []
+    for index in range(3):
+        source = get_or_create_source(f"https://profile-{index}.test", status="indexed")
+        upsert_document(
+            source=source,
+            url=f"https://profile-{index}.test/post",
+            document_type="essay",
+            crawl_status="fetched",
+            title=f"Essay {index}",
+            author=None,
+            published_at=None,
+            extracted_text="A considered essay about writing.",
+            summary="Writing.",
+            topics=["writing"],
+            embedding=None,
+            content_hash=f"profile-{index}",
+        )
+        sources.append(source)
+    session.commit()
+    active = 0
+    peak = 0
+
+    def fake_analyze(profile_input):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        time.sleep(0.05)
+        active -= 1
+        if profile_input.domain == "profile-2.test":
+            raise RuntimeError("provider timeout")
+        return {"display_name": profile_input.domain, "bio": "Writes essays."}
+
+    monkeypatch.setattr(source_profile_jobs, "analyze_profile", fake_analyze)
+
+    first = source_profile_jobs.enqueue_source_profile(sources[0])
+    queued_at = first.queued_at
+    again = source_profile_jobs.enqueue_source_profile(sources[0], force=True)
+    assert again.id == first.id and again.queued_at == queued_at
+    for source in sources[1:]:
+        source_profile_jobs.enqueue_source_profile(source)
+    session.commit()
+
+    result = source_profile_jobs.run_source_profile_jobs(concurrency=2)
+
+    assert (result.claimed, result.succeeded, result.failed, result.superseded) == (3, 2, 1, 0)
+    assert peak == 2
+    analyses = [session.get(Source, source.id).profile_analysis for source in sources]
+    assert [analysis.status for analysis in analyses] == ["succeeded", "succeeded", "failed"]
+    assert analyses[0].display_name == "profile-0.test"
+    assert analyses[2].error == "provider timeout"
+    assert all(analysis.queued_at is None for analysis in analyses)
+    # Unchanged input after success is not queued again.
+    assert source_profile_jobs.enqueue_source_profile(sources[0]).queued_at is None
+    assert source_profile_jobs.run_source_profile_jobs().claimed == 0
+
+
 def test_summary_backfill_updates_only_summary(session, monkeypatch):
     source = get_or_create_source("https://summary-backfill.test", status="indexed")
     document = upsert_document(
@@ -212,16 +281,340 @@ def test_summary_backfill_updates_only_summary(session, monkeypatch):
     assert document.topics == ["old-topic"]
 
 
-def test_alembic_upgrade_head_creates_schema(tmp_path):
-    db_path = tmp_path / "alembic.db"
+class _Interrupted(BaseException):
+    pass
+
+
+def test_summary_backfill_commits_batches_and_resumes(session, monkeypatch):
+    source = get_or_create_source("https://resume-backfill.test", status="indexed")
+    documents = [
+        upsert_document(
+            source=source,
+            url=f"https://resume-backfill.test/post-{index}",
+            document_type="essay",
+            crawl_status="fetched",
+            title=f"Post {index}",
+            author=None,
+            published_at=None,
+            extracted_text=f"post body {index}",
+            summary="Old summary.",
+            topics=["resume"],
+            embedding=None,
+            content_hash=f"post-{index}",
+        )
+        for index in range(5)
+    ]
+    upsert_link(source_document=documents[0], target_url="https://elsewhere.test/a", anchor_text=None, context=None)
+    upsert_link(source_document=documents[0], target_url="https://elsewhere.test/b", anchor_text=None, context=None)
+    session.commit()
+    ids = [document.id for document in documents]
+    seen: list[tuple[str, int]] = []
+
+    async def crashing_analyze(**kwargs):
+        seen.append((kwargs["metadata_title"], kwargs["link_count"]))
+        if kwargs["metadata_title"] == "Post 3":
+            raise _Interrupted()
+        return DocumentAnalysis(title="ignored", summary=f"New {kwargs['metadata_title']}.", topics=[], category_slug=None, document_type="essay")
+
+    monkeypatch.setattr(document_summaries, "analyze_document_async", crashing_analyze)
+    with pytest.raises(_Interrupted):
+        document_summaries.backfill_document_summaries(
+            source_domain="resume-backfill.test",
+            max_attempts=1,
+            active_documents=1,
+            batch_size=2,
+        )
+    session.rollback()
+
+    checkpoint = get_backfill_checkpoint(document_summaries.SUMMARY_BACKFILL_NAME, "source=resume-backfill.test")
+    assert checkpoint.last_document_id == ids[1]
+    assert checkpoint.counters == {"checked": 2, "changed": 2}
+    assert checkpoint.finished_at is None
+    assert ("Post 0", 2) in seen
+    assert [session.get(Document, document_id).summary for document_id in ids] == [
+        "New Post 0.",
+        "New Post 1.",
+        "Old summary.",
+        "Old summary.",
+        "Old summary.",
+    ]
+
+    async def fake_analyze(**kwargs):
+        seen.append((kwargs["metadata_title"], kwargs["link_count"]))
+        return DocumentAnalysis(title="ignored", summary=f"New {kwargs['metadata_title']}.", topics=[], category_slug=None, document_type="essay")
+
+    monkeypatch.setattr(document_summaries, "analyze_document_async", fake_analyze)
+    seen.clear()
+    result = document_summaries.backfill_document_summaries(
+        source_domain="resume-backfill.test",
+        max_attempts=1,
+        active_documents=2,
+        batch_size=2,
+        resume=True,
+    )
+
+    session.expire_all()
+    checkpoint = get_backfill_checkpoint(document_summaries.SUMMARY_BACKFILL_NAME, "source=resume-backfill.test")
+    assert sorted(title for title, _ in seen) == ["Post 2", "Post 3", "Post 4"]
+    assert (result.checked, result.changed, result.failed) == (3, 3, 0)
+    assert checkpoint.last_document_id == ids[-1]
+    assert checkpoint.counters == {"checked": 5, "changed": 5}
+    assert checkpoint.finished_at is not None
+    assert all(session.get(Document, document_id).summary.startswith("New Post") for document_id in ids)
+
+
+def test_backfill_engine_reads_next_page_while_workers_run_and_resumes_failures(session):
+    import threading
+    from collections import Counter
+
+    from iris.backfills.engine import BackfillSpec, run_document_backfill
+    from iris.dao import maintenance as maintenance_dao
+
+    source = get_or_create_source("https://engine-backfill.test", status="indexed")
+    documents = [
+        upsert_document(
+            source=source,
+            url=f"https://engine-backfill.test/post-{index}",
+            document_type="essay",
+            crawl_status="fetched",
+            title=f"Post {index}",
+            author=None,
+            published_at=None,
+            extracted_text=f"post body {index}",
+            summary="Old summary.",
+            topics=[],
+            embedding=None,
+            content_hash=f"engine-post-{index}",
+        )
+        for index in range(4)
+    ]
+    session.commit()
+    ids = [document.id for document in documents]
+    workers_started = threading.Event()
+    overlapped: list[bool] = []
+    measure_overlap = True
+    failing = {ids[1]}
+
+    def fetch_page(after_id: int, size: int):
+        if after_id and measure_overlap:
+            # Only returns early if batch workers are running while this page is read.
+            overlapped.append(workers_started.wait(timeout=2))
+        return maintenance_dao.get_fetched_document_page(source_domain="engine-backfill.test", after_id=after_id, limit=size)
+
+    async def run_batch(items: list[int]) -> list[int]:
+        workers_started.set()
+        await asyncio.sleep(0.01)
+        workers_started.clear()
+        return items
+
+    def apply(document_id: int, document: Document, counters: Counter) -> None:
+        if document_id in failing:
+            counters["failed"] += 1
+        else:
+            document.summary = "New summary."
+
+    def spec() -> BackfillSpec:
+        return BackfillSpec(
+            name="engine-test",
+            scope="all",
+            fetch_page=fetch_page,
+            build_item=lambda document, _index, _link_count: document.id,
+            run_batch=run_batch,
+            apply=apply,
+            item_document_id=lambda document_id: document_id,
+            item_failed=lambda document_id: document_id in failing,
+        )
+
+    progress = run_document_backfill(spec(), batch_size=2)
+
+    assert progress.checked == 4
+    assert overlapped and all(overlapped)
+    checkpoint = get_backfill_checkpoint("engine-test", "all")
+    assert checkpoint.last_document_id == ids[0]
+    assert checkpoint.finished_at is None
+    session.expire_all()
+    assert [session.get(Document, document_id).summary for document_id in ids] == [
+        "New summary.",
+        "Old summary.",
+        "New summary.",
+        "New summary.",
+    ]
+
+    failing.clear()
+    measure_overlap = False
+    progress = run_document_backfill(spec(), batch_size=2, resume=True)
+
+    session.expire_all()
+    checkpoint = get_backfill_checkpoint("engine-test", "all")
+    assert progress.resumed_after_id == ids[0]
+    assert progress.checked == 3
+    assert checkpoint.last_document_id == ids[-1]
+    assert checkpoint.finished_at is not None
+    assert session.get(Document, ids[1]).summary == "New summary."
+
+
+def test_analysis_batches_prepare_submit_and_collect_resumably(session, tmp_path):
+    source = get_or_create_source("https://batch-analysis.test", status="indexed")
+    texts = [f"Post {index} argues a careful point about writing." for index in range(5)]
+    texts.append("카지노 토토 먹튀 " * 5)
+    documents = [
+        upsert_document(
+            source=source,
+            url=f"https://batch-analysis.test/post-{index}",
+            document_type="essay",
+            crawl_status="fetched",
+            title=f"Post {index}",
+            author=None,
+            published_at=None,
+            extracted_text=text,
+            summary="Old summary.",
+            topics=["batch"],
+            embedding=None,
+            content_hash=f"batch-{index}",
+        )
+        for index, text in enumerate(texts)
+    ]
+    session.commit()
+    ids = [document.id for document in documents]
+
+    def respond(body):
+        prompt = json.dumps(body)
+        if "Post 2 argues" in prompt:
+            raise RuntimeError("model refused")
+        title = next(f"Post {index}" for index in range(5) if f"Post {index} argues" in prompt)
+        return {"output_text": json.dumps({"title": title, "summary": f"New {title}.", "document_type": "essay"})}
+
+    first = analysis_batches.prepare_analysis_batches(
+        AnalysisBatchMode.SUMMARIES, source_domain="batch-analysis.test", limit=4, max_requests=2, directory=tmp_path
+    )
+    assert (first.batches, first.requests, first.decided_locally, first.last_document_id) == (2, 4, 0, ids[3])
+    rest = analysis_batches.prepare_analysis_batches(
+        AnalysisBatchMode.SUMMARIES, source_domain="batch-analysis.test", max_requests=2, directory=tmp_path
+    )
+    assert (rest.batches, rest.requests, rest.decided_locally) == (1, 1, 1)
+    request = json.loads(Path(session.get(AnalysisBatch, 1).request_path).read_text().splitlines()[0])
+    assert request["custom_id"] == f"doc-{ids[0]}"
+    assert request["url"] == "/v1/responses"
+
+    waiting = LocalBatchTransport(tmp_path / "provider")
+    assert analysis_batches.submit_analysis_batches(transport=waiting) == 3
+    assert analysis_batches.collect_analysis_batches(transport=waiting).pending == 3
+
+    answering = LocalBatchTransport(tmp_path / "provider", respond=respond)
+    result = analysis_batches.collect_analysis_batches(transport=answering)
+    assert (result.ingested_batches, result.checked, result.changed, result.failed) == (3, 5, 4, 1)
+
+    session.expire_all()
+    summaries = [session.get(Document, document_id).summary for document_id in ids]
+    assert summaries[:5] == ["New Post 0.", "New Post 1.", "Old summary.", "New Post 3.", "New Post 4."]
+    assert summaries[5] != "Old summary."
+    batches = session.query(AnalysisBatch).order_by(AnalysisBatch.id).all()
+    assert {batch.status for batch in batches} == {AnalysisBatchStatus.INGESTED}
+    assert batches[1].counters == {"decided_locally": 0, "checked": 2, "changed": 1, "failed": 1}
+
+    again = analysis_batches.prepare_analysis_batches(
+        AnalysisBatchMode.SUMMARIES, source_domain="batch-analysis.test", directory=tmp_path
+    )
+    assert again.batches == 0
+    assert analysis_batches.collect_analysis_batches(transport=answering).ingested_batches == 0
+
+
+def test_binary_embedding_conversion_rewrites_json_rows(session):
+    source = get_or_create_source("https://binary-embeddings.test", status="indexed")
+    vector = [math.cos(index) / 28 for index in range(1536)]
+    documents = [
+        upsert_document(
+            source=source,
+            url=f"https://binary-embeddings.test/{index}",
+            document_type="essay",
+            crawl_status="fetched",
+            title=f"Post {index}",
+            author=None,
+            published_at=None,
+            extracted_text="post",
+            summary="Post.",
+            topics=["binary"],
+            embedding=vector,
+            content_hash=f"binary-{index}",
+        )
+        for index in range(3)
+    ]
+    session.commit()
+    legacy_ids = [documents[0].id, documents[2].id]
+    session.execute(
+        text("update documents set embedding_vector = :embedding where id = :document_id"),
+        [{"embedding": dumps_embedding(vector), "document_id": document_id} for document_id in legacy_ids],
+    )
+    session.commit()
+
+    result = convert_embeddings_to_binary(batch_size=1)
+
+    storage = dict(session.execute(text("select id, typeof(embedding_vector) from documents")).all())
+    assert (result.checked, result.converted, result.skipped) == (2, 2, 0)
+    assert result.bytes_after * 2 < result.bytes_before
+    assert set(storage.values()) == {"blob"}
+    session.expire_all()
+    for document in documents:
+        stored = session.get(Document, document.id).embedding_vector
+        assert loads_embedding(stored) == pytest.approx(vector, abs=1e-6)
+
+
+def test_reembed_fills_target_model_beside_serving_model_then_promotes(session, monkeypatch):
+    source = get_or_create_source("https://reembed.test", status="indexed")
+    documents = [
+        upsert_document(
+            source=source,
+            url=f"https://reembed.test/{index}",
+            document_type="essay",
+            crawl_status="fetched",
+            title=f"Post {index}",
+            author=None,
+            published_at=None,
+            extracted_text=f"post {index}",
+            summary="Post.",
+            topics=["reembed"],
+            embedding=embed_text_local(f"post {index}"),
+            content_hash=f"reembed-{index}",
+        )
+        for index in range(3)
+    ]
+    session.commit()
+    local_vectors = {document.id: loads_embedding(document.embedding_vector) for document in documents}
+
+    async def fake_embed(text, model):
+        assert model == "wide-model"
+        return [1.0, 0.0, 0.0, float(len(text))]
+
+    monkeypatch.setattr(reembed, "embed_text_for_model_async", fake_embed)
+
+    assert embeddings_dao.serving_model_name() == LOCAL_EMBEDDING_MODEL
+    assert reembed.plan_reembedding("wide-model").action == "embed"
+    partial = reembed.reembed_corpus("wide-model", limit=2, batch_size=1)
+
+    assert (partial.embedded, partial.promoted, partial.plan.missing) == (2, False, 1)
+    session.expire_all()
+    assert embeddings_dao.serving_model_name() == LOCAL_EMBEDDING_MODEL
+    for document in documents:
+        assert loads_embedding(session.get(Document, document.id).embedding_vector) == pytest.approx(local_vectors[document.id])
+    assert session.get(DocumentEmbedding, (documents[1].id, "wide-model")).dimensions == 4
+
+    finished = reembed.reembed_corpus("wide-model", batch_size=1, resume=True)
+
+    assert (finished.embedded, finished.promoted, finished.plan.action) == (1, True, "up_to_date")
+    assert embeddings_dao.serving_model_name() == "wide-model"
+    assert embeddings_dao.get_embedding_model(LOCAL_EMBEDDING_MODEL).status == "retired"
+    for document in documents:
+        assert len(loads_embedding(session.get(Document, document.id).embedding_vector)) == 4
+
+
+def _alembic_upgrade(db_path: Path, revision: str) -> subprocess.CompletedProcess:
     env = {
         **os.environ,
         "DEV_DATABASE_URL": f"sqlite:///{db_path}",
         "PYTHONPATH": "backend",
     }
-
-    result = subprocess.run(
-        [sys.executable, "-m", "alembic", "-c", "alembic.ini", "upgrade", "head"],
+    return subprocess.run(
+        [sys.executable, "-m", "alembic", "-c", "alembic.ini", "upgrade", revision],
         cwd=Path(__file__).resolve().parents[2],
         env=env,
         text=True,
@@ -229,7 +622,42 @@ def test_alembic_upgrade_head_creates_schema(tmp_path):
         check=False,
     )
 
+
+def test_alembic_upgrade_head_creates_schema(tmp_path):
+    result = _alembic_upgrade(tmp_path / "alembic.db", "head")
+
+    assert result.returncode == 0, result.stderr
+
+
+def test_url_key_migration_resolves_links_across_http_and_https(tmp_path):
+    import sqlite3
+
+    db_path = tmp_path / "alembic.db"
+    result = _alembic_upgrade(db_path, "20261019_0014")
     assert result.returncode == 0, result.stderr
+    now = "2026-10-19 00:00:00"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            "INSERT INTO sources (id, url, canonical_domain, first_seen_at, status) VALUES (1, 'https://keys.test', 'keys.test', ?, 'indexed')",
+            (now,),
+        )
+        connection.executemany(
+            "INSERT INTO documents (id, uuid, source_id, url, url_hash, crawl_status, first_seen_at, document_type, category) "
+            "VALUES (?, ?, 1, ?, ?, 'fetched', ?, 'essay', 'unknown')",
+            [(1, "doc-1", "https://keys.test/a", 1, now), (2, "doc-2", "http://keys.test/b", 2, now)],
+        )
+        connection.executemany(
+            "INSERT INTO links (id, source_document_id, first_seen_at, target_url, target_url_hash, link_type) "
+            "VALUES (?, 1, ?, ?, ?, 'internal')",
+            [(1, now, "https://keys.test/a", 1), (2, now, "http://keys.test/a", 2), (3, now, "https://keys.test/b", 3), (4, now, "https://keys.test/c", 4)],
+        )
+
+    result = _alembic_upgrade(db_path, "20261019_0015")
+    assert result.returncode == 0, result.stderr
+
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute("SELECT id, target_document_id, target_source_id FROM links ORDER BY id").fetchall()
+    assert rows == [(1, 1, 1), (2, 1, 1), (3, 2, 1), (4, None, None)]
 
 
 def test_document_crawl_job_backfill_sets_unambiguous_job(session):
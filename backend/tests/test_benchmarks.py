@@ -0,0 +1,40 @@
+from sqlalchemy import text
+
+from benchmarks.corpus import CorpusSpec, generate_corpus
+from benchmarks.run import BenchmarkCase, compare, measure, percentile, recall_at_k, recall_cases
+from iris.models import Document, DocumentTopic, Link, UserDocumentMapping
+
+
+def test_synthetic_corpus_is_deterministic_and_judged(session):
+    spec = CorpusSpec(documents=40, documents_per_source=10, users=3, saves_per_user=5, judged_queries=4, relevant_per_query=2)
+    corpus = generate_corpus(spec)
+
+    assert session.query(Document).count() == 40
+    assert session.query(Link).count() == corpus.links > 0
+    assert session.query(DocumentTopic).count() > 0
+    assert session.query(UserDocumentMapping).count() == 15
+    assert [len(judged.relevant_document_ids) for judged in corpus.judged_queries] == [2, 2, 2, 2]
+    titles = [title for (title,) in session.query(Document.title).order_by(Document.id)]
+
+    session.rollback()
+    for table in ("document_topics", "topics", "links", "user_document_mappings", "friendships", "users", "documents", "sources"):
+        session.execute(text(f"DELETE FROM {table}"))
+    session.commit()
+    generate_corpus(spec)
+    assert [title for (title,) in session.query(Document.title).order_by(Document.id)] == titles
+
+    assert recall_at_k(corpus, recall_cases()["agent_keyword_search"], k=10) == 1.0
+
+
+def test_benchmark_measure_and_compare_report_percentiles():
+    assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 50) == 3.0
+    assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 99) == 5.0
+
+    result = measure(BenchmarkCase("noop", lambda _index: None, shared_session=True), iterations=5, warmup=1)
+    assert result.runs == 5
+
+    before = {"k": 10, "results": [{"corpus": {"documents": 10}, "latency": {"noop": {"p95_ms": 2.0}}, "recall_at_10": {"noop": 0.5}}]}
+    after = {"k": 10, "results": [{"corpus": {"documents": 10}, "latency": {"noop": {"p95_ms": 1.0}}, "recall_at_10": {"noop": 0.75}}]}
+    lines = compare(after, before)
+    assert "(0.50x)" in lines[1]
+    assert lines[2].endswith("0.500 -> 0.750")
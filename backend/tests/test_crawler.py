@@ -1,52 +1,39 @@
 from __future__ import annotations
 
 import asyncio
+import time
 import httpx
 import pytest
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin
 
 from iris.services.ingestion import crawler as crawler_module
 from iris.services.ingestion.crawler import Crawler, PagePipelineResult
 from iris.models import CrawlJob, Document, Link, Source
 from iris.dao.sources import get_or_create_source
-from iris.schemas.ingestion import ExtractedLink, ExtractedPage, FetchResult
+from iris.schemas.ingestion import ExtractedLink, ExtractedPage, FetchResult, ParsedPage
 
 
 @pytest.fixture(autouse=True)
 def deterministic_page_pipeline(monkeypatch):
     """Keep crawler tests focused on crawl mechanics, not live LLM output."""
 
-    async def fake_extract_page_async(html: str, final_url: str) -> ExtractedPage:
-        soup = BeautifulSoup(html, "html.parser")
-        title_tag = soup.find("title")
-        title = title_tag.get_text(" ", strip=True) if title_tag else None
-        text = soup.get_text(" ", strip=True)
-        links = [
-            ExtractedLink(
-                url=urljoin(final_url, str(anchor.get("href") or "")),
-                anchor_text=anchor.get_text(" ", strip=True),
-                context="",
-            )
-            for anchor in soup.find_all("a")
-        ]
-        document_type = "essay" if len(text.split()) >= 20 else "ignore"
+    async def fake_analyze_parsed_page_async(parsed: ParsedPage, final_url: str) -> ExtractedPage:
+        document_type = "essay" if len(parsed.text.split()) >= 20 else "ignore"
         return ExtractedPage(
-            title=title,
+            title=parsed.title,
             author=None,
             published_at=None,
-            text=text,
-            summary=text[:200],
+            text=parsed.text,
+            summary=parsed.text[:200],
             topics=["test"],
             document_type=document_type,
             category_slug=None,
-            links=links,
+            links=parsed.links,
         )
 
     async def fake_embed_text_async(_text: str) -> list[float]:
         return [0.1, 0.2, 0.3]
 
-    monkeypatch.setattr(crawler_module, "extract_page_async", fake_extract_page_async)
+    monkeypatch.setattr(crawler_module, "analyze_parsed_page_async", fake_analyze_parsed_page_async)
     monkeypatch.setattr(crawler_module, "embed_text_async", fake_embed_text_async)
 
 
@@ -196,6 +183,66 @@ def test_bfs_indexes_documents_links_and_discovers_external_source(session):
 
     titles = {doc.title for doc in session.query(Document).all()}
     assert "Deep" not in titles
+    # Profile generation is queued for the profile job runner, not run inline.
+    assert source.profile_analysis.status == "pending"
+    assert source.profile_analysis.queued_at is not None
+
+
+def test_new_document_resolves_earlier_links_to_its_url(session):
+    from iris.dao import metrics
+    from iris.dao.documents import upsert_document
+    from iris.dao.links import upsert_link
+
+    def add_document(url: str) -> Document:
+        return upsert_document(
+            source=source, url=url, document_type="essay", crawl_status="fetched", title=None, author=None,
+            published_at=None, extracted_text="text", summary="Summary.", topics=[], embedding=None, content_hash=url,
+        )
+
+    source = get_or_create_source("https://late.test/", status="indexed")
+    earlier = add_document("https://late.test/earlier")
+    secure = upsert_link(source_document=earlier, target_url="https://late.test/later", anchor_text=None, context=None)
+    plain = upsert_link(source_document=earlier, target_url="http://late.test/later", anchor_text=None, context=None)
+    other = upsert_link(source_document=earlier, target_url="https://late.test/other", anchor_text=None, context=None)
+    session.commit()
+    metrics.reset_metrics()
+    assert metrics.get_metrics().totals["resolved_links"] == 0
+
+    later = add_document("https://late.test/later")
+    session.commit()
+    session.expire_all()
+
+    assert secure.target_document_id == later.id
+    assert plain.target_document_id == later.id
+    assert other.target_document_id is None
+    assert metrics.get_metrics(max_age_seconds=3600).totals["resolved_links"] == 2
+
+
+def test_crawl_records_stage_timings_and_prometheus_metrics(session):
+    from fastapi.testclient import TestClient
+
+    from iris.routes.api import app
+    from iris.services.ingestion import crawl_timing
+
+    crawl_timing.reset_process_timings()
+    source = get_or_create_source("https://a.test/", status="queued")
+    crawler = Crawler(client_for_fixture())
+    job = crawler.crawl_source(source, max_pages=10, max_depth=1)
+
+    timings = crawler.timings
+    assert timings.pages >= job.pages_fetched == 3
+    assert timings.wall_seconds > 0
+    for stage in ("queue_wait", "download", "parse", "analysis", "embedding", "persist"):
+        assert timings.stages[stage].observations >= 3
+    assert set(timings.occupancy) == set(crawl_timing.PIPELINE_STAGES)
+    restored = crawl_timing.CrawlTimings.from_payload(timings.as_payload())
+    assert restored.stages["persist"].counts == timings.stages["persist"].counts
+    assert restored.occupancy["analysis"].busy == round(timings.occupancy["analysis"].busy, 6)
+
+    body = TestClient(app).get("/metrics").text
+    assert f'iris_crawl_stage_seconds_count{{stage="persist"}} {timings.pages}' in body
+    assert 'iris_crawl_stage_seconds_bucket{stage="analysis",le="+Inf"}' in body
+    assert 'iris_crawl_stage_occupancy_seconds_total{stage="fetch",state="busy"}' in body
 
 
 def test_feed_does_not_prevent_sitemap_archive_crawl(session):
@@ -271,48 +318,203 @@ def test_first_candidate_failure_does_not_rollback_crawl_job(session):
     assert session.get(CrawlJob, job.id) is not None
 
 
-def test_bfs_uses_active_pages_for_concurrent_processing(session, monkeypatch):
+def test_page_batch_commits_once_and_isolates_failing_pages_in_savepoints(session, monkeypatch):
+    from sqlalchemy import event
+
+    from iris.dao import crawler as crawler_dao
+    from iris.dao import metrics
+    from iris.models import Category
+
+    source = get_or_create_source("https://batch.test/", status="queued")
+    job = crawler_dao.create_crawl_job(source)
+    session.commit()
+    metrics.reset_metrics()
+    reconciled_at = metrics.get_metrics().reconciled_at
+
+    def page(path: str, *, category: str | None = "science", links: list[ExtractedLink] = (), error: str | None = None):
+        url = f"https://batch.test/{path}"
+        extracted = ExtractedPage(
+            title=path.title(), author=None, published_at=None, text="batch words " * 30, summary="Summary.",
+            topics=["batching"], document_type="essay", category_slug=category, links=list(links),
+        )
+        fetched = FetchResult(url=url, final_url=url, content_type="text/html", text="<html></html>")
+        return PagePipelineResult(url, None if error else fetched, None if error else extracted, path, [0.1, 0.2, 0.3], error=error)
+
+    links = [
+        ExtractedLink("/second", "Second", "See also"),
+        ExtractedLink("https://elsewhere.test/post", "Elsewhere", "A citation"),
+        ExtractedLink("https://elsewhere.test/post", "Elsewhere again", "A later citation"),
+    ]
+    upsert_links = crawler_module.upsert_links
+
+    def fail_on_broken(document, page_links):
+        if document.url.endswith("/broken"):
+            raise RuntimeError("link write failed")
+        return upsert_links(document, page_links)
+
+    monkeypatch.setattr(crawler_module, "upsert_links", fail_on_broken)
+    commits = []
+
+    def count_commit(_connection):
+        commits.append(1)
+
+    event.listen(session.get_bind(), "commit", count_commit)
+    crawler = Crawler(client_for_fixture())
+    results = [
+        page("first", links=links),
+        page("missing", error="404 not found"),
+        page("broken", category="writing", links=links),
+        page("second", category="ai"),
+    ]
+    documents = crawler._persist_page_results(source, job, results)
+    event.remove(session.get_bind(), "commit", count_commit)
+
+    assert len(commits) == 1
+    assert [document.url if document else None for document in documents] == [
+        "https://batch.test/first", None, None, "https://batch.test/second",
+    ]
+    session.expire_all()
+    assert (job.pages_fetched, job.documents_indexed, job.pages_failed) == (2, 2, 2)
+    assert (job.links_seen, job.sources_discovered) == (3, 1)
+    assert {document.url for document in session.query(Document)} == {"https://batch.test/first", "https://batch.test/second"}
+    # The broken page's category insert ran in the batch, before its savepoint rolled back.
+    assert {category.slug for category in session.query(Category)} == {"science", "writing", "ai"}
+    first_links = {link.target_url: link for link in documents[0].outgoing_links}
+    assert set(first_links) == {"https://batch.test/second", "https://elsewhere.test/post"}
+    assert first_links["https://batch.test/second"].target_document_id == documents[3].id
+    assert first_links["https://elsewhere.test/post"].anchor_text == "Elsewhere again"
+    assert first_links["https://elsewhere.test/post"].target_source_id is not None
+    # Counts flushed inside the rolled-back savepoint never reach the incremental snapshot.
+    counts = metrics.get_metrics(max_age_seconds=3600)
+    assert counts.reconciled_at == reconciled_at
+    assert counts.document_types == {"essay/fetched": 2}
+    assert counts.source_statuses == {"queued": 2}
+    assert (counts.totals["links"], counts.totals["resolved_links"]) == (2, 1)
+
+    crawler._persist_page_results(source, job, [page("first", links=[ExtractedLink("/second", "Renamed", None)])])
+    session.expire_all()
+    assert session.query(Link).count() == 2
+    assert session.query(Link).filter_by(target_url="https://batch.test/second").one().anchor_text == "Renamed"
+
+
+def test_bfs_uses_active_pages_for_concurrent_fetches(session, monkeypatch):
     source = get_or_create_source("https://a.test/", status="queued")
     active = 0
     max_active = 0
 
-    async def fake_process_page(self, url: str):
+    async def fake_fetch(self, url: str, timer):
         nonlocal active, max_active
         active += 1
         max_active = max(max_active, active)
         await asyncio.sleep(0.01)
         active -= 1
-        path = httpx.URL(url).path
-        links = []
-        if path == "/":
-            links = [
-                ExtractedLink(url="https://a.test/one", anchor_text="One", context="One"),
-                ExtractedLink(url="https://a.test/two", anchor_text="Two", context="Two"),
-            ]
-        fetched = FetchResult(url=url, final_url=url, content_type="text/html", text="<html></html>")
-        extracted = ExtractedPage(
-            title=path or "/",
-            author=None,
-            published_at=None,
-            text="body",
-            summary="summary",
-            topics=["test"],
-            document_type="essay",
-            category_slug="software",
-            links=links,
-        )
-        return PagePipelineResult(
-            requested_url=url,
-            fetched=fetched,
-            extracted=extracted,
-            content_hash=url,
-            embedding="[1.0]",
-        )
+        links = '<a href="/one">One</a><a href="/two">Two</a>' if httpx.URL(url).path == "/" else ""
+        return FetchResult(url=url, final_url=url, content_type="text/html", text=f"<html><body>{links}</body></html>")
 
-    monkeypatch.setattr(Crawler, "_process_page_async", fake_process_page)
+    monkeypatch.setattr(Crawler, "_fetch_with_retries", fake_fetch)
 
     job = Crawler(client_for_fixture()).crawl_source(source, max_pages=3, max_depth=1, active_pages=2)
 
     assert job.status == "succeeded"
     assert job.pages_fetched == 3
     assert max_active == 2
+
+
+def test_slow_analysis_does_not_hold_back_fetching(session, monkeypatch):
+    pages = {f"https://staged.test/post-{idx}": f"<html><title>Post {idx}</title><article>{'words ' * 40}</article></html>" for idx in range(6)}
+    pages["https://staged.test/"] = "<html><body>" + "".join(f'<a href="{url}">{url}</a>' for url in pages) + "</body></html>"
+    events: list[str] = []
+    analysing = 0
+    max_analysing = 0
+
+    async def fake_fetch(self, url: str, timer):
+        events.append("fetched")
+        return FetchResult(url=url, final_url=url, content_type="text/html", text=pages[url])
+
+    async def slow_analysis(parsed: ParsedPage, final_url: str) -> ExtractedPage:
+        nonlocal analysing, max_analysing
+        analysing += 1
+        max_analysing = max(max_analysing, analysing)
+        await asyncio.sleep(0.02)
+        analysing -= 1
+        events.append("analysed")
+        return ExtractedPage(
+            title=parsed.title, author=None, published_at=None, text=parsed.text, summary="", topics=[],
+            document_type="essay", category_slug=None, links=parsed.links,
+        )
+
+    monkeypatch.setattr(Crawler, "_fetch_with_retries", fake_fetch)
+    monkeypatch.setattr(crawler_module, "analyze_parsed_page_async", slow_analysis)
+    monkeypatch.setattr(crawler_module, "CRAWL_ANALYSIS_CONCURRENCY", 1)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if str(request.url) in pages:
+            return httpx.Response(200, text=pages[str(request.url)], headers={"content-type": "text/html"}, request=request)
+        return httpx.Response(404, request=request)
+
+    crawler = Crawler(httpx.Client(transport=httpx.MockTransport(handler)))
+    job = crawler.crawl_source(get_or_create_source("https://staged.test/", status="queued"), max_pages=7, max_depth=1)
+
+    assert job.pages_fetched == 7
+    assert max_analysing == 1
+    # Every page was fetched while the single analysis worker was still on its first few pages.
+    assert events.index("analysed") < events.index("fetched", 2)
+    assert events[:events.index("analysed", events.index("analysed") + 2)].count("fetched") == 7
+    analysis = crawler.timings.occupancy["analysis"]
+    assert analysis.waiting > analysis.busy > 0
+    assert crawler.timings.occupancy["fetch"].busy > 0
+
+
+def test_transient_failures_are_retried_and_shrink_host_concurrency(session, monkeypatch):
+    fixture = client_for_fixture()
+    failures = {"https://a.test/one": 429, "https://a.test/two": 503}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = failures.pop(str(request.url), None)
+        if status == 429:
+            return httpx.Response(429, headers={"retry-after": "0"}, request=request)
+        if status:
+            return httpx.Response(status, request=request)
+        return fixture.get(str(request.url))
+
+    monkeypatch.setattr(crawler_module, "CRAWL_RETRY_BACKOFF_SECONDS", 0.0)
+    source = get_or_create_source("https://a.test/", status="queued")
+    client = httpx.Client(transport=httpx.MockTransport(handler), follow_redirects=True)
+    job = Crawler(client).crawl_source(source, max_pages=3, max_depth=1, active_pages=4)
+
+    assert job.status == "succeeded"
+    assert job.pages_fetched == 3
+    assert job.pages_failed == 0
+    assert job.fetch_retries == 2
+    assert job.throttled_responses == 1
+    assert job.peak_active_pages >= 4
+    assert 1 <= job.active_pages < job.peak_active_pages
+
+
+def test_host_concurrency_grows_on_fast_responses_and_halves_once_per_window():
+    from iris.services.ingestion.host_concurrency import HostConcurrency, retry_after_seconds
+
+    concurrency = HostConcurrency.start(2)
+    for _ in range(40):
+        concurrency.observe_response(time.monotonic(), 0.05)
+    assert concurrency.active_limit > 2
+    grown = concurrency.limit
+
+    in_flight_since = time.monotonic()
+    concurrency.observe_failure(in_flight_since)
+    concurrency.observe_failure(in_flight_since)
+    assert concurrency.limit == grown / 2
+
+    concurrency.observe_failure(time.monotonic(), retry_after=5)
+    assert concurrency.limit == grown / 4
+    assert concurrency.resume_at > time.monotonic() + 4
+
+    slow = HostConcurrency.start(8)
+    slow.observe_response(time.monotonic(), 0.2)
+    for _ in range(5):
+        slow.observe_response(time.monotonic(), 3.0)
+    assert slow.active_limit < 8
+
+    assert retry_after_seconds("7") == 7.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after_seconds("soon") is None
@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import json
+
 from iris.services.ingestion.embedding import dumps_embedding, embed_text
 from iris.services.indexing import indexer
 from iris.services.indexing.indexer import plan_sources, autopilot
+from iris.services.ingestion.crawl_timing import CrawlTimings
 from iris.models import CrawlJob, IndexEvent, IndexRun, Link
 from iris.dao.sources import get_or_create_source
 from iris.dao.documents import upsert_document
@@ -89,6 +92,72 @@ def test_source_priorities_use_bfs_seed_frontier(session):
     assert "bfs_links=1" in priorities[0].reason
 
 
+def test_source_priorities_follow_favourite_personalised_authority(session):
+    from iris.dao import authority as authority_dao
+    from iris.dao import bookshelf as bookshelf_dao
+    from iris.dao.user_state import get_or_create_firebase_user
+    from iris.services.auth import FirebaseIdentity
+    from iris.services.indexing.authority import refresh_authority_scores
+
+    favourite = get_or_create_source("https://favourite.test", status="indexed")
+    generic = get_or_create_source("https://generic.test", status="indexed")
+    trusted_target = get_or_create_source("https://trusted-target.test", status="queued")
+    popular_target = get_or_create_source("https://popular-target.test", status="queued")
+    favourite_doc = add_essay(session, favourite, "Favourite Essay", "substantive writing about software")
+    generic_doc = add_essay(session, generic, "Generic Essay", "substantive writing about software")
+    generic_docs = [generic_doc] + [
+        add_essay(session, generic, f"Generic Essay {idx}", "more writing about software") for idx in range(3)
+    ]
+    session.add(
+        Link(
+            source_document_id=favourite_doc.id,
+            target_url="https://trusted-target.test/",
+            target_domain="trusted-target.test",
+            target_source_id=trusted_target.id,
+            link_type="external",
+        )
+    )
+    for document in generic_docs:
+        session.add(
+            Link(
+                source_document_id=document.id,
+                target_url="https://popular-target.test/",
+                target_domain="popular-target.test",
+                target_source_id=popular_target.id,
+                link_type="external",
+            )
+        )
+    user = get_or_create_firebase_user(FirebaseIdentity(uid="reader", email="reader@example.com", display_name="Reader"))
+    bookshelf_dao.update_entry(user, favourite_doc, favorited=True)
+    session.flush()
+
+    results = refresh_authority_scores()
+    assert [result.skipped for result in results] == [False, False]
+    assert results[0].seeds == 1
+    scores = authority_dao.get_authority_scores(results[0].graph)
+    assert scores[trusted_target.id] > scores[popular_target.id]
+
+    priorities = plan_sources(limit=2)
+    assert [item.source.id for item in priorities] == [trusted_target.id, popular_target.id]
+    assert "algorithm=pagerank" in priorities[0].reason
+
+    assert all(result.skipped for result in refresh_authority_scores())
+    newcomer = get_or_create_source("https://newcomer.test", status="queued")
+    session.add(
+        Link(
+            source_document_id=generic_doc.id,
+            target_url="https://newcomer.test/",
+            target_domain="newcomer.test",
+            target_source_id=newcomer.id,
+            link_type="external",
+        )
+    )
+    session.flush()
+    assert [item.source.id for item in plan_sources(limit=3)][-1] == newcomer.id
+    assert not refresh_authority_scores()[0].skipped
+    assert newcomer.id in authority_dao.get_authority_scores(results[0].graph)
+
+
 def test_source_priorities_skip_obvious_non_sources(session):
     seed = get_or_create_source("https://seed.test", status="indexed")
     youtube = get_or_create_source("https://youtube.com", status="queued")
@@ -154,6 +223,9 @@ def test_autopilot_refreshes_existing_seed_before_planning(session, monkeypatch)
     crawled_domains = []
 
     class FakeCrawler:
+        def __init__(self):
+            self.timings = CrawlTimings(pages=1, wall_seconds=0.5)
+
         def crawl_source(self, source, **_kwargs):
             crawled_domains.append(source.canonical_domain)
             source.status = "indexed"
@@ -185,6 +257,8 @@ def test_autopilot_refreshes_existing_seed_before_planning(session, monkeypatch)
     assert events[0].message == "refreshing seed noahrousell.com"
     assert events[1].message == "refreshed seed noahrousell.com: succeeded"
     assert events[2].event_type == "plan_created"
+    assert events[-1].event_type == "run_finished"
+    assert json.loads(events[-1].payload)["timings"]["summary"]["pages_per_second"] == 2.0
 
 
 def test_crawl_job_can_link_to_index_run(session):
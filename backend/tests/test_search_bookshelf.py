@@ -1,9 +1,25 @@
 import json
+import math
 from datetime import datetime, timezone
 
+import numpy as np
+import pytest
+
 from iris.dao import bookshelf
+from iris.dao import search as search_dao
 from iris.dao.user_state import get_or_create_local_user, get_or_create_user_document_mapping
-from iris.services.ingestion.embedding import dumps_embedding, embed_text
+from iris.services.common.rank_fusion import reciprocal_rank_fusion
+from iris.services.common.vectors import cosine_scores, principal_components, stack_vectors, top_k
+from iris.services.ingestion.embedding import (
+    DIMENSIONS,
+    coerce_embedding_vector,
+    dumps_embedding,
+    embed_text,
+    embed_text_local,
+    embed_texts_local,
+    loads_embedding,
+)
+from iris.services.ingestion.embedding_codec import decode_embedding, encode_embedding
 from iris.models import BookshelfStatus, Document
 from iris.dao.sources import get_or_create_source
 from iris.dao.documents import upsert_document
@@ -14,6 +30,7 @@ from iris.services.common.langfuse_tracing import (
 )
 from iris.schemas.enums import AgentToolName
 from iris.schemas.retrieval import AgentToolRun, RankedDocument
+from iris.services.retrieval.embedding_map import project_embeddings
 from iris.services.retrieval.search import (
     AGENT_INSTRUCTIONS,
     _document_search_payload,
@@ -56,6 +73,93 @@ def test_search_ranks_relevant_documents(session):
     assert results[0].document.title == "Small teams"
 
 
+def test_hybrid_search_fuses_keyword_and_semantic_ranks_with_user_adjustments(session):
+    source = get_or_create_source("https://a.test", status="indexed")
+    teams = add_doc(session, source, "Small teams", "small teams coordination costs software organizations")
+    add_doc(session, source, "Cooking", "recipes fermentation kitchen vegetables")
+    notes = add_doc(session, source, "Zettelkasten notes", "index cards and a slip box for writing")
+
+    hits = search_dao.hybrid_search_documents(["zettelkasten"], embed_text("zettelkasten"), candidates=10, limit=3)
+    assert hits[0].document_id == notes.id
+    assert hits[0].keyword_rank == 1
+
+    notes.title = "Commonplace notes"
+    session.flush()
+    assert all(hit.keyword_rank is None for hit in search_dao.hybrid_search_documents(["zettelkasten"], None, candidates=10, limit=3))
+
+    query_vector = embed_text("small teams coordination")
+    before_hits = search_dao.hybrid_search_documents(["small", "teams"], query_vector, candidates=10, limit=3)
+    before = {hit.document_id: hit.score for hit in before_hits}
+    assert max(before, key=before.get) == teams.id
+    top = before_hits[0]
+    assert (top.keyword_rank, top.semantic_rank) == (1, 1)
+    # First in both rankings: the best keyword match at full strength, the semantic rank scaled by cosine.
+    assert top.score == pytest.approx(search_dao.KEYWORD_FUSION_WEIGHT + search_dao.SEMANTIC_FUSION_WEIGHT * top.similarity)
+
+    user = get_or_create_local_user()
+    get_or_create_user_document_mapping(user, notes).favorited_at = datetime.now(timezone.utc)
+    get_or_create_user_document_mapping(user, teams).dismissed_at = datetime.now(timezone.utc)
+    session.flush()
+    after = {hit.document_id: hit.score for hit in search_dao.hybrid_search_documents(["small", "teams"], query_vector, candidates=10, limit=3)}
+    assert after[notes.id] == pytest.approx(before[notes.id] + search_dao.FAVORITE_SEARCH_BONUS)
+    assert after[teams.id] == pytest.approx(before[teams.id] - search_dao.DISMISSED_SEARCH_PENALTY)
+
+
+def test_hybrid_search_keeps_a_pure_keyword_hit_in_the_top_k(session):
+    source = get_or_create_source("https://a.test", status="indexed")
+    planted = add_doc(session, source, "Field notes", "kestrelfold archive migration")
+    for index in range(30):
+        add_doc(session, source, f"Planning essay {index}", "planning roadmaps quarterly goals teams offsite review")
+
+    query = "kestrelfold planning roadmaps"
+    hits = search_dao.hybrid_search_documents(sorted(query.split()), embed_text(query), candidates=80, limit=5)
+
+    assert planted.id in [hit.document_id for hit in hits]
+    assert all(hit.score > search_dao.MIN_SEARCH_SCORE for hit in hits)
+
+
+def test_postgres_fusion_sql_matches_portable_scores_when_keywords_miss(session):
+    from sqlalchemy import text
+
+    source = get_or_create_source("https://a.test", status="indexed")
+    add_doc(session, source, "Small teams", "small teams coordination costs software organizations")
+    add_doc(session, source, "Team rituals", "teams standups coordination retrospectives")
+    add_doc(session, source, "Cooking", "recipes fermentation kitchen vegetables")
+
+    hits = search_dao.hybrid_search_documents(["qqzzyx"], embed_text("small teams coordination"), candidates=10, limit=5)
+    assert hits and all(hit.keyword_rank is None for hit in hits)
+
+    params = {"rrf_k": 60, "keyword_weight": search_dao.KEYWORD_FUSION_WEIGHT, "semantic_weight": search_dao.SEMANTIC_FUSION_WEIGHT}
+    semantic_rows = []
+    for index, hit in enumerate(hits):
+        params.update({f"id_{index}": hit.document_id, f"rank_{index}": hit.semantic_rank, f"similarity_{index}": hit.similarity})
+        semantic_rows.append(f"select :id_{index}, :rank_{index}, :similarity_{index}")
+    rows = session.execute(
+        text(
+            f"""
+            with keyword(id, rank, strength) as (select null, null, null where 0),
+            semantic(id, rank, similarity) as ({" union all ".join(semantic_rows)}),
+            fused as (
+                select id, null as keyword_rank, null as keyword_strength, rank as semantic_rank, similarity from semantic
+            )
+            select f.id, {search_dao._fused_relevance_sql(["keyword", "semantic"])} as relevance from fused f
+            """
+        ),
+        params,
+    ).all()
+
+    assert {row.id: row.relevance for row in rows} == pytest.approx({hit.document_id: hit.score for hit in hits})
+
+
+def test_reciprocal_rank_fusion_scales_a_unanimous_first_place_to_one():
+    fused = reciprocal_rank_fusion([[1, 2, 2], [2, 3]])
+
+    assert list(fused) == [2, 1, 3]
+    assert reciprocal_rank_fusion([[7], [7]])[7] == pytest.approx(1.0)
+    assert reciprocal_rank_fusion([[7], []], [0.45, 0.55])[7] == pytest.approx(1.0)
+    assert reciprocal_rank_fusion([[7], [7]], strengths=[{7: 1.0}, {7: 0.5}])[7] == pytest.approx(0.75)
+
+
 def test_agent_document_payload_includes_structured_summary_fields(session):
     source = get_or_create_source("https://a.test", status="indexed")
     document = add_doc(
@@ -319,3 +423,212 @@ def test_bookshelf_update_persists_note_favorite_and_tags(session):
     assert mapping.note == "This is worth revisiting."
     assert mapping.intent_note == "Need this for retention."
     assert tags[document.id] == ["reflection", "writing"]
+
+
+def test_topic_index_tracks_document_topics_and_drives_tag_search(session):
+    from fastapi.testclient import TestClient
+
+    from iris.backfills.document_topics import backfill_document_topics
+    from iris.dao import topics as topics_dao
+    from iris.dao.documents import update_document_analysis
+    from iris.models import DocumentTopic, Topic
+    from iris.routes import app
+    from iris.schemas.ingestion import DocumentAnalysis
+    from iris.services.retrieval.search import _tag_query_terms, _tag_search
+
+    source = get_or_create_source("https://topics.test", status="indexed")
+    teams = add_doc(session, source, "Small teams", "small teams coordination costs")
+    compilers = add_doc(session, source, "Compilers", "weekend compiler projects")
+    update_document_analysis(
+        compilers,
+        DocumentAnalysis(
+            title="Compilers",
+            summary="Weekend compiler projects.",
+            topics=["Software", "Compilers"],
+            document_type="essay",
+            category_slug=None,
+        ),
+    )
+    session.commit()
+
+    counts = {topic.slug: topic.document_count for topic in session.query(Topic)}
+    assert counts == {"teams": 1, "software": 2, "compilers": 1}
+    assert _tag_query_terms({"software", "compilers", "cooking"}) == {"software", "compilers"}
+
+    rows = _tag_search({"compilers", "software"}, {teams.id: teams, compilers.id: compilers}, limit=5)
+    assert [row.document.title for row in rows] == ["Compilers", "Small teams"]
+    assert rows[0].reason == "topic match: compilers, software"
+
+    facets = TestClient(app).get("/api/topics", params={"limit": 2}).json()
+    assert facets == [
+        {"slug": "software", "name": "software", "document_count": 2},
+        {"slug": "compilers", "name": "Compilers", "document_count": 1},
+    ]
+
+    session.query(DocumentTopic).delete()
+    session.flush()
+    assert topics_dao.document_topics_for_slugs({"software"}) == []
+    assert backfill_document_topics() == 4
+    assert sorted(document_id for document_id, _slug in topics_dao.document_topics_for_slugs({"software"})) == sorted(
+        [teams.id, compilers.id]
+    )
+
+
+def test_posting_lists_refresh_incrementally_for_tag_and_category_tools(session, monkeypatch):
+    from iris.dao import postings as postings_dao
+    from iris.dao.categories import assign_category, get_or_create_category
+    from iris.dao.documents import update_document_analysis
+    from iris.dao.user_state import get_or_create_tag, tag_document
+    from iris.models import TagScope
+    from iris.schemas.ingestion import DocumentAnalysis
+    from iris.services.retrieval.posting_lists import current_posting_lists
+    from iris.services.retrieval.search import _category_search, _tag_query_terms, _tag_search
+
+    source = get_or_create_source("https://postings.test", status="indexed")
+    teams = add_doc(session, source, "Small teams", "small teams coordination costs")
+    compilers = add_doc(session, source, "Compilers", "weekend compiler projects")
+    session.commit()
+    corpus = {teams.id: teams, compilers.id: compilers}
+
+    postings = current_posting_lists()
+    assert postings.topics.get("software").tolist() == sorted([teams.id, compilers.id])
+    assert _category_search({"startups"}, corpus, limit=5) == []
+
+    loads: list[list[int] | None] = []
+    load_rows = postings_dao.get_posting_rows
+    monkeypatch.setattr(postings_dao, "get_posting_rows", lambda ids=None: loads.append(ids) or load_rows(ids))
+    tag_document(compilers, get_or_create_tag("Deep Work", scope=TagScope.SYSTEM))
+    assign_category(teams, get_or_create_category("startups", name="Startups"))
+    update_document_analysis(
+        compilers,
+        DocumentAnalysis(title="Compilers", summary="Weekend compiler projects.", topics=["Compilers"], document_type="essay", category_slug=None),
+    )
+    session.commit()
+
+    rows = _tag_search({"deep work", "software"}, corpus, limit=5)
+    assert loads == [sorted([teams.id, compilers.id])]
+    assert [(row.document.title, row.reason) for row in rows] == [
+        ("Compilers", "tag match: deep work"),
+        ("Small teams", "topic match: software"),
+    ]
+    assert current_posting_lists().topics.get("software").tolist() == [teams.id]
+    assert _tag_query_terms({"software", "compilers", "teams", "cooking"}) == {"software", "compilers", "teams"}
+    assert [(row.document.title, row.score, row.reason) for row in _category_search({"startups"}, corpus, limit=5)] == [
+        ("Small teams", 0.48, "category match: startups")
+    ]
+    assert _tag_search({"deep work"}, {teams.id: teams}, limit=5) == []
+
+    loads.clear()
+    _tag_search({"software"}, corpus, limit=5)
+    assert loads == []
+    postings_dao.mark_postings_changed(None)
+    session.commit()
+    _tag_search({"software"}, corpus, limit=5)
+    assert loads == [None]
+
+
+def test_agent_tools_are_async_and_use_worker_sessions(session):
+    import asyncio
+
+    from iris.dao import db
+    from iris.dao import search as search_dao
+    from iris.services.retrieval.search import _agent_tool_functions
+
+    source = get_or_create_source("https://tools.test", status="indexed")
+    add_doc(session, source, "Small teams", "small teams coordination costs software organizations")
+    add_doc(session, source, "Cooking", "recipes fermentation kitchen vegetables")
+    session.commit()
+
+    documents = search_dao.get_searchable_documents()
+    tool_runs: list[AgentToolRun] = []
+    tools = {tool.__name__: tool for tool in _agent_tool_functions(documents, tool_runs)}
+    assert all(asyncio.iscoroutinefunction(tool) for tool in tools.values())
+
+    async def first_turn():
+        return await asyncio.gather(tools["keyword_search"]("small teams"), tools["get_source_metadata"]("tools.test"))
+
+    keyword_output, source_output = asyncio.run(first_turn())
+    assert json.loads(keyword_output)[0]["title"] == "Small teams"
+    assert json.loads(source_output)["domain"] == "tools.test"
+    assert json.loads(asyncio.run(tools["get_source_metadata"]("missing.test"))) == {"error": "source not found", "domain": "missing.test"}
+
+    semantic_rows = json.loads(asyncio.run(tools["semantic_search"]("fermentation kitchen recipes", max_results=1)))
+    assert [row["title"] for row in semantic_rows] == ["Cooking"]
+    tag_rows = json.loads(asyncio.run(tools["tag_search"]("teams")))
+    assert {row["title"] for row in tag_rows} == {"Small teams", "Cooking"}
+    assert {run.tool for run in tool_runs[:2]} == {AgentToolName.KEYWORD, AgentToolName.SOURCE_METADATA}
+    assert [run.tool for run in tool_runs[2:]] == [AgentToolName.SOURCE_METADATA, AgentToolName.SEMANTIC, AgentToolName.TAGS]
+    assert all(row.document in documents for run in tool_runs for row in run.rows)
+    assert asyncio.run(db.run_in_worker_session(db.current_session)) is not session
+
+
+def test_agent_document_metadata_tool_reads_the_preloaded_excerpt(session):
+    import asyncio
+
+    from iris.dao import search as search_dao
+    from iris.services.retrieval.search import _agent_tool_functions
+
+    source = get_or_create_source("https://tools.test", status="indexed")
+    document_id = add_doc(session, source, "Small teams", "small   teams\ncoordination costs").id
+    session.commit()
+    session.expunge_all()
+
+    documents = search_dao.get_searchable_documents()
+    # Detached rows raise instead of lazy-loading the deferred full text.
+    session.expunge_all()
+    tools = {tool.__name__: tool for tool in _agent_tool_functions(documents, [])}
+
+    metadata = json.loads(asyncio.run(tools["get_document_metadata"](document_id)))
+
+    assert metadata["excerpt"] == "small teams coordination costs"
+    assert metadata["source"] == "tools.test"
+
+
+def test_embedding_codec_round_trips_binary_vectors():
+    # Dense like real model embeddings; local hash vectors are mostly zeros.
+    vector = [math.sin(index) / 28 for index in range(1536)]
+    legacy = dumps_embedding(vector)
+    encoded = encode_embedding(vector, dtype="float32")
+    decoded = decode_embedding(encoded)
+
+    assert len(encoded) * 2 < len(legacy)
+    assert decoded.dtype == np.float32
+    assert np.shares_memory(decoded, np.frombuffer(encoded, dtype=np.uint8))
+    assert loads_embedding(encoded) == pytest.approx(vector, abs=1e-6)
+    assert loads_embedding(legacy) == pytest.approx(vector, abs=1e-6)
+    assert coerce_embedding_vector(encoded) == pytest.approx(vector, abs=1e-6)
+    assert decode_embedding(encode_embedding(vector, dtype="float16")) == pytest.approx(vector, abs=1e-3)
+    assert decode_embedding(encode_embedding(vector, dtype="int8")) == pytest.approx(vector, abs=max(map(abs, vector)) / 127)
+    assert len(encode_embedding(vector, dtype="int8")) == 8 + len(vector)
+    with pytest.raises(ValueError):
+        decode_embedding(b"not a vector")
+
+
+def test_vector_kernels_match_scalar_embedding_and_ranking():
+    texts = ["Postgres index planner", "", "index index planner-notes", "to be"]
+    vectors = embed_texts_local(texts)
+
+    assert vectors == [embed_text_local(text) for text in texts]
+    assert vectors[1] == [0.0] * DIMENSIONS
+    assert math.isclose(sum(value * value for value in vectors[0]), 1.0)
+
+    matrix, present = stack_vectors([vectors[0], None, vectors[2], [1.0, 0.0]], DIMENSIONS)
+    scores = cosine_scores(vectors[0], matrix)
+    assert present.tolist() == [True, False, True, False]
+    assert scores[0] == pytest.approx(1.0) and scores[1] == scores[3] == 0.0
+    assert top_k(np.array([0.2, 0.9, 0.2, 0.5, 0.01]), 3).tolist() == [1, 3, 0]
+    assert top_k(np.array([0.2, 0.9, 0.2, 0.5, 0.01]), 10, min_score=0.04).tolist() == [1, 3, 0, 2]
+
+    rng = np.random.default_rng(3)
+    axis = np.zeros(64)
+    axis[5] = 1.0
+    points = np.outer(rng.standard_normal(40) * 10, axis) + rng.standard_normal((40, 64)) * 0.01
+    projected = principal_components(points, 3)
+    assert projected.shape == (40, 3)
+    assert abs(np.corrcoef(projected[:, 0], points[:, 5])[0, 1]) > 0.99
+    assert np.array_equal(projected, principal_components(points, 3))
+
+    projection = project_embeddings([vectors[0], vectors[2], vectors[1]])
+    assert projection.method == "randomized_svd_fallback"
+    assert max(math.hypot(point.x, point.y, point.z) for point in projection.points) == pytest.approx(42.0, abs=1e-3)
+
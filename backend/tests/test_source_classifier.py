@@ -2,8 +2,9 @@ from __future__ import annotations
 
 import pytest
 
+from iris.models import Source, SourceHomepageClassification
 from iris.services.common.config import MissingOpenAIKeyError
-from iris.services.ingestion import source_classifier
+from iris.services.ingestion import source_bulk_classifier, source_classifier
 from iris.services.ingestion.source_classifier import (
     classify_source_homepage,
     classify_source_url,
@@ -275,3 +276,56 @@ def test_source_classifier_payload_uses_strict_structured_output(monkeypatch):
 def test_source_classifier_parser_requires_direct_structured_json():
     with pytest.raises(ValueError):
         source_classifier._parse_classifier_json('Here is JSON: {"should_crawl": true, "reason": "Blog."}')
+
+
+def test_bulk_classification_caches_identical_homepages_and_resumes(monkeypatch, session):
+    personal = "<html><body><main><h1>Notes</h1><p>I write essays about cities, trains and walking home late.</p></main></body></html>"
+    pages = {
+        "https://alpha.example/": personal,
+        "https://beta.example/": personal,
+        "https://gamma.example/": personal,
+        "https://shop.example/": "<html><body><p>Buy our widgets with enterprise pricing and a free demo.</p></body></html>",
+    }
+    fetched: list[str] = []
+    llm_calls: list[str] = []
+
+    async def fake_fetch(_client, url):
+        fetched.append(url)
+        if url not in pages:
+            raise RuntimeError("connection refused")
+        return url, pages[url]
+
+    async def fake_llm(_key, url, _context, *, client=None):
+        llm_calls.append(url)
+        if "shop" in url:
+            return {"should_crawl": False, "reason": "Company product site."}
+        return {"should_crawl": True, "reason": "Personal essay archive."}
+
+    monkeypatch.setattr(source_bulk_classifier, "_fetch_homepage", fake_fetch)
+    monkeypatch.setattr(source_classifier, "_classify_with_openai_async", fake_llm)
+    monkeypatch.setattr(source_classifier, "require_openai_api_key", lambda _feature: "test-key")
+    for domain in ["alpha.example", "beta.example", "shop.example", "down.example", "gamma.example"]:
+        session.add(Source(url=f"https://{domain}/", canonical_domain=domain))
+    session.commit()
+
+    first = source_bulk_classifier.classify_queued_sources(limit=3, batch_size=2, concurrency=4, per_host=1)
+
+    assert (first.checked, first.cached, first.ignored) == (3, 1, 1)
+    assert sorted(llm_calls) == ["https://alpha.example/", "https://shop.example/"]
+    assert session.query(SourceHomepageClassification).count() == 2
+
+    second = source_bulk_classifier.classify_queued_sources(batch_size=2)
+
+    assert (second.checked, second.cached, second.fetch_failed) == (2, 1, 1)
+    assert len(llm_calls) == 2
+    assert fetched.count("https://alpha.example/") == 1
+    sources = {source.canonical_domain: source for source in session.query(Source)}
+    assert sources["gamma.example"].status == "queued"
+    assert sources["gamma.example"].classified_at is not None
+    assert sources["shop.example"].status == "ignored"
+    assert sources["down.example"].classified_at is None
+
+    source_bulk_classifier.classify_queued_sources()
+
+    assert fetched.count("https://down.example/") == 2
+    assert len(llm_calls) == 2
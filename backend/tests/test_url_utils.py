@@ -1,4 +1,4 @@
-from iris.services.common.url_utils import domain_for_url, normalize_url
+from iris.services.common.url_utils import domain_for_url, http_scheme_variants, normalize_url, url_hash, url_key
 
 
 def test_normalize_url_strips_tracking_and_www():
@@ -11,3 +11,11 @@ def test_normalize_url_strips_tracking_and_www():
 def test_domain_for_url_adds_scheme():
     assert domain_for_url("www.example.com/path") == "example.com"
 
+
+
+def test_url_key_ignores_http_scheme_but_not_path():
+    assert url_key("http://example.com/a") == url_key("https://example.com/a")
+    assert url_hash("http://example.com/a") != url_hash("https://example.com/a")
+    assert -(2**63) <= url_hash("https://example.com/a") < 2**63
+    assert url_key("https://example.com/a") != url_key("https://example.com/b")
+    assert http_scheme_variants("http://example.com/a?b=2") == {"http://example.com/a?b=2", "https://example.com/a?b=2"}
@@ -317,7 +317,7 @@ export interface GraphResponse {
   edges: GraphEdge[];
 }
 
-export type SourceProfileAnalysisStatus = 'pending' | 'succeeded' | 'failed';
+export type SourceProfileAnalysisStatus = 'pending' | 'running' | 'succeeded' | 'failed';
 export type SourceProfileLinkKind = 'homepage' | 'profile' | 'visible_link' | 'email';
 export type SourceProfileLink = { label: string; url: string; kind: SourceProfileLinkKind };
 
@@ -330,6 +330,7 @@ export interface SourceProfileAnalysis {
   generated_at: string | null;
   model: string | null;
   input_fingerprint: string | null;
+  queued_at: string | null;
   bio: string | null;
   audiences: string[] | null;
   themes: string[] | null;